@@ -13,12 +13,14 @@ conscious design decision, leaving the door open for keyword arguments
 to modify the meaning of the API call itself.
 """
 
+import bisect
 import collections
 import collections.abc
 import concurrent.futures
 import functools
 import heapq
 import itertools
+import math
 import os
 import socket
 import stat
@@ -66,6 +68,13 @@ _HAS_IPv6 = hasattr(socket, 'AF_INET6')
 # Maximum timeout passed to select to avoid OS limitations
 MAXIMUM_SELECT_TIMEOUT = 24 * 3600
 
+# Each level of the timer wheel has 2**_WHEEL_BITS slots.  With 4 levels
+# and a tick of 1 ms, the wheel holds timers up to 49 days ahead; the
+# others are kept in the heap.
+_WHEEL_BITS = 8
+_WHEEL_MASK = (1 << _WHEEL_BITS) - 1
+_WHEEL_LEVELS = 4
+
 
 def _format_handle(handle):
     cb = handle._callback
@@ -76,6 +85,239 @@ def _format_handle(handle):
         return str(handle)
 
 
+# Upper bounds in seconds of the buckets of LoopStats.durations; the last
+# bucket counts the longer durations.
+_STATS_BUCKETS = (1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0)
+
+
+def _handle_name(handle):
+    # The name under which the duration of a handle is counted: the
+    # qualified name of the callback, or of the coroutine of a task.
+    cb = handle._callback
+    while isinstance(cb, functools.partial):
+        cb = cb.func
+    task = getattr(cb, '__self__', None)
+    if isinstance(task, tasks.Task):
+        cb = task.get_coro()
+    try:
+        return cb.__qualname__
+    except AttributeError:
+        return type(cb).__qualname__
+
+
+class _TimerWheel:
+    """Hierarchical timing wheel of timer handles, see call_timeout_at().
+
+    Time is divided into ticks, and a handle is due at the first tick at
+    or after its time.  Level n has 256 slots of 256**n ticks each, for the
+    handles due in the next 256 slots of that size.  When the ticks of
+    level 0 wrap around, the slot of level 1 which starts is cascaded into
+    level 0, and so on up the levels.
+
+    A slot is a dict mapping id(handle) to the handle, and is stored as the
+    handle's _scheduled attribute: cancelling a handle removes it from its
+    slot in constant time.
+    """
+
+    def __init__(self, tick, now):
+        self.tick = tick
+        # The next tick to expire
+        self.current = math.floor(now / tick)
+        self.slots = [[{} for index in range(_WHEEL_MASK + 1)]
+                      for level in range(_WHEEL_LEVELS)]
+        # Bitmaps of the slots of each level which may not be empty
+        self.occupied = [0] * _WHEEL_LEVELS
+
+    def __len__(self):
+        return sum(map(len, itertools.chain.from_iterable(self.slots)))
+
+    def add(self, handle):
+        """Add a handle, and return True, or False if it is too far ahead."""
+        current = self.current
+        tick = math.ceil(handle._when / self.tick)
+        if tick < current:
+            tick = current
+        level = shift = 0
+        while (tick >> shift) - (current >> shift) > _WHEEL_MASK:
+            level += 1
+            if level == _WHEEL_LEVELS:
+                return False
+            shift += _WHEEL_BITS
+        index = (tick >> shift) & _WHEEL_MASK
+        slot = self.slots[level][index]
+        slot[id(handle)] = handle
+        handle._scheduled = slot
+        self.occupied[level] |= 1 << index
+        return True
+
+    def pop_all(self):
+        """Remove all the handles and return them."""
+        handles = []
+        for slot in itertools.chain.from_iterable(self.slots):
+            handles.extend(slot.values())
+            slot.clear()
+        self.occupied = [0] * _WHEEL_LEVELS
+        for handle in handles:
+            handle._scheduled = False
+        return handles
+
+    def next_expiry(self):
+        """Return the time of the next tick which may have handles due, or
+        None if the wheel is empty."""
+        index = self.current & _WHEEL_MASK
+        if not index and any(self.occupied[1:]):
+            # Slots of the upper levels start at the current tick.
+            return self.current * self.tick
+        bits = self.occupied[0] >> index
+        if bits:
+            return (self.current + (bits & -bits).bit_length() - 1) * self.tick
+        if self.occupied[0]:
+            # Level 0 must wrap around first.
+            return ((self.current | _WHEEL_MASK) + 1) * self.tick
+        tick = self._next_cascade()
+        if tick is None:
+            return None
+        return tick * self.tick
+
+    def _next_cascade(self):
+        # Return the next tick at which a slot of the upper levels which
+        # may not be empty starts, or None.
+        for level in range(1, _WHEEL_LEVELS):
+            shift = _WHEEL_BITS * level
+            base = self.current >> shift
+            bits = self.occupied[level] >> ((base & _WHEEL_MASK) + 1)
+            if bits:
+                return (base + (bits & -bits).bit_length()) << shift
+            if self.occupied[level]:
+                # The level must wrap around first.
+                return ((base | _WHEEL_MASK) + 1) << shift
+        return None
+
+    def expire(self, now):
+        """Remove the handles due at or before now and return them."""
+        last = math.floor(now / self.tick)
+        expired = []
+        slots = self.slots[0]
+        while self.current <= last:
+            index = self.current & _WHEEL_MASK
+            if not index:
+                self._cascade()
+            bits = self.occupied[0] >> index
+            if not bits:
+                # Skip to the next tick which may have handles.
+                if self.occupied[0]:
+                    tick = self.current + _WHEEL_MASK + 1 - index
+                else:
+                    tick = self._next_cascade()
+                if tick is None or tick > last:
+                    self.current = last + 1
+                    break
+                self.current = tick
+                continue
+            step = (bits & -bits).bit_length() - 1
+            if self.current + step > last:
+                self.current = last + 1
+                break
+            index += step
+            self.occupied[0] &= ~(1 << index)
+            slot = slots[index]
+            if slot:
+                for handle in slot.values():
+                    handle._scheduled = False
+                expired.extend(slot.values())
+                slot.clear()
+            self.current += step + 1
+        return expired
+
+    def _cascade(self):
+        # Move the handles of the slots starting at the current tick down.
+        for level in range(1, _WHEEL_LEVELS):
+            index = (self.current >> (_WHEEL_BITS * level)) & _WHEEL_MASK
+            self.occupied[level] &= ~(1 << index)
+            slot = self.slots[level][index]
+            handles = list(slot.values())
+            slot.clear()
+            for handle in handles:
+                self.add(handle)
+            if index:
+                break
+
+
+class LoopStats:
+    """Statistics of an event loop, returned by BaseEventLoop.get_stats().
+
+    Times are in seconds of the loop's clock.  The durations of one in
+    sample_interval callbacks are measured and counted in durations, which
+    maps the name of each callback (the coroutine of a task) to a list of
+    counts for each of the buckets.  The lag of a timer is how late it is
+    called after its scheduled time.
+    """
+
+    buckets = _STATS_BUCKETS
+
+    def __init__(self, sample_interval, clock):
+        self.sample_interval = sample_interval
+        self.iterations = 0         # Iterations of the loop
+        self.select_time = 0.0      # Time spent waiting for I/O
+        self.callback_time = 0.0    # Time spent in callbacks
+        self.handles = 0            # Callbacks called
+        self.timers = 0             # Timers which became ready
+        self.timer_lag = 0.0        # Sum of the lags of the timers
+        self.max_timer_lag = 0.0
+        self.max_ready = 0          # Longest ready queue
+        self.ready = 0              # Ready callbacks, when taken
+        self.scheduled = 0          # Scheduled timers, when taken
+        self.durations = {}
+        self._countdown = sample_interval
+        self._clock = clock
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__} iterations={self.iterations} '
+                f'select_time={self.select_time:.3f} '
+                f'callback_time={self.callback_time:.3f} '
+                f'handles={self.handles} ready={self.ready} '
+                f'scheduled={self.scheduled} '
+                f'max_timer_lag={self.max_timer_lag:.3f}>')
+
+    def _snapshot(self, loop):
+        stats = LoopStats(self.sample_interval, None)
+        stats.__dict__.update(self.__dict__)
+        # Copy the dict first, it may be changed by the loop's thread.
+        stats.durations = {name: list(counts)
+                           for name, counts in dict(self.durations).items()}
+        stats.ready = len(loop._ready)
+        stats.scheduled = len(loop._scheduled)
+        if loop._timer_wheel is not None:
+            stats.scheduled += len(loop._timer_wheel)
+        stats._clock = None
+        return stats
+
+    def _add_timer(self, lag):
+        self.timers += 1
+        if lag > 0:
+            self.timer_lag += lag
+            if lag > self.max_timer_lag:
+                self.max_timer_lag = lag
+
+    def _run(self, handle):
+        self._countdown -= 1
+        if self._countdown:
+            handle._run()
+        else:
+            self._run_sampled(handle)
+
+    def _run_sampled(self, handle):
+        self._countdown = self.sample_interval
+        t0 = self._clock()
+        handle._run()
+        dt = self._clock() - t0
+        name = _handle_name(handle)
+        counts = self.durations.get(name)
+        if counts is None:
+            counts = self.durations[name] = [0] * (len(self.buckets) + 1)
+        counts[bisect.bisect_left(self.buckets, dt)] += 1
+
+
 def _format_pipe(fd):
     if fd == subprocess.PIPE:
         return '<pipe>'
@@ -415,6 +657,10 @@ class BaseEventLoop(events.AbstractEventLoop):
         self._asyncgens_shutdown_called = False
         # Set to True when `loop.shutdown_default_executor` is called.
         self._executor_shutdown_called = False
+        # Statistics collected by _run_once(), or None
+        self._stats = None
+        # Timer wheel used by call_timeout_at(), or None
+        self._timer_wheel = None
 
     def __repr__(self):
         return (
@@ -688,6 +934,7 @@ class BaseEventLoop(events.AbstractEventLoop):
         self._closed = True
         self._ready.clear()
         self._scheduled.clear()
+        self._timer_wheel = None
         self._executor_shutdown_called = True
         executor = self._default_executor
         if executor is not None:
@@ -759,6 +1006,56 @@ class BaseEventLoop(events.AbstractEventLoop):
         timer._scheduled = True
         return timer
 
+    def call_timeout_at(self, when, callback, *args, context=None):
+        """Like call_at(), for timeouts, which are usually cancelled or
+        rescheduled before they expire.
+
+        If the timer wheel of the loop is enabled, see set_timer_wheel(),
+        scheduling and cancelling the call take constant time, and the
+        callback may be called up to one tick late.
+        """
+        wheel = self._timer_wheel
+        if wheel is None:
+            timer = self.call_at(when, callback, *args, context=context)
+        else:
+            if when is None:
+                raise TypeError("when cannot be None")
+            self._check_closed()
+            if self._debug:
+                self._check_thread()
+                self._check_callback(callback, 'call_timeout_at')
+            timer = events.TimerHandle(when, callback, args, self, context)
+            if not wheel.add(timer):
+                heapq.heappush(self._scheduled, timer)
+                timer._scheduled = True
+        if timer._source_traceback:
+            del timer._source_traceback[-1]
+        return timer
+
+    def get_timer_wheel(self):
+        """Return the tick of the timer wheel in seconds, or None if it is
+        not enabled."""
+        if self._timer_wheel is None:
+            return None
+        return self._timer_wheel.tick
+
+    def set_timer_wheel(self, enabled, *, tick=0.001):
+        """Enable or disable the timer wheel used by call_timeout_at().
+
+        tick is the resolution of the wheel in seconds.  The timeouts in
+        the previous wheel, if any, are moved to the heap used by call_at().
+        """
+        if enabled and tick <= 0:
+            raise ValueError('tick must be > 0')
+        wheel = self._timer_wheel
+        self._timer_wheel = None
+        if wheel is not None:
+            for handle in wheel.pop_all():
+                heapq.heappush(self._scheduled, handle)
+                handle._scheduled = True
+        if enabled:
+            self._timer_wheel = _TimerWheel(tick, self.time())
+
     def call_soon(self, callback, *args, context=None):
         """Arrange for a callback to be called as soon as possible.
 
@@ -1868,8 +2165,13 @@ class BaseEventLoop(events.AbstractEventLoop):
 
     def _timer_handle_cancelled(self, handle):
         """Notification that a TimerHandle has been cancelled."""
-        if handle._scheduled:
+        scheduled = handle._scheduled
+        if scheduled is True:
             self._timer_cancelled_count += 1
+        elif scheduled:
+            # The handle is in a slot of the timer wheel.
+            del scheduled[id(handle)]
+            handle._scheduled = False
 
     def _run_once(self):
         """Run one full iteration of the event loop.
@@ -1879,6 +2181,7 @@ class BaseEventLoop(events.AbstractEventLoop):
         'call_later' callbacks.
         """
 
+        stats = self._stats
         sched_count = len(self._scheduled)
         if (sched_count > _MIN_SCHEDULED_TIMER_HANDLES and
             self._timer_cancelled_count / sched_count >
@@ -1902,15 +2205,29 @@ class BaseEventLoop(events.AbstractEventLoop):
                 handle = heapq.heappop(self._scheduled)
                 handle._scheduled = False
 
+        wheel = self._timer_wheel
         timeout = None
         if self._ready or self._stopping:
             timeout = 0
-        elif self._scheduled:
-            # Compute the desired timeout.
-            when = self._scheduled[0]._when
-            timeout = min(max(0, when - self.time()), MAXIMUM_SELECT_TIMEOUT)
-
-        event_list = self._selector.select(timeout)
+        else:
+            when = None
+            if self._scheduled:
+                when = self._scheduled[0]._when
+            if wheel is not None:
+                expiry = wheel.next_expiry()
+                if expiry is not None and (when is None or expiry < when):
+                    when = expiry
+            if when is not None:
+                # Compute the desired timeout.
+                timeout = min(max(0, when - self.time()),
+                              MAXIMUM_SELECT_TIMEOUT)
+
+        if stats is None:
+            event_list = self._selector.select(timeout)
+        else:
+            t0 = self.time()
+            event_list = self._selector.select(timeout)
+            stats.select_time += self.time() - t0
         self._process_events(event_list)
         # Needed to break cycles when an exception occurs.
         event_list = None
@@ -1924,6 +2241,15 @@ class BaseEventLoop(events.AbstractEventLoop):
             handle = heapq.heappop(self._scheduled)
             handle._scheduled = False
             self._ready.append(handle)
+            if stats is not None:
+                stats._add_timer(end_time - self._clock_resolution -
+                                 handle._when)
+        if wheel is not None:
+            for handle in wheel.expire(end_time):
+                self._ready.append(handle)
+                if stats is not None:
+                    stats._add_timer(end_time - self._clock_resolution -
+                                     handle._when)
 
         # This is the only place where callbacks are actually *called*.
         # All other places just add them to ready.
@@ -1932,24 +2258,44 @@ class BaseEventLoop(events.AbstractEventLoop):
         # they will be run the next time (after another I/O poll).
         # Use an idiom that is thread-safe without using locks.
         ntodo = len(self._ready)
+        if stats is not None:
+            stats.iterations += 1
+            if ntodo > stats.max_ready:
+                stats.max_ready = ntodo
+            t0 = self.time()
+        cancelled = 0
         for i in range(ntodo):
             handle = self._ready.popleft()
             if handle._cancelled:
+                cancelled += 1
                 continue
             if self._debug:
                 try:
                     self._current_handle = handle
-                    t0 = self.time()
-                    handle._run()
-                    dt = self.time() - t0
+                    t1 = self.time()
+                    if stats is None:
+                        handle._run()
+                    else:
+                        stats._run(handle)
+                    dt = self.time() - t1
                     if dt >= self.slow_callback_duration:
                         logger.warning('Executing %s took %.3f seconds',
                                        _format_handle(handle), dt)
                 finally:
                     self._current_handle = None
-            else:
+            elif stats is None:
                 handle._run()
+            else:
+                # Inlined stats._run(handle)
+                stats._countdown -= 1
+                if stats._countdown:
+                    handle._run()
+                else:
+                    stats._run_sampled(handle)
         handle = None  # Needed to break cycles when an exception occurs.
+        if stats is not None:
+            stats.handles += ntodo - cancelled
+            stats.callback_time += self.time() - t0
 
     def _set_coroutine_origin_tracking(self, enabled):
         if bool(enabled) == bool(self._coroutine_origin_tracking_enabled):
@@ -1966,6 +2312,31 @@ class BaseEventLoop(events.AbstractEventLoop):
 
         self._coroutine_origin_tracking_enabled = enabled
 
+    def get_stats(self):
+        """Return a snapshot of the statistics of the loop, a LoopStats
+        object, or None if they are not collected.
+
+        This can be called from any thread.
+        """
+        stats = self._stats
+        if stats is None:
+            return None
+        return stats._snapshot(self)
+
+    def set_stats(self, enabled, *, sample_interval=16):
+        """Start or stop collecting statistics of the loop.
+
+        Starting resets them.  The duration of one in sample_interval
+        callbacks is measured.  Unlike debug mode, this is cheap enough to
+        be left on.
+        """
+        if not enabled:
+            self._stats = None
+            return
+        if sample_interval < 1:
+            raise ValueError('sample_interval must be >= 1')
+        self._stats = LoopStats(sample_interval, self.time)
+
     def get_debug(self):
         return self._debug
 
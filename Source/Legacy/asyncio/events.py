@@ -270,6 +270,9 @@ class AbstractEventLoop:
     def call_at(self, when, callback, *args, context=None):
         raise NotImplementedError
 
+    def call_timeout_at(self, when, callback, *args, context=None):
+        return self.call_at(when, callback, *args, context=context)
+
     def time(self):
         raise NotImplementedError
 
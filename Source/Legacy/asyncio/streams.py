@@ -21,6 +21,11 @@ from .tasks import sleep
 
 _DEFAULT_LIMIT = 2 ** 16  # 64 KiB
 
+# Initial size of the buffer of a StreamReader, and minimum free space of
+# the buffer given to the transport by StreamReaderProtocol.get_buffer().
+_BUFFER_SIZE = 2 ** 16  # 64 KiB
+_MIN_READ_SIZE = 2 ** 14  # 16 KiB
+
 
 async def open_connection(host=None, port=None, *,
                           limit=_DEFAULT_LIMIT, **kwds):
@@ -177,13 +182,19 @@ class FlowControlMixin(protocols.Protocol):
         raise NotImplementedError
 
 
-class StreamReaderProtocol(FlowControlMixin, protocols.Protocol):
+class StreamReaderProtocol(FlowControlMixin, protocols.Protocol,
+                           protocols.BufferedProtocol):
     """Helper class to adapt between Protocol and StreamReader.
 
     (This is a helper class instead of making StreamReader itself a
     Protocol subclass, because the StreamReader has other potential
     uses, and to prevent the user of the StreamReader to accidentally
     call inappropriate methods of the protocol.)
+
+    Transports which support buffered protocols receive the data directly
+    into the buffer of the StreamReader; the others call data_received().
+    If a subclass overrides data_received(), it is called with the data
+    in both cases.
     """
 
     _source_traceback = None
@@ -207,6 +218,8 @@ class StreamReaderProtocol(FlowControlMixin, protocols.Protocol):
         self._client_connected_cb = client_connected_cb
         self._over_ssl = False
         self._closed = self._loop.create_future()
+        # Buffer returned by get_buffer() for data_received(), or None
+        self._receive_buffer = None
 
     @property
     def _stream_reader(self):
@@ -271,6 +284,28 @@ class StreamReaderProtocol(FlowControlMixin, protocols.Protocol):
         if reader is not None:
             reader.feed_data(data)
 
+    def get_buffer(self, sizehint):
+        reader = self._stream_reader
+        if (reader is not None and
+                getattr(self.data_received, '__func__', None) is
+                StreamReaderProtocol.data_received):
+            self._receive_buffer = None
+            return reader._get_buffer()
+        # data_received() is overridden, or the data is discarded.
+        buf = self._receive_buffer
+        if buf is None:
+            buf = self._receive_buffer = bytearray(_MIN_READ_SIZE)
+        return buf
+
+    def buffer_updated(self, nbytes):
+        buf = self._receive_buffer
+        if buf is not None:
+            self.data_received(bytes(buf[:nbytes]))
+            return
+        reader = self._stream_reader
+        if reader is not None:
+            reader._buffer_updated(nbytes)
+
     def eof_received(self):
         reader = self._stream_reader
         if reader is not None:
@@ -393,6 +428,114 @@ class StreamWriter:
         protocol._replace_writer(self)
 
 
+class _StreamBuffer:
+    """The data received by a StreamReader and not read yet.
+
+    The data is kept in a bytearray between the offsets _start and _end, so
+    that reading it only moves _start.  When more space is needed, the data
+    is moved back to the front of the bytearray if at least as much has
+    been read, else the bytearray is enlarged.  If the transport still
+    holds a memoryview returned by reserve(), the bytearray cannot be
+    resized, and the data is copied to a new one.
+    """
+
+    def __init__(self):
+        self._data = bytearray()
+        self._start = 0
+        self._end = 0
+
+    def __len__(self):
+        return self._end - self._start
+
+    def __bytes__(self):
+        return bytes(memoryview(self._data)[self._start:self._end])
+
+    def reserve(self, size):
+        """Return a memoryview of the free space after the data, of at
+        least size bytes.  Call advance() once it has been filled."""
+        data = self._data
+        if len(data) - self._end < size:
+            start = self._start
+            end = self._end
+            length = end - start
+            if length <= start and len(data) - length >= size:
+                # The data does not overlap its new place.
+                data[:length] = memoryview(data)[start:end]
+                self._start = 0
+                self._end = length
+            else:
+                try:
+                    data.extend(bytes(max(len(data), size, _BUFFER_SIZE)))
+                except BufferError:
+                    # A memoryview of the bytearray is still alive.
+                    data = bytearray(max(2 * len(data), length + size))
+                    data[:length] = memoryview(self._data)[start:end]
+                    self._data = data
+                    self._start = 0
+                    self._end = length
+        return memoryview(data)[self._end:]
+
+    def advance(self, nbytes):
+        self._end += nbytes
+
+    def extend(self, data):
+        view = memoryview(data).cast('B')
+        nbytes = len(view)
+        self.reserve(nbytes)[:nbytes] = view
+        self._end += nbytes
+
+    def unread(self, data):
+        """Put data back before the data of the buffer."""
+        rest = bytes(self)
+        self.clear()
+        self.extend(data)
+        self.extend(rest)
+
+    def find(self, sub, start=0):
+        index = self._data.find(sub, self._start + start, self._end)
+        if index < 0:
+            return index
+        return index - self._start
+
+    def startswith(self, prefix, start=0):
+        return self._data.startswith(prefix, self._start + start, self._end)
+
+    def consume(self, nbytes):
+        self._start += nbytes
+        if self._start >= self._end:
+            self._start = self._end = 0
+            if len(self._data) > 4 * _BUFFER_SIZE:
+                # Release the memory used by a large read.
+                self._data = bytearray()
+
+    def clear(self):
+        self.consume(len(self))
+
+    def take(self, nbytes):
+        """Remove up to nbytes bytes from the front and return them."""
+        data = self._data
+        start = self._start
+        end = start + nbytes
+        if end < self._end:
+            self._start = end
+        else:
+            end = self._end
+            self.consume(end - start)
+        if end - start > 1024:
+            return bytes(memoryview(data)[start:end])
+        # Copying a small slice twice is faster than making a memoryview.
+        return bytes(data[start:end])
+
+    def take_into(self, view):
+        """Move up to len(view) bytes from the front into the memoryview
+        view and return their number."""
+        start = self._start
+        nbytes = min(len(view), self._end - start)
+        view[:nbytes] = memoryview(self._data)[start:start + nbytes]
+        self.consume(nbytes)
+        return nbytes
+
+
 class StreamReader:
 
     _source_traceback = None
@@ -409,9 +552,13 @@ class StreamReader:
             self._loop = events.get_event_loop()
         else:
             self._loop = loop
-        self._buffer = bytearray()
+        self._buffer = _StreamBuffer()
         self._eof = False    # Whether we're done.
         self._waiter = None  # A future used by _wait_for_data()
+        # The number of buffered bytes for which readexactly() waits
+        self._wanted = 0
+        # The unfilled part of the buffer of readexactly_into()
+        self._target = None
         self._exception = None
         self._transport = None
         self._paused = False
@@ -480,11 +627,52 @@ class StreamReader:
         if not data:
             return
 
-        self._buffer.extend(data)
-        self._wakeup_waiter()
+        target = self._target
+        if target is not None:
+            view = memoryview(data).cast('B')
+            nbytes = min(len(view), len(target))
+            target[:nbytes] = view[:nbytes]
+            self._target_filled(nbytes)
+            if nbytes == len(view):
+                return
+            self._buffer.extend(view[nbytes:])
+        else:
+            self._buffer.extend(data)
+        self._data_fed()
+
+    def _get_buffer(self):
+        # Called by StreamReaderProtocol.get_buffer(): while
+        # readexactly_into() waits, the data goes directly to its buffer.
+        if self._target is not None:
+            return self._target
+        return self._buffer.reserve(_MIN_READ_SIZE)
+
+    def _buffer_updated(self, nbytes):
+        assert not self._eof, 'buffer_updated after feed_eof'
+
+        if self._target is not None:
+            self._target_filled(nbytes)
+        else:
+            self._buffer.advance(nbytes)
+            self._data_fed()
+
+    def _target_filled(self, nbytes):
+        target = self._target[nbytes:]
+        if target:
+            self._target = target
+        else:
+            self._target = None
+            self._wakeup_waiter()
+
+    def _data_fed(self):
+        if len(self._buffer) >= self._wanted:
+            self._wakeup_waiter()
 
+        # Don't pause the transport if a reader still waits for more data:
+        # _wait_for_data() would resume it.
         if (self._transport is not None and
                 not self._paused and
+                self._waiter is None and
                 len(self._buffer) > 2 * self._limit):
             try:
                 self._transport.pause_reading()
@@ -548,7 +736,7 @@ class StreamReader:
             return e.partial
         except exceptions.LimitOverrunError as e:
             if self._buffer.startswith(sep, e.consumed):
-                del self._buffer[:e.consumed + seplen]
+                self._buffer.consume(e.consumed + seplen)
             else:
                 self._buffer.clear()
             self._maybe_resume_transport()
@@ -641,10 +829,9 @@ class StreamReader:
             raise exceptions.LimitOverrunError(
                 'Separator is found, but chunk is longer than limit', isep)
 
-        chunk = self._buffer[:isep + seplen]
-        del self._buffer[:isep + seplen]
+        chunk = self._buffer.take(isep + seplen)
         self._maybe_resume_transport()
-        return bytes(chunk)
+        return chunk
 
     async def read(self, n=-1):
         """Read up to `n` bytes from the stream.
@@ -691,12 +878,34 @@ class StreamReader:
             await self._wait_for_data('read')
 
         # This will work right even if buffer is less than n bytes
-        data = bytes(memoryview(self._buffer)[:n])
-        del self._buffer[:n]
+        data = self._buffer.take(n)
 
         self._maybe_resume_transport()
         return data
 
+    async def readinto(self, buffer):
+        """Read up to len(buffer) bytes from the stream into buffer.
+
+        Like read(len(buffer)), return the number of bytes read as soon
+        as at least 1 byte is available, or 0 at EOF.  buffer must be a
+        writable bytes-like object, such as a bytearray or a memoryview.
+        """
+        if self._exception is not None:
+            raise self._exception
+
+        with memoryview(buffer) as m, m.cast('B') as view:
+            if view.readonly:
+                raise TypeError('buffer must be writable')
+            if not view:
+                return 0
+
+            if not self._buffer and not self._eof:
+                await self._wait_for_data('readinto')
+
+            nbytes = self._buffer.take_into(view)
+        self._maybe_resume_transport()
+        return nbytes
+
     async def readexactly(self, n):
         """Read exactly `n` bytes.
 
@@ -727,17 +936,58 @@ class StreamReader:
                 self._buffer.clear()
                 raise exceptions.IncompleteReadError(incomplete, n)
 
-            await self._wait_for_data('readexactly')
+            self._wanted = n
+            try:
+                await self._wait_for_data('readexactly')
+            finally:
+                self._wanted = 0
 
-        if len(self._buffer) == n:
-            data = bytes(self._buffer)
-            self._buffer.clear()
-        else:
-            data = bytes(memoryview(self._buffer)[:n])
-            del self._buffer[:n]
+        data = self._buffer.take(n)
         self._maybe_resume_transport()
         return data
 
+    async def readexactly_into(self, buffer):
+        """Read exactly len(buffer) bytes into buffer.
+
+        buffer must be a writable bytes-like object, such as a bytearray
+        or a memoryview.  The data which is not buffered yet is received
+        directly into it by the transport, if it supports it.
+
+        Raise an IncompleteReadError if EOF is reached before buffer is
+        full, like readexactly().  If the read is cancelled or fails, the
+        data already read into buffer is kept in the stream.
+        """
+        if self._exception is not None:
+            raise self._exception
+
+        with memoryview(buffer) as m, m.cast('B') as view:
+            if view.readonly:
+                raise TypeError('buffer must be writable')
+            n = len(view)
+            filled = self._buffer.take_into(view)
+            if filled < n:
+                if self._eof:
+                    raise exceptions.IncompleteReadError(
+                        bytes(view[:filled]), n)
+                self._target = view[filled:]
+                try:
+                    while self._target is not None and not self._eof:
+                        await self._wait_for_data('readexactly_into')
+                except BaseException:
+                    if self._target is not None:
+                        filled = n - len(self._target)
+                        self._target = None
+                    else:
+                        filled = n
+                    self._buffer.unread(view[:filled])
+                    raise
+                if self._target is not None:
+                    filled = n - len(self._target)
+                    self._target = None
+                    raise exceptions.IncompleteReadError(
+                        bytes(view[:filled]), n)
+        self._maybe_resume_transport()
+
     def __aiter__(self):
         return self
 
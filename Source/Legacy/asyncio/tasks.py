@@ -486,7 +486,13 @@ async def _wait(fs, timeout, return_when, loop):
     waiter = loop.create_future()
     timeout_handle = None
     if timeout is not None:
-        timeout_handle = loop.call_later(timeout, _release_waiter, waiter)
+        try:
+            call_timeout_at = loop.call_timeout_at
+        except AttributeError:
+            # A loop not derived from AbstractEventLoop
+            call_timeout_at = loop.call_at
+        timeout_handle = call_timeout_at(loop.time() + timeout,
+                                         _release_waiter, waiter)
     counter = len(fs)
 
     def _on_completion(f):
@@ -55,7 +55,13 @@ class Timeout:
             if when <= loop.time():
                 self._timeout_handler = loop.call_soon(self._on_timeout)
             else:
-                self._timeout_handler = loop.call_at(when, self._on_timeout)
+                try:
+                    call_timeout_at = loop.call_timeout_at
+                except AttributeError:
+                    # A loop not derived from AbstractEventLoop
+                    call_timeout_at = loop.call_at
+                self._timeout_handler = call_timeout_at(
+                    when, self._on_timeout)
 
     def expired(self) -> bool:
         """Is timeout expired during execution?"""
@@ -4,10 +4,13 @@
 __author__ = 'Brian Quinlan (brian@sweetapp.com)'
 
 import collections
+import itertools
 import logging
+import queue
 import threading
 import time
 import types
+import weakref
 
 FIRST_COMPLETED = 'FIRST_COMPLETED'
 FIRST_EXCEPTION = 'FIRST_EXCEPTION'
@@ -146,11 +149,11 @@ class _AcquireFutures(object):
 
     def __enter__(self):
         for future in self.futures:
-            future._condition.acquire()
+            future._lock.acquire()
 
     def __exit__(self, *args):
         for future in self.futures:
-            future._condition.release()
+            future._lock.release()
 
 def _create_and_install_waiters(fs, return_when):
     if return_when == _AS_COMPLETED:
@@ -189,7 +192,7 @@ def _yield_finished_futures(fs, waiter, ref_collect):
         f = fs[-1]
         for futures_set in ref_collect:
             futures_set.remove(f)
-        with f._condition:
+        with f._lock:
             f._waiters.remove(waiter)
         del f
         # Careful not to keep a reference to the popped value
@@ -255,7 +258,7 @@ def as_completed(fs, timeout=None):
     finally:
         # Remove waiter from unfinished futures
         for f in fs:
-            with f._condition:
+            with f._lock:
                 f._waiters.remove(waiter)
 
 DoneAndNotDoneFutures = collections.namedtuple(
@@ -304,7 +307,7 @@ def wait(fs, timeout=None, return_when=ALL_COMPLETED):
 
     waiter.event.wait(timeout)
     for f in fs:
-        with f._condition:
+        with f._lock:
             f._waiters.remove(waiter)
 
     done.update(waiter.finished_futures)
@@ -327,13 +330,31 @@ class Future(object):
 
     def __init__(self):
         """Initializes the future. Should not be called by clients."""
-        self._condition = threading.Condition()
+        self._lock = threading.RLock()
+        # The condition is only needed to block in result() or exception();
+        # it is created on first use and shares self._lock.
+        self._cond = None
         self._state = PENDING
         self._result = None
         self._exception = None
         self._waiters = []
         self._done_callbacks = []
 
+    @property
+    def _condition(self):
+        cond = self._cond
+        if cond is None:
+            with self._lock:
+                cond = self._cond
+                if cond is None:
+                    cond = self._cond = threading.Condition(self._lock)
+        return cond
+
+    def _notify_all(self):
+        # Must be called with self._lock held.
+        if self._cond is not None:
+            self._cond.notify_all()
+
     def _invoke_callbacks(self):
         for callback in self._done_callbacks:
             try:
@@ -342,7 +363,7 @@ class Future(object):
                 LOGGER.exception('exception calling callback for %r', self)
 
     def __repr__(self):
-        with self._condition:
+        with self._lock:
             if self._state == FINISHED:
                 if self._exception:
                     return '<%s at %#x state=%s raised %s>' % (
@@ -367,7 +388,7 @@ class Future(object):
         Returns True if the future was cancelled, False otherwise. A future
         cannot be cancelled if it is running or has already completed.
         """
-        with self._condition:
+        with self._lock:
             if self._state in [RUNNING, FINISHED]:
                 return False
 
@@ -375,24 +396,24 @@ class Future(object):
                 return True
 
             self._state = CANCELLED
-            self._condition.notify_all()
+            self._notify_all()
 
         self._invoke_callbacks()
         return True
 
     def cancelled(self):
         """Return True if the future was cancelled."""
-        with self._condition:
+        with self._lock:
             return self._state in [CANCELLED, CANCELLED_AND_NOTIFIED]
 
     def running(self):
         """Return True if the future is currently executing."""
-        with self._condition:
+        with self._lock:
             return self._state == RUNNING
 
     def done(self):
         """Return True if the future was cancelled or finished executing."""
-        with self._condition:
+        with self._lock:
             return self._state in [CANCELLED, CANCELLED_AND_NOTIFIED, FINISHED]
 
     def __get_result(self):
@@ -416,7 +437,7 @@ class Future(object):
                 cancelled then the callable will be called immediately. These
                 callables are called in the order that they were added.
         """
-        with self._condition:
+        with self._lock:
             if self._state not in [CANCELLED, CANCELLED_AND_NOTIFIED, FINISHED]:
                 self._done_callbacks.append(fn)
                 return
@@ -442,7 +463,7 @@ class Future(object):
             Exception: If the call raised then that exception will be raised.
         """
         try:
-            with self._condition:
+            with self._lock:
                 if self._state in [CANCELLED, CANCELLED_AND_NOTIFIED]:
                     raise CancelledError()
                 elif self._state == FINISHED:
@@ -478,7 +499,7 @@ class Future(object):
                 timeout.
         """
 
-        with self._condition:
+        with self._lock:
             if self._state in [CANCELLED, CANCELLED_AND_NOTIFIED]:
                 raise CancelledError()
             elif self._state == FINISHED:
@@ -517,7 +538,7 @@ class Future(object):
             RuntimeError: if this method was already called or if set_result()
                 or set_exception() was called.
         """
-        with self._condition:
+        with self._lock:
             if self._state == CANCELLED:
                 self._state = CANCELLED_AND_NOTIFIED
                 for waiter in self._waiters:
@@ -539,14 +560,14 @@ class Future(object):
 
         Should only be used by Executor implementations and unit tests.
         """
-        with self._condition:
+        with self._lock:
             if self._state in {CANCELLED, CANCELLED_AND_NOTIFIED, FINISHED}:
                 raise InvalidStateError('{}: {!r}'.format(self._state, self))
             self._result = result
             self._state = FINISHED
             for waiter in self._waiters:
                 waiter.add_result(self)
-            self._condition.notify_all()
+            self._notify_all()
         self._invoke_callbacks()
 
     def set_exception(self, exception):
@@ -554,14 +575,14 @@ class Future(object):
 
         Should only be used by Executor implementations and unit tests.
         """
-        with self._condition:
+        with self._lock:
             if self._state in {CANCELLED, CANCELLED_AND_NOTIFIED, FINISHED}:
                 raise InvalidStateError('{}: {!r}'.format(self._state, self))
             self._exception = exception
             self._state = FINISHED
             for waiter in self._waiters:
                 waiter.add_exception(self)
-            self._condition.notify_all()
+            self._notify_all()
         self._invoke_callbacks()
 
     __class_getitem__ = classmethod(types.GenericAlias)
@@ -580,7 +601,31 @@ class Executor(object):
         """
         raise NotImplementedError()
 
-    def map(self, fn, *iterables, timeout=None, chunksize=1):
+    def submit_many(self, fn, iterable):
+        """Submits a callable to be executed once for each argument tuple.
+
+        Schedules fn(*args) for every args in *iterable* and returns the
+        Futures in the same order.  Executors may submit the whole batch
+        more cheaply than with one submit() call per item.
+
+        Returns:
+            A list of Futures representing the given calls.
+        """
+        return [self.submit(fn, *args) for args in iterable]
+
+    def _map_submit_many(self, fn, iterable):
+        # submit_many() may queue the calls without going through submit():
+        # if a subclass overrides submit() only, map() must call it.
+        cls = type(self)
+        for base in cls.__mro__:
+            if 'submit_many' in vars(base):
+                break
+        if cls.submit is base.submit:
+            return self.submit_many(fn, iterable)
+        return [self.submit(fn, *args) for args in iterable]
+
+    def map(self, fn, *iterables, timeout=None, chunksize=1, buffersize=None,
+            ordered=True):
         """Returns an iterator equivalent to map(fn, iter).
 
         Args:
@@ -592,6 +637,13 @@ class Executor(object):
                 before being passed to a child process. This argument is only
                 used by ProcessPoolExecutor; it is ignored by
                 ThreadPoolExecutor.
+            buffersize: The number of submitted tasks whose results have not
+                yet been yielded. If the buffer is full, iteration over the
+                iterables pauses until a result is yielded from the buffer.
+                If None, all input elements are eagerly collected, and a task
+                is submitted for each.
+            ordered: If False, results are yielded as soon as they are
+                available instead of in the order of the input.
 
         Returns:
             An iterator equivalent to: map(func, *iterables) but the calls may
@@ -602,18 +654,41 @@ class Executor(object):
                 before the given timeout.
             Exception: If fn(*args) raises for any values.
         """
+        if buffersize is not None and not isinstance(buffersize, int):
+            raise TypeError("buffersize must be an integer or None")
+        if buffersize is not None and buffersize < 1:
+            raise ValueError("buffersize must be None or > 0")
+
         if timeout is not None:
             end_time = timeout + time.monotonic()
 
-        fs = [self.submit(fn, *args) for args in zip(*iterables)]
+        zipped_iterables = zip(*iterables)
+        if buffersize:
+            fs = collections.deque(self._map_submit_many(
+                fn, itertools.islice(zipped_iterables, buffersize)))
+            # Do not keep the executor alive through the iterator.
+            executor_weakref = weakref.ref(self)
+        else:
+            fs = collections.deque(self._map_submit_many(fn, zipped_iterables))
+
+        def refill():
+            # Submit the next task, if any, to replace a consumed one.
+            if (buffersize
+                    and (executor := executor_weakref()) is not None
+                    and (args := next(zipped_iterables, None)) is not None):
+                return executor.submit(fn, *args)
+            return None
 
         # Yield must be hidden in closure so that the futures are submitted
         # before the first iterator value is required.
         def result_iterator():
             try:
-                # reverse to keep finishing order
                 fs.reverse()
                 while fs:
+                    fut = refill()
+                    if fut is not None:
+                        fs.appendleft(fut)
+                        del fut
                     # Careful not to keep a reference to the popped future
                     if timeout is None:
                         yield _result_or_cancel(fs.pop())
@@ -622,6 +697,37 @@ class Executor(object):
             finally:
                 for future in fs:
                     future.cancel()
+
+        def unordered_result_iterator():
+            done = queue.SimpleQueue()
+            pending = set(fs)
+            fs.clear()
+            for future in pending:
+                future.add_done_callback(done.put)
+            try:
+                while pending:
+                    fut = refill()
+                    if fut is not None:
+                        pending.add(fut)
+                        fut.add_done_callback(done.put)
+                    try:
+                        if timeout is None:
+                            fut = done.get()
+                        else:
+                            fut = done.get(timeout=max(0, end_time - time.monotonic()))
+                    except queue.Empty:
+                        raise TimeoutError(
+                                '%d futures unfinished' % len(pending)) from None
+                    pending.remove(fut)
+                    # Careful not to keep a reference to the future
+                    yield _result_or_cancel(fut)
+                    del fut
+            finally:
+                for future in pending:
+                    future.cancel()
+
+        if not ordered:
+            return unordered_result_iterator()
         return result_iterator()
 
     def shutdown(self, wait=True, *, cancel_futures=False):
@@ -41,6 +41,13 @@ Local worker thread:
 Process #1..n:
 - reads _CallItems from "Call Q", executes the calls, and puts the resulting
   _ResultItems in "Result Q"
+
+With a shared_memory_threshold, the local worker thread pickles the calls
+itself: large buffers, including those in the arguments of map() calls, are
+copied into a shared memory segment and the _CallItem only carries the rest
+of the pickle and the segment layout. Worker
+processes send large results back the same way. The executor unlinks every
+segment when the result of the call has been received.
 """
 
 __author__ = 'Brian Quinlan (brian@sweetapp.com)'
@@ -53,10 +60,14 @@ import multiprocessing as mp
 # so that it can be accessed later as `mp.connection`
 import multiprocessing.connection
 from multiprocessing.queues import Queue
+from multiprocessing.reduction import ForkingPickler
 import threading
 import weakref
 from functools import partial
+import array
+import io
 import itertools
+import pickle
 import sys
 from traceback import format_exception
 
@@ -144,6 +155,8 @@ class _WorkItem(object):
         self.fn = fn
         self.args = args
         self.kwargs = kwargs
+        # Shared memory segment holding the large arguments of the call.
+        self.segment = None
 
 class _ResultItem(object):
     def __init__(self, work_id, exception=None, result=None, exit_pid=None):
@@ -153,11 +166,162 @@ class _ResultItem(object):
         self.exit_pid = exit_pid
 
 class _CallItem(object):
-    def __init__(self, work_id, fn, args, kwargs):
+    def __init__(self, work_id, fn, args, kwargs, payload=None):
         self.work_id = work_id
         self.fn = fn
         self.args = args
         self.kwargs = kwargs
+        # A _SharedPayload of (fn, args, kwargs) replacing the three above.
+        self.payload = payload
+
+
+class _SharedPayload(object):
+    """A pickle whose large buffers are stored in a shared memory segment.
+
+    *layout* lists the (offset, size) of every out-of-band buffer of *data*
+    in the segment named *name*.
+    """
+    def __init__(self, data, name=None, layout=()):
+        self.data = data
+        self.name = name
+        self.layout = layout
+
+
+def _rebuild_buffer(cls, buf):
+    return cls(buf)
+
+def _rebuild_array(typecode, buf):
+    a = array.array(typecode)
+    a.frombytes(buf)
+    return a
+
+
+class _OutOfBand(object):
+    """Pickles a bytes, bytearray or array.array as an out-of-band buffer."""
+    __slots__ = ('obj',)
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __reduce_ex__(self, protocol):
+        obj = self.obj
+        if type(obj) is array.array:
+            return _rebuild_array, (obj.typecode, pickle.PickleBuffer(obj))
+        return _rebuild_buffer, (type(obj), pickle.PickleBuffer(obj))
+
+
+def _share_buffers(obj, threshold):
+    """Mark the large buffers of obj to be pickled out-of-band.
+
+    obj itself, or the items of an exact tuple or list or the values of an
+    exact dict, are wrapped in _OutOfBand if they are bytes, bytearray or
+    array.array objects of at least threshold bytes.
+    """
+    cls = type(obj)
+    if cls is bytes or cls is bytearray:
+        if len(obj) >= threshold:
+            return _OutOfBand(obj)
+    elif cls is array.array:
+        if len(obj) * obj.itemsize >= threshold:
+            return _OutOfBand(obj)
+    elif cls is tuple or cls is list:
+        return cls([_share_buffers(item, threshold)
+                    if type(item) in _BUFFER_TYPES else item
+                    for item in obj])
+    elif cls is dict:
+        return {key: _share_buffers(value, threshold)
+                if type(value) in _BUFFER_TYPES else value
+                for key, value in obj.items()}
+    return obj
+
+_BUFFER_TYPES = frozenset((bytes, bytearray, array.array))
+
+
+# Segments that could not be closed because objects built from them are
+# still alive.  Closing them is retried by _close_segment().
+_lingering_segments = []
+
+def _close_segment(segment, unlink=False):
+    if unlink:
+        try:
+            segment.unlink()
+        except FileNotFoundError:
+            pass
+    for shm in _lingering_segments[:]:
+        try:
+            shm.close()
+        except BufferError:
+            continue
+        _lingering_segments.remove(shm)
+    try:
+        segment.close()
+    except BufferError:
+        _lingering_segments.append(segment)
+
+
+def _dump_shared(obj, threshold):
+    """Pickle obj, moving buffers of threshold bytes or more to a segment.
+
+    Return a _SharedPayload and the segment, or None if no buffer was large
+    enough.  The caller owns the segment.
+    """
+    buffers = []
+    def buffer_callback(buf):
+        try:
+            raw = buf.raw()
+        except BufferError:
+            # Not contiguous.
+            return True
+        if raw.nbytes < threshold:
+            return True
+        buffers.append(raw)
+        return False
+
+    f = io.BytesIO()
+    ForkingPickler(f, 5, buffer_callback=buffer_callback).dump(obj)
+    data = f.getvalue()
+    if not buffers:
+        return _SharedPayload(data), None
+
+    from multiprocessing.shared_memory import SharedMemory
+    segment = SharedMemory(create=True, size=sum(b.nbytes for b in buffers))
+    try:
+        layout = []
+        offset = 0
+        for buf in buffers:
+            size = buf.nbytes
+            segment.buf[offset:offset + size] = buf
+            layout.append((offset, size))
+            offset += size
+    except BaseException:
+        _close_segment(segment, unlink=True)
+        raise
+    return _SharedPayload(data, segment.name, layout), segment
+
+
+def _load_shared(payload, unlink=False):
+    """Unpickle a _SharedPayload.
+
+    Return the object and the attached segment, or None if the payload has
+    no out-of-band buffers.  The caller must close the segment.  If unlink is
+    true, the segment is unlinked as soon as it is attached.
+    """
+    if payload.name is None:
+        return pickle.loads(payload.data), None
+
+    from multiprocessing.shared_memory import SharedMemory
+    segment = SharedMemory(payload.name)
+    buffers = None
+    try:
+        if unlink:
+            segment.unlink()
+        buffers = [segment.buf[offset:offset + size]
+                   for offset, size in payload.layout]
+        return pickle.loads(payload.data, buffers=buffers), segment
+    except BaseException:
+        del buffers
+        _close_segment(segment)
+        raise
 
 
 class _SafeQueue(Queue):
@@ -174,6 +338,9 @@ class _SafeQueue(Queue):
             tb = format_exception(type(e), e, e.__traceback__)
             e.__cause__ = _RemoteTraceback('\n"""\n{}"""'.format(''.join(tb)))
             work_item = self.pending_work_items.pop(obj.work_id, None)
+            if work_item is not None and work_item.segment is not None:
+                _close_segment(work_item.segment, unlink=True)
+                work_item.segment = None
             with self.shutdown_lock:
                 self.thread_wakeup.wakeup()
             # work_item can be None if another process terminated. In this
@@ -208,18 +375,30 @@ def _process_chunk(fn, chunk):
 
 
 def _sendback_result(result_queue, work_id, result=None, exception=None,
-                     exit_pid=None):
+                     exit_pid=None, shared_memory_threshold=None):
     """Safely send back the given result or exception"""
+    segment = None
     try:
+        if shared_memory_threshold is not None and exception is None:
+            result, segment = _dump_shared(
+                _share_buffers(result, shared_memory_threshold),
+                shared_memory_threshold)
         result_queue.put(_ResultItem(work_id, result=result,
                                      exception=exception, exit_pid=exit_pid))
     except BaseException as e:
+        if segment is not None:
+            _close_segment(segment, unlink=True)
+            segment = None
         exc = _ExceptionWithTraceback(e, e.__traceback__)
         result_queue.put(_ResultItem(work_id, exception=exc,
                                      exit_pid=exit_pid))
+    if segment is not None:
+        # The executor unlinks the segment once it has read the result.
+        _close_segment(segment)
 
 
-def _process_worker(call_queue, result_queue, initializer, initargs, max_tasks=None):
+def _process_worker(call_queue, result_queue, initializer, initargs, max_tasks=None,
+                    shared_memory_threshold=None):
     """Evaluates calls from call_queue and places the results in result_queue.
 
     This worker is run in a separate process.
@@ -231,6 +410,10 @@ def _process_worker(call_queue, result_queue, initializer, initargs, max_tasks=N
             to by the worker.
         initializer: A callable initializer, or None
         initargs: A tuple of args for the initializer
+        max_tasks: The maximum number of tasks to run before exiting, or None
+        shared_memory_threshold: If not None, results are sent as
+            _SharedPayloads whose buffers of at least this many bytes are
+            stored in shared memory.
     """
     if initializer is not None:
         try:
@@ -254,20 +437,30 @@ def _process_worker(call_queue, result_queue, initializer, initargs, max_tasks=N
             if num_tasks >= max_tasks:
                 exit_pid = os.getpid()
 
+        segment = None
         try:
-            r = call_item.fn(*call_item.args, **call_item.kwargs)
+            if call_item.payload is not None:
+                (fn, args, kwargs), segment = _load_shared(call_item.payload)
+            else:
+                fn, args, kwargs = call_item.fn, call_item.args, call_item.kwargs
+            r = fn(*args, **kwargs)
         except BaseException as e:
             exc = _ExceptionWithTraceback(e, e.__traceback__)
             _sendback_result(result_queue, call_item.work_id, exception=exc,
                              exit_pid=exit_pid)
         else:
             _sendback_result(result_queue, call_item.work_id, result=r,
-                             exit_pid=exit_pid)
+                             exit_pid=exit_pid,
+                             shared_memory_threshold=shared_memory_threshold)
             del r
 
         # Liberate the resource as soon as possible, to avoid holding onto
         # open files or shared memory that is not needed anymore
         del call_item
+        fn = args = kwargs = None
+        if segment is not None:
+            _close_segment(segment)
+            del segment
 
         if exit_pid is not None:
             return
@@ -330,6 +523,9 @@ class _ExecutorManagerThread(threading.Thread):
         #     {5: <_WorkItem...>, 6: <_WorkItem...>, ...}
         self.pending_work_items = executor._pending_work_items
 
+        # The size from which buffers are passed in shared memory, or None.
+        self.shared_memory_threshold = executor._shared_memory_threshold
+
         super().__init__()
 
     def run(self):
@@ -338,6 +534,12 @@ class _ExecutorManagerThread(threading.Thread):
         while True:
             self.add_call_item_to_queue()
 
+            # add_call_item_to_queue() drops the work items whose futures
+            # were cancelled, which may have been the last ones.
+            if not self.pending_work_items and self.is_shutting_down():
+                self.join_executor_internals()
+                return
+
             result_item, is_broken, cause = self.wait_result_broken_or_wakeup()
 
             if is_broken:
@@ -386,15 +588,45 @@ class _ExecutorManagerThread(threading.Thread):
                 work_item = self.pending_work_items[work_id]
 
                 if work_item.future.set_running_or_notify_cancel():
-                    self.call_queue.put(_CallItem(work_id,
-                                                  work_item.fn,
-                                                  work_item.args,
-                                                  work_item.kwargs),
-                                        block=True)
+                    if self.shared_memory_threshold is not None:
+                        call_item = self.make_shared_call_item(work_id,
+                                                               work_item)
+                        if call_item is None:
+                            continue
+                    else:
+                        call_item = _CallItem(work_id,
+                                              work_item.fn,
+                                              work_item.args,
+                                              work_item.kwargs)
+                    self.call_queue.put(call_item, block=True)
+                    del call_item
                 else:
                     del self.pending_work_items[work_id]
                     continue
 
+    def make_shared_call_item(self, work_id, work_item):
+        # Pickle the call here rather than in the call queue's feeder thread
+        # so that its large buffers can be stored in shared memory.
+        try:
+            threshold = self.shared_memory_threshold
+            fn, args = work_item.fn, work_item.args
+            if type(fn) is partial and fn.func is _process_chunk:
+                # A chunk of map(): share the arguments of every call.
+                args = (tuple(_share_buffers(call_args, threshold)
+                              for call_args in args[0]),)
+            else:
+                args = _share_buffers(args, threshold)
+            payload, work_item.segment = _dump_shared(
+                (fn, args, _share_buffers(work_item.kwargs, threshold)),
+                threshold)
+        except BaseException as e:
+            tb = format_exception(type(e), e, e.__traceback__)
+            e.__cause__ = _RemoteTraceback('\n"""\n{}"""'.format(''.join(tb)))
+            del self.pending_work_items[work_id]
+            work_item.future.set_exception(e)
+            return None
+        return _CallItem(work_id, None, None, None, payload=payload)
+
     def wait_result_broken_or_wakeup(self):
         # Wait for a result to be ready in the result_queue while checking
         # that all worker processes are still running, or for a wake up
@@ -442,12 +674,29 @@ class _ExecutorManagerThread(threading.Thread):
         else:
             # Received a _ResultItem so mark the future as completed.
             work_item = self.pending_work_items.pop(result_item.work_id, None)
+            result = result_item.result
+            if isinstance(result, _SharedPayload):
+                try:
+                    result = self.load_shared_result(result)
+                except BaseException as e:
+                    if work_item is not None and not result_item.exception:
+                        result_item.exception = e
             # work_item can be None if another process terminated (see above)
             if work_item is not None:
+                if work_item.segment is not None:
+                    _close_segment(work_item.segment, unlink=True)
+                    work_item.segment = None
                 if result_item.exception:
                     work_item.future.set_exception(result_item.exception)
                 else:
-                    work_item.future.set_result(result_item.result)
+                    work_item.future.set_result(result)
+
+    def load_shared_result(self, payload):
+        # The worker hands the segment over to the executor.
+        result, segment = _load_shared(payload, unlink=True)
+        if segment is not None:
+            _close_segment(segment)
+        return result
 
     def is_shutting_down(self):
         # Check whether we should start shutting down the executor.
@@ -484,6 +733,9 @@ class _ExecutorManagerThread(threading.Thread):
 
         # Mark pending tasks as failed.
         for work_id, work_item in self.pending_work_items.items():
+            if work_item.segment is not None:
+                _close_segment(work_item.segment, unlink=True)
+                work_item.segment = None
             work_item.future.set_exception(bpe)
             # Delete references to object. See issue16284
             del work_item
@@ -611,7 +863,8 @@ class BrokenProcessPool(_base.BrokenExecutor):
 
 class ProcessPoolExecutor(_base.Executor):
     def __init__(self, max_workers=None, mp_context=None,
-                 initializer=None, initargs=(), *, max_tasks_per_child=None):
+                 initializer=None, initargs=(), *, max_tasks_per_child=None,
+                 shared_memory_threshold=None):
         """Initializes a new ProcessPoolExecutor instance.
 
         Args:
@@ -629,6 +882,12 @@ class ProcessPoolExecutor(_base.Executor):
                 live as long as the executor. Requires a non-'fork' mp_context
                 start method. When given, we default to using 'spawn' if no
                 mp_context is supplied.
+            shared_memory_threshold: If not None, arguments and results are
+                pickled with protocol 5 and every bytes, bytearray,
+                array.array or other out-of-band buffer of at least this many
+                bytes is passed through a shared memory segment instead of
+                the pipe. The executor unlinks each segment once the call
+                or result has been received.
         """
         _check_system_limits()
 
@@ -675,6 +934,20 @@ class ProcessPoolExecutor(_base.Executor):
                                  " supply a different mp_context.")
         self._max_tasks_per_child = max_tasks_per_child
 
+        if shared_memory_threshold is not None:
+            if not isinstance(shared_memory_threshold, int):
+                raise TypeError("shared_memory_threshold must be an integer")
+            elif shared_memory_threshold <= 0:
+                raise ValueError("shared_memory_threshold must be >= 1")
+            from multiprocessing import shared_memory
+            if shared_memory._USE_POSIX:
+                # Start the resource tracker before the workers, so that they
+                # share it with this process: segments are created by one
+                # process and unlinked by the other.
+                from multiprocessing import resource_tracker
+                resource_tracker.ensure_running()
+        self._shared_memory_threshold = shared_memory_threshold
+
         # Management thread
         self._executor_manager_thread = None
 
@@ -757,7 +1030,8 @@ class ProcessPoolExecutor(_base.Executor):
                   self._result_queue,
                   self._initializer,
                   self._initargs,
-                  self._max_tasks_per_child))
+                  self._max_tasks_per_child,
+                  self._shared_memory_threshold))
         p.start()
         self._processes[p.pid] = p
 
@@ -786,7 +1060,36 @@ class ProcessPoolExecutor(_base.Executor):
             return f
     submit.__doc__ = _base.Executor.submit.__doc__
 
-    def map(self, fn, *iterables, timeout=None, chunksize=1):
+    def submit_many(self, fn, iterable):
+        # Build the batch before taking the lock: iterable may be slow.
+        items = [_WorkItem(_base.Future(), fn, args, {}) for args in iterable]
+        with self._shutdown_lock:
+            if self._broken:
+                raise BrokenProcessPool(self._broken)
+            if self._shutdown_thread:
+                raise RuntimeError('cannot schedule new futures after shutdown')
+            if _global_shutdown:
+                raise RuntimeError('cannot schedule new futures after '
+                                   'interpreter shutdown')
+            if not items:
+                return []
+
+            for w in items:
+                self._pending_work_items[self._queue_count] = w
+                self._work_ids.put(self._queue_count)
+                self._queue_count += 1
+            # Wake up queue management thread
+            self._executor_manager_thread_wakeup.wakeup()
+
+            if self._safe_to_dynamically_spawn_children:
+                for _ in range(min(len(items), self._max_workers)):
+                    self._adjust_process_count()
+            self._start_executor_manager_thread()
+            return [w.future for w in items]
+    submit_many.__doc__ = _base.Executor.submit_many.__doc__
+
+    def map(self, fn, *iterables, timeout=None, chunksize=1, buffersize=None,
+            ordered=True):
         """Returns an iterator equivalent to map(fn, iter).
 
         Args:
@@ -797,6 +1100,13 @@ class ProcessPoolExecutor(_base.Executor):
             chunksize: If greater than one, the iterables will be chopped into
                 chunks of size chunksize and submitted to the process pool.
                 If set to one, the items in the list will be sent one at a time.
+            buffersize: The number of submitted chunks whose results have not
+                yet been yielded. If the buffer is full, iteration over the
+                iterables pauses until a result is yielded from the buffer.
+                If None, all input elements are eagerly collected, and a task
+                is submitted for each chunk.
+            ordered: If False, the results of each chunk are yielded as soon
+                as the chunk is done instead of in the order of the input.
 
         Returns:
             An iterator equivalent to: map(func, *iterables) but the calls may
@@ -812,7 +1122,8 @@ class ProcessPoolExecutor(_base.Executor):
 
         results = super().map(partial(_process_chunk, fn),
                               _get_chunks(*iterables, chunksize=chunksize),
-                              timeout=timeout)
+                              timeout=timeout, buffersize=buffersize,
+                              ordered=ordered)
         return _chain_from_iterable_of_lists(results)
 
     def shutdown(self, wait=True, *, cancel_futures=False):
@@ -6,9 +6,11 @@
 __author__ = 'Brian Quinlan (brian@sweetapp.com)'
 
 from concurrent.futures import _base
+import collections
 import itertools
 import queue
 import threading
+import time
 import types
 import weakref
 import os
@@ -44,6 +46,8 @@ if hasattr(os, 'register_at_fork'):
 
 
 class _WorkItem(object):
+    __slots__ = ('future', 'fn', 'args', 'kwargs')
+
     def __init__(self, future, fn, args, kwargs):
         self.future = future
         self.fn = fn
@@ -109,6 +113,148 @@ def _worker(executor_reference, work_queue, initializer, initargs):
         _base.LOGGER.critical('Exception in worker', exc_info=True)
 
 
+# Put on the shared queue to wake an idle adaptive worker when work was
+# pushed on the local deque of another worker.
+_WAKE_UP = object()
+
+# The _WorkerState of the adaptive worker running in the current thread.
+_worker_local = threading.local()
+
+
+class _WorkerState(object):
+    """Bookkeeping of one adaptive worker thread."""
+
+    def __init__(self, work_queue):
+        self.work_queue = work_queue
+        # Work submitted from this worker. The owner takes the newest
+        # item, thieves take the oldest.
+        self.local = collections.deque()
+        self.started = time.monotonic()
+        self.running = False
+        self.busy = 0.0
+        self.completed = 0
+        self.stolen = 0
+
+    def run(self, work_item):
+        self.running = True
+        start = time.monotonic()
+        try:
+            work_item.run()
+        finally:
+            self.busy += time.monotonic() - start
+            self.completed += 1
+            self.running = False
+
+
+def _steal(states, thief):
+    for state in list(states.values()):
+        if state is not thief:
+            try:
+                work_item = state.local.popleft()
+            except IndexError:
+                continue
+            thief.stolen += 1
+            return work_item
+    return None
+
+
+def _adaptive_worker(executor_reference, work_queue, states, initializer,
+                     initargs, keep_alive):
+    if initializer is not None:
+        try:
+            initializer(*initargs)
+        except BaseException:
+            _base.LOGGER.critical('Exception in initializer:', exc_info=True)
+            executor = executor_reference()
+            if executor is not None:
+                executor._initializer_failed()
+            return
+    me = threading.current_thread()
+    state = states[me] = _WorkerState(work_queue)
+    _worker_local.state = state
+    local = state.local
+    try:
+        while True:
+            # Own work first, then the shared queue, then other workers'
+            # work, and only then wait.
+            try:
+                work_item = local.pop()
+            except IndexError:
+                try:
+                    work_item = work_queue.get_nowait()
+                except queue.Empty:
+                    work_item = _steal(states, state)
+                    if work_item is None:
+                        try:
+                            work_item = work_queue.get(timeout=keep_alive)
+                        except queue.Empty:
+                            executor = executor_reference()
+                            if executor is None or executor._retire(me):
+                                return
+                            del executor
+                            continue
+            if work_item is _WAKE_UP:
+                continue
+            if work_item is not None:
+                state.run(work_item)
+                # Delete references to object. See issue16284
+                del work_item
+
+                # attempt to increment idle count
+                executor = executor_reference()
+                if executor is not None:
+                    executor._idle_semaphore.release()
+                del executor
+                continue
+
+            executor = executor_reference()
+            # Exit if:
+            #   - The interpreter is shutting down OR
+            #   - The executor that owns the worker has been collected OR
+            #   - The executor that owns the worker has been shutdown.
+            if _shutdown or executor is None or executor._shutdown:
+                # Flag the executor as shutting down as early as possible if it
+                # is not gc-ed yet.
+                if executor is not None:
+                    executor._shutdown = True
+                # Notice other workers
+                work_queue.put(None)
+                # Work still waiting on the deque of a busy worker is not
+                # abandoned.
+                work_item = _steal(states, state)
+                if work_item is None:
+                    return
+                state.run(work_item)
+                del work_item
+            del executor
+    except BaseException:
+        _base.LOGGER.critical('Exception in worker', exc_info=True)
+    finally:
+        _worker_local.state = None
+        executor = executor_reference()
+        if executor is not None:
+            executor._worker_exited(me, state)
+        else:
+            states.pop(me, None)
+
+
+ThreadPoolStats = collections.namedtuple('ThreadPoolStats', [
+    'max_workers', 'workers', 'idle_workers', 'queued', 'submitted',
+    'completed', 'stolen', 'utilization'])
+ThreadPoolStats.__doc__ = """Statistics of a ThreadPoolExecutor.
+
+max_workers, workers: the thread limit and the number of live threads.
+idle_workers: live threads not running a call.
+queued: calls waiting to run, in the shared queue and in worker deques.
+submitted, completed: calls submitted and run since the executor started.
+stolen: calls taken from the deque of another worker.
+utilization: the fraction of the workers' lifetime spent running calls.
+
+completed, stolen and utilization are only tracked in adaptive mode; they
+are None otherwise.
+"""
+
+
 class BrokenThreadPool(_base.BrokenExecutor):
     """
     Raised when a worker thread in a ThreadPoolExecutor failed initializing.
@@ -121,7 +267,8 @@ class ThreadPoolExecutor(_base.Executor):
     _counter = itertools.count().__next__
 
     def __init__(self, max_workers=None, thread_name_prefix='',
-                 initializer=None, initargs=()):
+                 initializer=None, initargs=(), *, keep_alive=None,
+                 work_stealing=False):
         """Initializes a new ThreadPoolExecutor instance.
 
         Args:
@@ -130,6 +277,16 @@ class ThreadPoolExecutor(_base.Executor):
             thread_name_prefix: An optional name prefix to give our threads.
             initializer: A callable used to initialize worker threads.
             initargs: A tuple of arguments to pass to the initializer.
+            keep_alive: If not None, the number of seconds after which an
+                idle worker thread exits. New threads are started again
+                as work arrives.
+            work_stealing: If true, calls submitted from a worker thread
+                are put on a deque local to that worker instead of the
+                shared queue; idle workers take work from the deques of
+                busy ones.
+
+        Setting keep_alive or work_stealing selects the adaptive mode,
+        which also keeps the statistics reported by stats().
         """
         if max_workers is None:
             # ThreadPoolExecutor is often used to:
@@ -146,6 +303,9 @@ class ThreadPoolExecutor(_base.Executor):
         if initializer is not None and not callable(initializer):
             raise TypeError("initializer must be a callable")
 
+        if keep_alive is not None and keep_alive <= 0:
+            raise ValueError("keep_alive must be greater than 0")
+
         self._max_workers = max_workers
         self._work_queue = queue.SimpleQueue()
         self._idle_semaphore = threading.Semaphore(0)
@@ -157,6 +317,16 @@ class ThreadPoolExecutor(_base.Executor):
                                     ("ThreadPoolExecutor-%d" % self._counter()))
         self._initializer = initializer
         self._initargs = initargs
+        self._thread_ids = itertools.count()
+        self._keep_alive = keep_alive
+        self._work_stealing = work_stealing
+        self._adaptive = keep_alive is not None or work_stealing
+        # _WorkerState of the live adaptive workers, by thread.
+        self._worker_states = {}
+        self._submitted = 0
+        # Totals of the adaptive workers which have exited.
+        self._retired = {'alive': 0.0, 'busy': 0.0, 'completed': 0,
+                         'stolen': 0}
 
     def submit(self, fn, /, *args, **kwargs):
         with self._shutdown_lock, _global_shutdown_lock:
@@ -171,16 +341,57 @@ class ThreadPoolExecutor(_base.Executor):
 
             f = _base.Future()
             w = _WorkItem(f, fn, args, kwargs)
-
+            self._submitted += 1
+
+            if self._work_stealing:
+                state = getattr(_worker_local, 'state', None)
+                if state is not None and state.work_queue is self._work_queue:
+                    state.local.append(w)
+                    self._adjust_thread_count(wake_up=True)
+                    return f
             self._work_queue.put(w)
             self._adjust_thread_count()
             return f
     submit.__doc__ = _base.Executor.submit.__doc__
 
-    def _adjust_thread_count(self):
+    def submit_many(self, fn, iterable):
+        # Build the batch before taking the locks: iterable may be slow.
+        items = [_WorkItem(_base.Future(), fn, args, {}) for args in iterable]
+        with self._shutdown_lock, _global_shutdown_lock:
+            if self._broken:
+                raise BrokenThreadPool(self._broken)
+
+            if self._shutdown:
+                raise RuntimeError('cannot schedule new futures after shutdown')
+            if _shutdown:
+                raise RuntimeError('cannot schedule new futures after '
+                                   'interpreter shutdown')
+
+            self._submitted += len(items)
+            put = self._work_queue.put
+            wake_up = False
+            if self._work_stealing:
+                state = getattr(_worker_local, 'state', None)
+                if state is not None and state.work_queue is self._work_queue:
+                    put = state.local.append
+                    wake_up = True
+            for w in items:
+                put(w)
+            for _ in range(min(len(items), self._max_workers)):
+                self._adjust_thread_count(wake_up=wake_up)
+            return [w.future for w in items]
+    submit_many.__doc__ = _base.Executor.submit_many.__doc__
+
+    def _adjust_thread_count(self, wake_up=False):
         # if idle threads are available, don't spin new threads
         if self._idle_semaphore.acquire(timeout=0):
-            return
+            if wake_up:
+                # The work is not on the shared queue: tell the idle thread
+                # where to look.
+                self._work_queue.put(_WAKE_UP)
+            # Idle adaptive threads may all have exited meanwhile.
+            if self._threads or not self._adaptive:
+                return
 
         # When the executor gets lost, the weakref callback will wake up
         # the worker threads.
@@ -190,28 +401,105 @@ class ThreadPoolExecutor(_base.Executor):
         num_threads = len(self._threads)
         if num_threads < self._max_workers:
             thread_name = '%s_%d' % (self._thread_name_prefix or self,
-                                     num_threads)
-            t = threading.Thread(name=thread_name, target=_worker,
-                                 args=(weakref.ref(self, weakref_cb),
-                                       self._work_queue,
-                                       self._initializer,
-                                       self._initargs))
+                                     next(self._thread_ids))
+            if self._adaptive:
+                t = threading.Thread(name=thread_name, target=_adaptive_worker,
+                                     args=(weakref.ref(self, weakref_cb),
+                                           self._work_queue,
+                                           self._worker_states,
+                                           self._initializer,
+                                           self._initargs,
+                                           self._keep_alive))
+            else:
+                t = threading.Thread(name=thread_name, target=_worker,
+                                     args=(weakref.ref(self, weakref_cb),
+                                           self._work_queue,
+                                           self._initializer,
+                                           self._initargs))
             t.start()
             self._threads.add(t)
             _threads_queues[t] = self._work_queue
 
+    def _retire(self, thread):
+        """Let an idle adaptive worker exit, unless there is work for it.
+
+        Called by the worker when keep_alive expired. Returns True if
+        the worker should exit.
+        """
+        with self._shutdown_lock, _global_shutdown_lock:
+            # After shutdown, the worker exits through the usual path.
+            if self._shutdown or _shutdown or not self._work_queue.empty():
+                return False
+            if any(state.local for state in self._worker_states.values()):
+                return False
+            # This thread no longer counts as idle.
+            self._idle_semaphore.acquire(blocking=False)
+            self._threads.discard(thread)
+            _threads_queues.pop(thread, None)
+            return True
+
+    def _worker_exited(self, thread, state):
+        with self._shutdown_lock:
+            if self._worker_states.pop(thread, None) is None:
+                return
+            retired = self._retired
+            retired['alive'] += time.monotonic() - state.started
+            retired['busy'] += state.busy
+            retired['completed'] += state.completed
+            retired['stolen'] += state.stolen
+
+    def _drain(self):
+        # Remove all pending work items; the shutdown lock must be held.
+        while True:
+            try:
+                work_item = self._work_queue.get_nowait()
+            except queue.Empty:
+                break
+            if work_item is not None and work_item is not _WAKE_UP:
+                yield work_item
+        for state in list(self._worker_states.values()):
+            while True:
+                try:
+                    yield state.local.popleft()
+                except IndexError:
+                    break
+
+    def stats(self):
+        """Return a ThreadPoolStats snapshot of the executor's activity."""
+        with self._shutdown_lock:
+            states = list(self._worker_states.values())
+            queued = (self._work_queue.qsize() +
+                      sum(len(state.local) for state in states))
+            workers = len(self._threads)
+            submitted = self._submitted
+            if not self._adaptive:
+                return ThreadPoolStats(self._max_workers, workers, None,
+                                       queued, submitted, None, None, None)
+            now = time.monotonic()
+            retired = self._retired
+            alive = retired['alive']
+            busy = retired['busy']
+            completed = retired['completed']
+            stolen = retired['stolen']
+            running = 0
+            for state in states:
+                alive += now - state.started
+                busy += state.busy
+                completed += state.completed
+                stolen += state.stolen
+                running += state.running
+        utilization = busy / alive if alive > 0 else 0.0
+        return ThreadPoolStats(self._max_workers, workers,
+                               max(workers - running, 0), queued, submitted,
+                               completed, stolen, min(utilization, 1.0))
+
     def _initializer_failed(self):
         with self._shutdown_lock:
             self._broken = ('A thread initializer failed, the thread pool '
                             'is not usable anymore')
             # Drain work queue and mark pending futures failed
-            while True:
-                try:
-                    work_item = self._work_queue.get_nowait()
-                except queue.Empty:
-                    break
-                if work_item is not None:
-                    work_item.future.set_exception(BrokenThreadPool(self._broken))
+            for work_item in self._drain():
+                work_item.future.set_exception(BrokenThreadPool(self._broken))
 
     def shutdown(self, wait=True, *, cancel_futures=False):
         with self._shutdown_lock:
@@ -219,13 +507,8 @@ class ThreadPoolExecutor(_base.Executor):
             if cancel_futures:
                 # Drain all work items from the queue, and then cancel their
                 # associated futures.
-                while True:
-                    try:
-                        work_item = self._work_queue.get_nowait()
-                    except queue.Empty:
-                        break
-                    if work_item is not None:
-                        work_item.future.cancel()
+                for work_item in self._drain():
+                    work_item.future.cancel()
 
             # Send a wake-up to prevent threads calling
             # _work_queue.get(block=True) from permanently blocking.
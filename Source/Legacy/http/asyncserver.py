@@ -0,0 +1,702 @@
+"""Asynchronous HTTP/1.1 server.
+
+This module serves request handlers written for http.server from an
+asyncio event loop.  Each connection is driven by an HTTPServerProtocol
+instead of a thread, with persistent connections, pipelined requests
+and chunked request bodies.  Request heads are parsed in a single pass,
+without going through the email package.
+
+A handler is a BaseHTTPRequestHandler subclass with the usual do_GET(),
+do_POST(), ... methods.  Methods defined with "async def" are awaited in
+the event loop; plain methods are run in a thread pool, so existing
+blocking handlers work unchanged:
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        async def do_GET(self):
+            body = b"Hello"
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            await self.wfile.drain()
+
+    async def main():
+        async with AsyncHTTPServer(("", 8000), Handler) as server:
+            await server.serve_forever()
+
+Unlike with HTTPServer, the request body has been read in full before
+the handler is called: self.rfile holds the body only, with the chunked
+transfer coding removed, and ends where the body ends.  self.wfile
+buffers the response and sends it when the handler returns or when
+enough data has accumulated.  Coroutine handlers should await
+self.wfile.drain() after writing large amounts of data.
+"""
+
+__all__ = ["AsyncHTTPServer", "HTTPServerProtocol"]
+
+import asyncio
+import functools
+import http.client
+import inspect
+import io
+import re
+import socket
+import sys
+import threading
+import traceback
+
+from http import HTTPStatus
+
+
+# End of a header block, which may be empty
+_HEAD_END = re.compile(rb'(?:^|\n)\r?\n')
+_CHUNK_SIZE = re.compile(rb'[0-9A-Fa-f]+')
+
+
+class _RequestError(Exception):
+    """The request cannot be processed; the error is sent to the client."""
+
+    def __init__(self, code, message=None, explain=None):
+        super().__init__(code, message, explain)
+        self.code = code
+        self.message = message
+        self.explain = explain
+
+
+def _parse_fields(data):
+    """Parse a header block into a flat list of names and values, for
+    http.client.HTTPHeaders.
+
+    Raise _RequestError if the block is malformed.
+    """
+    fields = []
+    if not data:
+        return fields
+    for line in data.split(b'\n'):
+        if line[0] in b' \t':
+            # obsolete line folding
+            if not fields:
+                raise _RequestError(HTTPStatus.BAD_REQUEST,
+                                    "Bad header continuation line")
+            fields[-1] = (fields[-1] + b' ' + line.strip()).lstrip()
+            continue
+        name, sep, value = line.partition(b':')
+        if not sep or not name or name[-1] in b' \t':
+            raise _RequestError(HTTPStatus.BAD_REQUEST,
+                                "Bad header line (%r)" % line.rstrip(b'\r'))
+        fields.append(name.decode('iso-8859-1'))
+        fields.append(value.strip())
+    if len(fields) > 2 * http.client._MAXHEADERS:
+        raise _RequestError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                            "Too many headers")
+    return fields
+
+
+def _noop(self):
+    pass
+
+
+@functools.cache
+def _async_handler_class(cls):
+    # A subclass whose constructor does not handle the connection
+    return type(cls.__name__, (cls,), {
+        '__module__': cls.__module__,
+        '__qualname__': cls.__qualname__,
+        'setup': _noop,
+        'handle': _noop,
+        'finish': _noop,
+    })
+
+
+def _async_handler_factory(factory):
+    if isinstance(factory, functools.partial):
+        return functools.partial(_async_handler_factory(factory.func),
+                                 *factory.args, **factory.keywords)
+    return _async_handler_class(factory)
+
+
+class _ResponseWriter(io.BufferedIOBase):
+    """File object on which a handler writes its response.
+
+    Data is buffered and sent to the transport by flush(), which may be
+    called from the event loop or from the thread running a handler.
+    """
+
+    def __init__(self, protocol, buffer_size):
+        self._protocol = protocol
+        self._buffer_size = buffer_size
+        self._chunks = []
+        self._size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        if self.closed:
+            raise ValueError("write to closed file")
+        data = bytes(data)
+        if data:
+            self._chunks.append(data)
+            self._size += len(data)
+            if self._size >= self._buffer_size:
+                self.flush()
+        return len(data)
+
+    def flush(self):
+        if self._chunks:
+            data = b''.join(self._chunks)
+            self._chunks.clear()
+            self._size = 0
+            self._protocol._send(data)
+
+    async def drain(self):
+        """Send the buffered data and wait until the transport's write
+        buffer is below its high-water mark."""
+        self.flush()
+        await self._protocol._drain()
+
+
+class HTTPServerProtocol(asyncio.Protocol):
+    """Protocol handling the HTTP connections of an AsyncHTTPServer."""
+
+    def __init__(self, server):
+        self._server = server
+        self._loop = None
+        self._thread_id = None
+        self._transport = None
+        self._buffer = bytearray()
+        self._eof = False
+        self._reading_paused = False
+        self._writing_paused = False
+        self._waiter = None
+        self._drain_waiter = None
+        self._connection_lost = False
+        self._idle = False
+        self._closing = False
+        self._task = None
+
+    def connection_made(self, transport):
+        self._loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        self._transport = transport
+        self._server._connections.add(self)
+        self._task = self._loop.create_task(self._serve())
+
+    def connection_lost(self, exc):
+        self._connection_lost = True
+        self._eof = True
+        self._server._connections.discard(self)
+        self._wakeup()
+        waiter = self._drain_waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_exception(ConnectionResetError('Connection lost'))
+
+    def data_received(self, data):
+        self._buffer += data
+        if (not self._reading_paused and
+                len(self._buffer) > self._server.read_buffer_size):
+            self._reading_paused = True
+            self._transport.pause_reading()
+        self._wakeup()
+
+    def eof_received(self):
+        self._eof = True
+        self._wakeup()
+        # Keep the transport open to send the pending responses
+        return True
+
+    def pause_writing(self):
+        self._writing_paused = True
+
+    def resume_writing(self):
+        self._writing_paused = False
+        waiter = self._drain_waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def close(self):
+        """Close the connection once the current request is handled."""
+        self._closing = True
+        if self._idle and self._transport is not None:
+            self._transport.close()
+
+    # Reading
+
+    def _wakeup(self):
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def _timeout(self, waiter):
+        if not waiter.done():
+            waiter.set_exception(TimeoutError())
+
+    async def _fill(self, deadline):
+        """Wait for more data until the deadline, in loop time; return
+        False at end of stream."""
+        if self._eof:
+            return False
+        if self._reading_paused:
+            self._reading_paused = False
+            self._transport.resume_reading()
+        waiter = self._waiter = self._loop.create_future()
+        timer = None
+        if deadline is not None:
+            try:
+                call_timeout_at = self._loop.call_timeout_at
+            except AttributeError:
+                # A loop not derived from AbstractEventLoop
+                call_timeout_at = self._loop.call_at
+            timer = call_timeout_at(deadline, self._timeout, waiter)
+        try:
+            await waiter
+        finally:
+            self._waiter = None
+            if timer is not None:
+                timer.cancel()
+        return True
+
+    async def _readline(self, limit, deadline):
+        """Read a line of at most limit bytes.
+
+        A longer line is returned truncated to limit + 1 bytes; a line cut
+        by the end of stream is returned without its newline.
+        """
+        start = 0
+        buffer = self._buffer
+        while True:
+            end = buffer.find(b'\n', start, limit + 1)
+            if end >= 0:
+                end += 1
+                break
+            start = len(buffer)
+            if start > limit:
+                end = limit + 1
+                break
+            if not await self._fill(deadline):
+                end = len(buffer)
+                break
+        line = bytes(buffer[:end])
+        del buffer[:end]
+        return line
+
+    async def _readexactly(self, n, deadline):
+        buffer = self._buffer
+        while len(buffer) < n:
+            if not await self._fill(deadline):
+                partial = bytes(buffer)
+                buffer.clear()
+                raise asyncio.IncompleteReadError(partial, n)
+        data = bytes(buffer[:n])
+        del buffer[:n]
+        return data
+
+    async def _read_header_block(self, limit, deadline):
+        buffer = self._buffer
+        start = 0
+        while True:
+            match = _HEAD_END.search(buffer, start)
+            if match is not None and match.end() <= limit:
+                break
+            if len(buffer) > limit:
+                raise _RequestError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                                    "Request header fields too large")
+            start = max(len(buffer) - 3, 0)
+            if not await self._fill(deadline):
+                raise asyncio.IncompleteReadError(bytes(buffer), None)
+        data = bytes(buffer[:match.start()])
+        del buffer[:match.end()]
+        return data
+
+    async def _read_chunked(self, limit, deadline):
+        chunks = []
+        size = 0
+        while True:
+            line = await self._readline(http.client._MAXLINE, deadline)
+            if not line.endswith(b'\n'):
+                if len(line) > http.client._MAXLINE:
+                    raise _RequestError(HTTPStatus.BAD_REQUEST,
+                                        "Chunk size line too long")
+                raise asyncio.IncompleteReadError(line, None)
+            chunk_size = line.split(b';', 1)[0].strip()
+            if not _CHUNK_SIZE.fullmatch(chunk_size):
+                raise _RequestError(HTTPStatus.BAD_REQUEST,
+                                    "Bad chunk size (%r)" % chunk_size)
+            chunk_size = int(chunk_size, 16)
+            if not chunk_size:
+                break
+            size += chunk_size
+            if size > limit:
+                raise _RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+            chunks.append(await self._readexactly(chunk_size, deadline))
+            line = await self._readline(2, deadline)
+            if line not in (b'\r\n', b'\n'):
+                raise _RequestError(HTTPStatus.BAD_REQUEST,
+                                    "Bad chunk terminator")
+        # Skip the trailer section
+        while True:
+            line = await self._readline(http.client._MAXLINE, deadline)
+            if not line.endswith(b'\n'):
+                if len(line) > http.client._MAXLINE:
+                    raise _RequestError(HTTPStatus.BAD_REQUEST,
+                                        "Trailer line too long")
+                raise asyncio.IncompleteReadError(line, None)
+            if line in (b'\r\n', b'\n'):
+                break
+        return b''.join(chunks)
+
+    # Writing
+
+    def _send(self, data):
+        if threading.get_ident() != self._thread_id:
+            future = asyncio.run_coroutine_threadsafe(
+                self._send_and_drain(data), self._loop)
+            future.result()
+            return
+        if self._transport.is_closing():
+            raise ConnectionResetError('Connection lost')
+        self._transport.write(data)
+
+    async def _send_and_drain(self, data):
+        self._send(data)
+        await self._drain()
+
+    async def _drain(self):
+        if self._connection_lost:
+            raise ConnectionResetError('Connection lost')
+        if not self._writing_paused:
+            return
+        waiter = self._drain_waiter = self._loop.create_future()
+        try:
+            await waiter
+        finally:
+            self._drain_waiter = None
+
+    # Request handling
+
+    async def _serve(self):
+        server = self._server
+        transport = self._transport
+        peername = transport.get_extra_info('peername')
+        handler = None
+        try:
+            sock = transport.get_extra_info('socket')
+            handler = server._handler_factory(sock, peername, server)
+            handler.connection = sock
+            handler.wfile = _ResponseWriter(self, server.write_buffer_size)
+            while await self._handle_one_request(handler):
+                if self._closing:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except TimeoutError as e:
+            handler.log_error("Request timed out: %r", e)
+        except Exception:
+            server.handle_error(transport.get_extra_info('socket'), peername)
+        finally:
+            transport.close()
+
+    async def _handle_one_request(self, handler):
+        """Read, parse and handle one request.
+
+        Return True if the connection should be kept open.
+        """
+        server = self._server
+        handler.command = None
+        handler.request_version = handler.default_request_version
+        handler.close_connection = True
+        handler._headers_buffer = []
+
+        # Wait for the next request, skipping empty lines before the request
+        # line (RFC 9112, section 2.2)
+        buffer = self._buffer
+        self._idle = True
+        try:
+            while True:
+                while buffer[:1] in (b'\r', b'\n'):
+                    del buffer[:1]
+                if buffer:
+                    break
+                if self._closing:
+                    return False
+                try:
+                    if not await self._fill(
+                            self._loop.time() + server.keep_alive_timeout):
+                        return False
+                except TimeoutError:
+                    return False
+        finally:
+            self._idle = False
+
+        # The request head, then the body, must each be read in time
+        deadline = self._loop.time() + server.timeout
+        handler.raw_requestline = await self._readline(65536, deadline)
+        if len(handler.raw_requestline) > 65536:
+            handler.requestline = ''
+            handler.request_version = ''
+            handler.command = ''
+            handler.send_error(HTTPStatus.REQUEST_URI_TOO_LONG)
+            handler.wfile.flush()
+            return False
+        if not handler.raw_requestline.endswith(b'\n'):
+            return False
+        try:
+            if not await self._parse_request(handler, deadline):
+                # An error code has been sent, just exit
+                handler.wfile.flush()
+                return False
+            mname = 'do_' + handler.command
+            if not hasattr(handler, mname):
+                handler.send_error(
+                    HTTPStatus.NOT_IMPLEMENTED,
+                    "Unsupported method (%r)" % handler.command)
+                handler.wfile.flush()
+                return False
+            handler.rfile = io.BytesIO(await self._read_body(handler))
+        except _RequestError as err:
+            handler.send_error(err.code, err.message, err.explain)
+            handler.wfile.flush()
+            return False
+
+        method = getattr(handler, mname)
+        if inspect.iscoroutinefunction(method):
+            await method()
+        else:
+            await self._loop.run_in_executor(server.executor, method)
+        handler.wfile.flush()
+        await self._drain()
+        return not handler.close_connection
+
+    async def _parse_request(self, handler, deadline):
+        """Parse the request line and the header fields.
+
+        This does the same as BaseHTTPRequestHandler.parse_request(), with
+        the header fields read from the buffer.  Return True for success,
+        False for failure; on failure, any relevant error response has
+        already been sent back.
+        """
+        version = handler.request_version
+        requestline = str(handler.raw_requestline, 'iso-8859-1')
+        requestline = requestline.rstrip('\r\n')
+        handler.requestline = requestline
+        words = requestline.split()
+        if len(words) == 0:
+            return False
+
+        if len(words) >= 3:  # Enough to determine protocol version
+            version = words[-1]
+            try:
+                if not version.startswith('HTTP/'):
+                    raise ValueError
+                base_version_number = version.split('/', 1)[1]
+                version_number = base_version_number.split(".")
+                if len(version_number) != 2:
+                    raise ValueError
+                version_number = int(version_number[0]), int(version_number[1])
+            except (ValueError, IndexError):
+                handler.send_error(
+                    HTTPStatus.BAD_REQUEST,
+                    "Bad request version (%r)" % version)
+                return False
+            if (version_number >= (1, 1) and
+                    handler.protocol_version >= "HTTP/1.1"):
+                handler.close_connection = False
+            if version_number >= (2, 0):
+                handler.send_error(
+                    HTTPStatus.HTTP_VERSION_NOT_SUPPORTED,
+                    "Invalid HTTP version (%s)" % base_version_number)
+                return False
+            handler.request_version = version
+
+        if not 2 <= len(words) <= 3:
+            handler.send_error(
+                HTTPStatus.BAD_REQUEST,
+                "Bad request syntax (%r)" % requestline)
+            return False
+        command, path = words[:2]
+        if len(words) == 2:
+            handler.close_connection = True
+            if command != 'GET':
+                handler.send_error(
+                    HTTPStatus.BAD_REQUEST,
+                    "Bad HTTP/0.9 request type (%r)" % command)
+                return False
+            # HTTP/0.9 requests have no header fields
+            handler.command, handler.path = command, path
+            handler.headers = http.client.HTTPHeaders()
+            return True
+        handler.command, handler.path = command, path
+        if path.startswith('//'):
+            handler.path = '/' + path.lstrip('/')  # Reduce to a single /
+
+        server = self._server
+        data = await self._read_header_block(server.max_header_size,
+                                             deadline)
+        headers = http.client.HTTPHeaders(_parse_fields(data))
+        handler.headers = headers
+
+        conntype = headers.get('Connection', "")
+        if conntype.lower() == 'close':
+            handler.close_connection = True
+        elif (conntype.lower() == 'keep-alive' and
+              handler.protocol_version >= "HTTP/1.1"):
+            handler.close_connection = False
+        # Examine the headers and look for an Expect directive
+        expect = headers.get('Expect', "")
+        if (expect.lower() == "100-continue" and
+                handler.protocol_version >= "HTTP/1.1" and
+                handler.request_version >= "HTTP/1.1"):
+            ok = handler.handle_expect_100()
+            handler.wfile.flush()
+            if not ok:
+                return False
+        return True
+
+    async def _read_body(self, handler):
+        """Read the request body and return it with the transfer coding
+        removed."""
+        server = self._server
+        deadline = self._loop.time() + server.timeout
+        headers = handler.headers
+        coding = headers.get('Transfer-Encoding')
+        if coding is not None:
+            if 'Content-Length' in headers:
+                raise _RequestError(
+                    HTTPStatus.BAD_REQUEST,
+                    "Both Transfer-Encoding and Content-Length")
+            codings = [c.strip().lower() for c in coding.split(',')]
+            if codings[-1] != 'chunked':
+                raise _RequestError(
+                    HTTPStatus.BAD_REQUEST,
+                    "Bad Transfer-Encoding (%r)" % coding)
+            if len(codings) > 1:
+                raise _RequestError(
+                    HTTPStatus.NOT_IMPLEMENTED,
+                    "Unsupported Transfer-Encoding (%r)" % coding)
+            return await self._read_chunked(server.max_body_size, deadline)
+        lengths = headers.get_all('Content-Length')
+        if not lengths:
+            return b''
+        length = lengths[0]
+        if (any(value != length for value in lengths) or
+                not (length.isascii() and length.isdigit())):
+            raise _RequestError(HTTPStatus.BAD_REQUEST,
+                                "Bad Content-Length (%r)" % length)
+        length = int(length)
+        if length > server.max_body_size:
+            raise _RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        if not length:
+            return b''
+        return await self._readexactly(length, deadline)
+
+
+class AsyncHTTPServer:
+    """HTTP server running on an asyncio event loop.
+
+    RequestHandlerClass is a BaseHTTPRequestHandler subclass, or a callable
+    such as functools.partial() returning an instance of one.  A handler
+    instance is created for each connection.  Handler methods that are
+    not coroutine functions are run in executor, or in the default
+    executor of the event loop if it is None.
+    """
+
+    # Seconds to read the head of a request once it has begun, and then
+    # seconds to read its body
+    timeout = 60
+
+    # Seconds to wait for the next request on an idle connection
+    keep_alive_timeout = 15
+
+    # Limits on the size of the request head and of the request body
+    max_header_size = 65536
+    max_body_size = 64 * 1024 * 1024
+
+    # Reading from a connection is paused when this much data is buffered
+    # and no request is waiting for it
+    read_buffer_size = 256 * 1024
+
+    # Responses are sent when this much data has been written
+    write_buffer_size = 64 * 1024
+
+    request_queue_size = 100
+
+    def __init__(self, server_address, RequestHandlerClass, *,
+                 executor=None, ssl=None):
+        self.server_address = server_address
+        self.RequestHandlerClass = RequestHandlerClass
+        self.executor = executor
+        self.ssl = ssl
+        self.server_name = None
+        self.server_port = None
+        self._handler_factory = _async_handler_factory(RequestHandlerClass)
+        self._server = None
+        self._connections = set()
+
+    def __repr__(self):
+        return '<%s %s>' % (self.__class__.__name__, self.server_address)
+
+    @property
+    def sockets(self):
+        """The listening sockets, or an empty tuple if not started."""
+        if self._server is None:
+            return ()
+        return self._server.sockets
+
+    async def start(self):
+        """Bind the server and start accepting connections."""
+        if self._server is not None:
+            return
+        loop = asyncio.get_running_loop()
+        host, port = self.server_address[:2]
+        self._server = await loop.create_server(
+            lambda: HTTPServerProtocol(self), host or None, port,
+            backlog=self.request_queue_size, ssl=self.ssl,
+            reuse_address=True)
+        self.server_address = self._server.sockets[0].getsockname()
+        host, port = self.server_address[:2]
+        self.server_name = socket.getfqdn(host)
+        self.server_port = port
+
+    async def serve_forever(self):
+        """Accept connections until the server is closed."""
+        await self.start()
+        await self._server.serve_forever()
+
+    def close(self):
+        """Stop accepting connections and close the open connections.
+
+        Requests being handled are completed first.
+        """
+        if self._server is not None:
+            self._server.close()
+        for connection in list(self._connections):
+            connection.close()
+
+    async def wait_closed(self):
+        """Wait until the server and all its connections are closed."""
+        if self._server is not None:
+            await self._server.wait_closed()
+        tasks = [c._task for c in self._connections if c._task is not None]
+        if tasks:
+            await asyncio.wait(tasks)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        self.close()
+        await self.wait_closed()
+
+    def handle_error(self, request, client_address):
+        """Handle an error gracefully.
+
+        The default is to print a traceback and continue.
+        """
+        print('-'*40, file=sys.stderr)
+        print('Exception occurred during processing of request from',
+            client_address, file=sys.stderr)
+        traceback.print_exc()
+        print('-'*40, file=sys.stderr)
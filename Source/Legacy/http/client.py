@@ -81,7 +81,7 @@ from urllib.parse import urlsplit
 
 # HTTPMessage, parse_headers(), and the HTTP status code constants are
 # intentionally omitted for simplicity
-__all__ = ["HTTPResponse", "HTTPConnection",
+__all__ = ["HTTPResponse", "HTTPConnection", "HTTPHeaders",
            "HTTPException", "NotConnected", "UnknownProtocol",
            "UnknownTransferEncoding", "UnimplementedFileMode",
            "IncompleteRead", "InvalidURL", "ImproperConnectionState",
@@ -230,11 +230,171 @@ def parse_headers(fp, _class=HTTPMessage):
     So we read the correct bytes here, as bytes, for email Parser
     to parse.
 
+    If _class is HTTPHeaders or a subclass of it, the lines are parsed
+    as they are read, without the email package.
+
     """
+    if isinstance(_class, type) and issubclass(_class, HTTPHeaders):
+        return _class(_parse_header_fields(fp))
     headers = _read_headers(fp)
     hstring = b''.join(headers).decode('iso-8859-1')
     return email.parser.Parser(_class=_class).parsestr(hstring)
 
+def _parse_header_fields(fp):
+    """Reads header lines from a file pointer into a flat list of names
+    and values, for HTTPHeaders.
+
+    Values are left undecoded.  Lines which are not valid header fields
+    are ignored.  The limits are those of _read_headers().
+    """
+    fields = []
+    count = 0
+    # Whether the last line which was not a continuation was kept
+    accepted = False
+    while True:
+        line = fp.readline(_MAXLINE + 1)
+        if len(line) > _MAXLINE:
+            raise LineTooLong("header line")
+        count += 1
+        if count > _MAXHEADERS:
+            raise HTTPException("got more than %d headers" % _MAXHEADERS)
+        if line in (b'\r\n', b'\n', b''):
+            return fields
+        if line[0] in b' \t':
+            # obsolete line folding; continues an ignored line too
+            if accepted:
+                fields[-1] = (fields[-1] + b' ' + line.strip()).lstrip()
+            continue
+        name, sep, value = line.partition(b':')
+        accepted = bool(sep and name and name[-1] not in b' \t')
+        if accepted:
+            fields.append(name.decode('iso-8859-1'))
+            fields.append(value.strip())
+
+
+class HTTPHeaders:
+    """Header fields of an HTTP message.
+
+    This is a lighter alternative to HTTPMessage: a case-insensitive
+    multidict over a flat list of names and values, where the values are
+    decoded from ISO-8859-1 when first accessed.  It supports the methods
+    of email.message.Message commonly used with HTTP headers.
+
+    parse_headers() returns an instance when passed this class (or a
+    subclass) as _class, parsing the header lines in a single pass
+    without the email package.  Set HTTPResponse.MessageClass or
+    BaseHTTPRequestHandler.MessageClass to this class to use it.
+    """
+
+    __slots__ = ('_fields',)
+
+    def __init__(self, fields=None):
+        # Names and values alternate; values may be bytes until accessed
+        self._fields = [] if fields is None else fields
+
+    def _value(self, i):
+        value = self._fields[i]
+        if isinstance(value, bytes):
+            value = self._fields[i] = value.decode('iso-8859-1')
+        return value
+
+    def __len__(self):
+        return len(self._fields) // 2
+
+    def __iter__(self):
+        return iter(self._fields[::2])
+
+    def __contains__(self, name):
+        name = name.lower()
+        fields = self._fields
+        for i in range(0, len(fields), 2):
+            if fields[i].lower() == name:
+                return True
+        return False
+
+    def __getitem__(self, name):
+        """Get a header value, or None if the header is missing.
+
+        If there are several headers with this name, the first one is
+        returned.
+        """
+        return self.get(name)
+
+    def __setitem__(self, name, val):
+        """Add a header; existing headers with this name are kept."""
+        self._fields += (name, val)
+
+    def __delitem__(self, name):
+        """Delete all occurrences of a header, if present."""
+        name = name.lower()
+        fields = self._fields
+        self._fields = [x for i in range(0, len(fields), 2)
+                        if fields[i].lower() != name
+                        for x in fields[i:i+2]]
+
+    def get(self, name, failobj=None):
+        """Get a header value, or failobj if the header is missing."""
+        name = name.lower()
+        fields = self._fields
+        for i in range(0, len(fields), 2):
+            if fields[i].lower() == name:
+                return self._value(i + 1)
+        return failobj
+
+    def get_all(self, name, failobj=None):
+        """Return a list of all the values for the named header, or failobj
+        if there are none."""
+        name = name.lower()
+        fields = self._fields
+        values = [self._value(i + 1) for i in range(0, len(fields), 2)
+                  if fields[i].lower() == name]
+        return values or failobj
+
+    def keys(self):
+        return self._fields[::2]
+
+    def values(self):
+        return [self._value(i) for i in range(1, len(self._fields), 2)]
+
+    def items(self):
+        return list(zip(self.keys(), self.values()))
+
+    def get_content_type(self):
+        """Return the lowercased content type, "text/plain" by default."""
+        value = self.get('content-type')
+        if value is not None:
+            ctype = value.partition(';')[0].strip().lower()
+            if ctype.count('/') == 1:
+                return ctype
+        return 'text/plain'
+
+    def get_content_maintype(self):
+        return self.get_content_type().split('/')[0]
+
+    def get_content_subtype(self):
+        return self.get_content_type().split('/')[1]
+
+    def get_content_charset(self, failobj=None):
+        """Return the lowercased charset parameter of the Content-Type
+        header, or failobj if there is none."""
+        value = self.get('content-type')
+        if value is None:
+            return failobj
+        for param in value.split(';')[1:]:
+            name, sep, charset = param.partition('=')
+            if sep and name.strip().lower() == 'charset':
+                charset = charset.strip().strip('"').lower()
+                return charset or failobj
+        return failobj
+
+    def as_string(self):
+        return ''.join('%s: %s\n' % item for item in self.items()) + '\n'
+
+    __str__ = as_string
+
+    def __repr__(self):
+        return '<%s %r>' % (self.__class__.__name__, self.items())
+
 
 class HTTPResponse(io.BufferedIOBase):
 
@@ -245,6 +405,10 @@ class HTTPResponse(io.BufferedIOBase):
     # text following RFC 2047.  The basic status line parsing only
     # accepts iso-8859-1.
 
+    # Class of the headers; HTTPHeaders is faster than HTTPMessage, but
+    # has only part of the email.message.Message interface
+    MessageClass = HTTPMessage
+
     def __init__(self, sock, debuglevel=0, method=None, url=None):
         # If the response includes a content-length header, we need to
         # make sure that the client doesn't read more than the
@@ -334,7 +498,8 @@ class HTTPResponse(io.BufferedIOBase):
         else:
             raise UnknownProtocol(version)
 
-        self.headers = self.msg = parse_headers(self.fp)
+        self.headers = self.msg = parse_headers(self.fp,
+                                                _class=self.MessageClass)
 
         if self.debuglevel > 0:
             for hdr, val in self.headers.items():
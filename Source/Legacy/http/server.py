@@ -143,6 +143,14 @@ class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
     daemon_threads = True
 
 
+if hasattr(socketserver, "PreForkingMixIn"):
+    __all__.append("PreForkingHTTPServer")
+
+    class PreForkingHTTPServer(socketserver.PreForkingMixIn,
+                               ThreadingHTTPServer):
+        pass
+
+
 class BaseHTTPRequestHandler(socketserver.StreamRequestHandler):
 
     """HTTP request handler base class.
@@ -629,7 +637,8 @@ class BaseHTTPRequestHandler(socketserver.StreamRequestHandler):
     # Set this to HTTP/1.1 to enable automatic keepalive
     protocol_version = "HTTP/1.0"
 
-    # MessageClass used to parse headers
+    # MessageClass used to parse headers; set it to http.client.HTTPHeaders
+    # to parse them without the email package
     MessageClass = http.client.HTTPMessage
 
     # hack to maintain backwards compatibility
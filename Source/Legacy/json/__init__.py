@@ -301,6 +301,11 @@ def loads(s, *, cls=None, object_hook=None, parse_float=None,
     """Deserialize ``s`` (a ``str``, ``bytes`` or ``bytearray`` instance
     containing a JSON document) to a Python object.
 
+    ``s`` may also be any other object supporting the buffer protocol,
+    such as a ``memoryview`` or an ``mmap``.  If it holds UTF-8, it is
+    scanned in place instead of being decoded to a ``str`` first: only
+    string tokens are decoded, and error positions are byte offsets.
+
     ``object_hook`` is an optional function that will be called with the
     result of any object literal decode (a ``dict``). The return value of
     ``object_hook`` will be used instead of the ``dict``. This feature
@@ -334,11 +339,23 @@ def loads(s, *, cls=None, object_hook=None, parse_float=None,
         if s.startswith('\ufeff'):
             raise JSONDecodeError("Unexpected UTF-8 BOM (decode using utf-8-sig)",
                                   s, 0)
+    elif isinstance(s, (bytes, bytearray)):
+        s = s.decode(detect_encoding(s), 'surrogatepass')
     else:
-        if not isinstance(s, (bytes, bytearray)):
+        try:
+            view = memoryview(s)
+        except TypeError:
             raise TypeError(f'the JSON object must be str, bytes or bytearray, '
-                            f'not {s.__class__.__name__}')
-        s = s.decode(detect_encoding(s), 'surrogatepass')
+                            f'not {s.__class__.__name__}') from None
+        if view.ndim != 1 or view.format != 'B':
+            view = view.cast('B')
+        # The first four bytes are all detect_encoding() looks at.
+        encoding = detect_encoding(bytes(view[:4]))
+        if encoding in ('utf-8', 'utf-8-sig'):
+            # Scan the buffer in place, decoding only string tokens.
+            s = view
+        else:
+            s = str(view, encoding, 'surrogatepass')
 
     if (cls is None and object_hook is None and
             parse_int is None and parse_float is None and
@@ -26,12 +26,22 @@ class JSONDecodeError(ValueError):
     lineno: The line corresponding to pos
     colno: The column corresponding to pos
 
+    When doc is a bytes-like object, pos and colno are byte offsets.
+
     """
     # Note that this exception is used from _json
     def __init__(self, msg, doc, pos):
-        lineno = doc.count('\n', 0, pos) + 1
-        colno = pos - doc.rfind('\n', 0, pos)
-        errmsg = '%s: line %d column %d (char %d)' % (msg, lineno, colno, pos)
+        if isinstance(doc, str):
+            lineno = doc.count('\n', 0, pos) + 1
+            colno = pos - doc.rfind('\n', 0, pos)
+            unit = 'char'
+        else:
+            head = doc if isinstance(doc, (bytes, bytearray)) else bytes(doc[:pos])
+            lineno = head.count(b'\n', 0, pos) + 1
+            colno = pos - head.rfind(b'\n', 0, pos)
+            unit = 'byte'
+        errmsg = '%s: line %d column %d (%s %d)' % (msg, lineno, colno,
+                                                    unit, pos)
         ValueError.__init__(self, errmsg)
         self.msg = msg
         self.doc = doc
@@ -40,7 +50,10 @@ class JSONDecodeError(ValueError):
         self.colno = colno
 
     def __reduce__(self):
-        return self.__class__, (self.msg, self.doc, self.pos)
+        doc = self.doc
+        if not isinstance(doc, (str, bytes, bytearray)):
+            doc = bytes(doc)
+        return self.__class__, (self.msg, doc, self.pos)
 
 
 _CONSTANTS = {
@@ -129,6 +142,71 @@ def py_scanstring(s, end, strict=True,
 # Use speedup if available
 scanstring = c_scanstring or py_scanstring
 
+BYTES_STRINGCHUNK = re.compile(rb'(.*?)(["\\\x00-\x1f])', FLAGS)
+BYTES_BACKSLASH = {ord(k): v for k, v in BACKSLASH.items()}
+HEXDIGITS = re.compile(rb'[0-9a-fA-F]{4}')
+
+def _bytes_decode_uXXXX(s, pos, _m=HEXDIGITS.match):
+    esc = _m(s, pos + 1)
+    if esc is not None:
+        return int(esc.group(), 16)
+    msg = "Invalid \\uXXXX escape"
+    raise JSONDecodeError(msg, s, pos)
+
+def py_bytes_scanstring(s, end, strict=True,
+        _b=BYTES_BACKSLASH, _m=BYTES_STRINGCHUNK.match):
+    """Scan the UTF-8 encoded bytes-like object s for a JSON string.
+
+    Like scanstring(), but end and the returned index are byte offsets.
+    Only the bytes of the string itself are decoded."""
+    chunks = []
+    _append = chunks.append
+    begin = end - 1
+    while 1:
+        chunk = _m(s, end)
+        if chunk is None:
+            raise JSONDecodeError("Unterminated string starting at", s, begin)
+        end = chunk.end()
+        content, terminator = chunk.groups()
+        # Escapes and terminators are ASCII, so content never splits a
+        # multi-byte sequence.
+        if content:
+            _append(content.decode('utf-8', 'surrogatepass'))
+        if terminator == b'"':
+            break
+        elif terminator != b'\\':
+            if strict:
+                msg = "Invalid control character {0!r} at".format(
+                    terminator.decode('ascii'))
+                raise JSONDecodeError(msg, s, end)
+            else:
+                _append(terminator.decode('ascii'))
+                continue
+        try:
+            esc = s[end]
+        except IndexError:
+            raise JSONDecodeError("Unterminated string starting at",
+                                  s, begin) from None
+        # If not a unicode escape sequence, must be in the lookup table
+        if esc != 0x75:  # 'u'
+            try:
+                char = _b[esc]
+            except KeyError:
+                msg = "Invalid \\escape: {0!r}".format(chr(esc))
+                raise JSONDecodeError(msg, s, end)
+            end += 1
+        else:
+            uni = _bytes_decode_uXXXX(s, end)
+            end += 5
+            if 0xd800 <= uni <= 0xdbff and s[end:end + 2] == b'\\u':
+                uni2 = _bytes_decode_uXXXX(s, end + 1)
+                if 0xdc00 <= uni2 <= 0xdfff:
+                    uni = 0x10000 + (((uni - 0xd800) << 10) | (uni2 - 0xdc00))
+                    end += 6
+            char = chr(uni)
+        _append(char)
+    return ''.join(chunks), end
+
 WHITESPACE = re.compile(r'[ \t\n\r]*', FLAGS)
 WHITESPACE_STR = ' \t\n\r'
 
@@ -251,6 +329,166 @@ def JSONArray(s_and_end, scan_once, _w=WHITESPACE.match, _ws=WHITESPACE_STR):
     return values, end
 
 
+BYTES_WHITESPACE = re.compile(rb'[ \t\n\r]*', FLAGS)
+BYTES_WHITESPACE_SET = frozenset(b' \t\n\r')
+
+def BytesJSONObject(s_and_end, strict, scan_once, object_hook,
+                    object_pairs_hook, memo=None,
+                    _w=BYTES_WHITESPACE.match, _ws=BYTES_WHITESPACE_SET):
+    """Like JSONObject(), for a UTF-8 encoded bytes-like object.
+
+    Characters are compared as integers, which indexing returns for
+    bytes, bytearray, memoryview and mmap objects alike.
+    """
+    s, end = s_and_end
+    pairs = []
+    pairs_append = pairs.append
+    if memo is None:
+        memo = {}
+    memo_get = memo.setdefault
+    try:
+        nextchar = s[end]
+    except IndexError:
+        nextchar = -1
+    # Normally we expect nextchar == '"'
+    if nextchar != 0x22:
+        if nextchar in _ws:
+            end = _w(s, end).end()
+            try:
+                nextchar = s[end]
+            except IndexError:
+                nextchar = -1
+        # Trivial empty object
+        if nextchar == 0x7d:  # '}'
+            if object_pairs_hook is not None:
+                result = object_pairs_hook(pairs)
+                return result, end + 1
+            pairs = {}
+            if object_hook is not None:
+                pairs = object_hook(pairs)
+            return pairs, end + 1
+        elif nextchar != 0x22:
+            raise JSONDecodeError(
+                "Expecting property name enclosed in double quotes", s, end)
+    end += 1
+    while True:
+        key, end = py_bytes_scanstring(s, end, strict)
+        key = memo_get(key, key)
+        try:
+            nextchar = s[end]
+        except IndexError:
+            nextchar = -1
+        if nextchar != 0x3a:  # ':'
+            end = _w(s, end).end()
+            try:
+                nextchar = s[end]
+            except IndexError:
+                nextchar = -1
+            if nextchar != 0x3a:
+                raise JSONDecodeError("Expecting ':' delimiter", s, end)
+        end += 1
+
+        try:
+            if s[end] in _ws:
+                end += 1
+                if s[end] in _ws:
+                    end = _w(s, end + 1).end()
+        except IndexError:
+            pass
+
+        try:
+            value, end = scan_once(s, end)
+        except StopIteration as err:
+            raise JSONDecodeError("Expecting value", s, err.value) from None
+        pairs_append((key, value))
+        try:
+            nextchar = s[end]
+            if nextchar in _ws:
+                end = _w(s, end + 1).end()
+                nextchar = s[end]
+        except IndexError:
+            nextchar = -1
+        end += 1
+
+        if nextchar == 0x7d:  # '}'
+            break
+        elif nextchar != 0x2c:  # ','
+            raise JSONDecodeError("Expecting ',' delimiter", s, end - 1)
+        end = _w(s, end).end()
+        try:
+            nextchar = s[end]
+        except IndexError:
+            nextchar = -1
+        end += 1
+        if nextchar != 0x22:
+            raise JSONDecodeError(
+                "Expecting property name enclosed in double quotes", s, end - 1)
+    if object_pairs_hook is not None:
+        result = object_pairs_hook(pairs)
+        return result, end
+    pairs = dict(pairs)
+    if object_hook is not None:
+        pairs = object_hook(pairs)
+    return pairs, end
+
+def BytesJSONArray(s_and_end, scan_once, _w=BYTES_WHITESPACE.match,
+                   _ws=BYTES_WHITESPACE_SET):
+    """Like JSONArray(), for a UTF-8 encoded bytes-like object."""
+    s, end = s_and_end
+    values = []
+    try:
+        nextchar = s[end]
+    except IndexError:
+        nextchar = -1
+    if nextchar in _ws:
+        end = _w(s, end + 1).end()
+        try:
+            nextchar = s[end]
+        except IndexError:
+            nextchar = -1
+    # Look-ahead for trivial empty array
+    if nextchar == 0x5d:  # ']'
+        return values, end + 1
+    _append = values.append
+    while True:
+        try:
+            value, end = scan_once(s, end)
+        except StopIteration as err:
+            raise JSONDecodeError("Expecting value", s, err.value) from None
+        _append(value)
+        try:
+            nextchar = s[end]
+            if nextchar in _ws:
+                end = _w(s, end + 1).end()
+                nextchar = s[end]
+        except IndexError:
+            nextchar = -1
+        end += 1
+        if nextchar == 0x5d:  # ']'
+            break
+        elif nextchar != 0x2c:  # ','
+            raise JSONDecodeError("Expecting ',' delimiter", s, end - 1)
+        try:
+            if s[end] in _ws:
+                end += 1
+                if s[end] in _ws:
+                    end = _w(s, end + 1).end()
+        except IndexError:
+            pass
+
+    return values, end
+
+
+def _as_bytes_like(s):
+    """Return s as an object that can be indexed and matched in place."""
+    if isinstance(s, (bytes, bytearray)):
+        return s
+    view = memoryview(s)
+    if view.ndim != 1 or view.format != 'B':
+        view = view.cast('B')
+    return view
+
+
 class JSONDecoder(object):
     """Simple JSON <https://json.org> decoder
 
@@ -325,21 +563,40 @@ class JSONDecoder(object):
         self.parse_object = JSONObject
         self.parse_array = JSONArray
         self.parse_string = scanstring
+        self.parse_bytes_object = BytesJSONObject
+        self.parse_bytes_array = BytesJSONArray
+        self.parse_bytes_string = py_bytes_scanstring
         self.memo = {}
         self.scan_once = scanner.make_scanner(self)
+        self.scan_once_bytes = scanner.make_bytes_scanner(self)
 
 
     def decode(self, s, _w=WHITESPACE.match):
         """Return the Python representation of ``s`` (a ``str`` instance
         containing a JSON document).
 
+        ``s`` may also be a UTF-8 encoded bytes-like object (``bytes``,
+        ``bytearray``, ``memoryview``, ``mmap``...), optionally starting
+        with a BOM.  It is scanned in place without decoding it to a
+        ``str`` first, and error positions are byte offsets.
+
         """
+        if not isinstance(s, str):
+            return self._decode_bytes(_as_bytes_like(s))
         obj, end = self.raw_decode(s, idx=_w(s, 0).end())
         end = _w(s, end).end()
         if end != len(s):
             raise JSONDecodeError("Extra data", s, end)
         return obj
 
+    def _decode_bytes(self, s, _w=BYTES_WHITESPACE.match):
+        idx = 3 if s[:3] == b'\xef\xbb\xbf' else 0
+        obj, end = self._raw_decode_bytes(s, _w(s, idx).end())
+        end = _w(s, end).end()
+        if end != len(s):
+            raise JSONDecodeError("Extra data", s, end)
+        return obj
+
     def raw_decode(self, s, idx=0):
         """Decode a JSON document from ``s`` (a ``str`` beginning with
         a JSON document) and return a 2-tuple of the Python
@@ -348,9 +605,21 @@ class JSONDecoder(object):
         This can be used to decode a JSON document from a string that may
         have extraneous data at the end.
 
+        For a UTF-8 encoded bytes-like ``s``, ``idx`` and the returned
+        index are byte offsets.
+
         """
+        if not isinstance(s, str):
+            return self._raw_decode_bytes(_as_bytes_like(s), idx)
         try:
             obj, end = self.scan_once(s, idx)
         except StopIteration as err:
             raise JSONDecodeError("Expecting value", s, err.value) from None
         return obj, end
+
+    def _raw_decode_bytes(self, s, idx):
+        try:
+            obj, end = self.scan_once_bytes(s, idx)
+        except StopIteration as err:
+            raise JSONDecodeError("Expecting value", s, err.value) from None
+        return obj, end
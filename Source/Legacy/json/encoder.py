@@ -202,6 +202,23 @@ class JSONEncoder(object):
             chunks = list(chunks)
         return ''.join(chunks)
 
+    def compile(self, shape):
+        """Return a :class:`RecordEncoder` specialised for records of
+        ``shape``.
+
+        ``shape`` is a dataclass, a ``TypedDict`` or a sample record (a
+        ``dict`` or a dataclass instance).  Many records sharing one shape
+        can then be encoded faster than with :meth:`encode`, using the
+        options of this encoder.
+
+        >>> from json.encoder import JSONEncoder
+        >>> encode = JSONEncoder().compile({"id": 0, "tags": ["x"]}).encode
+        >>> encode({"id": 7, "tags": ["a", "b"]})
+        '{"id": 7, "tags": ["a", "b"]}'
+
+        """
+        return RecordEncoder(self, shape)
+
     def iterencode(self, o, _one_shot=False):
         """Encode the given object and yield each string
         representation as available.
@@ -221,28 +238,7 @@ class JSONEncoder(object):
         else:
             _encoder = encode_basestring
 
-        def floatstr(o, allow_nan=self.allow_nan,
-                _repr=float.__repr__, _inf=INFINITY, _neginf=-INFINITY):
-            # Check for specials.  Note that this type of test is processor
-            # and/or platform-specific, so do tests which don't depend on the
-            # internals.
-
-            if o != o:
-                text = 'NaN'
-            elif o == _inf:
-                text = 'Infinity'
-            elif o == _neginf:
-                text = '-Infinity'
-            else:
-                return _repr(o)
-
-            if not allow_nan:
-                raise ValueError(
-                    "Out of range float values are not JSON compliant: " +
-                    repr(o))
-
-            return text
-
+        floatstr = _make_floatstr(self.allow_nan)
 
         if (_one_shot and c_make_encoder is not None
                 and self.indent is None):
@@ -257,6 +253,31 @@ class JSONEncoder(object):
                 self.skipkeys, _one_shot)
         return _iterencode(o, 0)
 
+def _make_floatstr(allow_nan):
+    def floatstr(o, allow_nan=allow_nan,
+            _repr=float.__repr__, _inf=INFINITY, _neginf=-INFINITY):
+        # Check for specials.  Note that this type of test is processor
+        # and/or platform-specific, so do tests which don't depend on the
+        # internals.
+
+        if o != o:
+            text = 'NaN'
+        elif o == _inf:
+            text = 'Infinity'
+        elif o == _neginf:
+            text = '-Infinity'
+        else:
+            return _repr(o)
+
+        if not allow_nan:
+            raise ValueError(
+                "Out of range float values are not JSON compliant: " +
+                repr(o))
+
+        return text
+
+    return floatstr
+
 def _make_iterencode(markers, _default, _encoder, _indent, _floatstr,
         _key_separator, _item_separator, _sort_keys, _skipkeys, _one_shot,
         ## HACK: hand-optimized bytecode; turn globals into locals
@@ -441,3 +462,282 @@ def _make_iterencode(markers, _default, _encoder, _indent, _floatstr,
             if markers is not None:
                 del markers[markerid]
     return _iterencode
+
+
+class _RecordShape(object):
+    """A JSON object with a fixed set of fields.
+
+    ``cls`` is ``dict`` for mappings, otherwise the dataclass whose
+    attributes are read.  ``fields`` holds ``(name, shape)`` pairs, where
+    a shape is a ``_RecordShape`` or a tuple such as ``('int',)``,
+    ``('optional', shape)`` or ``('list', shape)``.
+    """
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.fields = []
+        self.index = None
+        self.cyclic = False
+
+
+_ANY = ('any',)
+_SCALARS = {str: ('str',), int: ('int',), float: ('float',), bool: ('bool',),
+            type(None): ('null',)}
+
+
+def _shape_from_type(tp, seen):
+    import dataclasses
+    import typing
+
+    if tp in seen:
+        return seen[tp]
+    is_dataclass = dataclasses.is_dataclass(tp)
+    if not is_dataclass and not typing.is_typeddict(tp):
+        raise TypeError(f'cannot compile an encoder for {tp!r}')
+    shape = seen[tp] = _RecordShape(tp if is_dataclass else dict)
+    try:
+        hints = typing.get_type_hints(tp)
+    except Exception:
+        # Unresolvable forward references: fall back to generic encoding.
+        hints = {}
+    if is_dataclass:
+        names = [f.name for f in dataclasses.fields(tp)]
+    else:
+        names = list(tp.__annotations__)
+    for name in names:
+        shape.fields.append((name, _shape_from_hint(hints.get(name), seen)))
+    return shape
+
+
+def _shape_from_hint(hint, seen):
+    import dataclasses
+    import types
+    import typing
+
+    if hint is None:
+        return _SCALARS[type(None)]
+    try:
+        return _SCALARS[hint]
+    except (KeyError, TypeError):
+        pass
+    origin = typing.get_origin(hint)
+    args = typing.get_args(hint)
+    if origin is typing.Union or origin is types.UnionType:
+        others = [arg for arg in args if arg is not type(None)]
+        if len(others) == 1 and len(args) == 2:
+            inner = _shape_from_hint(others[0], seen)
+            if inner is _ANY:
+                return _ANY
+            return ('optional', inner)
+        return _ANY
+    if origin is list and args:
+        return ('list', _shape_from_hint(args[0], seen))
+    if origin is tuple and len(args) == 2 and args[1] is Ellipsis:
+        return ('list', _shape_from_hint(args[0], seen))
+    if isinstance(hint, type) and (dataclasses.is_dataclass(hint) or
+                                   typing.is_typeddict(hint)):
+        return _shape_from_type(hint, seen)
+    return _ANY
+
+
+def _shape_from_sample(value, seen):
+    cls = value.__class__
+    if cls in _SCALARS and value is not None:
+        return _SCALARS[cls]
+    if cls is dict:
+        if not all(key.__class__ is str for key in value):
+            return _ANY
+        shape = _RecordShape(dict)
+        for key, item in value.items():
+            shape.fields.append((key, _shape_from_sample(item, seen)))
+        return shape
+    if cls is list or cls is tuple:
+        if not value:
+            return _ANY
+        # Trust the first element; the runtime guards catch the rest.
+        inner = _shape_from_sample(value[0], seen)
+        if inner is _ANY:
+            return _ANY
+        return ('list', inner)
+    if hasattr(cls, '__dataclass_fields__'):
+        return _shape_from_type(cls, seen)
+    # None and anything else carries no type information.
+    return _ANY
+
+
+def _mark_cycles(root):
+    """Number the record shapes reachable from root and flag those that
+    can contain themselves."""
+    records = []
+
+    def children(shape):
+        if isinstance(shape, _RecordShape):
+            yield shape
+        elif shape[0] in ('optional', 'list'):
+            yield from children(shape[1])
+
+    def visit(shape, path):
+        if shape.index is not None:
+            if shape in path:
+                for member in path[path.index(shape):]:
+                    member.cyclic = True
+            return
+        shape.index = len(records)
+        records.append(shape)
+        path.append(shape)
+        for name, field in shape.fields:
+            for child in children(field):
+                visit(child, path)
+        path.pop()
+
+    visit(root, [])
+    return records
+
+
+class RecordEncoder(object):
+    """Encoder specialised for records of a single shape.
+
+    Create instances with :meth:`JSONEncoder.compile`.  The key strings
+    of the shape are escaped once, and each field is encoded by a fast path
+    fixed for its type at compile time.  A value that does not match the
+    shape (a missing or extra key, a field of another type, a subclass) is
+    encoded by the generic :meth:`JSONEncoder.encode` instead, so the
+    result is always valid; only the order of the keys of a ``dict``
+    record follows the shape rather than the dict.
+
+    Shapes which cannot contain themselves need no circular reference
+    check.  Dataclass instances are encoded as JSON objects of their fields.
+    """
+
+    def __init__(self, encoder, shape):
+        self.encoder = encoder
+        seen = {}
+        if isinstance(shape, type):
+            root = _shape_from_type(shape, seen)
+        else:
+            root = _shape_from_sample(shape, seen)
+            if not isinstance(root, _RecordShape):
+                raise TypeError(f'cannot compile an encoder for '
+                                f'{shape.__class__.__name__} samples')
+        self.shape = root
+        if encoder.indent is not None:
+            # Pretty-printing stays on the generic path, just like the C
+            # accelerator is only used for compact output.
+            self._encode = encoder.encode
+        else:
+            self._encode = _compile_record_encoder(encoder, root)
+
+    def encode(self, o):
+        """Return the JSON representation of the record ``o``."""
+        return self._encode(o)
+
+    def encode_many(self, records):
+        """Return the JSON array of an iterable of records."""
+        if self.encoder.indent is not None:
+            return self.encoder.encode(list(records))
+        sep = self.encoder.item_separator
+        return '[' + sep.join(map(self._encode, records)) + ']'
+
+
+def _compile_record_encoder(encoder, root):
+    if encoder.ensure_ascii:
+        _encoder = encode_basestring_ascii
+    else:
+        _encoder = encode_basestring
+
+    floatstr = _make_floatstr(encoder.allow_nan)
+    records = _mark_cycles(root)
+    check_circular = encoder.check_circular
+    namespace = {
+        '_str': _encoder,
+        '_intstr': int.__repr__,
+        '_floatstr': floatstr,
+        '_any': encoder.encode,
+        '_sep': encoder.item_separator,
+        '_dict': dict,
+        '_id': id,
+        '_len': len,
+        'ValueError': ValueError,
+    }
+    counter = 0
+
+    def expr(shape, var, in_cycle):
+        nonlocal counter
+        if isinstance(shape, _RecordShape):
+            if in_cycle and shape.cyclic and check_circular:
+                return f'_enc{shape.index}({var}, markers)'
+            return f'_enc{shape.index}({var})'
+        kind = shape[0]
+        if kind == 'str':
+            return f'(_str({var}) if {var}.__class__ is str else _any({var}))'
+        if kind == 'int':
+            return (f'(_intstr({var}) if {var}.__class__ is int '
+                    f'else _any({var}))')
+        if kind == 'float':
+            return (f'(_floatstr({var}) if {var}.__class__ is float '
+                    f'else _any({var}))')
+        if kind == 'bool':
+            return (f"('true' if {var} is True else 'false' if {var} is False "
+                    f"else _any({var}))")
+        if kind == 'null':
+            return f"('null' if {var} is None else _any({var}))"
+        if kind == 'optional':
+            return (f"('null' if {var} is None "
+                    f"else {expr(shape[1], var, in_cycle)})")
+        if kind == 'list':
+            counter += 1
+            item = f'_x{counter}'
+            return (f"(('[' + _sep.join([{expr(shape[1], item, in_cycle)} "
+                    f"for {item} in {var}]) + ']') "
+                    f"if {var}.__class__ is list or {var}.__class__ is tuple "
+                    f"else _any({var}))")
+        return f'_any({var})'
+
+    lines = []
+    key_separator = encoder.key_separator
+    for shape in records:
+        fields = shape.fields
+        if encoder.sort_keys:
+            fields = sorted(fields, key=lambda field: field[0])
+        cycle = shape.cyclic and check_circular
+        namespace[f'_cls{shape.index}'] = shape.cls
+        lines.append(f'def _enc{shape.index}(o{", markers=None" if cycle else ""}):')
+        lines.append(f'    if o.__class__ is not _cls{shape.index}:')
+        lines.append(f'        return _any(o)')
+        if shape.cls is dict:
+            lines.append(f'    if _len(o) != {len(fields)}:')
+            lines.append(f'        return _any(o)')
+        if not fields:
+            lines.append("    return '{}'")
+            continue
+        if shape.cls is dict:
+            lines.append('    try:')
+            for i, (name, field) in enumerate(fields):
+                lines.append(f'        v{i} = o[{name!r}]')
+            lines.append('    except KeyError:')
+            lines.append('        return _any(o)')
+        else:
+            for i, (name, field) in enumerate(fields):
+                lines.append(f'    v{i} = o.{name}')
+        if cycle:
+            lines.append('    if markers is None:')
+            lines.append('        markers = {}')
+            lines.append('    markerid = _id(o)')
+            lines.append('    if markerid in markers:')
+            lines.append('        raise ValueError("Circular reference detected")')
+            lines.append('    markers[markerid] = o')
+        template = []
+        for i, (name, field) in enumerate(fields):
+            lines.append(f'    s{i} = {expr(field, f"v{i}", cycle)}')
+            # The key text, with its separators, is escaped only once and
+            # becomes part of a single f-string.
+            prefix = ('{' if i == 0 else encoder.item_separator)
+            literal = repr(prefix + _encoder(name) + key_separator + '"')
+            literal = literal[1:-2].replace('{', '{{').replace('}', '}}')
+            template.append(f'{literal}{{s{i}}}')
+        lines.append(f"    s = f'{''.join(template)}}}}}'")
+        if cycle:
+            lines.append('    del markers[markerid]')
+        lines.append('    return s')
+    exec('\n'.join(lines), namespace)
+    return namespace[f'_enc{root.index}']
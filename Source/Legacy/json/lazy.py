@@ -0,0 +1,339 @@
+r"""Lazy, on-demand JSON documents
+
+:func:`loads` makes one pass over a JSON document to find the extent of
+every object and array, without creating any Python objects for them.
+Objects and arrays are returned as read-only :class:`LazyObject` and
+:class:`LazyArray` proxies, which decode their members only when a key or
+index is accessed.  This is much cheaper than :func:`json.loads` when only
+a few values of a large document are needed::
+
+    >>> from json import lazy
+    >>> doc = lazy.loads('{"meta": {"count": 2}, "rows": [{"id": 1}, {"id": 2}]}')
+    >>> doc['meta']['count']
+    2
+    >>> rows = doc['rows']
+    >>> len(rows), rows[-1]['id']
+    (2, 2)
+    >>> rows.materialize()
+    [{'id': 1}, {'id': 2}]
+
+The proxies implement the :class:`collections.abc.Mapping` and
+:class:`collections.abc.Sequence` interfaces and compare equal to the
+dicts and lists they represent.  The hooks of the decoder (``parse_float``,
+``object_hook``...) apply to the values that are decoded, but
+``object_hook`` and ``object_pairs_hook`` only run for objects decoded by
+:meth:`~LazyObject.materialize`.
+
+The first pass checks the structure of the document: brackets, commas
+and colons.  Invalid strings, numbers and literals are reported by the
+access that decodes them.
+"""
+import re
+from collections.abc import Mapping, Sequence
+
+from json.decoder import JSONDecoder, JSONDecodeError, scanstring, WHITESPACE
+from json.scanner import NUMBER_RE
+
+__all__ = ['loads', 'LazyObject', 'LazyArray']
+
+FLAGS = re.VERBOSE | re.MULTILINE | re.DOTALL
+
+# Skip whitespace, then any run of text and complete strings up to the next
+# bracket, comma or colon.  Group 1 is the skipped text, which is empty if
+# there is no value before the token.  A match is found at every offset the
+# previous one ended, so the scan never restarts inside a string.
+TOKEN = re.compile(r"""
+    [ \t\n\r]*+
+    ( (?: [^"\[\]{},:]++ | "[^"\\]*+(?:\\.[^"\\]*+)*+" )*+ )
+    (?: ([\[\]{},:])            # 2: the token
+      | (")                     # 3: an unterminated string
+      | \Z )
+""", FLAGS)
+STRING = re.compile(r'"[^"\\]*+(?:\\.[^"\\]*+)*+"', FLAGS)
+
+# The characters which can follow a value inside a container
+_VALUE_END = frozenset(['', ',', ']', '}'])
+
+_LITERALS = {
+    'n': 'null',
+    't': 'true',
+    'f': 'false',
+    'N': 'NaN',
+    'I': 'Infinity',
+}
+
+
+class _Document(object):
+    """The text of a document and the offsets of its containers."""
+
+    def __init__(self, s, decoder):
+        self.s = s
+        self.decoder = decoder
+        self.ends, self.members = self._index(s)
+
+    @staticmethod
+    def _index(s, _finditer=TOKEN.finditer):
+        # Map the offset of every '{' and '[' to the offset just after the
+        # matching bracket, and to the offsets of its members: those of the
+        # elements of an array, alternately those of the keys and values of
+        # an object.
+        ends = {}
+        members = {}
+        # The enclosing containers, as (offset, is_object, members)
+        stack = []
+        # The innermost open container: its offset (None at the top level),
+        # whether it is an object, the offsets of its members, whether a
+        # key comes next and whether a value was found since the last
+        # delimiter.
+        opened = offsets = None
+        is_object = key = filled = False
+        for m in _finditer(s):
+            token = m.lastindex
+            if token == 1:
+                break
+            start, pos = m.span(1)
+            if token == 3:
+                raise JSONDecodeError("Unterminated string starting at",
+                                      s, pos)
+            c = s[pos]
+            if opened is None:
+                # Anything else at the top level is checked by loads().
+                if c == '[' or c == '{':
+                    opened = pos
+                    is_object = key = c == '{'
+                    offsets = []
+                elif c == ']' or c == '}':
+                    raise JSONDecodeError("Expecting value", s, pos)
+                continue
+            if start != pos:
+                if filled:
+                    raise JSONDecodeError("Expecting ',' delimiter", s, start)
+                if key and s[start] != '"':
+                    raise JSONDecodeError(
+                        "Expecting property name enclosed in double quotes",
+                        s, start)
+                offsets.append(start)
+                filled = True
+            if c == ',':
+                if filled and not key:
+                    key = is_object
+                    filled = False
+                    continue
+            elif c == ':':
+                if filled and key:
+                    key = filled = False
+                    continue
+            elif c == '[' or c == '{':
+                if not filled and not key:
+                    offsets.append(pos)
+                    stack.append((opened, is_object, offsets))
+                    opened = pos
+                    is_object = key = c == '{'
+                    filled = False
+                    offsets = []
+                    continue
+            elif is_object != (c == '}'):
+                raise JSONDecodeError("Mismatched %r" % c, s, pos)
+            elif filled and not key or not offsets:
+                ends[opened] = pos + 1
+                members[opened] = offsets
+                if stack:
+                    opened, is_object, offsets = stack.pop()
+                    key = False
+                    filled = True
+                else:
+                    opened = None
+                continue
+            # An unexpected token
+            if filled:
+                raise JSONDecodeError("Expecting %r delimiter" %
+                                      (':' if key else ','), s, pos)
+            if key:
+                raise JSONDecodeError(
+                    "Expecting property name enclosed in double quotes",
+                    s, pos)
+            raise JSONDecodeError("Expecting value", s, pos)
+        if opened is not None:
+            raise JSONDecodeError("Unterminated %s starting at" %
+                                  ('object' if is_object else 'array'),
+                                  s, opened)
+        return ends, members
+
+    def skip(self, pos, _string=STRING.match, _number=NUMBER_RE.match):
+        """Return the offset just after the value starting at pos."""
+        s = self.s
+        try:
+            c = s[pos]
+        except IndexError:
+            raise JSONDecodeError("Expecting value", s, pos) from None
+        if c == '{' or c == '[':
+            return self.ends[pos]
+        if c == '"':
+            m = _string(s, pos)
+            if m is None:
+                raise JSONDecodeError("Unterminated string starting at",
+                                      s, pos)
+            return m.end()
+        literal = _LITERALS.get(c)
+        if literal is not None and s.startswith(literal, pos):
+            return pos + len(literal)
+        if s.startswith('-Infinity', pos):
+            return pos + 9
+        m = _number(s, pos)
+        if m is None:
+            raise JSONDecodeError("Expecting value", s, pos)
+        return m.end()
+
+    def value(self, pos, _w=WHITESPACE.match):
+        """Return the value starting at pos, as a proxy for containers."""
+        c = self.s[pos]
+        if c == '{':
+            return LazyObject(self, pos)
+        if c == '[':
+            return LazyArray(self, pos)
+        s = self.s
+        try:
+            value, end = self.decoder.scan_once(s, pos)
+        except StopIteration as err:
+            raise JSONDecodeError("Expecting value", s, err.value) from None
+        end = _w(s, end).end()
+        if s[end:end + 1] not in _VALUE_END:
+            raise JSONDecodeError("Expecting ',' delimiter", s, end)
+        return value
+
+
+class _LazyContainer(object):
+
+    __slots__ = ('_doc', '_pos', '_values')
+
+    def __init__(self, doc, pos):
+        self._doc = doc
+        self._pos = pos
+        # Decoded members, filled in on first access.
+        self._values = {}
+
+    def materialize(self):
+        """Decode the whole value, like json.loads() would."""
+        return self._doc.decoder.raw_decode(self._doc.s, self._pos)[0]
+
+    def _member(self, pos):
+        try:
+            return self._values[pos]
+        except KeyError:
+            value = self._values[pos] = self._doc.value(pos)
+            return value
+
+
+class LazyObject(_LazyContainer, Mapping):
+    """Read-only mapping view of a JSON object.
+
+    Keys are decoded the first time the object is accessed; values are
+    decoded when they are looked up.  As with :func:`json.loads`, the last
+    occurrence of a duplicated key wins.
+    """
+
+    __slots__ = ('_keys',)
+
+    def __init__(self, doc, pos):
+        super().__init__(doc, pos)
+        self._keys = None
+
+    def _scan(self, _w=WHITESPACE.match):
+        doc = self._doc
+        s = doc.s
+        strict = doc.decoder.strict
+        offsets = doc.members[self._pos]
+        keys = {}
+        for i in range(0, len(offsets), 2):
+            key, end = scanstring(s, offsets[i] + 1, strict)
+            end = _w(s, end).end()
+            if s[end] != ':':
+                raise JSONDecodeError("Expecting ':' delimiter", s, end)
+            keys[key] = offsets[i + 1]
+        self._keys = keys
+        return keys
+
+    def _offsets(self):
+        keys = self._keys
+        if keys is None:
+            keys = self._scan()
+        return keys
+
+    def __getitem__(self, key):
+        return self._member(self._offsets()[key])
+
+    def __contains__(self, key):
+        return key in self._offsets()
+
+    def __iter__(self):
+        return iter(self._offsets())
+
+    def __len__(self):
+        return len(self._offsets())
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} with {len(self)} keys>'
+
+
+class LazyArray(_LazyContainer, Sequence):
+    """Read-only sequence view of a JSON array.
+
+    Elements are decoded when they are indexed.
+    """
+
+    __slots__ = ('_starts',)
+
+    def __init__(self, doc, pos):
+        super().__init__(doc, pos)
+        self._starts = doc.members[pos]
+
+    def __getitem__(self, index):
+        starts = self._starts
+        if isinstance(index, slice):
+            return [self._member(pos) for pos in starts[index]]
+        return self._member(starts[index])
+
+    def __len__(self):
+        return len(self._starts)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, LazyArray)):
+            return len(self) == len(other) and all(
+                a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} with {len(self)} elements>'
+
+
+def loads(s, *, cls=None, **kw):
+    """Return a lazy view of the JSON document ``s``.
+
+    ``s`` is a ``str``, or a ``bytes``-like object which is decoded as by
+    :func:`json.loads`.  Objects and arrays are returned as
+    :class:`LazyObject` and :class:`LazyArray`, other values as the Python
+    object itself.  The remaining keyword arguments configure the
+    :class:`JSONDecoder` (or *cls*) used for the decoded values.
+    """
+    if not isinstance(s, str):
+        from json import detect_encoding
+        try:
+            data = memoryview(s)
+        except TypeError:
+            raise TypeError(f'the JSON object must be str, bytes or bytearray, '
+                            f'not {s.__class__.__name__}') from None
+        s = str(data, detect_encoding(bytes(data[:4])), 'surrogatepass')
+    elif s.startswith('\ufeff'):
+        raise JSONDecodeError("Unexpected UTF-8 BOM (decode using utf-8-sig)",
+                              s, 0)
+    if cls is None:
+        cls = JSONDecoder
+    doc = _Document(s, cls(**kw))
+    _w = WHITESPACE.match
+    start = _w(s, 0).end()
+    end = _w(s, doc.skip(start)).end()
+    if end != len(s):
+        raise JSONDecodeError("Extra data", s, end)
+    return doc.value(start)
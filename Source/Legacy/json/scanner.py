@@ -6,11 +6,14 @@ try:
 except ImportError:
     c_make_scanner = None
 
-__all__ = ['make_scanner']
+__all__ = ['make_scanner', 'make_bytes_scanner']
 
 NUMBER_RE = re.compile(
     r'(-?(?:0|[1-9]\d*))(\.\d+)?([eE][-+]?\d+)?',
     (re.VERBOSE | re.MULTILINE | re.DOTALL))
+BYTES_NUMBER_RE = re.compile(
+    rb'(-?(?:0|[1-9]\d*))(\.\d+)?([eE][-+]?\d+)?',
+    (re.VERBOSE | re.MULTILINE | re.DOTALL))
 
 def py_make_scanner(context):
     parse_object = context.parse_object
@@ -71,3 +74,77 @@ def py_make_scanner(context):
     return scan_once
 
 make_scanner = c_make_scanner or py_make_scanner
+
+
+def py_make_bytes_scanner(context):
+    """Return a scan_once function for UTF-8 encoded bytes-like objects.
+
+    The document is indexed in place, so indices are byte offsets and
+    only the text of each string token is decoded.
+    """
+    parse_object = context.parse_bytes_object
+    parse_array = context.parse_bytes_array
+    parse_string = context.parse_bytes_string
+    match_number = BYTES_NUMBER_RE.match
+    strict = context.strict
+    parse_float = context.parse_float
+    parse_int = context.parse_int
+    parse_constant = context.parse_constant
+    object_hook = context.object_hook
+    object_pairs_hook = context.object_pairs_hook
+    memo = context.memo
+    # int() and float() accept ASCII bytes, other hooks are given a str.
+    int_from_bytes = parse_int is int
+    float_from_bytes = parse_float is float
+
+    def _scan_once(string, idx):
+        try:
+            nextchar = string[idx]
+        except IndexError:
+            raise StopIteration(idx) from None
+
+        if nextchar == 0x22:  # '"'
+            return parse_string(string, idx + 1, strict)
+        elif nextchar == 0x7b:  # '{'
+            return parse_object((string, idx + 1), strict,
+                _scan_once, object_hook, object_pairs_hook, memo)
+        elif nextchar == 0x5b:  # '['
+            return parse_array((string, idx + 1), _scan_once)
+        elif nextchar == 0x6e and string[idx:idx + 4] == b'null':
+            return None, idx + 4
+        elif nextchar == 0x74 and string[idx:idx + 4] == b'true':
+            return True, idx + 4
+        elif nextchar == 0x66 and string[idx:idx + 5] == b'false':
+            return False, idx + 5
+
+        m = match_number(string, idx)
+        if m is not None:
+            integer, frac, exp = m.groups()
+            if frac or exp:
+                number = m.group()
+                if not float_from_bytes:
+                    number = number.decode('ascii')
+                res = parse_float(number)
+            else:
+                if not int_from_bytes:
+                    integer = integer.decode('ascii')
+                res = parse_int(integer)
+            return res, m.end()
+        elif nextchar == 0x4e and string[idx:idx + 3] == b'NaN':
+            return parse_constant('NaN'), idx + 3
+        elif nextchar == 0x49 and string[idx:idx + 8] == b'Infinity':
+            return parse_constant('Infinity'), idx + 8
+        elif nextchar == 0x2d and string[idx:idx + 9] == b'-Infinity':
+            return parse_constant('-Infinity'), idx + 9
+        else:
+            raise StopIteration(idx)
+
+    def scan_once(string, idx):
+        try:
+            return _scan_once(string, idx)
+        finally:
+            memo.clear()
+
+    return scan_once
+
+make_bytes_scanner = py_make_bytes_scanner
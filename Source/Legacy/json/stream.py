@@ -0,0 +1,633 @@
+r"""Incremental JSON decoding
+
+The decoders in this module accept a JSON text in arbitrary chunks of
+``str`` or ``bytes`` and hand back results as soon as they are complete,
+so peak memory is bounded by the largest single value rather than by the
+whole stream.
+
+Decoding a stream of concatenated or newline-delimited values::
+
+    >>> from json.stream import JSONStreamDecoder
+    >>> decoder = JSONStreamDecoder()
+    >>> decoder.feed('{"a": 1} [2, ')
+    [{'a': 1}]
+    >>> decoder.feed('3] "x"\n')
+    [[2, 3], 'x']
+    >>> decoder.close()
+    []
+
+Path-addressed events::
+
+    >>> from json.stream import JSONEventParser
+    >>> parser = JSONEventParser()
+    >>> for event in parser.feed('{"rows": [1, tr'):
+    ...     print(event)
+    ('', 'start_map', None)
+    ('', 'map_key', 'rows')
+    ('rows', 'start_array', None)
+    ('rows.item', 'number', 1)
+    >>> parser.feed('ue]}') + parser.close()
+    [('rows.item', 'boolean', True), ('rows', 'end_array', None), ('', 'end_map', None)]
+
+Selecting values under a prefix from a file object::
+
+    >>> from io import StringIO
+    >>> from json.stream import iteritems
+    >>> list(iteritems(StringIO('{"rows": [{"id": 1}, {"id": 2}]}'), 'rows.item'))
+    [{'id': 1}, {'id': 2}]
+
+Positions in a :exc:`JSONDecodeError` raised by this module are relative
+to the text that is still buffered, not to the start of the stream.
+"""
+import codecs
+import re
+
+from json import detect_encoding
+from json.decoder import JSONDecoder, JSONDecodeError, scanstring, WHITESPACE
+from json.scanner import NUMBER_RE
+
+__all__ = [
+    'JSONStreamDecoder', 'JSONEventParser',
+    'iterload', 'iterload_lines', 'iterevents', 'iteritems',
+]
+
+FLAGS = re.VERBOSE | re.MULTILINE | re.DOTALL
+
+# Characters that change the nesting state outside of a string.
+STRUCTURE = re.compile(r'[\[\]{}"]', FLAGS)
+# Characters that end or escape inside a string.
+STRINGSPECIAL = re.compile(r'["\\]', FLAGS)
+# Characters that end a bare scalar (number or literal).
+SCALAREND = re.compile(r'[ \t\n\r\[\]{},:"]', FLAGS)
+
+_LITERALS = {
+    'n': ('null', 'null', None),
+    't': ('true', 'boolean', True),
+    'f': ('false', 'boolean', False),
+    'N': ('NaN', 'number', 'NaN'),
+    'I': ('Infinity', 'number', 'Infinity'),
+}
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class _TextReader(object):
+    """Turn a sequence of ``str`` or ``bytes`` chunks into text.
+
+    The encoding of ``bytes`` input is sniffed from the first four bytes
+    with :func:`json.detect_encoding`, exactly as :func:`json.loads` does.
+    """
+
+    def __init__(self):
+        self._decoder = None
+        self._pending = b''
+        self._started = False
+
+    def decode(self, data, final=False):
+        if isinstance(data, str):
+            if self._decoder is not None:
+                raise TypeError('cannot mix str and bytes input')
+            if not self._started and data:
+                self._started = True
+                if data.startswith('\ufeff'):
+                    raise JSONDecodeError(
+                        "Unexpected UTF-8 BOM (decode using utf-8-sig)",
+                        data, 0)
+            return data
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            raise TypeError(f'the JSON chunk must be str, bytes or bytearray, '
+                            f'not {data.__class__.__name__}')
+        if self._started and self._decoder is None:
+            raise TypeError('cannot mix str and bytes input')
+        if self._decoder is None:
+            self._pending += data
+            if len(self._pending) < 4 and not final:
+                return ''
+            self._started = True
+            encoding = detect_encoding(self._pending)
+            self._decoder = codecs.getincrementaldecoder(encoding)(
+                'surrogatepass')
+            data, self._pending = self._pending, b''
+        return self._decoder.decode(data, final)
+
+    def flush(self):
+        if self._decoder is None:
+            if not self._pending:
+                return ''
+            return self.decode(b'', True)
+        return self._decoder.decode(b'', True)
+
+
+def _make_decoder(cls, kw):
+    if cls is None:
+        cls = JSONDecoder
+    return cls(**kw)
+
+
+def _string_end(s, pos, escape, _special=STRINGSPECIAL.search):
+    """Find the closing quote of a string whose body starts at ``pos``.
+
+    ``escape`` is true when the previous chunk ended on a backslash.
+    Return the index after the quote, or -1 if the string continues past
+    the end of ``s``, together with the new escape state.
+    """
+    end = len(s)
+    while True:
+        if escape:
+            if pos >= end:
+                return -1, True
+            pos += 1
+            escape = False
+        m = _special(s, pos)
+        if m is None:
+            return -1, False
+        pos = m.end()
+        if m.group() == '"':
+            return pos, False
+        escape = True
+
+
+class JSONStreamDecoder(object):
+    """Decode a stream of whitespace separated top-level JSON values.
+
+    Chunks of ``str`` or ``bytes`` are passed to :meth:`feed`, which
+    returns the list of values that were completed by that chunk.  Each
+    complete value is handed to ``raw_decode()`` of a :class:`JSONDecoder`
+    (or *cls*), so the hooks accepted by :func:`json.loads` are honoured.
+    Only the text of the value currently being received is buffered.
+
+    This also covers newline-delimited JSON, where each line holds one
+    value.
+    """
+
+    def __init__(self, *, cls=None, **kw):
+        self.decoder = _make_decoder(cls, kw)
+        self._reader = _TextReader()
+        # Text of the value that is still incomplete, one part per chunk.
+        self._parts = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._scalar = False
+        self.closed = False
+
+    def feed(self, data):
+        """Add a chunk of input and return the list of completed values."""
+        if self.closed:
+            raise ValueError('feed() after close()')
+        return self._scan(self._reader.decode(data), False)
+
+    def close(self):
+        """Finish the stream and return the remaining values.
+
+        Raises :exc:`JSONDecodeError` if the input ends inside a value.
+        """
+        if self.closed:
+            return []
+        self.closed = True
+        return self._scan(self._reader.flush(), True)
+
+    def _scan(self, buf, final, _w=WHITESPACE.match,
+              _structure=STRUCTURE.search, _scalarend=SCALAREND.search):
+        parts = self._parts
+        depth = self._depth
+        in_string = self._in_string
+        escape = self._escape
+        scalar = self._scalar
+        raw_decode = self.decoder.raw_decode
+        values = []
+        pos = 0
+        end = len(buf)
+        while True:
+            if parts:
+                # Continue the value left incomplete by the previous chunk.
+                start = 0
+                err = None
+            else:
+                pos = _w(buf, pos).end()
+                if pos == end:
+                    break
+                start = pos
+                nextchar = buf[pos]
+                if nextchar in '{["':
+                    # Most values fit in one chunk: decode optimistically and
+                    # only scan for the end of the value when that fails.
+                    try:
+                        value, pos = raw_decode(buf, start)
+                    except ValueError as exc:
+                        err = exc
+                    else:
+                        values.append(value)
+                        continue
+                    if nextchar == '"':
+                        in_string = True
+                    else:
+                        depth = 1
+                    pos = start + 1
+                else:
+                    err = None
+                    scalar = True
+            if scalar:
+                m = _scalarend(buf, pos)
+                complete = m is not None or final
+                pos = m.start() if m is not None else end
+            else:
+                while True:
+                    if in_string:
+                        pos, escape = _string_end(buf, pos, escape)
+                        if pos < 0:
+                            pos = end
+                            break
+                        in_string = False
+                        if not depth:
+                            break
+                    else:
+                        m = _structure(buf, pos)
+                        if m is None:
+                            pos = end
+                            break
+                        pos = m.end()
+                        c = m.group()
+                        if c == '"':
+                            in_string = True
+                        elif c in '{[':
+                            depth += 1
+                        else:
+                            depth -= 1
+                            if not depth:
+                                break
+                complete = not (in_string or depth)
+            if not complete:
+                parts.append(buf[start:])
+                if final:
+                    # Let the decoder produce the precise error.
+                    doc = ''.join(parts)
+                    raw_decode(doc, 0)
+                    raise JSONDecodeError("Expecting value", doc, 0)
+                break
+            if err is not None:
+                # The value ended inside this chunk, so the error is genuine.
+                raise err
+            if parts:
+                parts.append(buf[start:pos])
+                doc = ''.join(parts)
+                parts.clear()
+                value, vend = raw_decode(doc, 0)
+                if vend != len(doc):
+                    raise JSONDecodeError("Extra data", doc, vend)
+            else:
+                value, vend = raw_decode(buf, start)
+                if vend != pos:
+                    raise JSONDecodeError("Extra data", buf, vend)
+            values.append(value)
+            scalar = False
+        self._depth = depth
+        self._in_string = in_string
+        self._escape = escape
+        self._scalar = scalar
+        return values
+
+
+class JSONEventParser(object):
+    """Incremental JSON parser producing path-addressed events.
+
+    :meth:`feed` returns a list of ``(prefix, event, value)`` tuples, where
+    *event* is one of ``'start_map'``, ``'map_key'``, ``'end_map'``,
+    ``'start_array'``, ``'end_array'``, ``'string'``, ``'number'``,
+    ``'boolean'`` or ``'null'``.  *prefix* is the dotted path of the value,
+    with ``item`` standing for any array element, so every record of
+    ``{"rows": [...]}`` has the prefix ``'rows.item'``.
+
+    Several top-level values may follow each other in the stream.  Numbers
+    are converted with the ``parse_int``, ``parse_float`` and
+    ``parse_constant`` hooks of the underlying :class:`JSONDecoder`.
+    """
+
+    # Container states.
+    _VALUE = 0          # expecting a value
+    _KEY_OR_END = 1     # just after '{'
+    _KEY = 2            # after ',' in an object
+    _COLON = 3          # after a key
+    _VALUE_OR_END = 4   # just after '['
+    _COMMA_OR_END = 5   # after a value inside a container
+
+    def __init__(self, *, cls=None, **kw):
+        self.decoder = _make_decoder(cls, kw)
+        self._reader = _TextReader()
+        self._buf = ''
+        # Parts of a string token that spans several chunks.
+        self._strparts = []
+        self._escape = False
+        # One (is_object, prefix) entry per open container.
+        self._stack = []
+        self._state = self._VALUE
+        self._prefix = ''
+        self.closed = False
+
+    def feed(self, data):
+        """Add a chunk of input and return the list of completed events."""
+        if self.closed:
+            raise ValueError('feed() after close()')
+        return self._parse(self._reader.decode(data), False)
+
+    def close(self):
+        """Finish the stream and return the remaining events.
+
+        Raises :exc:`JSONDecodeError` if the input ends inside a value.
+        """
+        if self.closed:
+            return []
+        self.closed = True
+        events = self._parse(self._reader.flush(), True)
+        if self._stack:
+            raise JSONDecodeError("Unterminated %s" %
+                                  ('object' if self._stack[-1][0] else 'array'),
+                                  self._buf, len(self._buf))
+        return events
+
+    def _child_prefix(self, key):
+        prefix = self._stack[-1][1]
+        return f'{prefix}.{key}' if prefix else key
+
+    def _end_value(self):
+        self._state = self._COMMA_OR_END if self._stack else self._VALUE
+        if self._stack and not self._stack[-1][0]:
+            self._prefix = self._child_prefix('item')
+
+    def _parse(self, text, final, _w=WHITESPACE.match,
+               _number=NUMBER_RE.match, _scalarend=SCALAREND.search):
+        strparts = self._strparts
+        if strparts:
+            # Only look at the new text until the pending string is closed,
+            # so a long string split over many chunks is scanned once.
+            stop, self._escape = _string_end(text, 0, self._escape)
+            if stop < 0 and not final:
+                strparts.append(text)
+                return []
+            strparts.append(text)
+            buf = ''.join(strparts)
+            strparts.clear()
+        elif self._buf:
+            buf = self._buf + text
+        else:
+            buf = text
+        end = len(buf)
+        pos = 0
+        stack = self._stack
+        strict = self.decoder.strict
+        parse_int = self.decoder.parse_int
+        parse_float = self.decoder.parse_float
+        parse_constant = self.decoder.parse_constant
+        events = []
+        append = events.append
+        while True:
+            pos = _w(buf, pos).end()
+            if pos == end:
+                break
+            nextchar = buf[pos]
+            state = self._state
+
+            if state == self._COLON:
+                if nextchar != ':':
+                    raise JSONDecodeError("Expecting ':' delimiter", buf, pos)
+                pos += 1
+                self._state = self._VALUE
+                continue
+            if state == self._COMMA_OR_END:
+                is_object, prefix = stack[-1]
+                if nextchar == ',':
+                    pos += 1
+                    self._state = self._KEY if is_object else self._VALUE
+                    continue
+                if nextchar != ('}' if is_object else ']'):
+                    raise JSONDecodeError("Expecting ',' delimiter", buf, pos)
+                pos += 1
+                stack.pop()
+                append((prefix, 'end_map' if is_object else 'end_array', None))
+                self._prefix = prefix
+                self._end_value()
+                continue
+            if state == self._KEY_OR_END and nextchar == '}':
+                pos += 1
+                prefix = stack.pop()[1]
+                append((prefix, 'end_map', None))
+                self._prefix = prefix
+                self._end_value()
+                continue
+            if state == self._VALUE_OR_END and nextchar == ']':
+                pos += 1
+                prefix = stack.pop()[1]
+                append((prefix, 'end_array', None))
+                self._prefix = prefix
+                self._end_value()
+                continue
+
+            if nextchar == '"':
+                stop, escape = _string_end(buf, pos + 1, False)
+                if stop < 0:
+                    if final:
+                        scanstring(buf, pos + 1, strict)
+                    strparts.append(buf[pos:])
+                    self._escape = escape
+                    pos = end
+                    break
+                value, pos = scanstring(buf, pos + 1, strict)
+                if state in (self._KEY_OR_END, self._KEY):
+                    append((stack[-1][1], 'map_key', value))
+                    self._prefix = self._child_prefix(value)
+                    self._state = self._COLON
+                    continue
+                append((self._prefix, 'string', value))
+                self._end_value()
+                continue
+            if state in (self._KEY_OR_END, self._KEY):
+                raise JSONDecodeError(
+                    "Expecting property name enclosed in double quotes",
+                    buf, pos)
+
+            if nextchar in '{[':
+                pos += 1
+                is_object = nextchar == '{'
+                prefix = self._prefix
+                append((prefix, 'start_map' if is_object else 'start_array',
+                        None))
+                stack.append((is_object, prefix))
+                if is_object:
+                    self._state = self._KEY_OR_END
+                else:
+                    self._state = self._VALUE_OR_END
+                    self._prefix = self._child_prefix('item')
+                continue
+
+            literal = _LITERALS.get(nextchar)
+            if literal is not None:
+                word, event, value = literal
+                if buf.startswith(word, pos):
+                    pos += len(word)
+                    if event == 'number':
+                        value = parse_constant(value)
+                    append((self._prefix, event, value))
+                    self._end_value()
+                    continue
+                if not final and word.startswith(buf[pos:]):
+                    break
+                raise JSONDecodeError("Expecting value", buf, pos)
+
+            if buf.startswith('-I', pos):
+                if buf.startswith('-Infinity', pos):
+                    pos += 9
+                    append((self._prefix, 'number',
+                            parse_constant('-Infinity')))
+                    self._end_value()
+                    continue
+                if not final and '-Infinity'.startswith(buf[pos:]):
+                    break
+                raise JSONDecodeError("Expecting value", buf, pos)
+            if not final and _scalarend(buf, pos) is None:
+                # The number may continue in the next chunk.
+                break
+            m = _number(buf, pos)
+            if m is None:
+                raise JSONDecodeError("Expecting value", buf, pos)
+            integer, frac, exp = m.groups()
+            if frac or exp:
+                value = parse_float(integer + (frac or '') + (exp or ''))
+            else:
+                value = parse_int(integer)
+            pos = m.end()
+            append((self._prefix, 'number', value))
+            self._end_value()
+
+        self._buf = buf[pos:]
+        return events
+
+
+class _ItemBuilder(object):
+    """Assemble Python objects from a run of parser events."""
+
+    def __init__(self, decoder):
+        self.object_hook = decoder.object_hook
+        self.object_pairs_hook = decoder.object_pairs_hook
+        self.memo = {}
+        self.stack = []
+        self.key = None
+
+    def _add(self, value):
+        top = self.stack[-1]
+        if top[0]:
+            top[1].append((self.memo.setdefault(top[2], top[2]), value))
+        else:
+            top[1].append(value)
+
+    def event(self, event, value):
+        """Process one event; return ``(True, obj)`` once obj is complete."""
+        stack = self.stack
+        if event == 'map_key':
+            stack[-1][2] = value
+            return False, None
+        if event == 'start_map':
+            stack.append([True, [], None])
+            return False, None
+        if event == 'start_array':
+            stack.append([False, []])
+            return False, None
+        if event == 'end_map':
+            pairs = stack.pop()[1]
+            if self.object_pairs_hook is not None:
+                value = self.object_pairs_hook(pairs)
+            else:
+                value = dict(pairs)
+                if self.object_hook is not None:
+                    value = self.object_hook(value)
+        elif event == 'end_array':
+            value = stack.pop()[1]
+        if not stack:
+            self.memo.clear()
+            return True, value
+        self._add(value)
+        return False, None
+
+
+def _read_chunks(fp, chunk_size):
+    read = fp.read
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def iterload(fp, *, chunk_size=DEFAULT_CHUNK_SIZE, cls=None, **kw):
+    """Iterate over the top-level JSON values read from ``fp``.
+
+    ``fp`` is a ``.read()``-supporting file-like object in text or binary
+    mode, containing zero or more whitespace separated JSON values.  It is
+    read in chunks of ``chunk_size``, and the remaining keyword arguments
+    have the same meaning as for :func:`json.load`.
+    """
+    decoder = JSONStreamDecoder(cls=cls, **kw)
+    for chunk in _read_chunks(fp, chunk_size):
+        yield from decoder.feed(chunk)
+    yield from decoder.close()
+
+
+def iterload_lines(fp, *, cls=None, **kw):
+    """Iterate over the values of a newline-delimited JSON file object.
+
+    Each non-blank line of ``fp`` must hold exactly one JSON value; only
+    one line is held in memory at a time.  Positions in a
+    :exc:`JSONDecodeError` are relative to the malformed line, whose number
+    in the stream is added as a note.
+    """
+    decoder = _make_decoder(cls, kw)
+    decode = decoder.decode
+    for lineno, line in enumerate(fp, 1):
+        if not isinstance(line, str):
+            line = line.decode(detect_encoding(line), 'surrogatepass')
+        if not line.strip():
+            continue
+        try:
+            value = decode(line)
+        except ValueError as err:
+            err.add_note(f'while decoding line {lineno} of the stream')
+            raise
+        yield value
+
+
+def iterevents(fp, *, chunk_size=DEFAULT_CHUNK_SIZE, cls=None, **kw):
+    """Iterate over the ``(prefix, event, value)`` events of ``fp``.
+
+    See :class:`JSONEventParser` for the meaning of the events.
+    """
+    parser = JSONEventParser(cls=cls, **kw)
+    for chunk in _read_chunks(fp, chunk_size):
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+def iteritems(fp, prefix, *, chunk_size=DEFAULT_CHUNK_SIZE, cls=None, **kw):
+    """Iterate over the values found at ``prefix`` in ``fp``.
+
+    Only the value currently being built is kept in memory, so this can
+    walk the elements of a huge top-level array (prefix ``'item'``) or of
+    an array nested in an envelope object (e.g. ``'data.item'``).
+    """
+    parser = JSONEventParser(cls=cls, **kw)
+    builder = None
+    def process(events):
+        nonlocal builder
+        for path, event, value in events:
+            if builder is not None:
+                done, obj = builder.event(event, value)
+                if done:
+                    builder = None
+                    yield obj
+            elif path == prefix:
+                if event in ('start_map', 'start_array'):
+                    builder = _ItemBuilder(parser.decoder)
+                    builder.event(event, value)
+                elif event not in ('end_map', 'end_array', 'map_key'):
+                    yield value
+    for chunk in _read_chunks(fp, chunk_size):
+        yield from process(parser.feed(chunk))
+    yield from process(parser.close())
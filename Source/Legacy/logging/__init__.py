@@ -283,7 +283,45 @@ else:
 #   The logging record
 #---------------------------------------------------------------------------
 
-class LogRecord(object):
+class _LazyAttribute(object):
+    """
+    A LogRecord attribute which is computed the first time it is looked up,
+    and then stored in the record's __dict__ like any other attribute.
+    """
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, record, owner=None):
+        if record is None:
+            return self
+        value = _rawRecordDict(record)[self.name] = self.func(record)
+        return value
+
+
+class _RecordBase(object):
+    """
+    Owns the descriptor of the instance dict of LogRecord, which replaces
+    it by one that computes the lazy attributes first.
+    """
+    __slots__ = ('__dict__', '__weakref__')
+
+_rawRecordDict = _RecordBase.__dict__['__dict__'].__get__
+
+def _recordDict(record):
+    """
+    Return the attribute dict of a record, without computing its lazy
+    attributes.
+    """
+    try:
+        return _rawRecordDict(record)
+    except TypeError:
+        # Not a LogRecord
+        return record.__dict__
+
+
+class LogRecord(_RecordBase):
     """
     A LogRecord instance represents an event being logged.
 
@@ -294,7 +332,15 @@ class LogRecord(object):
     record also includes information such as when the record was created,
     the source line where the logging call was made, and any exception
     information to be logged.
+
+    Attributes which are costly to compute and which most handlers never
+    look at (filename, module, msecs, relativeCreated, threadName and
+    processName) are computed on first access. Looking up
+    __dict__ (as vars(), pickling or copying a record do) computes them all.
     """
+    __slots__ = ('_threadObject', '_multiprocessing', '_messageCache',
+                 '_formattedTimes')
+
     def __init__(self, name, level, pathname, lineno,
                  msg, args, exc_info, func=None, sinfo=None, **kwargs):
         """
@@ -328,40 +374,25 @@ class LogRecord(object):
         self.levelname = getLevelName(level)
         self.levelno = level
         self.pathname = pathname
-        try:
-            self.filename = os.path.basename(pathname)
-            self.module = os.path.splitext(self.filename)[0]
-        except (TypeError, ValueError, AttributeError):
-            self.filename = pathname
-            self.module = "Unknown module"
         self.exc_info = exc_info
         self.exc_text = None      # used to cache the traceback text
         self.stack_info = sinfo
         self.lineno = lineno
         self.funcName = func
         self.created = ct
-        self.msecs = int((ct - int(ct)) * 1000) + 0.0  # see gh-89047
-        self.relativeCreated = (self.created - _startTime) * 1000
         if logThreads:
+            # The thread is only asked for its name if threadName is used.
             self.thread = threading.get_ident()
-            self.threadName = threading.current_thread().name
+            self._threadObject = threading.current_thread()
         else: # pragma: no cover
             self.thread = None
             self.threadName = None
         if not logMultiprocessing: # pragma: no cover
             self.processName = None
         else:
-            self.processName = 'MainProcess'
-            mp = sys.modules.get('multiprocessing')
-            if mp is not None:
-                # Errors may occur if multiprocessing has not finished loading
-                # yet - e.g. if a custom import hook causes third-party code
-                # to run when multiprocessing calls import. See issue 8200
-                # for an example
-                try:
-                    self.processName = mp.current_process().name
-                except Exception: #pragma: no cover
-                    pass
+            self._multiprocessing = sys.modules.get('multiprocessing')
+        # Not computed lazily: a record created before fork() and handled
+        # after it must report the process which created it.
         if logProcesses and hasattr(os, 'getpid'):
             self.process = os.getpid()
         else:
@@ -376,6 +407,73 @@ class LogRecord(object):
                 except Exception:
                     pass
 
+    @_LazyAttribute
+    def filename(self):
+        try:
+            return os.path.basename(self.pathname)
+        except (TypeError, ValueError, AttributeError):
+            return self.pathname
+
+    @_LazyAttribute
+    def module(self):
+        try:
+            return os.path.splitext(os.path.basename(self.pathname))[0]
+        except (TypeError, ValueError, AttributeError):
+            return "Unknown module"
+
+    @_LazyAttribute
+    def msecs(self):
+        ct = self.created
+        return int((ct - int(ct)) * 1000) + 0.0  # see gh-89047
+
+    @_LazyAttribute
+    def relativeCreated(self):
+        return (self.created - _startTime) * 1000
+
+    @_LazyAttribute
+    def threadName(self):
+        try:
+            return self._threadObject.name
+        except AttributeError:
+            return None
+
+    @_LazyAttribute
+    def processName(self):
+        # Use multiprocessing only if it was imported when the record was
+        # created.
+        mp = getattr(self, '_multiprocessing', None)
+        if mp is not None:
+            # Errors may occur if multiprocessing has not finished loading
+            # yet - e.g. if a custom import hook causes third-party code
+            # to run when multiprocessing calls import. See issue 8200
+            # for an example
+            try:
+                return mp.current_process().name
+            except Exception: #pragma: no cover
+                pass
+        return 'MainProcess'
+
+    @property
+    def __dict__(self):
+        """
+        The attribute dictionary, with all lazy attributes computed.
+        """
+        d = _rawRecordDict(self)
+        for name in _lazyRecordAttributes:
+            if name not in d:
+                getattr(self, name)
+        return d
+
+    def __getstate__(self):
+        """
+        Return the attribute dictionary, leaving out the slots, which hold
+        the context captured for the lazy attributes.
+        """
+        return self.__dict__
+
+    def __setstate__(self, state):
+        _rawRecordDict(self).update(state)
+
     def __repr__(self):
         return '<LogRecord: %s, %s, %s, %s, "%s">'%(self.name, self.levelno,
             self.pathname, self.lineno, self.msg)
@@ -385,12 +483,24 @@ class LogRecord(object):
         Return the message for this LogRecord.
 
         Return the message for this LogRecord after merging any user-supplied
-        arguments with the message.
-        """
-        msg = str(self.msg)
-        if self.args:
-            msg = msg % self.args
-        return msg
+        arguments with the message. The result is remembered for as long as
+        msg and args are unchanged, so that a record reaching several
+        handlers is only merged once.
+        """
+        msg = self.msg
+        args = self.args
+        cached = getattr(self, '_messageCache', None)
+        if cached is not None and cached[0] is msg and cached[1] is args:
+            return cached[2]
+        message = str(msg)
+        if args:
+            message = message % args
+        self._messageCache = (msg, args, message)
+        return message
+
+_lazyRecordAttributes = frozenset(
+    name for name, value in vars(LogRecord).items()
+    if isinstance(value, _LazyAttribute))
 
 #
 #   Determine which class to use when instantiating log records.
@@ -439,6 +549,11 @@ class PercentStyle(object):
     asctime_format = '%(asctime)s'
     asctime_search = '%(asctime)'
     validation_pattern = re.compile(r'%\(\w+\)[#0+ -]*(\*|\d+)?(\.(\*|\d+))?[diouxefgcrsa%]', re.I)
+    # The format string last compiled by _compile(), the function which
+    # renders it and the names of the lazy LogRecord attributes it uses.
+    _compiledFmt = None
+    _render = None
+    _lazyNames = ()
 
     def __init__(self, fmt, *, defaults=None):
         self._fmt = fmt or self.default_format
@@ -452,14 +567,35 @@ class PercentStyle(object):
         if not self.validation_pattern.search(self._fmt):
             raise ValueError("Invalid format '%s' for '%s' style" % (self._fmt, self.default_format[0]))
 
+    def _compile(self):
+        """
+        Return a function which renders the format string with a dict of
+        record attributes. It is built once for each format string.
+        """
+        fmt = self._fmt
+        if fmt is not self._compiledFmt:
+            self._render = self._make_renderer(fmt)
+            self._lazyNames = [name for name in _lazyRecordAttributes
+                               if name in fmt]
+            self._compiledFmt = fmt
+        return self._render
+
+    def _make_renderer(self, fmt):
+        return fmt.__mod__
+
     def _format(self, record):
         if defaults := self._defaults:
-            values = defaults | record.__dict__
+            values = defaults | _recordDict(record)
         else:
-            values = record.__dict__
-        return self._fmt % values
+            values = _recordDict(record)
+        return self._compile()(values)
 
     def format(self, record):
+        self._compile()
+        # Compute the lazy record attributes the format string may use, so
+        # that they are in the dict it is rendered with.
+        for name in self._lazyNames:
+            getattr(record, name, None)
         try:
             return self._format(record)
         except KeyError as e:
@@ -474,12 +610,9 @@ class StrFormatStyle(PercentStyle):
     fmt_spec = re.compile(r'^(.?[<>=^])?[+ -]?#?0?(\d+|{\w+})?[,_]?(\.(\d+|{\w+}))?[bcdefgnosx%]?$', re.I)
     field_spec = re.compile(r'^(\d+|\w+)(\.\w+|\[[^]]+\])*$')
 
-    def _format(self, record):
-        if defaults := self._defaults:
-            values = defaults | record.__dict__
-        else:
-            values = record.__dict__
-        return self._fmt.format(**values)
+    def _make_renderer(self, fmt):
+        # format_map() saves copying the attributes into keyword arguments.
+        return fmt.format_map
 
     def validate(self):
         """Validate the input format, ensure it is the correct string formatting style"""
@@ -527,12 +660,27 @@ class StringTemplateStyle(PercentStyle):
         if not fields:
             raise ValueError('invalid format: no fields')
 
-    def _format(self, record):
-        if defaults := self._defaults:
-            values = defaults | record.__dict__
-        else:
-            values = record.__dict__
-        return self._tpl.substitute(**values)
+    def _make_renderer(self, fmt):
+        # Template.substitute() converts every value with str(), so the
+        # template can be translated to an equivalent %-format string.
+        if fmt is not self._tpl.template:
+            self._tpl = Template(fmt)
+        tpl = self._tpl
+        parts = []
+        pos = 0
+        for m in tpl.pattern.finditer(fmt):
+            parts.append(fmt[pos:m.start()].replace('%', '%%'))
+            pos = m.end()
+            name = m.group('named') or m.group('braced')
+            if name is not None:
+                parts.append('%%(%s)s' % name)
+            elif m.group('escaped') is not None:
+                parts.append('$')
+            else:
+                # Let substitute() report the invalid placeholder.
+                return lambda values: tpl.substitute(values)
+        parts.append(fmt[pos:].replace('%', '%%'))
+        return ''.join(parts).__mod__
 
 
 BASIC_FORMAT = "%(levelname)s:%(name)s:%(message)s"
@@ -636,14 +784,48 @@ class Formatter(object):
         signature as time.localtime() or time.gmtime(). To change it for all
         formatters, for example if you want all logging times to be shown in GMT,
         set the 'converter' attribute in the Formatter class.
+
+        The result is remembered on the record, so that other formatters
+        using the same converter and format do not compute it again.
         """
-        ct = self.converter(record.created)
+        converter = self.converter
+        created = record.created
         if datefmt:
-            s = time.strftime(datefmt, ct)
+            key = (converter, datefmt, created)
         else:
-            s = time.strftime(self.default_time_format, ct)
-            if self.default_msec_format:
-                s = self.default_msec_format % (s, record.msecs)
+            key = (converter, self.default_time_format,
+                   self.default_msec_format, created, record.msecs)
+        times = getattr(record, '_formattedTimes', None)
+        if times is not None:
+            s = times.get(key)
+            if s is not None:
+                return s
+        s = self._strftime(datefmt or self.default_time_format, created)
+        if not datefmt and self.default_msec_format:
+            s = self.default_msec_format % (s, record.msecs)
+        if isinstance(record, LogRecord):
+            if times is None:
+                record._formattedTimes = times = {}
+            times[key] = s
+        return s
+
+    # The last (converter, format, second) formatted by _strftime(), and
+    # the result.
+    _lastStrftime = (None, None)
+
+    def _strftime(self, fmt, created):
+        converter = self.converter
+        if converter is not time.localtime and converter is not time.gmtime:
+            return time.strftime(fmt, converter(created))
+        # Both converters round down to the second, and time.strftime()
+        # has no finer directive, so records created within the same second
+        # share the result.
+        key = (converter, fmt, created // 1)
+        last = self._lastStrftime
+        if last[0] == key:
+            return last[1]
+        s = time.strftime(fmt, converter(created))
+        self._lastStrftime = (key, s)
         return s
 
     def formatException(self, ei):
@@ -1008,6 +1190,17 @@ class Handler(Filterer):
         raise NotImplementedError('emit must be implemented '
                                   'by Handler subclasses')
 
+    def emit_batch(self, records):
+        """
+        Emit a list of logging records.
+
+        This version calls emit() for each record. Subclasses which can
+        write several records more cheaply than one at a time (with a
+        single write or system call) should override it.
+        """
+        for record in records:
+            self.emit(record)
+
     def handle(self, record):
         """
         Conditionally emit the specified logging record.
@@ -1030,6 +1223,29 @@ class Handler(Filterer):
                 self.release()
         return rv
 
+    def handle_batch(self, records):
+        """
+        Conditionally emit a batch of logging records.
+
+        Each record is filtered as by handle(); the records which pass are
+        emitted with a single call to emit_batch() while the I/O thread lock
+        is held. Returns the list of records that were emitted.
+        """
+        batch = []
+        for record in records:
+            rv = self.filter(record)
+            if isinstance(rv, LogRecord):
+                record = rv
+            if rv:
+                batch.append(record)
+        if batch:
+            self.acquire()
+            try:
+                self.emit_batch(batch)
+            finally:
+                self.release()
+        return batch
+
     def setFormatter(self, fmt):
         """
         Set the formatter for this handler.
@@ -1167,6 +1383,30 @@ class StreamHandler(Handler):
         except Exception:
             self.handleError(record)
 
+    def emit_batch(self, records):
+        """
+        Emit a list of records.
+
+        The records are formatted as by emit() and written to the stream
+        with a single write, followed by a single flush.
+        """
+        parts = []
+        for record in records:
+            try:
+                parts.append(self.format(record) + self.terminator)
+            except RecursionError:  # See issue 36272
+                raise
+            except Exception:
+                self.handleError(record)
+        if parts:
+            try:
+                self.stream.write(''.join(parts))
+                self.flush()
+            except RecursionError:  # See issue 36272
+                raise
+            except Exception:
+                self.handleError(records[-1])
+
     def setStream(self, stream):
         """
         Sets the StreamHandler's stream to the specified value,
@@ -1279,6 +1519,19 @@ class FileHandler(StreamHandler):
         if self.stream:
             StreamHandler.emit(self, record)
 
+    def emit_batch(self, records):
+        """
+        Emit a list of records.
+
+        The stream is opened as by emit(), then the records are written
+        with a single write and a single flush.
+        """
+        if self.stream is None:
+            if self.mode != 'w' or not self._closed:
+                self.stream = self._open()
+        if self.stream:
+            StreamHandler.emit_batch(self, records)
+
     def __repr__(self):
         level = getLevelName(self.level)
         return '<%s %s (%s)>' % (self.__class__.__name__, self.baseFilename, level)
@@ -1651,10 +1904,12 @@ class Logger(Filterer):
         rv = _logRecordFactory(name, level, fn, lno, msg, args, exc_info, func,
                              sinfo)
         if extra is not None:
+            d = _recordDict(rv)
             for key in extra:
-                if (key in ["message", "asctime"]) or (key in rv.__dict__):
+                if ((key in ["message", "asctime"]) or (key in d)
+                    or (key in _lazyRecordAttributes)):
                     raise KeyError("Attempt to overwrite %r in LogRecord" % key)
-                rv.__dict__[key] = extra[key]
+                d[key] = extra[key]
         return rv
 
     def _log(self, level, msg, args, exc_info=None, extra=None, stack_info=False,
@@ -1663,6 +1918,9 @@ class Logger(Filterer):
         Low-level logging routine which creates a LogRecord and then calls
         all the handlers of this logger to handle the record.
         """
+        if not self._handlersAccept(level):
+            # Don't pay for findCaller() and a record nobody will see.
+            return
         sinfo = None
         if _srcfile:
             #IronPython doesn't track Python frames, so findCaller raises an
@@ -1743,6 +2001,36 @@ class Logger(Filterer):
                 c = c.parent
         return rv
 
+    def _handlersAccept(self, level):
+        """
+        Return False if it is known in advance that no handler would be
+        called for a record at this level, True otherwise.
+
+        This mirrors the level checks of callHandlers(), and is only
+        conclusive if this logger has no filters (which could change the
+        record or have side effects) and if record handling has not been
+        customised by a subclass.
+        """
+        if self.filters:
+            return True
+        cls = type(self)
+        if (cls.handle is not Logger.handle
+            or cls.callHandlers is not Logger.callHandlers
+            or cls.makeRecord is not Logger.makeRecord):
+            return True
+        c = self
+        found = False
+        while c:
+            for hdlr in c.handlers:
+                if level >= hdlr.level:
+                    return True
+                found = True
+            if not c.propagate:
+                break
+            c = c.parent
+        # Without any handler, callHandlers() falls back to lastResort.
+        return not found
+
     def callHandlers(self, record):
         """
         Pass a record to all relevant handlers.
@@ -715,7 +715,9 @@ class DictConfigurator(BaseConfigurator):
         else:
             lklass = logging.handlers.QueueListener
         listener = lklass(q, *kwargs['handlers'], respect_handler_level=rhl)
-        handler = klass(q)
+        options = {k: kwargs[k] for k in ('overflow', 'sample_rate')
+                   if k in kwargs}
+        handler = klass(q, **options)
         handler.listener = listener
         return handler
 
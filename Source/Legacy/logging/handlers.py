@@ -76,6 +76,15 @@ class BaseRotatingHandler(logging.FileHandler):
         except Exception:
             self.handleError(record)
 
+    def emit_batch(self, records):
+        """
+        Emit a list of records.
+
+        Each record is emitted on its own, so that rollover can happen
+        between any two of them.
+        """
+        logging.Handler.emit_batch(self, records)
+
     def rotation_filename(self, default_name):
         """
         Modify the filename of a log file when rotating.
@@ -525,6 +534,16 @@ class WatchedFileHandler(logging.FileHandler):
         self.reopenIfNeeded()
         logging.FileHandler.emit(self, record)
 
+    def emit_batch(self, records):
+        """
+        Emit a list of records.
+
+        If underlying file has changed, reopen the file before writing the
+        records to it.
+        """
+        self.reopenIfNeeded()
+        logging.FileHandler.emit_batch(self, records)
+
 
 class SocketHandler(logging.Handler):
     """
@@ -679,6 +698,22 @@ class SocketHandler(logging.Handler):
         except Exception:
             self.handleError(record)
 
+    def emit_batch(self, records):
+        """
+        Emit a list of records.
+
+        The records are pickled as by emit() and sent with a single
+        sendall() call.
+        """
+        record = None
+        try:
+            data = []
+            for record in records:
+                data.append(self.makePickle(record))
+            self.send(b''.join(data))
+        except Exception:
+            self.handleError(record)
+
     def close(self):
         """
         Closes the socket.
@@ -735,6 +770,14 @@ class DatagramHandler(SocketHandler):
             self.createSocket()
         self.sock.sendto(s, self.address)
 
+    def emit_batch(self, records):
+        """
+        Emit a list of records.
+
+        Each record is sent in a datagram of its own.
+        """
+        logging.Handler.emit_batch(self, records)
+
 class SysLogHandler(logging.Handler):
     """
     A handler class which sends formatted logging records to a syslog
@@ -1436,25 +1479,105 @@ class QueueHandler(logging.Handler):
 
     This code is new in Python 3.2, but this class can be copy pasted into
     user code for use with earlier Python versions.
+
+    If the queue is bounded, *overflow* selects what happens to a record
+    which finds it full:
+
+    * None (the default): queue.Full is raised and reported by handleError().
+    * 'block': wait until the listener makes room.
+    * 'drop-newest': discard the new record.
+    * 'drop-oldest': discard the oldest queued record to make room.
+    * 'sample': as 'drop-newest', but once the queue is half full only
+      one record in every *sample_rate* is queued.
+
+    The number of records queued and dropped are kept in the ``queued``
+    and ``dropped`` attributes.
     """
+    overflow_policies = (None, 'block', 'drop-newest', 'drop-oldest', 'sample')
 
-    def __init__(self, queue):
+    def __init__(self, queue, overflow=None, sample_rate=10):
         """
         Initialise an instance, using the passed queue.
         """
+        if overflow not in self.overflow_policies:
+            raise ValueError('Invalid overflow policy %r' % (overflow,))
+        if sample_rate < 1:
+            raise ValueError('sample_rate must be at least 1')
         logging.Handler.__init__(self)
         self.queue = queue
         self.listener = None  # will be set to listener if configured via dictConfig()
+        self.overflow = overflow
+        self.sample_rate = sample_rate
+        self.queued = 0
+        self.dropped = 0
+        self._sampled = 0
 
     def enqueue(self, record):
         """
         Enqueue a record.
 
-        The base implementation uses put_nowait. You may want to override
-        this method if you want to use blocking, timeouts or custom queue
-        implementations.
+        The base implementation uses put_nowait, or put if the overflow
+        policy is 'block', and applies the other overflow policies when the
+        queue is full. You may want to override this method if you want to
+        use timeouts or custom queue implementations.
         """
-        self.queue.put_nowait(record)
+        overflow = self.overflow
+        q = self.queue
+        if overflow is None:
+            q.put_nowait(record)
+        elif overflow == 'block':
+            q.put(record)
+        else:
+            if overflow == 'sample' and self._sampling():
+                self._sampled += 1
+                if self._sampled % self.sample_rate:
+                    self.dropped += 1
+                    return
+            try:
+                q.put_nowait(record)
+            except queue.Full:
+                if overflow != 'drop-oldest':
+                    self.dropped += 1
+                    return
+                # Make room, then try once more: the listener may have
+                # emptied the queue meanwhile, or other producers may have
+                # filled it again.
+                try:
+                    oldest = q.get_nowait()
+                except queue.Empty:
+                    pass
+                else:
+                    if hasattr(q, 'task_done'):
+                        q.task_done()
+                    if oldest is QueueListener._sentinel:
+                        # Never lose the request to stop the listener: if
+                        # other producers took its place meanwhile, evict
+                        # their records until it is queued again.
+                        self.dropped += 1
+                        while True:
+                            try:
+                                q.put_nowait(oldest)
+                                return
+                            except queue.Full:
+                                pass
+                            try:
+                                q.get_nowait()
+                            except queue.Empty:
+                                continue
+                            if hasattr(q, 'task_done'):
+                                q.task_done()
+                            self.dropped += 1
+                    self.dropped += 1
+                try:
+                    q.put_nowait(record)
+                except queue.Full:
+                    self.dropped += 1
+                    return
+        self.queued += 1
+
+    def _sampling(self):
+        maxsize = getattr(self.queue, 'maxsize', 0)
+        return maxsize > 0 and self.queue.qsize() * 2 >= maxsize
 
     def prepare(self, record):
         """
@@ -1592,11 +1715,15 @@ class QueueListener(object):
         """
         This is used to enqueue the sentinel record.
 
-        The base implementation uses put_nowait. You may want to override this
-        method if you want to use timeouts or work with custom queue
-        implementations.
+        The base implementation uses put_nowait, or put if a bounded queue is
+        full: the listener makes room as it handles the queued records. You
+        may want to override this method if you want to use timeouts or work
+        with custom queue implementations.
         """
-        self.queue.put_nowait(self._sentinel)
+        try:
+            self.queue.put_nowait(self._sentinel)
+        except queue.Full:
+            self.queue.put(self._sentinel)
 
     def stop(self):
         """
@@ -1609,3 +1736,118 @@ class QueueListener(object):
         self.enqueue_sentinel()
         self._thread.join()
         self._thread = None
+
+
+class BatchingQueueListener(QueueListener):
+    """
+    A QueueListener which removes records from the queue in batches, and
+    passes each batch to the handlers' handle_batch() method, so that
+    handlers such as FileHandler and SocketHandler can write a whole batch
+    with a single call.
+
+    A batch holds at most *max_batch* records. Once the first record of a
+    batch has arrived, the listener waits up to *max_wait* seconds for more
+    records before handling the batch; with the default of zero, only the
+    records already queued are taken.
+
+    The number of batches and of records handled are kept in the
+    ``batches`` and ``handled`` attributes.
+    """
+
+    def __init__(self, queue, *handlers, respect_handler_level=False,
+                 max_batch=100, max_wait=0.0):
+        """
+        Initialise an instance with the specified queue, handlers and
+        batch limits.
+        """
+        if max_batch < 1:
+            raise ValueError('max_batch must be at least 1')
+        QueueListener.__init__(self, queue, *handlers,
+                               respect_handler_level=respect_handler_level)
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self.handled = 0
+
+    def dequeue_batch(self):
+        """
+        Dequeue a batch of records, blocking until the first one arrives.
+
+        The first record is obtained with dequeue(True) and the others with
+        dequeue(False); waiting up to max_wait for more records uses the
+        queue's get method with a timeout. If the sentinel is dequeued, it
+        ends the batch and is returned as its last item.
+        """
+        record = self.dequeue(True)
+        records = [record]
+        deadline = None
+        while record is not self._sentinel and len(records) < self.max_batch:
+            try:
+                record = self.dequeue(False)
+            except queue.Empty:
+                if self.max_wait <= 0:
+                    break
+                if deadline is None:
+                    deadline = time.monotonic() + self.max_wait
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    record = self.queue.get(True, timeout)
+                except queue.Empty:
+                    break
+            records.append(record)
+        return records
+
+    def handle_batch(self, records):
+        """
+        Handle a batch of records.
+
+        Each record is prepared, then the batch is offered to each handler
+        through its handle_batch() method, or one record at a time for
+        handlers which do not have one.
+        """
+        records = [self.prepare(record) for record in records]
+        for handler in self.handlers:
+            if self.respect_handler_level:
+                level = handler.level
+                batch = [record for record in records
+                         if record.levelno >= level]
+            else:
+                batch = records
+            if not batch:
+                continue
+            handle_batch = getattr(handler, 'handle_batch', None)
+            if handle_batch is not None:
+                handle_batch(batch)
+            else:
+                for record in batch:
+                    handler.handle(record)
+        self.batches += 1
+        self.handled += len(records)
+
+    def _monitor(self):
+        """
+        Monitor the queue for batches of records, and ask the handlers
+        to deal with them.
+
+        This method runs on a separate, internal thread.
+        The thread will terminate if it sees a sentinel object in the queue.
+        """
+        q = self.queue
+        has_task_done = hasattr(q, 'task_done')
+        while True:
+            try:
+                records = self.dequeue_batch()
+            except queue.Empty:
+                break
+            stop = records[-1] is self._sentinel
+            if stop:
+                del records[-1]
+            if records:
+                self.handle_batch(records)
+            if has_task_done:
+                for _ in range(len(records) + stop):
+                    q.task_done()
+            if stop:
+                break
@@ -44,6 +44,19 @@ CONNECTION_TIMEOUT = 20.
 
 _mmap_counter = itertools.count()
 
+# Buffers of this size or more are sent out-of-band by send()
+_OUT_OF_BAND_THRESHOLD = 16384
+
+# Vectored I/O on file descriptors, used by Connection on Unix
+_writev = getattr(os, 'writev', None)
+_readv = getattr(os, 'readv', None)
+try:
+    _IOV_MAX = os.sysconf('SC_IOV_MAX')
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = -1
+if _IOV_MAX <= 0:
+    _IOV_MAX = 16
+
 default_family = 'AF_INET'
 families = ['AF_INET']
 
@@ -111,6 +124,88 @@ def address_type(address):
 # Connection classes
 #
 
+def _parse_buffers_header(size, data):
+    """Return the sizes of the parts of a message sent by send_buffers()"""
+    if size >= 4:
+        count, = struct.unpack_from("!I", data)
+        if 4 + 8 * count <= min(size, len(data)):
+            sizes = struct.unpack_from("!%dQ" % count, data, 4)
+            if 4 + 8 * count + sum(sizes) == size:
+                return sizes
+    raise OSError("message was not sent by send_buffers()")
+
+def _unpack_buffers(data, buffers):
+    """Return the parts of a message sent by send_buffers(), copied into
+    the buffers if there are any"""
+    sizes = _parse_buffers_header(data.nbytes, data)
+    parts = _split(data[4 + 8 * len(sizes):], sizes)
+    if buffers is None:
+        return parts
+    views = _buffer_views(buffers, sizes)
+    if views is None:
+        raise BufferTooShort([part.tobytes() for part in parts])
+    for view, part in zip(views, parts):
+        view[:] = part
+    return views
+
+def _split(data, sizes):
+    """Split a memoryview into parts of the given sizes"""
+    parts = []
+    offset = 0
+    for size in sizes:
+        parts.append(data[offset:offset + size])
+        offset += size
+    return parts
+
+def _buffer_views(buffers, sizes):
+    """Return views of the buffers to receive parts of the given sizes
+    into, or None if they do not fit"""
+    if len(buffers) < len(sizes):
+        return None
+    views = []
+    for buf, size in zip(buffers, sizes):
+        m = memoryview(buf).cast('B')
+        if len(m) < size:
+            return None
+        views.append(m[:size])
+    return views
+
+def _dumps(obj):
+    """Pickle obj for send(), keeping large buffers out-of-band.
+    Return a list of the pickle data followed by those buffers.
+
+    Every message is pickled with protocol 5, which out-of-band buffers
+    need, rather than with the default protocol of ForkingPickler:
+    telling whether an object has large buffers would take pickling it
+    twice.  Both ends of a connection use the same Python, which reads
+    either protocol."""
+    parts = [None]
+    def buffer_callback(buf):
+        try:
+            m = buf.raw()
+        except BufferError:
+            # Not contiguous, so it is serialized in-band
+            return True
+        if m.nbytes < _OUT_OF_BAND_THRESHOLD:
+            return True
+        parts.append(m)
+        return False
+    parts[0] = _ForkingPickler.dumps(obj, 5, buffer_callback=buffer_callback)
+    return parts
+
+def _loads(parts):
+    """Unpickle the parts of a message sent by send()"""
+    return _ForkingPickler.loads(parts[0], buffers=parts[1:])
+
+def _message_parts(data):
+    """Return the parts of a message sent by send()"""
+    # A message with out-of-band buffers is sent by send_buffers() and
+    # starts with a null byte, which no pickle starts with.
+    if data[:1] == b'\0':
+        return _unpack_buffers(data, None)
+    return [data]
+
+
 class _ConnectionBase:
     _handle = None
 
@@ -198,11 +293,39 @@ class _ConnectionBase:
             raise ValueError("buffer length < offset + size")
         self._send_bytes(m[offset:offset + size])
 
+    def send_buffers(self, buffers):
+        """Send a sequence of bytes-like objects as a single message"""
+        self._check_closed()
+        self._check_writable()
+        views = []
+        for buf in buffers:
+            m = memoryview(buf)
+            if m.itemsize > 1 or m.ndim != 1:
+                m = m.cast('B')
+            views.append(m)
+        self._send_buffers(views)
+
+    def _send_buffers(self, views):
+        header = struct.pack("!I%dQ" % len(views), len(views),
+                             *[len(m) for m in views])
+        self._send_vector([header] + views)
+
+    def _send_vector(self, bufs):
+        self._send_bytes(b''.join(bufs))
+
     def send(self, obj):
         """Send a (picklable) object"""
+        self._send_parts(_dumps(obj))
+
+    def _send_parts(self, parts):
+        # Send the parts of a pickled object returned by _dumps()
         self._check_closed()
         self._check_writable()
-        self._send_bytes(_ForkingPickler.dumps(obj))
+        if len(parts) == 1:
+            self._send_bytes(parts[0])
+        else:
+            # Large buffers are written from the memory they are in.
+            self._send_buffers(parts)
 
     def recv_bytes(self, maxlength=None):
         """
@@ -232,22 +355,47 @@ class _ConnectionBase:
                 raise ValueError("negative offset")
             elif offset > bytesize:
                 raise ValueError("offset too large")
-            result = self._recv_bytes()
-            size = result.tell()
-            if bytesize < offset + size:
-                raise BufferTooShort(result.getvalue())
-            # Message can fit in dest
-            result.seek(0)
-            result.readinto(m[offset // itemsize :
-                              (offset + size) // itemsize])
-            return size
+            return self._recv_bytes_into(m, offset, bytesize)
+
+    def _recv_bytes_into(self, m, offset, bytesize):
+        result = self._recv_bytes()
+        size = result.tell()
+        if bytesize < offset + size:
+            raise BufferTooShort(result.getvalue())
+        # Message can fit in dest
+        result.seek(0)
+        result.readinto(m[offset // m.itemsize :
+                          (offset + size) // m.itemsize])
+        return size
+
+    def recv_buffers(self, buffers=None):
+        """
+        Receive a message sent by send_buffers().
+        Return a list of memoryviews of its parts.  If a sequence of
+        writeable bytes-like objects is given, each part is received into
+        the buffer at the same position, so that buffers can be reused
+        from one message to the next; BufferTooShort is raised if a part
+        does not fit.
+        """
+        self._check_closed()
+        self._check_readable()
+        return self._recv_buffers(buffers)
+
+    def _recv_buffers(self, buffers):
+        return _unpack_buffers(self._recv_bytes().getbuffer(), buffers)
 
     def recv(self):
         """Receive a (picklable) object"""
+        return _loads(self._recv_parts())
+
+    def _recv_parts(self):
+        # Receive the parts of a pickled object, to pass to _loads()
         self._check_closed()
         self._check_readable()
-        buf = self._recv_bytes()
-        return _ForkingPickler.loads(buf.getbuffer())
+        return self._recv_message_parts()
+
+    def _recv_message_parts(self):
+        return _message_parts(self._recv_bytes().getbuffer())
 
     def poll(self, timeout=0.0):
         """Whether there is any input available to be read"""
@@ -360,6 +508,8 @@ class Connection(_ConnectionBase):
             _close(self._handle)
         _write = os.write
         _read = os.read
+    _writev = _writev
+    _readv = _readv
 
     def _send(self, buf, write=_write):
         remaining = len(buf)
@@ -387,38 +537,140 @@ class Connection(_ConnectionBase):
         return buf
 
     def _send_bytes(self, buf):
-        n = len(buf)
+        self._send_vector([buf])
+
+    def _send_vector(self, bufs):
+        n = sum(len(buf) for buf in bufs)
         if n > 0x7fffffff:
-            pre_header = struct.pack("!i", -1)
-            header = struct.pack("!Q", n)
-            self._send(pre_header)
-            self._send(header)
-            self._send(buf)
+            headers = [struct.pack("!i", -1), struct.pack("!Q", n)]
         else:
             # For wire compatibility with 3.7 and lower
-            header = struct.pack("!i", n)
-            if n > 16384:
-                # The payload is large so Nagle's algorithm won't be triggered
-                # and we'd better avoid the cost of concatenation.
-                self._send(header)
-                self._send(buf)
-            else:
-                # Issue #20540: concatenate before sending, to avoid delays due
-                # to Nagle's algorithm on a TCP socket.
-                # Also note we want to avoid sending a 0-length buffer separately,
-                # to avoid "broken pipe" errors if the other end closed the pipe.
-                self._send(header + buf)
+            headers = [struct.pack("!i", n)]
+        if n > 16384 and self._writev is not None:
+            # Send the header and the payload with one system call, which
+            # avoids both copying them and delays due to Nagle's algorithm
+            # on a TCP socket (issue #20540).
+            self._sendv(headers + bufs)
+        elif n > 16384:
+            # The payload is large so Nagle's algorithm won't be triggered
+            # and we'd better avoid the cost of concatenation.
+            for buf in headers + bufs:
+                if len(buf):
+                    self._send(buf)
+        else:
+            # Issue #20540: concatenate before sending, to avoid delays due
+            # to Nagle's algorithm on a TCP socket.
+            # Also note we want to avoid sending a 0-length buffer separately,
+            # to avoid "broken pipe" errors if the other end closed the pipe.
+            self._send(b''.join(headers + bufs))
 
-    def _recv_bytes(self, maxsize=None):
+    def _sendv(self, bufs):
+        handle = self._handle
+        while bufs:
+            n = self._writev(handle, bufs[:_IOV_MAX])
+            # Drop what was written, possibly ending in the middle of a buffer
+            i = 0
+            while i < len(bufs) and n >= len(bufs[i]):
+                n -= len(bufs[i])
+                i += 1
+            bufs = bufs[i:]
+            if n:
+                bufs[0] = memoryview(bufs[0])[n:]
+
+    def _recvv(self, views):
+        # Fill memoryviews of bytes with the next bytes of the stream.
+        handle = self._handle
+        views = [m for m in views if len(m)]
+        while views:
+            n = self._readv(handle, views[:_IOV_MAX])
+            if n == 0:
+                raise OSError("got end of file during message")
+            i = 0
+            while i < len(views) and n >= len(views[i]):
+                n -= len(views[i])
+                i += 1
+            views = views[i:]
+            if n:
+                views[0] = views[0][n:]
+
+    def _recv_size(self):
         buf = self._recv(4)
         size, = struct.unpack("!i", buf.getvalue())
         if size == -1:
             buf = self._recv(8)
             size, = struct.unpack("!Q", buf.getvalue())
+        return size
+
+    def _recv_bytes(self, maxsize=None):
+        size = self._recv_size()
         if maxsize is not None and size > maxsize:
             return None
         return self._recv(size)
 
+    def _recv_bytes_into(self, m, offset, bytesize):
+        if self._readv is None:
+            return super()._recv_bytes_into(m, offset, bytesize)
+        size = self._recv_size()
+        if bytesize < offset + size:
+            raise BufferTooShort(self._recv(size).getvalue())
+        with m.cast('B') as b:
+            if size > 16384:
+                # Read straight into the destination.
+                self._recvv([b[offset:offset + size]])
+            else:
+                b[offset:offset + size] = self._recv(size).getbuffer()
+        return size
+
+    def _recv_buffers(self, buffers):
+        if self._readv is None:
+            return super()._recv_buffers(buffers)
+        size = self._recv_size()
+        if size <= 16384:
+            return _unpack_buffers(self._recv(size).getbuffer(), buffers)
+        return self._recv_buffers_payload(size, b'', buffers)
+
+    def _recv_message_parts(self):
+        if self._readv is None:
+            return super()._recv_message_parts()
+        size = self._recv_size()
+        if size <= 16384:
+            return _message_parts(self._recv(size).getbuffer())
+        header = self._recv(1).getvalue()
+        if header != b'\0':
+            # A single pickle, read straight into a new buffer.
+            data = memoryview(bytearray(size))
+            data[:1] = header
+            self._recvv([data[1:]])
+            return [data]
+        # The out-of-band buffers of a pickle sent by send_buffers() are
+        # read into memory that the unpickled objects can keep using.
+        return self._recv_buffers_payload(size, header, None)
+
+    def _recv_buffers_payload(self, size, header, buffers):
+        # Receive the payload of a message sent by send_buffers() after
+        # the first bytes, which are given in header.
+        if len(header) < 4:
+            header += self._recv(min(size, 4) - len(header)).getvalue()
+        if len(header) == 4:
+            count, = struct.unpack("!I", header)
+            header += self._recv(min(size - 4, 8 * count)).getvalue()
+        try:
+            sizes = _parse_buffers_header(size, header)
+        except OSError:
+            self._recv(size - len(header))
+            raise
+        if buffers is None:
+            views = _split(memoryview(bytearray(size - len(header))), sizes)
+        else:
+            views = _buffer_views(buffers, sizes)
+            if views is None:
+                data = self._recv(size - len(header)).getbuffer()
+                raise BufferTooShort([part.tobytes()
+                                      for part in _split(data, sizes)])
+        # Read straight into the destinations.
+        self._recvv(views)
+        return views
+
     def _poll(self, timeout):
         r = wait([self], timeout)
         return bool(r)
@@ -112,6 +112,11 @@ class BaseContext(object):
         from .queues import SimpleQueue
         return SimpleQueue(ctx=self.get_context())
 
+    def SharedMemoryQueue(self, size=1 << 20, *, mpmc=False):
+        '''Returns a queue object backed by a shared memory ring buffer'''
+        from .queues import SharedMemoryQueue
+        return SharedMemoryQueue(size, mpmc=mpmc, ctx=self.get_context())
+
     def Pool(self, processes=None, initializer=None, initargs=(),
              maxtasksperchild=None):
         '''Returns a process pool object'''
@@ -8,7 +8,7 @@
 # Licensed to PSF under a Contributor Agreement.
 #
 
-__all__ = [ 'BaseManager', 'SyncManager', 'BaseProxy', 'Token' ]
+__all__ = [ 'BaseManager', 'SyncManager', 'BaseProxy', 'Token', 'Batch' ]
 
 #
 # Imports
@@ -244,64 +244,30 @@ class Server(object):
 
         recv = conn.recv
         send = conn.send
-        id_to_obj = self.id_to_obj
+        # Failures of the calls made in batches without replies
+        failures = []
 
         while not self.stop_event.is_set():
 
             try:
-                methodname = obj = None
                 request = recv()
                 ident, methodname, args, kwds = request
-                try:
-                    obj, exposed, gettypeid = id_to_obj[ident]
-                except KeyError as ke:
-                    try:
-                        obj, exposed, gettypeid = \
-                            self.id_to_local_proxy_obj[ident]
-                    except KeyError:
-                        raise ke
-
-                if methodname not in exposed:
-                    raise AttributeError(
-                        'method %r of %r object is not in exposed=%r' %
-                        (methodname, type(obj), exposed)
-                        )
-
-                function = getattr(obj, methodname)
-
-                try:
-                    res = function(*args, **kwds)
-                except Exception as e:
-                    msg = ('#ERROR', e)
-                else:
-                    typeid = gettypeid and gettypeid.get(methodname, None)
-                    if typeid:
-                        rident, rexposed = self.create(conn, typeid, res)
-                        token = Token(typeid, self.address, rident)
-                        msg = ('#PROXY', (rexposed, token))
-                    else:
-                        msg = ('#RETURN', res)
-
-            except AttributeError:
-                if methodname is None:
-                    msg = ('#TRACEBACK', format_exc())
-                else:
-                    try:
-                        fallback_func = self.fallback_mapping[methodname]
-                        result = fallback_func(
-                            self, conn, ident, obj, *args, **kwds
-                            )
-                        msg = ('#RETURN', result)
-                    except Exception:
-                        msg = ('#TRACEBACK', format_exc())
-
             except EOFError:
                 util.debug('got EOF -- exiting thread serving %r',
                            threading.current_thread().name)
                 sys.exit(0)
-
             except Exception:
                 msg = ('#TRACEBACK', format_exc())
+            else:
+                if ident is None and methodname == '#BATCH':
+                    msg = self.serve_batch(conn, failures, *args)
+                    if msg is None:
+                        continue
+                elif ident is None and methodname == '#BATCH_FAILURES':
+                    msg = ('#RETURN', failures[:])
+                    del failures[:]
+                else:
+                    msg = self.serve_call(conn, ident, methodname, args, kwds)
 
             try:
                 try:
@@ -316,6 +282,71 @@ class Server(object):
                 conn.close()
                 sys.exit(1)
 
+    def serve_call(self, conn, ident, methodname, args, kwds):
+        '''
+        Call a method of a shared object and return the reply message
+        '''
+        obj = None
+        try:
+            try:
+                obj, exposed, gettypeid = self.id_to_obj[ident]
+            except KeyError as ke:
+                try:
+                    obj, exposed, gettypeid = \
+                        self.id_to_local_proxy_obj[ident]
+                except KeyError:
+                    raise ke
+
+            if methodname not in exposed:
+                raise AttributeError(
+                    'method %r of %r object is not in exposed=%r' %
+                    (methodname, type(obj), exposed)
+                    )
+
+            function = getattr(obj, methodname)
+
+            try:
+                res = function(*args, **kwds)
+            except Exception as e:
+                return ('#ERROR', e)
+
+            typeid = gettypeid and gettypeid.get(methodname, None)
+            if typeid:
+                rident, rexposed = self.create(conn, typeid, res)
+                token = Token(typeid, self.address, rident)
+                return ('#PROXY', (rexposed, token))
+            return ('#RETURN', res)
+
+        except AttributeError:
+            try:
+                fallback_func = self.fallback_mapping[methodname]
+                result = fallback_func(
+                    self, conn, ident, obj, *args, **kwds
+                    )
+                return ('#RETURN', result)
+            except Exception:
+                return ('#TRACEBACK', format_exc())
+
+        except Exception:
+            return ('#TRACEBACK', format_exc())
+
+    def serve_batch(self, conn, failures, calls, reply):
+        '''
+        Make the calls of a batch in order and return the reply message,
+        or None if the sender does not wait for the results, in which case
+        the failed calls are added to `failures`
+        '''
+        msgs = [self.serve_call(conn, *call) for call in calls]
+        if reply:
+            return ('#BATCH', msgs)
+        for call, (kind, result) in zip(calls, msgs):
+            if kind == '#PROXY':
+                # Nobody will own the new shared object.
+                self.decref(conn, result[1].id)
+            elif kind != '#RETURN':
+                failures.append((call[1], kind, result))
+        return None
+
     def fallback_getvalue(self, conn, ident, obj):
         return obj
 
@@ -610,6 +641,14 @@ class BaseManager(object):
             conn.close()
         return Token(typeid, self._address, id), exposed
 
+    def batch(self, results=True, size=1000):
+        '''
+        Return a `Batch` for the calls made by this thread through proxies
+        for shared objects of the manager
+        '''
+        return Batch(self._address, self._authkey, self._serializer,
+                     results, size)
+
     def join(self, timeout=None):
         '''
         Join the manager process (if it has been spawned)
@@ -744,6 +783,179 @@ class ProcessLocalSet(set):
     def __reduce__(self):
         return type(self), ()
 
+#
+# Batches of method calls
+#
+
+# Special methods whose result is ignored, which are queued in batches
+_BATCHED_SPECIAL_METHODS = frozenset({
+    '__setitem__', '__delitem__', '__setattr__', '__delattr__', '__imul__'
+    })
+
+def _thread_locals(address):
+    '''
+    Return the thread local and set of ids used for the manager at `address`
+    '''
+    with BaseProxy._mutex:
+        tls_idset = BaseProxy._address_to_local.get(address, None)
+        if tls_idset is None:
+            tls_idset = util.ForkAwareLocal(), ProcessLocalSet()
+            BaseProxy._address_to_local[address] = tls_idset
+    return tls_idset
+
+def _connect(tls, address, authkey, _Client):
+    '''
+    Make the connection used by this thread to talk to the manager
+    '''
+    util.debug('making connection to manager')
+    name = process.current_process().name
+    if threading.current_thread().name != 'MainThread':
+        name += '|' + threading.current_thread().name
+    conn = _Client(address, authkey=authkey)
+    dispatch(conn, None, 'accept_connection', (name,))
+    tls.connection = conn
+    return conn
+
+class BatchResult(object):
+    '''
+    Result of a method call made in a batch
+    '''
+    __slots__ = ('_batch', '_success', '_value')
+
+    def __init__(self, batch):
+        self._batch = batch
+        self._success = None
+
+    def ready(self):
+        return self._success is not None
+
+    def successful(self):
+        if not self.ready():
+            raise ValueError("{0!r} not ready".format(self))
+        return self._success
+
+    def get(self):
+        '''
+        Return the result of the call, sending the batch first if needed
+        '''
+        if self._success is None:
+            self._batch.flush()
+        if self._success:
+            return self._value
+        raise self._value
+
+    def _set(self, success, value):
+        self._success, self._value = success, value
+        self._batch = None
+
+    __class_getitem__ = classmethod(types.GenericAlias)
+
+class Batch(object):
+    '''
+    Context manager which queues the method calls made by the current
+    thread through proxies for the manager at `address`
+
+    The queued calls are sent as a single message when the batch holds
+    `size` calls, when `flush()` is called and on exit, and the manager
+    makes them in order.  If `results` is true each call returns a
+    `BatchResult`; otherwise calls return None, nothing is sent back for
+    them, and `flush()` and the exit raise the error of the first call
+    which failed.
+
+    Special methods whose result Python uses, such as `__len__()` or
+    `__getitem__()`, are not queued: the batch is flushed and the call is
+    made at once.
+    '''
+    def __init__(self, address, authkey=None, serializer='pickle',
+                 results=True, size=1000):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self._address = address
+        if authkey is None:
+            authkey = process.current_process().authkey
+        self._authkey = process.AuthenticationString(authkey)
+        self._Client = listener_client[serializer][1]
+        self._tls = _thread_locals(address)[0]
+        self._results = results
+        self._size = size
+        self._calls = []
+        self._pending = []
+
+    def __enter__(self):
+        if getattr(self._tls, 'batch', None) is not None:
+            raise RuntimeError('a batch is already active for this manager '
+                               'in this thread')
+        self._tls.batch = self
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        del self._tls.batch
+        self.flush()
+
+    def _add(self, proxy, methodname, args, kwds):
+        self._calls.append((proxy._id, methodname, args, kwds))
+        if self._results:
+            result = BatchResult(self)
+            self._pending.append((proxy, result))
+        else:
+            result = None
+        if len(self._calls) >= self._size:
+            self._send()
+        return result
+
+    def _connection(self):
+        try:
+            return self._tls.connection
+        except AttributeError:
+            return _connect(self._tls, self._address, self._authkey,
+                            self._Client)
+
+    def flush(self):
+        '''
+        Send the queued calls and wait for their results or, if results
+        are not wanted, raise the error of the first call which failed
+        '''
+        self._send()
+        if self._results:
+            return
+        conn = self._connection()
+        conn.send((None, '#BATCH_FAILURES', (), {}))
+        kind, failures = conn.recv()
+        if kind != '#RETURN':
+            raise convert_to_error(kind, failures)
+        if failures:
+            methodname, kind, result = failures[0]
+            error = convert_to_error(kind, result)
+            error.add_note('in a call of %r in a batch' % methodname)
+            if len(failures) > 1:
+                error.add_note('%d other calls of the batch failed' %
+                               (len(failures) - 1))
+            raise error
+
+    def _send(self):
+        calls, self._calls = self._calls, []
+        pending, self._pending = self._pending, []
+        if not calls:
+            return
+        conn = self._connection()
+        conn.send((None, '#BATCH', (calls, self._results), {}))
+        if not self._results:
+            return
+
+        kind, result = conn.recv()
+        if kind != '#BATCH':
+            error = convert_to_error(kind, result)
+            for proxy, batch_result in pending:
+                batch_result._set(False, error)
+            raise error
+        for (proxy, batch_result), (kind, value) in zip(pending, result):
+            try:
+                value = proxy._convert_result(kind, value)
+            except Exception as e:
+                batch_result._set(False, e)
+            else:
+                batch_result._set(True, value)
+
 #
 # Definition of BaseProxy
 #
@@ -757,11 +969,7 @@ class BaseProxy(object):
 
     def __init__(self, token, serializer, manager=None,
                  authkey=None, exposed=None, incref=True, manager_owned=False):
-        with BaseProxy._mutex:
-            tls_idset = BaseProxy._address_to_local.get(token.address, None)
-            if tls_idset is None:
-                tls_idset = util.ForkAwareLocal(), ProcessLocalSet()
-                BaseProxy._address_to_local[token.address] = tls_idset
+        tls_idset = _thread_locals(token.address)
 
         # self._tls is used to record the connection used by this
         # thread to communicate with the manager at token.address
@@ -797,18 +1005,20 @@ class BaseProxy(object):
         util.register_after_fork(self, BaseProxy._after_fork)
 
     def _connect(self):
-        util.debug('making connection to manager')
-        name = process.current_process().name
-        if threading.current_thread().name != 'MainThread':
-            name += '|' + threading.current_thread().name
-        conn = self._Client(self._token.address, authkey=self._authkey)
-        dispatch(conn, None, 'accept_connection', (name,))
-        self._tls.connection = conn
+        _connect(self._tls, self._token.address, self._authkey, self._Client)
 
     def _callmethod(self, methodname, args=(), kwds={}):
         '''
         Try to call a method of the referent and return a copy of the result
         '''
+        batch = getattr(self._tls, 'batch', None)
+        if batch is not None:
+            if (not methodname.startswith('__') or
+                    methodname in _BATCHED_SPECIAL_METHODS):
+                return batch._add(self, methodname, args, kwds)
+            # Python uses the result: make the call after the queued ones.
+            batch.flush()
+
         try:
             conn = self._tls.connection
         except AttributeError:
@@ -819,7 +1029,9 @@ class BaseProxy(object):
 
         conn.send((self._id, methodname, args, kwds))
         kind, result = conn.recv()
+        return self._convert_result(kind, result)
 
+    def _convert_result(self, kind, result):
         if kind == '#RETURN':
             return result
         elif kind == '#PROXY':
@@ -835,6 +1047,14 @@ class BaseProxy(object):
             return proxy
         raise convert_to_error(kind, result)
 
+    def _batch(self, results=True, size=1000):
+        '''
+        Return a `Batch` for the calls made by this thread through the
+        proxies for the referent's manager
+        '''
+        return Batch(self._token.address, self._authkey, self._serializer,
+                     results, size)
+
     def _getvalue(self):
         '''
         Get a copy of the value of the referent
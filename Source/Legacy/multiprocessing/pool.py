@@ -22,6 +22,7 @@ import time
 import traceback
 import types
 import warnings
+import weakref
 
 # If threading is available then ThreadPool should be provided.  Therefore
 # we avoid top-level imports which are liable to fail on some systems.
@@ -50,6 +51,44 @@ def mapstar(args):
 def starmapstar(args):
     return list(itertools.starmap(args[0], args[1]))
 
+def timedstar(args):
+    mapper, args = args
+    t = time.monotonic()
+    result = mapper(args)
+    return time.monotonic() - t, result
+
+#
+# Choice of chunk sizes from measured run times
+#
+
+class _ChunkSizer(object):
+    '''
+    Choose chunk sizes so that tasks take about `duration` seconds, from
+    the time per item measured by the workers.
+    '''
+    max_size = 1 << 16
+
+    def __init__(self, duration, size):
+        self.duration = duration
+        self.size = size
+        self._item_time = None
+
+    def update(self, elapsed, n):
+        if n == 0:
+            return
+        item_time = elapsed / n
+        if self._item_time is None:
+            self._item_time = item_time
+        else:
+            # Smooth out variations between chunks.
+            self._item_time += (item_time - self._item_time) / 4
+        if self._item_time > 0:
+            size = int(self.duration / self._item_time)
+        else:
+            size = self.max_size
+        # Grow gradually, as the estimate comes from a single chunk at first.
+        self.size = max(1, min(size, 2 * self.size, self.max_size))
+
 #
 # Hack to embed stringification of remote traceback in local traceback
 #
@@ -359,19 +398,27 @@ class Pool(object):
         '''
         return self.apply_async(func, args, kwds).get()
 
-    def map(self, func, iterable, chunksize=None):
+    def map(self, func, iterable, chunksize=None, *, chunk_duration=None):
         '''
         Apply `func` to each element in `iterable`, collecting the results
-        in a list that is returned.
+        in a list that is returned.  If `chunk_duration` is given, chunks
+        are resized as they run, as with `imap()`.
         '''
+        if chunk_duration is not None:
+            return list(self._imap(IMapIterator, func, iterable,
+                                   chunksize or 1, None, chunk_duration))
         return self._map_async(func, iterable, mapstar, chunksize).get()
 
-    def starmap(self, func, iterable, chunksize=None):
+    def starmap(self, func, iterable, chunksize=None, *, chunk_duration=None):
         '''
         Like `map()` method but the elements of the `iterable` are expected to
         be iterables as well and will be unpacked as arguments. Hence
         `func` and (a, b) becomes func(a, b).
         '''
+        if chunk_duration is not None:
+            return list(self._imap(IMapIterator, func, iterable,
+                                   chunksize or 1, None, chunk_duration,
+                                   starmapstar))
         return self._map_async(func, iterable, starmapstar, chunksize).get()
 
     def starmap_async(self, func, iterable, chunksize=None, callback=None,
@@ -382,73 +429,125 @@ class Pool(object):
         return self._map_async(func, iterable, starmapstar, chunksize,
                                callback, error_callback)
 
-    def _guarded_task_generation(self, result_job, func, iterable):
+    def _guarded_task_generation(self, result_job, func, iterable,
+                                 inflight=None, abandoned=None):
         '''Provides a generator of tasks for imap and imap_unordered with
         appropriate handling for iterables which throw exceptions during
         iteration.'''
         try:
             i = -1
+            if inflight is not None:
+                iterable = self._throttle(iterable, inflight, abandoned)
             for i, x in enumerate(iterable):
                 yield (result_job, i, func, (x,), {})
         except Exception as e:
             yield (result_job, i+1, _helper_reraises_exception, (e,), {})
 
-    def imap(self, func, iterable, chunksize=1):
+    def _throttle(self, iterable, inflight, abandoned):
+        '''Take items from `iterable` only while `inflight` can be
+        acquired, until the result iterator is abandoned or the pool is
+        terminated.'''
+        it = iter(iterable)
+        while True:
+            while not inflight.acquire(timeout=0.1):
+                if self._task_handler._state != RUN:
+                    return
+            if abandoned.is_set():
+                return
+            try:
+                x = next(it)
+            except StopIteration:
+                return
+            yield x
+
+    def _submit_tasks(self, result, tasks):
+        '''Submit the tasks of an imap() iterator.'''
+        if result._inflight is None:
+            self._taskqueue.put((tasks, result._set_length))
+            return
+        # The tasks are submitted as the iterator is consumed, which must
+        # not hold up the task handler, nor keep the iterator alive.
+        feeder = threading.Thread(
+            target=self._feed_tasks,
+            args=(tasks, weakref.WeakMethod(result._set_length)),
+            daemon=True)
+        feeder.start()
+
+    def _feed_tasks(self, tasks, set_length):
+        n = 0
+        for task in tasks:
+            self._taskqueue.put(([task], None))
+            n += 1
+        set_length = set_length()
+        if set_length is not None:
+            set_length(n)
+
+    def imap(self, func, iterable, chunksize=1, *, max_inflight=None,
+             chunk_duration=None):
         '''
         Equivalent of `map()` -- can be MUCH slower than `Pool.map()`.
         '''
-        self._check_running()
-        if chunksize == 1:
-            result = IMapIterator(self)
-            self._taskqueue.put(
-                (
-                    self._guarded_task_generation(result._job, func, iterable),
-                    result._set_length
-                ))
-            return result
-        else:
-            if chunksize < 1:
-                raise ValueError(
-                    "Chunksize must be 1+, not {0:n}".format(
-                        chunksize))
-            task_batches = Pool._get_tasks(func, iterable, chunksize)
-            result = IMapIterator(self)
-            self._taskqueue.put(
-                (
-                    self._guarded_task_generation(result._job,
-                                                  mapstar,
-                                                  task_batches),
-                    result._set_length
-                ))
-            return (item for chunk in result for item in chunk)
-
-    def imap_unordered(self, func, iterable, chunksize=1):
+        return self._imap(IMapIterator, func, iterable, chunksize,
+                          max_inflight, chunk_duration)
+
+    def imap_unordered(self, func, iterable, chunksize=1, *,
+                       max_inflight=None, chunk_duration=None):
         '''
         Like `imap()` method but ordering of results is arbitrary.
         '''
+        return self._imap(IMapUnorderedIterator, func, iterable, chunksize,
+                          max_inflight, chunk_duration)
+
+    def _imap(self, iterator_class, func, iterable, chunksize, max_inflight,
+              chunk_duration, mapper=mapstar):
+        '''
+        Helper function to implement imap, imap_unordered and the adaptive
+        versions of map and starmap.
+
+        At most `max_inflight` tasks are submitted and not yet returned by
+        the iterator.  If `chunk_duration` is given, chunks start with
+        `chunksize` items and are resized so that each takes about
+        `chunk_duration` seconds to run; `max_inflight` then defaults to
+        four times the number of workers.
+        '''
         self._check_running()
-        if chunksize == 1:
-            result = IMapUnorderedIterator(self)
-            self._taskqueue.put(
-                (
-                    self._guarded_task_generation(result._job, func, iterable),
-                    result._set_length
-                ))
+        if chunksize < 1:
+            raise ValueError(
+                "Chunksize must be 1+, not {0!r}".format(chunksize))
+        if chunk_duration is not None:
+            if chunk_duration <= 0:
+                raise ValueError("chunk_duration must be positive")
+            if max_inflight is None:
+                max_inflight = 4 * len(self._pool)
+        if max_inflight is not None and max_inflight < 1:
+            raise ValueError(
+                "max_inflight must be 1+, not {0!r}".format(max_inflight))
+
+        result = iterator_class(self, max_inflight)
+        if chunk_duration is not None:
+            result._sizer = _ChunkSizer(chunk_duration, chunksize)
+            task_batches = zip(
+                itertools.repeat(mapper),
+                Pool._get_adaptive_tasks(func, iterable, result._sizer))
+            func = timedstar
+        elif chunksize == 1 and mapper is mapstar:
+            self._submit_tasks(
+                result,
+                self._guarded_task_generation(result._job, func, iterable,
+                                              result._inflight,
+                                              result._abandoned))
             return result
         else:
-            if chunksize < 1:
-                raise ValueError(
-                    "Chunksize must be 1+, not {0!r}".format(chunksize))
             task_batches = Pool._get_tasks(func, iterable, chunksize)
-            result = IMapUnorderedIterator(self)
-            self._taskqueue.put(
-                (
-                    self._guarded_task_generation(result._job,
-                                                  mapstar,
-                                                  task_batches),
-                    result._set_length
-                ))
-            return (item for chunk in result for item in chunk)
+            func = mapper
+        self._submit_tasks(
+            result,
+            self._guarded_task_generation(result._job,
+                                          func,
+                                          task_batches,
+                                          result._inflight,
+                                          result._abandoned))
+        return (item for chunk in result for item in chunk)
 
     def apply_async(self, func, args=(), kwds={}, callback=None,
             error_callback=None):
@@ -639,6 +738,15 @@ class Pool(object):
                 return
             yield (func, x)
 
+    @staticmethod
+    def _get_adaptive_tasks(func, it, sizer):
+        it = iter(it)
+        while 1:
+            x = tuple(itertools.islice(it, sizer.size))
+            if not x:
+                return
+            yield (func, x)
+
     def __reduce__(self):
         raise NotImplementedError(
               'pool objects cannot be passed between processes or pickled'
@@ -836,7 +944,9 @@ class MapResult(ApplyResult):
 
 class IMapIterator(object):
 
-    def __init__(self, pool):
+    _sizer = None
+
+    def __init__(self, pool, max_inflight=None):
         self._pool = pool
         self._cond = threading.Condition(threading.Lock())
         self._job = next(job_counter)
@@ -845,7 +955,18 @@ class IMapIterator(object):
         self._index = 0
         self._length = None
         self._unsorted = {}
-        self._cache[self._job] = self
+        # Tasks submitted and not yet returned by next()
+        if max_inflight is None:
+            self._inflight = self._abandoned = None
+            self._cache[self._job] = self
+        else:
+            self._inflight = threading.Semaphore(max_inflight)
+            # Tasks are only submitted while the iterator is used: once
+            # it is garbage collected, the job is dropped.
+            self._abandoned = threading.Event()
+            self._cache[self._job] = _WeakJob(self)
+            weakref.finalize(self, _abandon_job, self._cache, self._job,
+                             self._inflight, self._abandoned)
 
     def __iter__(self):
         return self
@@ -867,6 +988,8 @@ class IMapIterator(object):
                         raise StopIteration from None
                     raise TimeoutError from None
 
+        if self._inflight is not None:
+            self._inflight.release()
         success, value = item
         if success:
             return value
@@ -874,7 +997,18 @@ class IMapIterator(object):
 
     __next__ = next                    # XXX
 
+    def _timed(self, obj):
+        # Record the run time of a chunk and strip it from the result.
+        success, value = obj
+        if not success:
+            return obj
+        elapsed, chunk = value
+        self._sizer.update(elapsed, len(chunk))
+        return success, chunk
+
     def _set(self, i, obj):
+        if self._sizer is not None:
+            obj = self._timed(obj)
         with self._cond:
             if self._index == i:
                 self._items.append(obj)
@@ -899,6 +1033,25 @@ class IMapIterator(object):
                 del self._cache[self._job]
                 self._pool = None
 
+class _WeakJob(object):
+    '''Entry of the cache for an iterator, which does not keep it alive.'''
+
+    def __init__(self, result):
+        self._ref = weakref.ref(result)
+
+    def _set(self, i, obj):
+        result = self._ref()
+        if result is not None:
+            result._set(i, obj)
+
+def _abandon_job(cache, job, inflight, abandoned):
+    abandoned.set()
+    inflight.release()
+    try:
+        del cache[job]
+    except KeyError:
+        pass
+
 #
 # Class whose instances are returned by `Pool.imap_unordered()`
 #
@@ -906,6 +1059,8 @@ class IMapIterator(object):
 class IMapUnorderedIterator(IMapIterator):
 
     def _set(self, i, obj):
+        if self._sizer is not None:
+            obj = self._timed(obj)
         with self._cond:
             self._items.append(obj)
             self._index += 1
@@ -7,7 +7,7 @@
 # Licensed to PSF under a Contributor Agreement.
 #
 
-__all__ = ['Queue', 'SimpleQueue', 'JoinableQueue']
+__all__ = ['Queue', 'SimpleQueue', 'JoinableQueue', 'SharedMemoryQueue']
 
 import sys
 import os
@@ -79,8 +79,8 @@ class Queue(object):
         self._joincancelled = False
         self._closed = False
         self._close = None
-        self._send_bytes = self._writer.send_bytes
-        self._recv_bytes = self._reader.recv_bytes
+        self._send_parts = self._writer._send_parts
+        self._recv_parts = self._reader._recv_parts
         self._poll = self._reader.poll
 
     def put(self, obj, block=True, timeout=None):
@@ -100,7 +100,7 @@ class Queue(object):
             raise ValueError(f"Queue {self!r} is closed")
         if block and timeout is None:
             with self._rlock:
-                res = self._recv_bytes()
+                res = self._recv_parts()
             self._sem.release()
         else:
             if block:
@@ -114,12 +114,12 @@ class Queue(object):
                         raise Empty
                 elif not self._poll():
                     raise Empty
-                res = self._recv_bytes()
+                res = self._recv_parts()
                 self._sem.release()
             finally:
                 self._rlock.release()
         # unserialize the data after having released the lock
-        return _ForkingPickler.loads(res)
+        return connection._loads(res)
 
     def qsize(self):
         # Raises NotImplementedError on Mac OSX because of broken sem_getvalue()
@@ -165,7 +165,7 @@ class Queue(object):
         self._buffer.clear()
         self._thread = threading.Thread(
             target=Queue._feed,
-            args=(self._buffer, self._notempty, self._send_bytes,
+            args=(self._buffer, self._notempty, self._send_parts,
                   self._wlock, self._reader.close, self._writer.close,
                   self._ignore_epipe, self._on_queue_feeder_error,
                   self._sem),
@@ -209,7 +209,7 @@ class Queue(object):
             notempty.notify()
 
     @staticmethod
-    def _feed(buffer, notempty, send_bytes, writelock, reader_close,
+    def _feed(buffer, notempty, send_parts, writelock, reader_close,
               writer_close, ignore_epipe, onerror, queue_sem):
         debug('starting thread to feed data to pipe')
         nacquire = notempty.acquire
@@ -241,13 +241,13 @@ class Queue(object):
                             return
 
                         # serialize the data before acquiring the lock
-                        obj = _ForkingPickler.dumps(obj)
+                        obj = connection._dumps(obj)
                         if wacquire is None:
-                            send_bytes(obj)
+                            send_parts(obj)
                         else:
                             wacquire()
                             try:
-                                send_bytes(obj)
+                                send_parts(obj)
                             finally:
                                 wrelease()
                 except IndexError:
@@ -364,18 +364,273 @@ class SimpleQueue(object):
 
     def get(self):
         with self._rlock:
-            res = self._reader.recv_bytes()
+            res = self._reader._recv_parts()
         # unserialize the data after having released the lock
-        return _ForkingPickler.loads(res)
+        return connection._loads(res)
 
     def put(self, obj):
         # serialize the data before acquiring the lock
-        obj = _ForkingPickler.dumps(obj)
+        obj = connection._dumps(obj)
         if self._wlock is None:
             # writes to a message oriented win32 pipe are atomic
-            self._writer.send_bytes(obj)
+            self._writer._send_parts(obj)
         else:
             with self._wlock:
-                self._writer.send_bytes(obj)
+                self._writer._send_parts(obj)
+
+    __class_getitem__ = classmethod(types.GenericAlias)
+
+
+#
+# Queue type using a ring buffer in shared memory
+#
+
+# Offsets, in 8-byte words, of the counters at the start of the segment.
+# The consumer side only writes _HEAD and _GETS, the producer side only
+# _TAIL, _PUTS and _WAITING; the two groups are on separate cache lines.
+_HEAD = 0       # bytes consumed
+_GETS = 1       # records consumed
+_TAIL = 8       # bytes produced
+_PUTS = 9       # records produced
+_WAITING = 10   # producers waiting for free space
+_HEADER_SIZE = 128
+
+# Every record starts with an 8-byte word holding its size; the top bit
+# marks records put with put_bytes().  Records are padded to 8 bytes.
+_RAW = 1 << 63
+_SIZE_MASK = _RAW - 1
+
+# Waits for free space are woken up by the consumer, but as the counters
+# are not updated atomically a wakeup could be missed: producers check
+# again after this many seconds.
+_SPACE_POLL_INTERVAL = 0.05
+
+# Number of times get() polls an empty queue before blocking.  Polling
+# only helps if the producer runs on another CPU.
+_GET_SPIN = 100 if (os.cpu_count() or 1) > 1 else 0
+
+
+def _close_segment(shm, views, unlink):
+    for view in views:
+        view.release()
+    shm.close()
+    if unlink:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedMemoryQueue(object):
+    """Queue of records stored in a ring buffer in shared memory.
+
+    Items are pickled into length-prefixed records, without a feeder
+    thread or a pipe; put_bytes() and get_bytes() skip pickling.  By
+    default the queue only supports one producer and one consumer at a
+    time and takes no lock; with mpmc=True, producers and consumers are
+    serialized by one lock per side.  size is the capacity of the ring
+    buffer in bytes and bounds the size of a record.
+    """
+
+    def __init__(self, size=1 << 20, *, mpmc=False, ctx):
+        from .shared_memory import SharedMemory
+        from .synchronize import SEM_VALUE_MAX
+        if size < 16:
+            raise ValueError("size must be at least 16")
+        self._capacity = (size + 7) & ~7
+        self._maxrecords = SEM_VALUE_MAX
+        self._items = ctx.Semaphore(0)
+        self._space = ctx.Semaphore(0)
+        if mpmc:
+            self._rlock = ctx.Lock()
+            self._wlock = ctx.Lock()
+        else:
+            self._rlock = self._wlock = None
+        shm = SharedMemory(create=True, size=_HEADER_SIZE + self._capacity)
+        self._setup(shm, owner=True)
+        if sys.platform != 'win32':
+            register_after_fork(self, SharedMemoryQueue._after_fork)
+
+    def _setup(self, shm, owner):
+        self._shm = shm
+        self._header = shm.buf[:_HEADER_SIZE].cast('Q')
+        self._data = shm.buf[_HEADER_SIZE:_HEADER_SIZE + self._capacity]
+        self._words = self._data.cast('Q')
+        self._closed = False
+        self._close = Finalize(
+            self, _close_segment,
+            (shm, (self._words, self._data, self._header), owner),
+            exitpriority=10)
+
+    def _after_fork(self):
+        # The child shares the mapping but must not unlink the segment.
+        self._close = Finalize(
+            self, _close_segment,
+            (self._shm, (self._words, self._data, self._header), False),
+            exitpriority=10)
+
+    def __getstate__(self):
+        context.assert_spawning(self)
+        return (self._shm.name, self._capacity, self._maxrecords,
+                self._items, self._space, self._rlock, self._wlock)
+
+    def __setstate__(self, state):
+        from .shared_memory import SharedMemory
+        (name, self._capacity, self._maxrecords,
+         self._items, self._space, self._rlock, self._wlock) = state
+        self._setup(SharedMemory(name), owner=False)
+
+    def _check_closed(self):
+        if self._closed:
+            raise ValueError(f"Queue {self!r} is closed")
+
+    def put(self, obj, block=True, timeout=None):
+        self._check_closed()
+        self._put(_ForkingPickler.dumps(obj), 0, block, timeout)
+
+    def put_bytes(self, buf, block=True, timeout=None):
+        """Put the bytes-like object buf; get() returns it as bytes."""
+        self._check_closed()
+        with memoryview(buf) as m:
+            self._put(m.cast('B') if m.ndim != 1 or m.itemsize != 1 else m,
+                      _RAW, block, timeout)
+
+    def _put(self, buf, flag, block, timeout):
+        size = buf.nbytes
+        need = (size + 15) & ~7
+        capacity = self._capacity
+        if need > capacity:
+            raise ValueError(f"record of {size} bytes does not fit in "
+                             f"a queue of {capacity} bytes")
+        header = self._header
+        wlock = self._wlock
+        if block and timeout is not None:
+            deadline = time.monotonic() + timeout
+        if wlock is not None:
+            if not wlock.acquire(block, timeout):
+                raise Full
+        try:
+            tail = header[_TAIL]
+            if (capacity - (tail - header[_HEAD]) < need or
+                    header[_PUTS] - header[_GETS] >= self._maxrecords):
+                if not block:
+                    raise Full
+                header[_WAITING] += 1
+                try:
+                    while (capacity - (tail - header[_HEAD]) < need or
+                           header[_PUTS] - header[_GETS] >= self._maxrecords):
+                        wait = _SPACE_POLL_INTERVAL
+                        if timeout is not None:
+                            remaining = deadline - time.monotonic()
+                            if remaining <= 0:
+                                raise Full
+                            wait = min(wait, remaining)
+                        self._space.acquire(True, wait)
+                finally:
+                    header[_WAITING] -= 1
+
+            pos = tail % capacity
+            self._words[pos >> 3] = size | flag
+            start = pos + 8
+            if start == capacity:
+                start = 0
+            end = start + size
+            data = self._data
+            if end <= capacity:
+                data[start:end] = buf
+            else:
+                split = capacity - start
+                data[start:] = buf[:split]
+                data[:size - split] = buf[split:]
+            header[_TAIL] = tail + need
+            header[_PUTS] += 1
+        finally:
+            if wlock is not None:
+                wlock.release()
+        self._items.release()
+
+    def get(self, block=True, timeout=None):
+        self._check_closed()
+        return self._get(block, timeout, True)
+
+    def get_bytes(self, block=True, timeout=None):
+        """Return the next record as bytes, without unpickling it."""
+        self._check_closed()
+        return self._get(block, timeout, False)
+
+    def _get(self, block, timeout, decode):
+        items = self._items
+        if not items.acquire(False):
+            if not block:
+                raise Empty
+            # A busy producer usually puts the next item within a few
+            # microseconds, which is cheaper to wait for than a wakeup.
+            for i in range(_GET_SPIN):
+                if items.acquire(False):
+                    break
+            else:
+                if not items.acquire(True, timeout):
+                    raise Empty
+        header = self._header
+        rlock = self._rlock
+        if rlock is not None:
+            rlock.acquire()
+        try:
+            capacity = self._capacity
+            head = header[_HEAD]
+            pos = head % capacity
+            word = self._words[pos >> 3]
+            size = word & _SIZE_MASK
+            decode = decode and not word & _RAW
+            start = pos + 8
+            if start == capacity:
+                start = 0
+            end = start + size
+            data = self._data
+            if end <= capacity:
+                if decode and rlock is None:
+                    # Nobody else can consume: unpickle in place.
+                    with data[start:end] as view:
+                        res = _ForkingPickler.loads(view)
+                    decode = False
+                else:
+                    res = data[start:end].tobytes()
+            else:
+                split = capacity - start
+                res = data[start:].tobytes() + data[:size - split].tobytes()
+            header[_HEAD] = head + ((size + 15) & ~7)
+            header[_GETS] += 1
+        finally:
+            if rlock is not None:
+                rlock.release()
+        if header[_WAITING]:
+            self._space.release()
+        if decode:
+            res = _ForkingPickler.loads(res)
+        return res
+
+    def get_nowait(self):
+        return self.get(False)
+
+    def put_nowait(self, obj):
+        return self.put(obj, False)
+
+    def qsize(self):
+        header = self._header
+        return header[_PUTS] - header[_GETS]
+
+    def empty(self):
+        return not self.qsize()
+
+    def close(self):
+        """Release the shared memory mapped by this process.
+
+        The process that created the queue also unlinks the segment; other
+        processes that already use the queue are not affected.
+        """
+        if not self._closed:
+            self._closed = True
+            self._header = self._data = self._words = None
+            self._close()
 
     __class_getitem__ = classmethod(types.GenericAlias)
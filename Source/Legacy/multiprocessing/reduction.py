@@ -35,8 +35,8 @@ class ForkingPickler(pickle.Pickler):
     _extra_reducers = {}
     _copyreg_dispatch_table = copyreg.dispatch_table
 
-    def __init__(self, *args):
-        super().__init__(*args)
+    def __init__(self, *args, **kwds):
+        super().__init__(*args, **kwds)
         self.dispatch_table = self._copyreg_dispatch_table.copy()
         self.dispatch_table.update(self._extra_reducers)
 
@@ -46,9 +46,9 @@ class ForkingPickler(pickle.Pickler):
         cls._extra_reducers[type] = reduce
 
     @classmethod
-    def dumps(cls, obj, protocol=None):
+    def dumps(cls, obj, protocol=None, *, buffer_callback=None):
         buf = io.BytesIO()
-        cls(buf, protocol).dump(obj)
+        cls(buf, protocol, buffer_callback=buffer_callback).dump(obj)
         return buf.getbuffer()
 
     loads = pickle.loads
@@ -5,10 +5,11 @@ documentation for details.
 """
 
 
-__all__ = [ 'SharedMemory', 'ShareableList' ]
+__all__ = [ 'SharedMemory', 'ShareableList', 'SharedArray', 'SharedTable' ]
 
 
 from functools import partial
+import array
 import mmap
 import os
 import errno
@@ -532,3 +533,347 @@ class ShareableList:
             raise ValueError(f"{value!r} not in this container")
 
     __class_getitem__ = classmethod(types.GenericAlias)
+
+
+# Typed arrays and tables.  A block holding a SharedTable is organized as
+# follows:
+# - 8 bytes: size of the header (H) as a 64-bit integer
+# - 8 bytes: number of rows (N)
+# - 8 bytes: number of columns (C)
+# - H - 24 bytes: for each column, its name and its dtype, each encoded and
+#                 followed by a NUL byte
+# - for each column, N values of the column's dtype, padded to 8 bytes
+# A SharedArray is stored as a table with a single column named ''.
+
+_dtype_formats = {
+    'int64': 'q',
+    'float64': 'd',
+}
+
+def _parse_dtype(dtype):
+    """Return the item size and the memoryview format of a dtype.
+
+    The format is None for fixed-width bytes ('S<width>').
+    """
+    if dtype in _dtype_formats:
+        return 8, _dtype_formats[dtype]
+    if (isinstance(dtype, str) and dtype[:1] == 'S' and dtype[1:].isdigit()
+            and int(dtype[1:]) > 0):
+        return int(dtype[1:]), None
+    raise ValueError(f"unsupported dtype {dtype!r}: expected 'int64', "
+                     f"'float64' or 'S<width>'")
+
+def _column_size(dtype, nrows):
+    itemsize, _ = _parse_dtype(dtype)
+    return -(-itemsize * nrows // 8) * 8
+
+def _create_table(schema, nrows, name):
+    """Create a block for the given (name, dtype) columns."""
+    if nrows < 0:
+        raise ValueError("number of rows must be non-negative")
+    encoded = b''
+    for column, dtype in schema:
+        column = column.encode(_encoding)
+        if b'\x00' in column:
+            raise ValueError("column names must not contain NUL")
+        _parse_dtype(dtype)
+        encoded += column + b'\x00' + dtype.encode('ascii') + b'\x00'
+    header_size = 24 + -(-len(encoded) // 8) * 8
+    size = header_size + sum(_column_size(dtype, nrows)
+                             for _, dtype in schema)
+    shm = SharedMemory(name, create=True, size=size)
+    struct.pack_into(f"qqq{len(encoded)}s", shm.buf, 0,
+                     header_size, nrows, len(schema), encoded)
+    return shm
+
+def _read_table(shm):
+    """Return the (name, dtype) columns and the number of rows of a block."""
+    header_size, nrows, ncolumns = struct.unpack_from("qqq", shm.buf, 0)
+    fields = bytes(shm.buf[24:header_size]).split(b'\x00')
+    schema = [(fields[i].decode(_encoding), fields[i + 1].decode('ascii'))
+              for i in range(0, 2 * ncolumns, 2)]
+    return schema, nrows, header_size
+
+def _table_columns(shm, schema, nrows, header_size):
+    offset = header_size
+    columns = {}
+    for column, dtype in schema:
+        columns[column] = SharedArray._from_block(shm, dtype, offset, nrows)
+        offset += _column_size(dtype, nrows)
+    return columns
+
+
+class SharedArray:
+    """Fixed-length array of values of a single dtype in shared memory.
+
+    The dtype is 'int64', 'float64' or 'S<width>' for bytes of at most
+    width bytes (shorter values are padded with NUL bytes, which are
+    stripped when reading).  Create an array from an initial sequence or
+    length (all values are then zero)::
+
+        a = SharedArray('float64', 1000)
+        b = SharedArray(name=a.shm.name)   # in another process
+
+    Indexing with a slice reads or writes a range of values at once, as do
+    the get() and set() methods; the buf attribute is a memoryview of the
+    values, cast to the dtype for numeric arrays, which gives direct access
+    without copies.  Arrays pickle as a reference to the block.
+    """
+
+    def __init__(self, dtype=None, initial=None, *, name=None):
+        if name is None or dtype is not None:
+            if isinstance(initial, int):
+                values, nrows = None, initial
+            else:
+                values = list(initial) if initial is not None else []
+                nrows = len(values)
+            shm = _create_table([('', dtype)], nrows, name)
+            schema = [('', dtype)]
+            header_size = struct.unpack_from("q", shm.buf, 0)[0]
+        else:
+            values = None
+            shm = SharedMemory(name)
+            schema, nrows, header_size = _read_table(shm)
+            if len(schema) != 1:
+                shm.close()
+                raise ValueError(f"{name!r} holds a SharedTable, not a "
+                                 f"SharedArray")
+        self._setup(shm, schema[0][1], header_size, nrows)
+        self._owner = True
+        if values:
+            self.set(0, values)
+
+    @classmethod
+    def _from_block(cls, shm, dtype, offset, length):
+        # A column of a SharedTable.
+        self = cls.__new__(cls)
+        self._setup(shm, dtype, offset, length)
+        self._owner = False
+        return self
+
+    def _setup(self, shm, dtype, offset, length):
+        self.shm = shm
+        self._dtype = dtype
+        self._itemsize, self._format = _parse_dtype(dtype)
+        self._length = length
+        raw = shm.buf[offset:offset + self._itemsize * length]
+        self._raw = raw
+        self._view = raw.cast(self._format) if self._format else raw
+
+    @property
+    def dtype(self):
+        "The dtype of the values."
+        return self._dtype
+
+    @property
+    def buf(self):
+        "A memoryview of the values, cast to the dtype if it is numeric."
+        # A new view, which the caller may release, and which close()
+        # does not release under the caller.
+        return memoryview(self._view)
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        return iter(self.get())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step == 1:
+                return self.get(start, stop)
+            if self._format:
+                return self._view[index].tolist()
+            return [self[i] for i in range(start, stop, step)]
+        if self._format:
+            return self._view[index]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("index out of range")
+        w = self._itemsize
+        return self._raw[index * w:(index + 1) * w].tobytes().rstrip(b'\x00')
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step == 1:
+                value = list(value) if not isinstance(
+                    value, (list, tuple, array.array, memoryview)) else value
+                if len(value) != max(0, stop - start):
+                    raise ValueError("SharedArray slice assignment cannot "
+                                     "change the length of the array")
+                self.set(start, value)
+            else:
+                indices = range(start, stop, step)
+                value = list(value)
+                if len(value) != len(indices):
+                    raise ValueError("SharedArray slice assignment cannot "
+                                     "change the length of the array")
+                for i, v in zip(indices, value):
+                    self[i] = v
+        elif self._format:
+            self._view[index] = value
+        else:
+            if index < 0:
+                index += self._length
+            if not 0 <= index < self._length:
+                raise IndexError("assignment index out of range")
+            w = self._itemsize
+            self._raw[index * w:(index + 1) * w] = self._pad(value)
+
+    def _pad(self, value):
+        if len(value) > self._itemsize:
+            raise ValueError(f"bytes item exceeds the {self._dtype} dtype")
+        return bytes(value).ljust(self._itemsize, b'\x00')
+
+    def get(self, start=0, stop=None):
+        """Return the values from index start to index stop as a list."""
+        start, stop, _ = slice(start, stop).indices(self._length)
+        if self._format:
+            return self._view[start:stop].tolist()
+        w = self._itemsize
+        data = self._raw[start * w:stop * w].tobytes()
+        return [data[i:i + w].rstrip(b'\x00') for i in range(0, len(data), w)]
+
+    def set(self, start, values):
+        """Store the values of a sequence from index start onwards.
+
+        For numeric arrays, values can also be an array.array or a
+        memoryview of the matching format, which is copied directly.
+        """
+        if start < 0:
+            start += self._length
+        n = len(values)
+        if not 0 <= start <= start + n <= self._length:
+            raise IndexError("values do not fit in the array")
+        if self._format:
+            fmt = self._format
+            if not (isinstance(values, array.array) and values.typecode == fmt
+                    or isinstance(values, memoryview) and values.format == fmt):
+                values = array.array(fmt, values)
+            self._view[start:start + n] = values
+        else:
+            w = self._itemsize
+            self._raw[start * w:(start + n) * w] = b''.join(
+                self._pad(value) for value in values)
+
+    def __del__(self):
+        # The views must go before the block can be closed.
+        try:
+            self._view.release()
+            self._raw.release()
+        except (AttributeError, BufferError):
+            pass
+
+    def close(self):
+        """Release the views of the block and, if the array owns it,
+        close the shared memory block."""
+        self._view.release()
+        self._raw.release()
+        if self._owner:
+            self.shm.close()
+
+    def unlink(self):
+        "Request that the underlying shared memory block be destroyed."
+        self.shm.unlink()
+
+    def __reduce__(self):
+        if not self._owner:
+            raise TypeError("columns of a SharedTable cannot be pickled; "
+                            "pickle the SharedTable")
+        return partial(self.__class__, name=self.shm.name), ()
+
+    def __repr__(self):
+        return (f'{self.__class__.__name__}({self._dtype!r}, {len(self)}, '
+                f'name={self.shm.name!r})')
+
+    __class_getitem__ = classmethod(types.GenericAlias)
+
+
+class SharedTable:
+    """Table of typed columns of equal length in a shared memory block.
+
+    Columns are given as (name, dtype) pairs or as a mapping, with the same
+    dtypes as SharedArray; all values start as zero::
+
+        t = SharedTable([('id', 'int64'), ('score', 'float64'),
+                         ('tag', 'S8')], 1000)
+        t['score'][10:20] = [0.5] * 10
+        t2 = SharedTable(name=t.shm.name)  # in another process
+
+    Each column is a SharedArray sharing the block of the table, so column
+    reads and writes, including slices and bulk get() and set(), do not go
+    through the table.  Attaching by name only reads the header.
+    """
+
+    def __init__(self, columns=None, nrows=0, *, name=None):
+        if name is None or columns is not None:
+            if hasattr(columns, 'items'):
+                columns = columns.items()
+            schema = [(str(column), dtype) for column, dtype in columns]
+            if len({column for column, _ in schema}) != len(schema):
+                raise ValueError("duplicate column name")
+            shm = _create_table(schema, nrows, name)
+            header_size = struct.unpack_from("q", shm.buf, 0)[0]
+        else:
+            shm = SharedMemory(name)
+            schema, nrows, header_size = _read_table(shm)
+        self.shm = shm
+        self._nrows = nrows
+        self._dtypes = dict(schema)
+        self._columns = _table_columns(shm, schema, nrows, header_size)
+
+    @property
+    def columns(self):
+        "The names of the columns."
+        return tuple(self._columns)
+
+    @property
+    def dtypes(self):
+        "A dict mapping the names of the columns to their dtypes."
+        return dict(self._dtypes)
+
+    def __len__(self):
+        return self._nrows
+
+    def __getitem__(self, column):
+        return self._columns[column]
+
+    def row(self, index):
+        """Return the values of a row as a tuple."""
+        return tuple(column[index] for column in self._columns.values())
+
+    def rows(self, start=0, stop=None):
+        """Return the rows from index start to index stop as tuples."""
+        return list(zip(*(column.get(start, stop)
+                          for column in self._columns.values())))
+
+    def set_row(self, index, values):
+        """Store a sequence of values, one per column, in a row."""
+        values = tuple(values)
+        if len(values) != len(self._columns):
+            raise ValueError(f"expected {len(self._columns)} values, "
+                             f"got {len(values)}")
+        for column, value in zip(self._columns.values(), values):
+            column[index] = value
+
+    def close(self):
+        "Close access to the shared memory block from this instance."
+        for column in self._columns.values():
+            column.close()
+        self.shm.close()
+
+    def unlink(self):
+        "Request that the underlying shared memory block be destroyed."
+        self.shm.unlink()
+
+    def __reduce__(self):
+        return partial(self.__class__, name=self.shm.name), ()
+
+    def __repr__(self):
+        return (f'{self.__class__.__name__}({list(self._dtypes.items())}, '
+                f'{len(self)}, name={self.shm.name!r})')
+
+    __class_getitem__ = classmethod(types.GenericAlias)
@@ -25,9 +25,11 @@ Misc variables:
 
 from types import FunctionType
 from copyreg import dispatch_table
+from copyreg import __newobj__ as _newobj
 from copyreg import _extension_registry, _inverted_registry, _extension_cache
 from itertools import islice
 from functools import partial
+from weakref import WeakKeyDictionary
 import sys
 from sys import maxsize
 from struct import pack, unpack
@@ -396,6 +398,112 @@ def decode_long(data):
     return int.from_bytes(data, byteorder='little', signed=True)
 
 
+# Save routines compiled for classes, by class, protocol and fix_imports
+_compiled_saves = WeakKeyDictionary()
+
+def _compile_save(cls, proto, fix_imports):
+    """Return a routine saving instances of cls, or None.
+
+    Routines are compiled for classes which rely on the default
+    object.__reduce_ex__(), and write what save_reduce() and save_dict()
+    would for them without looking up the reduce method again.  In fast
+    mode the reference to the class and the keys of the state are written
+    from bytes encoded once.
+    """
+    try:
+        return _compiled_saves[cls][proto, fix_imports]
+    except KeyError:
+        pass
+    except TypeError:
+        return None
+    routine = None
+    if (getattr(cls, "__reduce_ex__", None) is object.__reduce_ex__ and
+            getattr(cls, "__reduce__", None) is object.__reduce__ and
+            getattr(cls, "__getattribute__", None) is
+                object.__getattribute__ and
+            not hasattr(cls, "__getnewargs_ex__") and
+            hasattr(cls, "__new__")):
+        f = io.BytesIO()
+        pickler = _Pickler(f, proto, fix_imports=fix_imports)
+        pickler.fast = 1
+        try:
+            pickler.save_global(cls)
+        except PicklingError:
+            pass
+        else:
+            routine = _make_save_routine(f.getvalue(), proto)
+    _compiled_saves.setdefault(cls, {})[proto, fix_imports] = routine
+    return routine
+
+def _make_save_routine(class_ref, proto):
+    # Nothing here refers to the class, so that it can be collected.
+    reduce_ex = object.__reduce_ex__
+    batchsize = _Pickler._BATCHSIZE
+    keys = {}
+
+    def encode_key(key):
+        f = io.BytesIO()
+        pickler = _Pickler(f, proto)
+        pickler.fast = 1
+        pickler.save_str(key)
+        return f.getvalue()
+
+    def save_instance(self, obj):
+        rv = reduce_ex(obj, proto)
+        if (rv[0] is not _newobj or len(rv[1]) != 1 or
+                rv[1][0] is not obj.__class__ or
+                rv[3] is not None or rv[4] is not None):
+            # save_reduce() handles or rejects the other cases.
+            self.save_reduce(obj=obj, *rv)
+            return
+
+        fast = self.fast
+        save = self.save
+        write = self.write
+        memo = self.memo
+        if fast:
+            write(class_ref)
+        else:
+            save(rv[1][0])
+        write(EMPTY_TUPLE + NEWOBJ)
+        if id(obj) in memo:
+            write(POP + self.get(memo[id(obj)][0]))
+        else:
+            self.memoize(obj)
+
+        state = rv[2]
+        if state is None:
+            return
+        if (type(state) is not dict or len(state) > batchsize or
+                id(state) in memo):
+            save(state)
+            write(BUILD)
+            return
+        write(EMPTY_DICT)
+        self.memoize(state)
+        n = len(state)
+        if n > 1:
+            write(MARK)
+        for k, v in state.items():
+            if fast and type(k) is str:
+                data = keys.get(k)
+                if data is None:
+                    data = encode_key(k)
+                    if len(keys) < batchsize:
+                        keys[k] = data
+                write(data)
+            else:
+                save(k)
+            save(v)
+        if n > 1:
+            write(SETITEMS)
+        elif n:
+            write(SETITEM)
+        write(BUILD)
+
+    return save_instance
+
+
 # Pickling machinery
 
 class _Pickler:
@@ -456,6 +564,8 @@ class _Pickler:
         self.bin = protocol >= 1
         self.fast = 0
         self.fix_imports = fix_imports and protocol < 3
+        self._compiled = False
+        self._save_routines = {}
 
     def clear_memo(self):
         """Clears the pickler's "memo".
@@ -478,10 +588,25 @@ class _Pickler:
             self.write(PROTO + pack("<B", self.proto))
         if self.proto >= 4:
             self.framer.start_framing()
+        self._compiled = self._can_compile()
         self.save(obj)
         self.write(STOP)
         self.framer.end_framing()
 
+    def _can_compile(self):
+        # Compiled save routines stand for save_reduce() and save_dict(),
+        # and write class references directly in fast mode, so they are
+        # only used if none of the hooks involved is customized.
+        return (self.proto >= 2 and
+                getattr(self, "reducer_override", None) is None and
+                getattr(self.persistent_id, "__func__", None) is
+                    _Pickler.persistent_id and
+                getattr(self.save_global, "__func__", None) is
+                    _Pickler.save_global and
+                getattr(self.save_reduce, "__func__", None) is
+                    _Pickler.save_reduce and
+                self.dispatch.get(dict) is _Pickler.save_dict)
+
     def memoize(self, obj):
         """Store an object in the memo."""
 
@@ -535,11 +660,12 @@ class _Pickler:
             self.save_pers(pid)
             return
 
-        # Check the memo
-        x = self.memo.get(id(obj))
-        if x is not None:
-            self.write(self.get(x[0]))
-            return
+        # Check the memo; nothing is memoized in fast mode
+        if not self.fast:
+            x = self.memo.get(id(obj))
+            if x is not None:
+                self.write(self.get(x[0]))
+                return
 
         rv = NotImplemented
         reduce = getattr(self, "reducer_override", None)
@@ -566,6 +692,17 @@ class _Pickler:
                     self.save_global(obj)
                     return
 
+                # Use the save routine compiled for the class, if any
+                if self._compiled:
+                    try:
+                        f = self._save_routines[t]
+                    except KeyError:
+                        f = self._save_routines[t] = _compile_save(
+                            t, self.proto, self.fix_imports)
+                    if f is not None:
+                        f(self, obj)
+                        return
+
                 # Check for a __reduce_ex__ method, fall back to __reduce__
                 reduce = getattr(obj, "__reduce_ex__", None)
                 if reduce is not None:
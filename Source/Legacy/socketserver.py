@@ -21,6 +21,8 @@ For request-based servers (including socket-based):
         - synchronous (one request is handled at a time)
         - forking (each request is handled by a new process)
         - threading (each request is handled by a new thread)
+        - pooling (requests are handled by a fixed pool of threads)
+        - pre-forking (requests are handled by a pool of processes)
 
 The classes in this module favor the server type that is simplest to
 write: a synchronous TCP/IP server.  This is bad class design, but
@@ -55,6 +57,11 @@ instance, a threading UDP server class is created as follows:
 
         class ThreadingUDPServer(ThreadingMixIn, UDPServer): pass
 
+The PreForkingMixIn mix-in class runs any of them in several processes,
+which share the listening socket:
+
+        class PreForkingTCPServer(PreForkingMixIn, ThreadingTCPServer): pass
+
 The Mix-in class must come first, since it overrides a method defined
 in UDPServer! Setting the various member variables also changes
 the behavior of the underlying server mechanism.
@@ -123,20 +130,26 @@ BaseServer:
 __version__ = "0.4"
 
 
+import collections
+import mmap
 import socket
 import selectors
 import os
+import signal
+import struct
 import sys
 import threading
 from io import BufferedIOBase
-from time import monotonic as time
+from time import monotonic as time, sleep
 
 __all__ = ["BaseServer", "TCPServer", "UDPServer",
            "ThreadingUDPServer", "ThreadingTCPServer",
+           "PoolingUDPServer", "PoolingTCPServer",
            "BaseRequestHandler", "StreamRequestHandler",
-           "DatagramRequestHandler", "ThreadingMixIn"]
+           "DatagramRequestHandler", "ThreadingMixIn", "PoolingMixIn"]
 if hasattr(os, "fork"):
-    __all__.extend(["ForkingUDPServer","ForkingTCPServer", "ForkingMixIn"])
+    __all__.extend(["ForkingUDPServer","ForkingTCPServer", "ForkingMixIn",
+                    "PreForkingMixIn"])
 if hasattr(socket, "AF_UNIX"):
     __all__.extend(["UnixStreamServer","UnixDatagramServer",
                     "ThreadingUnixStreamServer",
@@ -635,6 +648,321 @@ if hasattr(os, "fork"):
             self.collect_children(blocking=self.block_on_close)
 
 
+    class _PreForkedWorker:
+        """A worker process of a PreForkingMixIn server."""
+
+        def __init__(self, slot, generation):
+            self.slot = slot
+            self.generation = generation
+            self.started = time()
+            # Time after which the worker is killed, once it is stopped
+            self.deadline = None
+
+
+    class PreForkingMixIn:
+        """Mix-in class to handle requests in a pool of pre-forked processes.
+
+        serve_forever() forks `workers` processes (one per CPU by default)
+        which accept the requests and handle them as the rest of the server
+        class does, for instance in threads with ThreadingMixIn.  The parent
+        process supervises them: a worker which exits, or which does not
+        report within worker_timeout seconds if it is set, is replaced.
+
+        SIGHUP, or restart_workers(), replaces all the workers gracefully:
+        new workers are started, and the old ones stop accepting requests
+        and finish those they handle before exiting.  shutdown() and
+        server_close() stop the workers the same way.  The workers are
+        killed if they take more than graceful_timeout seconds.
+
+        The workers share the listening socket inherited from the parent
+        or, if reuse_port is true, each stream server worker listens on
+        its own socket bound to the same address with SO_REUSEPORT, and
+        the kernel balances the connections between them.
+
+        get_stats() returns the request counters of all the workers.
+        """
+
+        workers = None
+        reuse_port = False
+        graceful_timeout = 30
+        worker_timeout = None
+        # In a worker process, the number of the worker, which is lower
+        # than twice the number of workers; None in the parent process.
+        worker_id = None
+
+        # Requests, errors, active requests and time of the last report
+        # of a worker, in a slot of memory shared with the parent.
+        _slot = struct.Struct('qqqd')
+        _workers = None
+
+        def _use_reuse_port(self):
+            return self.reuse_port and self.socket_type == socket.SOCK_STREAM
+
+        def server_bind(self):
+            if self._use_reuse_port():
+                if not hasattr(socket, 'SO_REUSEPORT'):
+                    raise ValueError('SO_REUSEPORT is not supported')
+                self.socket.setsockopt(socket.SOL_SOCKET,
+                                       socket.SO_REUSEPORT, 1)
+            super().server_bind()
+
+        def server_activate(self):
+            # With reuse_port, only the sockets of the workers listen: the
+            # kernel would queue connections on the socket of the parent.
+            if not self._use_reuse_port():
+                super().server_activate()
+
+        def serve_forever(self, poll_interval=0.5):
+            """Start the workers and supervise them until shutdown().
+
+            Workers check for shutdown every poll_interval seconds.
+            """
+            nworkers = self.workers or os.cpu_count() or 1
+            self._nworkers = nworkers
+            self._stats = mmap.mmap(-1, 2 * nworkers * self._slot.size)
+            self._free_slots = list(range(2 * nworkers))
+            self._workers = {}
+            self._generation = 0
+            self._retired = [0, 0]
+            self._restarts = 0
+            self._restart_request = False
+            self._spawn_after = 0
+            self._stop_request = threading.Event()
+            self._stopped = threading.Event()
+            previous = None
+            if threading.current_thread() is threading.main_thread():
+                previous = signal.signal(signal.SIGHUP, self._handle_sighup)
+            try:
+                while not self._stop_request.is_set():
+                    self._supervise_workers(poll_interval)
+                    self.service_actions()
+                    self._stop_request.wait(poll_interval)
+            finally:
+                if previous is not None:
+                    signal.signal(signal.SIGHUP, previous)
+                self._stop_workers()
+                self._stopped.set()
+
+        def shutdown(self):
+            """Stops the workers and the serve_forever loop.
+
+            Blocks until the workers have finished their requests.  This
+            must be called while serve_forever() is running in another
+            thread, or it will deadlock.
+            """
+            self._stop_request.set()
+            self._stopped.wait()
+
+        def restart_workers(self):
+            """Replace the workers gracefully, like SIGHUP."""
+            self._restart_request = True
+
+        def _handle_sighup(self, signum, frame):
+            self._restart_request = True
+
+        def get_stats(self):
+            """Return a dict of counters of the workers.
+
+            requests and errors count the requests handled by all the
+            workers, active those being handled, workers the running
+            workers and restarts the workers which had to be replaced.
+            """
+            if self._workers is None:
+                raise RuntimeError('the server is not serving')
+            requests, errors = self._retired
+            active = 0
+            for worker in list(self._workers.values()):
+                r, e, a, _ = self._slot.unpack_from(
+                    self._stats, worker.slot * self._slot.size)
+                requests += r
+                errors += e
+                active += a
+            return {'workers': len(self._workers), 'requests': requests,
+                    'errors': errors, 'active': active,
+                    'restarts': self._restarts}
+
+        def _supervise_workers(self, poll_interval):
+            now = time()
+            self._reap_workers()
+            if self._restart_request:
+                self._restart_request = False
+                self._generation += 1
+                old = list(self._workers)
+                self._spawn_workers(poll_interval)
+                for pid in old:
+                    self._terminate_worker(pid)
+            for pid, worker in list(self._workers.items()):
+                if worker.deadline is not None:
+                    if now > worker.deadline:
+                        self._kill_worker(pid)
+                elif self.worker_timeout is not None:
+                    _, _, _, last = self._slot.unpack_from(
+                        self._stats, worker.slot * self._slot.size)
+                    if now - max(last, worker.started) > self.worker_timeout:
+                        self._kill_worker(pid)
+            self._spawn_workers(poll_interval)
+
+        def _spawn_workers(self, poll_interval):
+            if time() < self._spawn_after:
+                return
+            running = sum(1 for worker in self._workers.values()
+                          if worker.generation == self._generation)
+            while running < self._nworkers and self._free_slots:
+                slot = self._free_slots.pop(0)
+                pid = os.fork()
+                if not pid:
+                    # Child process: this never returns.
+                    self._run_worker(slot, poll_interval)
+                self._workers[pid] = _PreForkedWorker(slot, self._generation)
+                running += 1
+
+        def _terminate_worker(self, pid):
+            worker = self._workers[pid]
+            if worker.deadline is None:
+                worker.deadline = time() + self.graceful_timeout
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+
+        def _kill_worker(self, pid):
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+        def _reap_workers(self, pids=None):
+            # Collect the workers which exited, or wait for the given ones.
+            for pid in list(self._workers if pids is None else pids):
+                worker = self._workers[pid]
+                try:
+                    if not os.waitpid(pid, 0 if pids else os.WNOHANG)[0]:
+                        continue
+                except ChildProcessError:
+                    pass
+                offset = worker.slot * self._slot.size
+                requests, errors, _, _ = self._slot.unpack_from(
+                    self._stats, offset)
+                self._retired[0] += requests
+                self._retired[1] += errors
+                self._slot.pack_into(self._stats, offset, 0, 0, 0, 0)
+                self._free_slots.append(worker.slot)
+                del self._workers[pid]
+                if worker.deadline is None:
+                    # The worker exited by itself, or did not report.
+                    self._restarts += 1
+                    if time() - worker.started < 1.0:
+                        # Don't fork in a loop if the workers fail early.
+                        self._spawn_after = time() + 1.0
+
+        def _stop_workers(self):
+            for pid in list(self._workers):
+                self._terminate_worker(pid)
+            while self._workers:
+                self._reap_workers()
+                for pid in list(self._workers):
+                    # Only the killed worker is reaped, so the pids of the
+                    # other workers cannot be reused meanwhile.
+                    worker = self._workers.get(pid)
+                    if worker is not None and time() > worker.deadline:
+                        self._kill_worker(pid)
+                        self._reap_workers([pid])
+                sleep(0.01)
+
+        def _run_worker(self, slot, poll_interval):
+            # Accept and handle requests until SIGTERM, wait for the active
+            # requests, and exit.
+            status = 1
+            try:
+                self.worker_id = slot
+                self._workers = None
+                self._counters = [0, 0, 0]
+                self._counters_lock = threading.Lock()
+                self._worker_stop = False
+                signal.signal(signal.SIGTERM, self._handle_sigterm)
+                # The parent handles the signals sent to the process group.
+                signal.signal(signal.SIGHUP, signal.SIG_IGN)
+                signal.signal(signal.SIGINT, signal.SIG_IGN)
+                if self._use_reuse_port():
+                    sock = socket.socket(self.address_family,
+                                         self.socket_type)
+                    if self.allow_reuse_address:
+                        sock.setsockopt(socket.SOL_SOCKET,
+                                        socket.SO_REUSEADDR, 1)
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+                    sock.bind(self.server_address)
+                    sock.listen(self.request_queue_size)
+                    self.socket.close()
+                    self.socket = sock
+                # Other workers may accept the request first.
+                self.socket.setblocking(False)
+                parent = os.getppid()
+                with _ServerSelector() as selector:
+                    selector.register(self, selectors.EVENT_READ)
+                    while not self._worker_stop and os.getppid() == parent:
+                        self._count()
+                        if (selector.select(poll_interval) and
+                                not self._worker_stop):
+                            self._handle_request_noblock()
+                        self.service_actions()
+                self.socket.close()
+                deadline = time() + self.graceful_timeout
+                while self._counters[2] and time() < deadline:
+                    self._count()
+                    sleep(0.01)
+                status = 0
+            except:
+                import traceback
+                traceback.print_exc()
+            finally:
+                try:
+                    self.server_close()
+                finally:
+                    os._exit(status)
+
+        def _handle_sigterm(self, signum, frame):
+            self._worker_stop = True
+
+        def _count(self, requests=0, errors=0, active=0):
+            # Update the counters of the worker and report them.
+            with self._counters_lock:
+                counters = self._counters
+                counters[0] += requests
+                counters[1] += errors
+                counters[2] += active
+                self._slot.pack_into(self._stats,
+                                     self.worker_id * self._slot.size,
+                                     *counters, time())
+
+        def get_request(self):
+            request, client_address = super().get_request()
+            if (self.worker_id is not None and
+                    self.socket_type == socket.SOCK_STREAM):
+                # The listening socket of a worker is non-blocking, and the
+                # accepted sockets inherit that on some platforms (BSD).
+                request.setblocking(True)
+            return request, client_address
+
+        def finish_request(self, request, client_address):
+            if self.worker_id is None:
+                return super().finish_request(request, client_address)
+            self._count(active=1)
+            try:
+                super().finish_request(request, client_address)
+            finally:
+                self._count(requests=1, active=-1)
+
+        def handle_error(self, request, client_address):
+            if self.worker_id is not None:
+                self._count(errors=1)
+            super().handle_error(request, client_address)
+
+        def server_close(self):
+            if self.worker_id is None and self._workers:
+                self._stop_workers()
+            super().server_close()
+
+
 class _Threads(list):
     """
     Joinable list of all non-daemon threads.
@@ -708,6 +1036,144 @@ class ThreadingMixIn:
         self._threads.join()
 
 
+class PoolingMixIn:
+    """Mix-in class to handle requests in a fixed pool of threads.
+
+    The requests are queued for pool_size threads, which are started with
+    the first request and reused.  When all the threads are busy and
+    queue_size requests are waiting, the pool is full, and overflow
+    decides what happens to new requests: with 'reject', they are passed
+    to handle_overload(), which closes them; with 'block', the server
+    stops accepting requests until a thread is free, so that the clients
+    wait in the listen backlog of the socket.
+
+    get_pool_stats() reports how busy the pool is and how often it was
+    full.
+    """
+
+    pool_size = 8
+    queue_size = 32
+    overflow = 'block'
+    # Decides how threads will act upon termination of the
+    # main process
+    daemon_threads = False
+    # If true, server_close() waits until the threads have handled the
+    # queued requests.
+    block_on_close = True
+    _pool = None
+
+    def _start_pool(self):
+        if self.overflow not in ('block', 'reject'):
+            raise ValueError("overflow must be 'block' or 'reject'")
+        lock = threading.Lock()
+        self._pool_work = threading.Condition(lock)
+        self._pool_room = threading.Condition(lock)
+        self._pool_queue = collections.deque()
+        self._pool_busy = 0
+        self._pool_closing = False
+        self._pool_counters = {'handled': 0, 'rejected': 0, 'max_queued': 0,
+                               'saturated': 0}
+        self._pool = []
+        for i in range(self.pool_size):
+            t = threading.Thread(target=self._pool_worker,
+                                 name=f'{type(self).__name__}-{i}')
+            t.daemon = self.daemon_threads
+            self._pool.append(t)
+            t.start()
+
+    def _pool_full(self):
+        # Called with the lock held.
+        return (len(self._pool_queue) >=
+                self.queue_size + self.pool_size - self._pool_busy)
+
+    def _pool_worker(self):
+        while True:
+            with self._pool_work:
+                while not self._pool_queue and not self._pool_closing:
+                    self._pool_work.wait()
+                if not self._pool_queue:
+                    return
+                request, client_address = self._pool_queue.popleft()
+                self._pool_busy += 1
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+                with self._pool_work:
+                    self._pool_busy -= 1
+                    self._pool_counters['handled'] += 1
+                    self._pool_room.notify()
+
+    def _handle_request_noblock(self):
+        # With overflow='block', don't accept a request while the pool is
+        # full.  Waiting is bounded, so that shutdown() is not delayed.
+        if self.overflow == 'block' and self._pool is not None:
+            with self._pool_room:
+                if (self._pool_full() and
+                        not self._pool_room.wait_for(
+                            lambda: not self._pool_full(), 0.1)):
+                    return
+        super()._handle_request_noblock()
+
+    def process_request(self, request, client_address):
+        """Queue the request for the pool of threads."""
+        if self._pool is None:
+            self._start_pool()
+        counters = self._pool_counters
+        with self._pool_work:
+            if self.overflow == 'reject' and self._pool_full():
+                counters['rejected'] += 1
+                rejected = True
+            else:
+                rejected = False
+                self._pool_queue.append((request, client_address))
+                counters['max_queued'] = max(counters['max_queued'],
+                                             len(self._pool_queue))
+                if self._pool_full():
+                    counters['saturated'] += 1
+                self._pool_work.notify()
+        if rejected:
+            self.handle_overload(request, client_address)
+
+    def handle_overload(self, request, client_address):
+        """Handle a request rejected because the pool is full.
+
+        May be overridden, for instance to send an error response.  The
+        default is to close the request.
+        """
+        self.shutdown_request(request)
+
+    def get_pool_stats(self):
+        """Return a dict of counters of the pool.
+
+        workers is the number of threads, busy the number handling a
+        request, queued the number of requests waiting for a thread and
+        max_queued its maximum.  handled counts the requests handled,
+        rejected those rejected, and saturated the times the pool became
+        full; full tells whether it is full.
+        """
+        if self._pool is None:
+            return {'workers': 0, 'busy': 0, 'queued': 0, 'handled': 0,
+                    'rejected': 0, 'max_queued': 0, 'saturated': 0,
+                    'full': False}
+        with self._pool_work:
+            return {'workers': len(self._pool), 'busy': self._pool_busy,
+                    'queued': len(self._pool_queue), **self._pool_counters,
+                    'full': self._pool_full()}
+
+    def server_close(self):
+        super().server_close()
+        if self._pool is not None:
+            with self._pool_work:
+                self._pool_closing = True
+                self._pool_work.notify_all()
+            if self.block_on_close:
+                for thread in self._pool:
+                    thread.join()
+
+
 if hasattr(os, "fork"):
     class ForkingUDPServer(ForkingMixIn, UDPServer): pass
     class ForkingTCPServer(ForkingMixIn, TCPServer): pass
@@ -715,6 +1181,9 @@ if hasattr(os, "fork"):
 class ThreadingUDPServer(ThreadingMixIn, UDPServer): pass
 class ThreadingTCPServer(ThreadingMixIn, TCPServer): pass
 
+class PoolingUDPServer(PoolingMixIn, UDPServer): pass
+class PoolingTCPServer(PoolingMixIn, TCPServer): pass
+
 if hasattr(socket, 'AF_UNIX'):
 
     class UnixStreamServer(TCPServer):
@@ -242,6 +242,15 @@ class DummyCallable:
         q.put(5)
 
 
+class BufferHolder:
+    # Pickled with an out-of-band buffer, as NumPy arrays are
+    def __init__(self, data):
+        self.data = data
+
+    def __reduce_ex__(self, protocol):
+        return type(self), (pickle.PickleBuffer(self.data),)
+
+
 class _TestProcess(BaseTestCase):
 
     ALLOWED_TYPES = ('processes', 'threads')
@@ -1124,6 +1133,20 @@ class _TestQueue(BaseTestCase):
         p.join()
         close_queue(queue)
 
+    def test_out_of_band_buffers(self):
+        if self.TYPE != 'processes':
+            self.skipTest('test not appropriate for {}'.format(self.TYPE))
+
+        q = self.Queue()
+        data = bytes(range(256)) * 1000
+        q.put(BufferHolder(data))
+        q.put(BufferHolder(b'small'))
+        obj = q.get(timeout=support.SHORT_TIMEOUT)
+        self.assertIsInstance(obj.data, memoryview)
+        self.assertEqual(obj.data, data)
+        self.assertEqual(q.get(timeout=support.SHORT_TIMEOUT).data, b'small')
+        close_queue(q)
+
     def test_qsize(self):
         q = self.Queue()
         try:
@@ -1277,6 +1300,118 @@ class _TestQueue(BaseTestCase):
                 q.put('foo')
             with self.assertRaisesRegex(ValueError, 'is closed'):
                 q.get()
+
+
+@unittest.skipUnless(HAS_SHMEM, "requires multiprocessing.shared_memory")
+class _TestSharedMemoryQueue(BaseTestCase):
+
+    ALLOWED_TYPES = ('processes',)
+
+    @classmethod
+    def _test_echo(cls, inq, outq):
+        # get() returns the records put with put_bytes() as bytes.
+        for item in iter(inq.get, 'stop'):
+            if type(item) is bytes:
+                outq.put_bytes(item)
+            else:
+                outq.put(item)
+
+    def test_put_get(self):
+        # Small queues so that records wrap around the end of the buffer.
+        inq = self.SharedMemoryQueue(200)
+        outq = self.SharedMemoryQueue(152)
+        items = [None, 'x' * 50, list(range(10)), {'a': b'b' * 7},
+                 1.5, b'', bytearray(b'y' * 80)] * 10
+        p = self.Process(target=self._test_echo, args=(inq, outq))
+        p.daemon = True
+        p.start()
+        for item in items:
+            inq.put(item)
+            self.assertEqual(outq.get(timeout=support.SHORT_TIMEOUT), item)
+        for size in range(0, 100, 7):
+            data = bytes(range(size))
+            inq.put_bytes(memoryview(data))
+            self.assertEqual(outq.get_bytes(timeout=support.SHORT_TIMEOUT),
+                             data)
+        inq.put_bytes(array.array('i', [1, 2]))
+        self.assertEqual(outq.get(), array.array('i', [1, 2]).tobytes())
+        inq.put('stop')
+        p.join()
+        inq.close()
+        outq.close()
+
+    def test_nonblocking(self):
+        q = self.SharedMemoryQueue(64)
+        self.assertTrue(q.empty())
+        self.assertRaises(pyqueue.Empty, q.get_nowait)
+        self.assertRaises(pyqueue.Empty, q.get_bytes, False)
+        self.assertRaises(pyqueue.Empty, q.get, timeout=0.01)
+        q.put_bytes(b'a' * 20)
+        q.put_bytes(b'b' * 20)
+        self.assertEqual(q.qsize(), 2)
+        self.assertRaises(pyqueue.Full, q.put_bytes, b'c' * 20, False)
+        start = time.monotonic()
+        self.assertRaises(pyqueue.Full, q.put_bytes, b'c' * 20, timeout=0.1)
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+        with self.assertRaisesRegex(ValueError, 'does not fit'):
+            q.put_bytes(b'c' * 60)
+        self.assertEqual(q.get_bytes(), b'a' * 20)
+        q.put_bytes(b'c' * 20)
+        self.assertEqual(q.get_bytes(), b'b' * 20)
+        self.assertEqual(q.get_bytes(), b'c' * 20)
+        self.assertTrue(q.empty())
+        q.close()
+
+    @classmethod
+    def _test_produce(cls, q, n):
+        for i in range(n):
+            q.put(i)
+        q.put(None)
+
+    def test_blocking_put(self):
+        q = self.SharedMemoryQueue(64)
+        p = self.Process(target=self._test_produce, args=(q, 100))
+        p.daemon = True
+        p.start()
+        # The producer has to wait for space repeatedly.
+        time.sleep(DELTA)
+        self.assertEqual(list(iter(q.get, None)), list(range(100)))
+        p.join()
+        q.close()
+
+    def test_mpmc(self):
+        q = self.SharedMemoryQueue(256, mpmc=True)
+        procs = [self.Process(target=self._test_produce, args=(q, 200))
+                 for i in range(3)]
+        for p in procs:
+            p.daemon = True
+            p.start()
+        results = []
+        done = 0
+        while done < len(procs):
+            item = q.get(timeout=support.SHORT_TIMEOUT)
+            if item is None:
+                done += 1
+            else:
+                results.append(item)
+        self.assertEqual(sorted(results), sorted(list(range(200)) * 3))
+        for p in procs:
+            p.join()
+        q.close()
+
+    def test_close(self):
+        q = self.SharedMemoryQueue(64)
+        name = q._shm.name
+        q.close()
+        q.close()
+        with self.assertRaisesRegex(ValueError, 'is closed'):
+            q.put(1)
+        with self.assertRaisesRegex(ValueError, 'is closed'):
+            q.get_bytes()
+        # The creator unlinks the segment.
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name)
+
 #
 #
 #
@@ -2373,6 +2508,87 @@ class _TestContainers(BaseTestCase):
         self.assertTrue(hasattr(n, 'name'))
         self.assertTrue(not hasattr(n, 'job'))
 
+    def test_batch(self):
+        d = self.dict()
+        a = self.list()
+        with d._batch() as batch:
+            for i in range(10):
+                d[i] = i * i
+            r1 = d.get(3)
+            r2 = a.append(d)
+            r3 = d.pop('missing')
+            self.assertFalse(r1.ready())
+            batch.flush()
+            r4 = d.get(9)
+        for r in (r1, r2, r3, r4):
+            self.assertTrue(r.ready())
+        self.assertEqual(r1.get(), 9)
+        self.assertIsNone(r2.get())
+        self.assertTrue(r2.successful())
+        self.assertFalse(r3.successful())
+        self.assertRaises(KeyError, r3.get)
+        self.assertEqual(r4.get(), 81)
+        self.assertEqual(len(d), 10)
+        self.assertEqual(a[0][9], 81)
+
+        # Results are sent when the batch is full or looked at.
+        with d._batch(size=3):
+            r1 = d.get(1)
+            r2 = d.get(2)
+            self.assertFalse(r1.ready())
+            d.clear()
+            self.assertTrue(r1.ready())
+            r3 = d.get(3)
+            self.assertIsNone(r3.get())
+        self.assertEqual((r1.get(), r2.get()), (1, 4))
+
+        # Special methods whose result is used are called at once, after
+        # the queued calls.
+        with d._batch():
+            d['a'] = 1
+            r1 = d.get('a')
+            self.assertEqual(len(d), 1)
+            self.assertTrue(r1.ready())
+            self.assertIn('a', d)
+            self.assertEqual(d['a'], 1)
+            self.assertRaises(KeyError, d.__getitem__, 'missing')
+            self.assertEqual(str(d), "{'a': 1}")
+            del d['a']
+        self.assertEqual(len(d), 0)
+
+        with d._batch():
+            self.assertRaises(RuntimeError, d._batch().__enter__)
+        self.assertRaises(ValueError, d._batch, size=0)
+
+    def test_batch_without_results(self):
+        a = self.list()
+        with a._batch(results=False, size=7):
+            for i in range(20):
+                self.assertIsNone(a.append(i))
+        self.assertEqual(a[:], list(range(20)))
+
+        # The first error is raised on flush and on exit, once the other
+        # calls are made.
+        with a._batch(results=False, size=2) as batch:
+            a.remove('missing')
+            a.append(20)
+            a.append(21)
+            with self.assertRaises(ValueError) as cm:
+                batch.flush()
+            self.assertIn("in a call of 'remove' in a batch",
+                          cm.exception.__notes__)
+            batch.flush()
+            a.insert(0, -1)
+            self.assertEqual(len(a), 23)
+        with self.assertRaises(IndexError) as cm:
+            with a._batch(results=False):
+                a.pop(100)
+                a.remove('missing')
+        self.assertEqual(cm.exception.__notes__,
+                         ["in a call of 'pop' in a batch",
+                          "1 other calls of the batch failed"])
+        self.assertEqual(a[:], [-1] + list(range(22)))
+
 #
 #
 #
@@ -2605,6 +2821,92 @@ class _TestPool(BaseTestCase):
                 self.assertIn(value, expected_values)
                 expected_values.remove(value)
 
+    def test_imap_max_inflight(self):
+        if self.TYPE == 'manager':
+            self.skipTest('test not appropriate for {}'.format(self.TYPE))
+
+        taken = []
+        def generate(n):
+            for i in range(n):
+                taken.append(i)
+                yield i
+
+        for imap in (self.pool.imap, self.pool.imap_unordered):
+            with self.subTest(imap=imap.__name__):
+                del taken[:]
+                it = imap(sqr, generate(1000), max_inflight=3)
+                results = [next(it)]
+                time.sleep(0.1)
+                # One task was returned, so at most four were taken.
+                self.assertLessEqual(len(taken), 4)
+                results.extend(it)
+                self.assertEqual(sorted(results),
+                                 [sqr(i) for i in range(1000)])
+
+                del taken[:]
+                it = imap(sqr, generate(100), chunksize=10, max_inflight=2)
+                time.sleep(0.1)
+                self.assertLessEqual(len(taken), 20)
+                self.assertEqual(sorted(it), [sqr(i) for i in range(100)])
+
+        it = self.pool.imap(sqr, exception_throwing_generator(10, 3),
+                            max_inflight=2)
+        self.assertEqual([next(it) for i in range(3)], [0, 1, 4])
+        self.assertRaises(SayWhenError, it.__next__)
+
+        self.assertRaises(ValueError, self.pool.imap, sqr, [], max_inflight=0)
+
+    def test_imap_max_inflight_other_tasks(self):
+        if self.TYPE == 'manager':
+            self.skipTest('test not appropriate for {}'.format(self.TYPE))
+
+        # Tasks submitted while a throttled iterator is consumed run.
+        it = self.pool.imap(sqr, range(10), max_inflight=2)
+        for i, value in enumerate(it):
+            self.assertEqual(self.pool.apply(sqr, (i,)), value)
+
+        # An abandoned iterator does not keep the pool running.
+        p = self.Pool(2)
+        it = p.imap(sqr, itertools.count(), max_inflight=4)
+        self.assertEqual(next(it), 0)
+        del it
+        support.gc_collect()
+        p.close()
+        p.join()
+
+    def test_chunk_duration(self):
+        expected = [sqr(i) for i in range(1000)]
+        self.assertEqual(list(self.pool.imap(sqr, range(1000),
+                                             chunk_duration=0.01)), expected)
+        self.assertEqual(sorted(self.pool.imap_unordered(
+            sqr, range(1000), chunksize=7, chunk_duration=0.01)), expected)
+        self.assertEqual(self.pool.map(sqr, range(1000), chunk_duration=0.01),
+                         expected)
+        self.assertEqual(self.pool.starmap(mul, [(1, 2), (3, 4)],
+                                           chunk_duration=0.01), [2, 12])
+        self.assertEqual(self.pool.map(sqr, [], chunk_duration=0.01), [])
+        self.assertRaises(ValueError, self.pool.map, sqr, [1],
+                          chunk_duration=0)
+
+    def test_chunk_sizer(self):
+        sizer = multiprocessing.pool._ChunkSizer(0.1, 1)
+        # Chunks grow gradually towards the target duration...
+        sizer.update(0.001, 1)
+        self.assertEqual(sizer.size, 2)
+        for i in range(10):
+            sizer.update(0.001 * sizer.size, sizer.size)
+        self.assertIn(sizer.size, (99, 100))
+        # ... and shrink at once when items get slower.
+        sizer.update(1.0, 100)
+        self.assertLess(sizer.size, 100)
+        for i in range(10):
+            sizer.update(0.1 * sizer.size, sizer.size)
+        self.assertEqual(sizer.size, 1)
+
+        sizer = multiprocessing.pool._ChunkSizer(0.1, 1000)
+        sizer.update(0.0, 1000)
+        self.assertEqual(sizer.size, 2000)
+
     def test_make_pool(self):
         expected_error = (RemoteError if self.TYPE == 'manager'
                           else ValueError)
@@ -3256,6 +3558,112 @@ class _TestConnection(BaseTestCase):
 
         self.assertRaises(ValueError, a.send_bytes, msg, 4, -1)
 
+    def test_send_buffers(self):
+        if self.TYPE != 'processes':
+            self.skipTest('test not appropriate for {}'.format(self.TYPE))
+
+        a, b = self.Pipe()
+        arr = array.array('i', range(4))
+        a.send_buffers([b'abc', b'', arr, memoryview(b'xyz')[1:]])
+        parts = b.recv_buffers()
+        self.assertEqual([bytes(part) for part in parts],
+                         [b'abc', b'', arr.tobytes(), b'yz'])
+
+        # Parts are received into the given buffers.
+        buffers = [bytearray(4), array.array('i', [0] * 4)]
+        a.send_buffers([b'ab', arr])
+        parts = b.recv_buffers(buffers)
+        self.assertEqual(buffers[0], bytearray(b'ab\0\0'))
+        self.assertEqual(buffers[1], arr)
+        self.assertEqual([len(part) for part in parts], [2, 16])
+
+        a.send_buffers([b'abcde'])
+        with self.assertRaises(multiprocessing.BufferTooShort) as cm:
+            b.recv_buffers(buffers)
+        self.assertEqual(cm.exception.args, ([b'abcde'],))
+        a.send_buffers([b'ab', b'cd'])
+        with self.assertRaises(multiprocessing.BufferTooShort):
+            b.recv_buffers(buffers[:1])
+
+        # The message is consumed even if it is not a buffers message.
+        for msg in (b'', b'abc', b'\0\0\0\1' + b'\0' * 16):
+            a.send_bytes(msg)
+            self.assertRaises(OSError, b.recv_buffers)
+        a.send_buffers([b'a', b'b'])
+        self.assertEqual(b.recv_bytes(),
+                         struct.pack('!IQQ', 2, 1, 1) + b'ab')
+
+    def test_send_out_of_band(self):
+        if self.TYPE != 'processes':
+            self.skipTest('test not appropriate for {}'.format(self.TYPE))
+
+        conn, child_conn = self.Pipe()
+        p = self.Process(target=self._echo, args=(child_conn,))
+        p.daemon = True
+        p.start()
+        child_conn.close()
+
+        # Large buffers are sent after the pickle data, and the objects
+        # are rebuilt over the memory they are received into.
+        data = bytes(range(256)) * 1000
+        small = b'x' * 100
+        obj = [BufferHolder(data), BufferHolder(small),
+               BufferHolder(bytearray(data))]
+        conn.send(obj)
+        a, b, c = conn.recv()
+        self.assertIsInstance(a.data, memoryview)
+        self.assertEqual(a.data, data)
+        self.assertIsInstance(b.data, bytes)
+        self.assertEqual(b.data, small)
+        self.assertFalse(c.data.readonly)
+        self.assertEqual(c.data, data)
+
+        conn.send(obj)
+        parts = conn.recv_buffers()
+        self.assertEqual(len(parts), 3)
+        self.assertEqual(parts[1], data)
+
+        # Messages which are not out-of-band still go through recv_bytes().
+        for msg in ([1, 2], b'x' * 100000):
+            conn.send(msg)
+            self.assertEqual(pickle.loads(conn.recv_bytes()), msg)
+
+        conn.send_bytes(SENTINEL)
+        p.join()
+        conn.close()
+
+    def test_send_buffers_large(self):
+        if self.TYPE != 'processes':
+            self.skipTest('test not appropriate for {}'.format(self.TYPE))
+
+        conn, child_conn = self.Pipe()
+        p = self.Process(target=self._echo, args=(child_conn,))
+        p.daemon = True
+        p.start()
+        child_conn.close()
+
+        chunks = [bytes([i]) * (i * 1000) for i in range(100)]
+        conn.send_buffers(chunks)
+        self.assertEqual([bytes(part) for part in conn.recv_buffers()],
+                         chunks)
+
+        buffers = [bytearray(100 * 1000) for i in range(100)]
+        conn.send_buffers(chunks)
+        parts = conn.recv_buffers(buffers)
+        for i, part in enumerate(parts):
+            self.assertEqual(part, chunks[i])
+            self.assertEqual(buffers[i][:len(part)], chunks[i])
+
+        data = bytes(range(256)) * 1000
+        buf = bytearray(len(data) + 10)
+        conn.send_bytes(data)
+        self.assertEqual(conn.recv_bytes_into(buf, 10), len(data))
+        self.assertEqual(buf[10:], data)
+
+        conn.send_bytes(SENTINEL)
+        p.join()
+        conn.close()
+
     @classmethod
     def _is_fd_assigned(cls, fd):
         try:
@@ -4299,6 +4707,129 @@ class _TestSharedMemory(BaseTestCase):
                 with self.assertRaises(FileNotFoundError):
                     pickle.loads(serialized_sl)
 
+    def test_shared_memory_SharedArray_basics(self):
+        sa = shared_memory.SharedArray('int64', [1, 2, 3, 4])
+        self.addCleanup(sa.unlink)
+        self.addCleanup(sa.close)
+        self.assertEqual(sa.dtype, 'int64')
+        self.assertEqual(len(sa), 4)
+        self.assertEqual(list(sa), [1, 2, 3, 4])
+        self.assertEqual(sa[-1], 4)
+        self.assertEqual(sa[1:3], [2, 3])
+        self.assertEqual(sa[::2], [1, 3])
+        sa[0] = -2 ** 63
+        sa[2:] = array.array('q', [30, 40])
+        sa[1::2] = [20, 41]
+        self.assertEqual(sa.get(), [-2 ** 63, 20, 30, 41])
+        with sa.buf as view:
+            self.assertEqual(view.format, 'q')
+            self.assertEqual(view[1], 20)
+        # Releasing the view does not release the array.
+        self.assertEqual(sa[1], 20)
+        with self.assertRaises(ValueError):
+            sa[1:3] = [1]
+        with self.assertRaises(IndexError):
+            sa.set(3, [1, 2])
+        with self.assertRaises(IndexError):
+            sa[4]
+
+        # Attaching by name does not need the dtype.
+        other = shared_memory.SharedArray(name=sa.shm.name)
+        self.assertEqual(other.dtype, 'int64')
+        other[1] = 99
+        self.assertEqual(sa[1], 99)
+        other.close()
+
+        zeros = shared_memory.SharedArray('float64', 3)
+        self.addCleanup(zeros.unlink)
+        self.assertEqual(zeros[:], [0.0, 0.0, 0.0])
+        zeros.set(1, memoryview(array.array('d', [1.5, 2.5])))
+        self.assertEqual(zeros.get(1), [1.5, 2.5])
+        zeros.close()
+
+        strings = shared_memory.SharedArray('S4', [b'ab', b'abcd', b''])
+        self.addCleanup(strings.unlink)
+        self.assertEqual(strings[:], [b'ab', b'abcd', b''])
+        strings[-1] = b'xyz'
+        self.assertEqual(strings[::-1], [b'xyz', b'abcd', b'ab'])
+        with self.assertRaises(ValueError):
+            strings[0] = b'abcde'
+        strings.close()
+
+        for dtype in ('int32', 'S0', 'S', None):
+            with self.subTest(dtype=dtype):
+                with self.assertRaises(ValueError):
+                    shared_memory.SharedArray(dtype, 1)
+
+    def test_shared_memory_SharedTable_basics(self):
+        st = shared_memory.SharedTable(
+            [('id', 'int64'), ('score', 'float64'), ('tag', 'S8')], 5)
+        self.addCleanup(st.unlink)
+        self.addCleanup(st.close)
+        self.assertEqual(len(st), 5)
+        self.assertEqual(st.columns, ('id', 'score', 'tag'))
+        self.assertEqual(st.dtypes,
+                         {'id': 'int64', 'score': 'float64', 'tag': 'S8'})
+        self.assertEqual(st.row(0), (0, 0.0, b''))
+        st['id'].set(0, range(5))
+        st['score'][3:] = [0.5, 1.5]
+        st.set_row(1, (10, 2.5, b'ten'))
+        self.assertEqual(st.rows(1, 4),
+                         [(10, 2.5, b'ten'), (2, 0.0, b''), (3, 0.5, b'')])
+        self.assertIsInstance(st['tag'], shared_memory.SharedArray)
+        self.assertRaises(KeyError, st.__getitem__, 'missing')
+        self.assertRaises(ValueError, st.set_row, 0, (1, 2.0))
+        self.assertRaises(TypeError, pickle.dumps, st['id'])
+
+        other = shared_memory.SharedTable(name=st.shm.name)
+        self.assertEqual(other.dtypes, st.dtypes)
+        self.assertEqual(other.rows(), st.rows())
+        self.assertRaises(ValueError, shared_memory.SharedArray,
+                          name=st.shm.name)
+        other.close()
+
+        with self.assertRaises(ValueError):
+            shared_memory.SharedTable([('a', 'int64'), ('a', 'int64')], 1)
+        empty = shared_memory.SharedTable({'a': 'float64'})
+        self.addCleanup(empty.unlink)
+        self.assertEqual(empty.rows(), [])
+        empty.close()
+
+    @classmethod
+    def _fill_table(cls, st, start, stop):
+        st['id'].set(start, range(start, stop))
+        st['score'][start:stop] = [i / 2 for i in range(start, stop)]
+        st.close()
+
+    def test_shared_memory_SharedTable_pickling(self):
+        st = shared_memory.SharedTable({'id': 'int64', 'score': 'float64'}, 100)
+        self.addCleanup(st.unlink)
+        self.addCleanup(st.close)
+        for proto in range(pickle.HIGHEST_PROTOCOL + 1):
+            with self.subTest(proto=proto):
+                other = pickle.loads(pickle.dumps(st, protocol=proto))
+                self.assertIsNot(other, st)
+                other['id'][7] = proto
+                self.assertEqual(st['id'][7], proto)
+                other.close()
+
+        procs = [self.Process(target=self._fill_table, args=(st, i, i + 50))
+                 for i in (0, 50)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            join_process(p)
+            self.assertEqual(p.exitcode, 0)
+        self.assertEqual(st['id'][:], list(range(100)))
+        self.assertEqual(st['score'][99], 49.5)
+
+        sa = shared_memory.SharedArray('S2', [b'a'])
+        self.addCleanup(sa.unlink)
+        other = pickle.loads(pickle.dumps(sa))
+        self.assertEqual(other[0], b'a')
+        other.close()
+        sa.close()
+
     def test_shared_memory_cleaned_after_process_termination(self):
         cmd = '''if 1:
             import os, time, sys
@@ -5854,6 +6385,7 @@ class ProcessesMixin(BaseMixin):
     Pipe = staticmethod(multiprocessing.Pipe)
     Queue = staticmethod(multiprocessing.Queue)
     JoinableQueue = staticmethod(multiprocessing.JoinableQueue)
+    SharedMemoryQueue = staticmethod(multiprocessing.SharedMemoryQueue)
     Lock = staticmethod(multiprocessing.Lock)
     RLock = staticmethod(multiprocessing.RLock)
     Semaphore = staticmethod(multiprocessing.Semaphore)
@@ -2,6 +2,7 @@
 
 import concurrent.futures
 import errno
+import functools
 import math
 import socket
 import sys
@@ -1949,6 +1950,204 @@ class BaseEventLoopWithSelectorTests(test_utils.TestCase):
                          "took .* seconds$")
 
 
+class LoopStatsTests(test_utils.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.loop = asyncio.new_event_loop()
+        self.set_event_loop(self.loop)
+
+    def test_disabled(self):
+        self.assertIsNone(self.loop.get_stats())
+        self.loop.set_stats(True)
+        self.assertIsNotNone(self.loop.get_stats())
+        self.loop.set_stats(False)
+        self.assertIsNone(self.loop.get_stats())
+        with self.assertRaises(ValueError):
+            self.loop.set_stats(True, sample_interval=0)
+
+    def test_counters(self):
+        def callback():
+            pass
+
+        async def coro():
+            await asyncio.sleep(0.001)
+
+        self.loop.set_stats(True, sample_interval=1)
+        for i in range(5):
+            self.loop.call_soon(callback)
+        self.loop.run_until_complete(coro())
+
+        stats = self.loop.get_stats()
+        self.assertGreater(stats.iterations, 1)
+        self.assertGreaterEqual(stats.handles, 8)
+        self.assertGreaterEqual(stats.max_ready, 5)
+        self.assertEqual(stats.timers, 1)
+        self.assertGreaterEqual(stats.select_time, 0)
+        self.assertGreater(stats.callback_time, 0)
+        counts = stats.durations[callback.__qualname__]
+        self.assertEqual(len(counts), len(stats.buckets) + 1)
+        self.assertEqual(sum(counts), 5)
+        # The steps of a task are counted under its coroutine.
+        self.assertEqual(sum(stats.durations[coro.__qualname__]), 2)
+        self.assertEqual(sum(map(sum, stats.durations.values())),
+                         stats.handles)
+
+        # A snapshot does not change.
+        self.loop.call_soon(callback)
+        self.loop.call_later(60, callback)
+        self.loop.run_until_complete(coro())
+        self.assertEqual(sum(counts), 5)
+        stats2 = self.loop.get_stats()
+        self.assertEqual(sum(stats2.durations[callback.__qualname__]), 6)
+        self.assertEqual(stats2.scheduled, 1)
+        self.assertEqual(stats2.ready, 0)
+
+        # Enabling the statistics again resets them.
+        self.loop.set_stats(True)
+        self.assertEqual(self.loop.get_stats().handles, 0)
+
+    def test_sampling(self):
+        names = []
+        self.loop.set_stats(True, sample_interval=4)
+        for i in range(10):
+            self.loop.call_soon(functools.partial(names.append, i))
+        self.loop.call_soon(self.loop.stop)
+        self.loop.run_forever()
+        stats = self.loop.get_stats()
+        self.assertEqual(stats.handles, 11)
+        self.assertEqual(stats.sample_interval, 4)
+        self.assertEqual(sum(map(sum, stats.durations.values())), 2)
+        self.assertIn(names.append.__qualname__, stats.durations)
+
+    def test_timer_lag(self):
+        self.loop.set_stats(True)
+        self.loop.call_at(self.loop.time() - 1, self.loop.stop)
+        self.loop.run_forever()
+        stats = self.loop.get_stats()
+        self.assertEqual(stats.timers, 1)
+        self.assertGreaterEqual(stats.max_timer_lag, 1)
+        self.assertEqual(stats.timer_lag, stats.max_timer_lag)
+
+    def test_get_stats_from_other_thread(self):
+        async def work(i):
+            for j in range(i % 5):
+                await asyncio.sleep(0)
+
+        self.loop.set_stats(True, sample_interval=1)
+        snapshots = []
+        def poll():
+            while not done.is_set():
+                snapshots.append(self.loop.get_stats())
+
+        done = threading.Event()
+        thread = threading.Thread(target=poll)
+        thread.start()
+        try:
+            async def main():
+                await asyncio.gather(*[work(i) for i in range(500)])
+            self.loop.run_until_complete(main())
+        finally:
+            done.set()
+            thread.join()
+        self.assertTrue(snapshots)
+        self.assertGreaterEqual(self.loop.get_stats().handles, 1000)
+
+
+class TimerWheelTests(test_utils.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.loop = asyncio.new_event_loop()
+        self.set_event_loop(self.loop)
+
+    def handle(self, when):
+        return asyncio.TimerHandle(when, lambda: None, (), self.loop)
+
+    def test_wheel_levels(self):
+        wheel = base_events._TimerWheel(1, 0)
+        whens = [0, 1, 255, 256, 1000, 65535, 65536, 100000, 2 ** 24]
+        handles = [self.handle(when) for when in whens]
+        for handle in handles:
+            self.assertTrue(wheel.add(handle))
+        self.assertFalse(wheel.add(self.handle(2 ** 32)))
+        self.assertEqual(len(wheel), len(handles))
+
+        expired = []
+        while wheel:
+            when = wheel.next_expiry()
+            self.assertIsNotNone(when)
+            for handle in wheel.expire(when):
+                self.assertLessEqual(handle.when(), when)
+                self.assertFalse(handle._scheduled)
+                expired.append(handle.when())
+        self.assertEqual(expired, whens)
+        self.assertIsNone(wheel.next_expiry())
+
+    def test_wheel_cancel(self):
+        wheel = base_events._TimerWheel(1, 0)
+        handle = self.handle(300)
+        wheel.add(handle)
+        self.assertIsInstance(handle._scheduled, dict)
+        self.loop._timer_handle_cancelled(handle)
+        self.assertFalse(handle._scheduled)
+        self.assertEqual(len(wheel), 0)
+        self.assertEqual(wheel.expire(1000), [])
+
+    def test_wheel_rounds_up(self):
+        wheel = base_events._TimerWheel(0.5, 10)
+        handle = self.handle(10.2)
+        wheel.add(handle)
+        self.assertEqual(wheel.next_expiry(), 10.5)
+        self.assertEqual(wheel.expire(10.2), [])
+        self.assertEqual(wheel.expire(10.5), [handle])
+
+    def test_set_timer_wheel(self):
+        self.assertIsNone(self.loop.get_timer_wheel())
+        with self.assertRaises(ValueError):
+            self.loop.set_timer_wheel(True, tick=0)
+        self.loop.set_timer_wheel(True, tick=0.01)
+        self.assertEqual(self.loop.get_timer_wheel(), 0.01)
+
+        when = self.loop.time() + 60
+        handle = self.loop.call_timeout_at(when, lambda: None)
+        self.assertEqual(handle.when(), when)
+        self.assertFalse(self.loop._scheduled)
+        # Timeouts too far ahead use the heap.
+        far = self.loop.call_timeout_at(when + 10 ** 8, lambda: None)
+        self.assertEqual(self.loop._scheduled, [far])
+
+        # Disabling the wheel moves its timeouts to the heap.
+        self.loop.set_timer_wheel(False)
+        self.assertIsNone(self.loop.get_timer_wheel())
+        self.assertEqual(sorted(self.loop._scheduled), [handle, far])
+        self.assertIs(handle._scheduled, True)
+        self.assertIsInstance(self.loop.call_timeout_at(when, lambda: None),
+                              asyncio.TimerHandle)
+        self.assertEqual(len(self.loop._scheduled), 3)
+
+    def test_call_timeout_at(self):
+        self.loop.set_timer_wheel(True, tick=0.01)
+        calls = []
+        start = self.loop.time()
+        when = start + 0.05
+        self.loop.call_timeout_at(when, calls.append, 'late')
+        self.loop.call_timeout_at(start + 0.02, calls.append, 'early')
+        cancelled = self.loop.call_timeout_at(start + 0.03, calls.append, 'x')
+        cancelled.cancel()
+        self.assertEqual(len(self.loop._timer_wheel), 2)
+        self.loop.call_at(when + 0.01, self.loop.stop)
+        self.loop.run_forever()
+        self.assertEqual(calls, ['early', 'late'])
+        self.assertGreaterEqual(self.loop.time(), when)
+        self.assertEqual(len(self.loop._timer_wheel), 0)
+
+    def test_close(self):
+        self.loop.set_timer_wheel(True)
+        self.loop.close()
+        self.assertIsNone(self.loop.get_timer_wheel())
+
+
 class RunningLoopTests(unittest.TestCase):
 
     def test_running_loop_within_a_loop(self):
@@ -10,6 +10,7 @@ import threading
 import unittest
 from unittest import mock
 import warnings
+from test import support
 from test.support import socket_helper
 try:
     import ssl
@@ -129,13 +130,13 @@ class StreamTests(test_utils.TestCase):
         stream = asyncio.StreamReader(loop=self.loop)
 
         stream.feed_data(b'')
-        self.assertEqual(b'', stream._buffer)
+        self.assertEqual(b'', bytes(stream._buffer))
 
     def test_feed_nonempty_data(self):
         stream = asyncio.StreamReader(loop=self.loop)
 
         stream.feed_data(self.DATA)
-        self.assertEqual(self.DATA, stream._buffer)
+        self.assertEqual(self.DATA, bytes(stream._buffer))
 
     def test_read_zero(self):
         # Read zero bytes.
@@ -144,7 +145,7 @@ class StreamTests(test_utils.TestCase):
 
         data = self.loop.run_until_complete(stream.read(0))
         self.assertEqual(b'', data)
-        self.assertEqual(self.DATA, stream._buffer)
+        self.assertEqual(self.DATA, bytes(stream._buffer))
 
     def test_read(self):
         # Read bytes.
@@ -157,7 +158,7 @@ class StreamTests(test_utils.TestCase):
 
         data = self.loop.run_until_complete(read_task)
         self.assertEqual(self.DATA, data)
-        self.assertEqual(b'', stream._buffer)
+        self.assertEqual(b'', bytes(stream._buffer))
 
     def test_read_line_breaks(self):
         # Read bytes without line breaks.
@@ -168,7 +169,7 @@ class StreamTests(test_utils.TestCase):
         data = self.loop.run_until_complete(stream.read(5))
 
         self.assertEqual(b'line1', data)
-        self.assertEqual(b'line2', stream._buffer)
+        self.assertEqual(b'line2', bytes(stream._buffer))
 
     def test_read_eof(self):
         # Read bytes, stop at eof.
@@ -181,7 +182,7 @@ class StreamTests(test_utils.TestCase):
 
         data = self.loop.run_until_complete(read_task)
         self.assertEqual(b'', data)
-        self.assertEqual(b'', stream._buffer)
+        self.assertEqual(b'', bytes(stream._buffer))
 
     def test_read_until_eof(self):
         # Read all bytes until eof.
@@ -197,7 +198,7 @@ class StreamTests(test_utils.TestCase):
         data = self.loop.run_until_complete(read_task)
 
         self.assertEqual(b'chunk1\nchunk2', data)
-        self.assertEqual(b'', stream._buffer)
+        self.assertEqual(b'', bytes(stream._buffer))
 
     def test_read_exception(self):
         stream = asyncio.StreamReader(loop=self.loop)
@@ -222,7 +223,7 @@ class StreamTests(test_utils.TestCase):
         stream.feed_data(b'chunk')
         data = self.loop.run_until_complete(stream.read(5))
         self.assertEqual(b'chunk', data)
-        self.assertEqual(b'', stream._buffer)
+        self.assertEqual(b'', bytes(stream._buffer))
 
     def test_readline(self):
         # Read one line. 'readline' will need to wait for the data
@@ -239,7 +240,7 @@ class StreamTests(test_utils.TestCase):
 
         line = self.loop.run_until_complete(read_task)
         self.assertEqual(b'chunk1 chunk2 chunk3 \n', line)
-        self.assertEqual(b' chunk4', stream._buffer)
+        self.assertEqual(b' chunk4', bytes(stream._buffer))
 
     def test_readline_limit_with_existing_data(self):
         # Read one line. The data is in StreamReader's buffer
@@ -252,7 +253,7 @@ class StreamTests(test_utils.TestCase):
         self.assertRaises(
             ValueError, self.loop.run_until_complete, stream.readline())
         # The buffer should contain the remaining data after exception
-        self.assertEqual(b'line2\n', stream._buffer)
+        self.assertEqual(b'line2\n', bytes(stream._buffer))
 
         stream = asyncio.StreamReader(limit=3, loop=self.loop)
         stream.feed_data(b'li')
@@ -266,7 +267,7 @@ class StreamTests(test_utils.TestCase):
         # the entire buffer, and since the length of the consumed data
         # is more than 3, it will raise a ValueError. The buffer is
         # expected to be empty now.
-        self.assertEqual(b'', stream._buffer)
+        self.assertEqual(b'', bytes(stream._buffer))
 
     def test_at_eof(self):
         stream = asyncio.StreamReader(loop=self.loop)
@@ -299,7 +300,7 @@ class StreamTests(test_utils.TestCase):
             ValueError, self.loop.run_until_complete, stream.readline())
         # The buffer had just one line of data, and after raising
         # a ValueError it should be empty.
-        self.assertEqual(b'', stream._buffer)
+        self.assertEqual(b'', bytes(stream._buffer))
 
         stream = asyncio.StreamReader(limit=7, loop=self.loop)
         def cb():
@@ -311,24 +312,24 @@ class StreamTests(test_utils.TestCase):
 
         self.assertRaises(
             ValueError, self.loop.run_until_complete, stream.readline())
-        self.assertEqual(b'chunk3\n', stream._buffer)
+        self.assertEqual(b'chunk3\n', bytes(stream._buffer))
 
         # check strictness of the limit
         stream = asyncio.StreamReader(limit=7, loop=self.loop)
         stream.feed_data(b'1234567\n')
         line = self.loop.run_until_complete(stream.readline())
         self.assertEqual(b'1234567\n', line)
-        self.assertEqual(b'', stream._buffer)
+        self.assertEqual(b'', bytes(stream._buffer))
 
         stream.feed_data(b'12345678\n')
         with self.assertRaises(ValueError) as cm:
             self.loop.run_until_complete(stream.readline())
-        self.assertEqual(b'', stream._buffer)
+        self.assertEqual(b'', bytes(stream._buffer))
 
         stream.feed_data(b'12345678')
         with self.assertRaises(ValueError) as cm:
             self.loop.run_until_complete(stream.readline())
-        self.assertEqual(b'', stream._buffer)
+        self.assertEqual(b'', bytes(stream._buffer))
 
     def test_readline_nolimit_nowait(self):
         # All needed data for the first 'readline' call will be
@@ -340,7 +341,7 @@ class StreamTests(test_utils.TestCase):
         line = self.loop.run_until_complete(stream.readline())
 
         self.assertEqual(b'line1\n', line)
-        self.assertEqual(b'line2\nline3\n', stream._buffer)
+        self.assertEqual(b'line2\nline3\n', bytes(stream._buffer))
 
     def test_readline_eof(self):
         stream = asyncio.StreamReader(loop=self.loop)
@@ -366,7 +367,7 @@ class StreamTests(test_utils.TestCase):
         data = self.loop.run_until_complete(stream.read(7))
 
         self.assertEqual(b'line2\nl', data)
-        self.assertEqual(b'ine3\n', stream._buffer)
+        self.assertEqual(b'ine3\n', bytes(stream._buffer))
 
     def test_readline_exception(self):
         stream = asyncio.StreamReader(loop=self.loop)
@@ -378,7 +379,7 @@ class StreamTests(test_utils.TestCase):
         stream.set_exception(ValueError())
         self.assertRaises(
             ValueError, self.loop.run_until_complete, stream.readline())
-        self.assertEqual(b'', stream._buffer)
+        self.assertEqual(b'', bytes(stream._buffer))
 
     def test_readuntil_separator(self):
         stream = asyncio.StreamReader(loop=self.loop)
@@ -391,17 +392,17 @@ class StreamTests(test_utils.TestCase):
         stream.feed_data(b'lineAAA')
         data = self.loop.run_until_complete(stream.readuntil(separator=b'AAA'))
         self.assertEqual(b'lineAAA', data)
-        self.assertEqual(b'', stream._buffer)
+        self.assertEqual(b'', bytes(stream._buffer))
 
         stream.feed_data(b'lineAAA')
         data = self.loop.run_until_complete(stream.readuntil(b'AAA'))
         self.assertEqual(b'lineAAA', data)
-        self.assertEqual(b'', stream._buffer)
+        self.assertEqual(b'', bytes(stream._buffer))
 
         stream.feed_data(b'lineAAAxxx')
         data = self.loop.run_until_complete(stream.readuntil(b'AAA'))
         self.assertEqual(b'lineAAA', data)
-        self.assertEqual(b'xxx', stream._buffer)
+        self.assertEqual(b'xxx', bytes(stream._buffer))
 
     def test_readuntil_multi_chunks_1(self):
         stream = asyncio.StreamReader(loop=self.loop)
@@ -411,24 +412,24 @@ class StreamTests(test_utils.TestCase):
         stream.feed_data(b'a')
         data = self.loop.run_until_complete(stream.readuntil(b'aaa'))
         self.assertEqual(b'QWEaaXYaaa', data)
-        self.assertEqual(b'', stream._buffer)
+        self.assertEqual(b'', bytes(stream._buffer))
 
         stream.feed_data(b'QWEaa')
         stream.feed_data(b'XYa')
         stream.feed_data(b'aa')
         data = self.loop.run_until_complete(stream.readuntil(b'aaa'))
         self.assertEqual(b'QWEaaXYaaa', data)
-        self.assertEqual(b'', stream._buffer)
+        self.assertEqual(b'', bytes(stream._buffer))
 
         stream.feed_data(b'aaa')
         data = self.loop.run_until_complete(stream.readuntil(b'aaa'))
         self.assertEqual(b'aaa', data)
-        self.assertEqual(b'', stream._buffer)
+        self.assertEqual(b'', bytes(stream._buffer))
 
         stream.feed_data(b'Xaaa')
         data = self.loop.run_until_complete(stream.readuntil(b'aaa'))
         self.assertEqual(b'Xaaa', data)
-        self.assertEqual(b'', stream._buffer)
+        self.assertEqual(b'', bytes(stream._buffer))
 
         stream.feed_data(b'XXX')
         stream.feed_data(b'a')
@@ -436,7 +437,7 @@ class StreamTests(test_utils.TestCase):
         stream.feed_data(b'a')
         data = self.loop.run_until_complete(stream.readuntil(b'aaa'))
         self.assertEqual(b'XXXaaa', data)
-        self.assertEqual(b'', stream._buffer)
+        self.assertEqual(b'', bytes(stream._buffer))
 
     def test_readuntil_eof(self):
         stream = asyncio.StreamReader(loop=self.loop)
@@ -449,7 +450,7 @@ class StreamTests(test_utils.TestCase):
             self.loop.run_until_complete(stream.readuntil(b'AAA'))
         self.assertEqual(cm.exception.partial, data)
         self.assertIsNone(cm.exception.expected)
-        self.assertEqual(b'', stream._buffer)
+        self.assertEqual(b'', bytes(stream._buffer))
 
     def test_readuntil_limit_found_sep(self):
         stream = asyncio.StreamReader(loop=self.loop, limit=3)
@@ -458,14 +459,14 @@ class StreamTests(test_utils.TestCase):
                                     'not found') as cm:
             self.loop.run_until_complete(stream.readuntil(b'AAA'))
 
-        self.assertEqual(b'some dataAA', stream._buffer)
+        self.assertEqual(b'some dataAA', bytes(stream._buffer))
 
         stream.feed_data(b'A')
         with self.assertRaisesRegex(asyncio.LimitOverrunError,
                                     'is found') as cm:
             self.loop.run_until_complete(stream.readuntil(b'AAA'))
 
-        self.assertEqual(b'some dataAAA', stream._buffer)
+        self.assertEqual(b'some dataAAA', bytes(stream._buffer))
 
     def test_readexactly_zero_or_less(self):
         # Read exact number of bytes (zero or less).
@@ -474,11 +475,11 @@ class StreamTests(test_utils.TestCase):
 
         data = self.loop.run_until_complete(stream.readexactly(0))
         self.assertEqual(b'', data)
-        self.assertEqual(self.DATA, stream._buffer)
+        self.assertEqual(self.DATA, bytes(stream._buffer))
 
         with self.assertRaisesRegex(ValueError, 'less than zero'):
             self.loop.run_until_complete(stream.readexactly(-1))
-        self.assertEqual(self.DATA, stream._buffer)
+        self.assertEqual(self.DATA, bytes(stream._buffer))
 
     def test_readexactly(self):
         # Read exact number of bytes.
@@ -495,14 +496,14 @@ class StreamTests(test_utils.TestCase):
 
         data = self.loop.run_until_complete(read_task)
         self.assertEqual(self.DATA + self.DATA, data)
-        self.assertEqual(self.DATA, stream._buffer)
+        self.assertEqual(self.DATA, bytes(stream._buffer))
 
     def test_readexactly_limit(self):
         stream = asyncio.StreamReader(limit=3, loop=self.loop)
         stream.feed_data(b'chunk')
         data = self.loop.run_until_complete(stream.readexactly(5))
         self.assertEqual(b'chunk', data)
-        self.assertEqual(b'', stream._buffer)
+        self.assertEqual(b'', bytes(stream._buffer))
 
     def test_readexactly_eof(self):
         # Read exact number of bytes (eof).
@@ -521,7 +522,7 @@ class StreamTests(test_utils.TestCase):
         self.assertEqual(cm.exception.expected, n)
         self.assertEqual(str(cm.exception),
                          '18 bytes read on a total of 36 expected bytes')
-        self.assertEqual(b'', stream._buffer)
+        self.assertEqual(b'', bytes(stream._buffer))
 
     def test_readexactly_exception(self):
         stream = asyncio.StreamReader(loop=self.loop)
@@ -534,6 +535,186 @@ class StreamTests(test_utils.TestCase):
         self.assertRaises(
             ValueError, self.loop.run_until_complete, stream.readexactly(2))
 
+    def test_readinto(self):
+        stream = asyncio.StreamReader(loop=self.loop)
+        buf = bytearray(8)
+        read_task = self.loop.create_task(stream.readinto(buf))
+        self.loop.call_soon(stream.feed_data, self.DATA)
+
+        n = self.loop.run_until_complete(read_task)
+        self.assertEqual(n, 8)
+        self.assertEqual(buf, self.DATA[:8])
+        self.assertEqual(self.DATA[8:], bytes(stream._buffer))
+
+        n = self.loop.run_until_complete(stream.readinto(memoryview(buf)[2:]))
+        self.assertEqual(n, 6)
+        self.assertEqual(buf, self.DATA[:2] + self.DATA[8:14])
+
+        stream.feed_eof()
+        n = self.loop.run_until_complete(stream.readinto(buf))
+        self.assertEqual(n, len(self.DATA) - 14)
+        self.assertEqual(self.loop.run_until_complete(stream.readinto(buf)), 0)
+        with self.assertRaises(TypeError):
+            self.loop.run_until_complete(stream.readinto(b'readonly'))
+
+    def test_readexactly_into(self):
+        stream = asyncio.StreamReader(loop=self.loop)
+        stream.feed_data(b'abc')
+        buf = bytearray(2 * len(self.DATA))
+        read_task = self.loop.create_task(stream.readexactly_into(buf))
+
+        def cb():
+            # The data goes directly to the buffer of readexactly_into().
+            self.assertEqual(len(stream._get_buffer()), len(buf) - 3)
+            stream.feed_data(self.DATA)
+            stream.feed_data(self.DATA)
+        self.loop.call_soon(cb)
+
+        self.assertIsNone(self.loop.run_until_complete(read_task))
+        self.assertEqual(buf, (b'abc' + self.DATA + self.DATA)[:len(buf)])
+        self.assertEqual(self.DATA[-3:], bytes(stream._buffer))
+
+    def test_readexactly_into_buffer_updated(self):
+        stream = asyncio.StreamReader(loop=self.loop)
+        protocol = asyncio.StreamReaderProtocol(stream, loop=self.loop)
+        self.assertIsInstance(protocol, asyncio.BufferedProtocol)
+        data = bytes(range(256)) * 1024
+
+        # The buffer of the stream grows as needed.
+        for i in range(0, len(data), 1000):
+            chunk = data[i:i + 1000]
+            buf = protocol.get_buffer(-1)
+            self.assertGreaterEqual(len(buf), len(chunk))
+            buf[:len(chunk)] = chunk
+            protocol.buffer_updated(len(chunk))
+        self.assertEqual(bytes(stream._buffer), data)
+        self.assertEqual(
+            self.loop.run_until_complete(stream.readexactly(len(data) - 10)),
+            data[:-10])
+
+        result = bytearray(len(data) + 10)
+        read_task = self.loop.create_task(stream.readexactly_into(result))
+        test_utils.run_briefly(self.loop)
+        buf = protocol.get_buffer(-1)
+        self.assertEqual(len(buf), len(data))
+        buf[:] = data
+        protocol.buffer_updated(len(data))
+        self.loop.run_until_complete(read_task)
+        self.assertEqual(result, data[-10:] + data)
+        self.assertEqual(len(stream._buffer), 0)
+
+    def test_readexactly_into_eof(self):
+        stream = asyncio.StreamReader(loop=self.loop)
+        buf = bytearray(2 * len(self.DATA))
+        read_task = self.loop.create_task(stream.readexactly_into(buf))
+
+        def cb():
+            stream.feed_data(self.DATA)
+            stream.feed_eof()
+        self.loop.call_soon(cb)
+
+        with self.assertRaises(asyncio.IncompleteReadError) as cm:
+            self.loop.run_until_complete(read_task)
+        self.assertEqual(cm.exception.partial, self.DATA)
+        self.assertEqual(cm.exception.expected, len(buf))
+        self.assertEqual(b'', bytes(stream._buffer))
+
+    def test_readexactly_into_cancelled(self):
+        stream = asyncio.StreamReader(loop=self.loop)
+        stream.feed_data(b'abc')
+        buf = bytearray(2 * len(self.DATA))
+        read_task = self.loop.create_task(stream.readexactly_into(buf))
+        test_utils.run_briefly(self.loop)
+        stream.feed_data(self.DATA)
+        read_task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            self.loop.run_until_complete(read_task)
+
+        # The data read into buf is kept in the stream.
+        self.assertIsNone(stream._target)
+        stream.feed_data(b'xyz')
+        self.assertEqual(b'abc' + self.DATA + b'xyz', bytes(stream._buffer))
+
+    def test_read_into_released(self):
+        # No view of the buffer outlives the call, even in the traceback
+        # kept by the task.
+        for method in ('readinto', 'readexactly_into'):
+            for cancel in (True, False):
+                with self.subTest(method=method, cancel=cancel):
+                    stream = asyncio.StreamReader(loop=self.loop)
+                    buf = bytearray(8)
+                    read_task = self.loop.create_task(
+                        getattr(stream, method)(buf))
+                    test_utils.run_briefly(self.loop)
+                    if cancel:
+                        read_task.cancel()
+                    else:
+                        stream.set_exception(ValueError())
+                    self.loop.run_until_complete(asyncio.wait([read_task]))
+                    if not cancel:
+                        self.assertIsInstance(read_task.exception(),
+                                              ValueError)
+                    buf.extend(b'resized')
+
+    def test_readuntil_large(self):
+        stream = asyncio.StreamReader(loop=self.loop, limit=2 ** 20)
+        frame = b'x' * 500_000 + b'\r\n\r\n'
+        read_task = self.loop.create_task(stream.readuntil(b'\r\n\r\n'))
+
+        def cb():
+            for i in range(0, len(frame), 1000):
+                stream.feed_data(frame[i:i + 1000])
+            stream.feed_data(b'rest')
+        self.loop.call_soon(cb)
+
+        self.assertEqual(self.loop.run_until_complete(read_task), frame)
+        self.assertEqual(b'rest', bytes(stream._buffer))
+
+    def test_readexactly_into_socket(self):
+        size = 2 ** 22
+        data = os.urandom(size)
+
+        async def main():
+            rsock, wsock = socket.socketpair()
+            reader, rwriter = await asyncio.open_connection(sock=rsock)
+            _, writer = await asyncio.open_connection(sock=wsock)
+            writer.write(data)
+            header = await reader.readexactly(10)
+            buf = bytearray(size - 10)
+            await reader.readexactly_into(buf)
+            writer.close()
+            rwriter.close()
+            await writer.wait_closed()
+            await rwriter.wait_closed()
+            return header + buf
+
+        self.assertEqual(self.loop.run_until_complete(main()), data)
+
+    def test_data_received_overridden(self):
+        # Subclasses overriding data_received() still get all the data.
+        received = []
+
+        class Protocol(asyncio.StreamReaderProtocol):
+            def data_received(self, data):
+                received.append(data)
+                super().data_received(data.upper())
+
+        async def main():
+            rsock, wsock = socket.socketpair()
+            with wsock:
+                reader = asyncio.StreamReader()
+                transport, _ = await self.loop.connect_accepted_socket(
+                    lambda: Protocol(reader), rsock)
+                wsock.sendall(b'abcdef')
+                async with asyncio.timeout(support.SHORT_TIMEOUT):
+                    data = await reader.readexactly(6)
+                transport.close()
+                return data
+
+        self.assertEqual(self.loop.run_until_complete(main()), b'ABCDEF')
+        self.assertEqual(b''.join(received), b'abcdef')
+        self.assertTrue(all(type(data) is bytes for data in received))
+
     def test_exception(self):
         stream = asyncio.StreamReader(loop=self.loop)
         self.assertIsNone(stream.exception())
@@ -217,6 +217,23 @@ class TimeoutTests(unittest.IsolatedAsyncioTestCase):
             await task
         self.assertFalse(cm.expired())
 
+    async def test_timer_wheel(self):
+        loop = asyncio.get_running_loop()
+        loop.set_timer_wheel(True)
+        try:
+            with self.assertRaises(TimeoutError):
+                async with asyncio.timeout(0.01) as cm:
+                    await asyncio.sleep(10)
+            self.assertTrue(cm.expired())
+
+            async with asyncio.timeout(0.01) as cm:
+                cm.reschedule(loop.time() + 10)
+                await asyncio.sleep(0.02)
+            self.assertFalse(cm.expired())
+            self.assertEqual(len(loop._timer_wheel), 0)
+        finally:
+            loop.set_timer_wheel(False)
+
     async def test_repr_active(self):
         async with asyncio.timeout(10) as cm:
             self.assertRegex(repr(cm), r"<Timeout \[active\] when=\d+\.\d*>")
@@ -248,5 +265,40 @@ class TimeoutTests(unittest.IsolatedAsyncioTestCase):
                             await asyncio.sleep(10)
 
 
+class DuckTypedLoopTests(unittest.TestCase):
+    # Loops which do not derive from AbstractEventLoop may lack
+    # call_timeout_at().
+
+    class Loop(asyncio.SelectorEventLoop):
+        def __getattribute__(self, name):
+            if name == 'call_timeout_at':
+                raise AttributeError(name)
+            return super().__getattribute__(name)
+
+    def test_timeout(self):
+        async def main():
+            with self.assertRaises(TimeoutError):
+                async with asyncio.timeout(0.01) as cm:
+                    await asyncio.sleep(10)
+            self.assertTrue(cm.expired())
+            async with asyncio.timeout(None) as cm:
+                cm.reschedule(asyncio.get_running_loop().time() + 10)
+                await asyncio.sleep(0)
+            self.assertFalse(cm.expired())
+
+        with asyncio.Runner(loop_factory=self.Loop) as runner:
+            runner.run(main())
+
+    def test_wait(self):
+        async def main():
+            task = asyncio.create_task(asyncio.sleep(10))
+            done, pending = await asyncio.wait([task], timeout=0.01)
+            self.assertEqual((done, pending), (set(), {task}))
+            task.cancel()
+
+        with asyncio.Runner(loop_factory=self.Loop) as runner:
+            runner.run(main())
+
+
 if __name__ == '__main__':
     unittest.main()
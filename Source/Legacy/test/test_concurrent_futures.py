@@ -8,7 +8,9 @@ import_helper.import_module('_multiprocessing')
 from test.support import hashlib_helper
 from test.support.script_helper import assert_python_ok
 
+import array
 import contextlib
+import glob
 import itertools
 import logging
 from logging.handlers import QueueHandler
@@ -61,6 +63,9 @@ def mul(x, y):
 def capture(*args, **kwargs):
     return args, kwargs
 
+def shared_memory_segments(*args):
+    return set(glob.glob('/dev/shm/psm_*'))
+
 def sleep_and_raise(t):
     time.sleep(t)
     raise Exception('this is an exception')
@@ -150,6 +155,11 @@ class ThreadPoolMixin(ExecutorMixin):
     executor_type = futures.ThreadPoolExecutor
 
 
+class AdaptiveThreadPoolMixin(ThreadPoolMixin):
+    executor_kwargs = dict(keep_alive=support.SHORT_TIMEOUT,
+                           work_stealing=True)
+
+
 class ProcessPoolForkMixin(ExecutorMixin):
     executor_type = futures.ProcessPoolExecutor
     ctx = "fork"
@@ -845,6 +855,103 @@ class ExecutorTest:
 
         self.assertEqual([None, None], results)
 
+    def test_map_buffersize_type_validation(self):
+        for buffersize in ("foo", 2.0):
+            with self.subTest(buffersize=buffersize):
+                with self.assertRaisesRegex(
+                    TypeError,
+                    "buffersize must be an integer or None",
+                ):
+                    self.executor.map(str, range(4), buffersize=buffersize)
+
+    def test_map_buffersize_value_validation(self):
+        for buffersize in (0, -1):
+            with self.subTest(buffersize=buffersize):
+                with self.assertRaisesRegex(
+                    ValueError,
+                    "buffersize must be None or > 0",
+                ):
+                    self.executor.map(str, range(4), buffersize=buffersize)
+
+    def test_map_buffersize(self):
+        ints = range(4)
+        for buffersize in (1, 2, len(ints), len(ints) * 2):
+            with self.subTest(buffersize=buffersize):
+                res = self.executor.map(str, ints, buffersize=buffersize)
+                self.assertListEqual(list(res), ["0", "1", "2", "3"])
+                res = self.executor.map(str, ints, buffersize=buffersize,
+                                        chunksize=3)
+                self.assertListEqual(list(res), ["0", "1", "2", "3"])
+
+    def test_map_buffersize_on_infinite_iterable(self):
+        res = self.executor.map(str, itertools.count(), buffersize=2)
+        self.assertEqual(next(res, None), "0")
+        self.assertEqual(next(res, None), "1")
+        self.assertEqual(next(res, None), "2")
+
+    def test_map_buffersize_does_not_consume_ahead(self):
+        it = iter(range(10))
+        res = self.executor.map(str, it, buffersize=2)
+        self.assertEqual(next(it), 2)
+        self.assertEqual(next(res), "0")
+        # Yielding a result submits exactly one more task.
+        self.assertEqual(next(it), 4)
+        self.assertEqual(list(res), ["1", "3", "5", "6", "7", "8", "9"])
+
+    def test_map_unordered(self):
+        for kwargs in ({}, {'buffersize': 2}, {'chunksize': 3},
+                       {'timeout': support.SHORT_TIMEOUT}):
+            with self.subTest(**kwargs):
+                res = self.executor.map(pow, range(10), range(10),
+                                        ordered=False, **kwargs)
+                self.assertCountEqual(list(res),
+                                      list(map(pow, range(10), range(10))))
+
+    def test_map_unordered_yields_first_done(self):
+        # The first call only returns once the result of the second one
+        # has been yielded.
+        if hasattr(self, "ctx"):
+            mgr = self.get_context().Manager()
+            self.addCleanup(mgr.shutdown)
+            event = mgr.Event()
+        else:
+            event = threading.Event()
+        res = self.executor.map(event.wait, [support.SHORT_TIMEOUT, 0],
+                                ordered=False)
+        self.assertIs(next(res), False)
+        event.set()
+        self.assertIs(next(res), True)
+
+    def test_map_unordered_exception(self):
+        res = self.executor.map(divmod, [1, 1], [0, 0], ordered=False)
+        self.assertRaises(ZeroDivisionError, list, res)
+
+    def test_submit_many(self):
+        fs = self.executor.submit_many(pow, [(2, 8), (3, 2), (2, -1)])
+        self.assertEqual([f.result() for f in fs], [256, 9, 0.5])
+        self.assertEqual(self.executor.submit_many(pow, iter([])), [])
+        fs = self.executor.submit_many(divmod, [(1, 0)])
+        self.assertRaises(ZeroDivisionError, fs[0].result)
+
+    def test_map_calls_overridden_submit(self):
+        submitted = []
+        class CountingExecutor(type(self.executor)):
+            def submit(self, fn, /, *args, **kwargs):
+                submitted.append(args)
+                return super().submit(fn, *args, **kwargs)
+        self.executor.__class__ = CountingExecutor
+        self.assertEqual(list(self.executor.map(pow, [2, 3], [2, 2])), [4, 9])
+        self.assertEqual(len(submitted), 2)
+        del submitted[:]
+        self.assertEqual(list(self.executor.map(pow, [2, 3, 4], [2, 2, 2],
+                                                buffersize=1)), [4, 9, 16])
+        self.assertEqual(len(submitted), 3)
+
+    def test_submit_many_after_shutdown(self):
+        self.executor.shutdown()
+        self.assertRaises(RuntimeError,
+                          self.executor.submit_many, pow, [(2, 3)])
+
     def test_shutdown_race_issue12456(self):
         # Issue #12456: race condition at shutdown where trying to post a
         # sentinel in the call queue blocks (the queue is full while processes
@@ -964,6 +1071,95 @@ class ThreadPoolExecutorTest(ThreadPoolMixin, ExecutorTest, BaseTestCase):
         self.assertListEqual(log, ["ident='first' started", "ident='first' stopped"])
 
 
+class AdaptiveThreadPoolExecutorTest(AdaptiveThreadPoolMixin, ExecutorTest,
+                                     BaseTestCase):
+    def test_invalid_keep_alive(self):
+        self.assertRaises(ValueError, self.executor_type, keep_alive=0)
+
+    def test_idle_workers_exit(self):
+        executor = self.executor_type(4, keep_alive=0.05)
+        started = threading.Barrier(5)
+        futs = [executor.submit(started.wait) for _ in range(4)]
+        started.wait()
+        futures.wait(futs)
+        self.assertEqual(len(executor._threads), 4)
+        for _ in support.sleeping_retry(support.SHORT_TIMEOUT):
+            if not executor._threads:
+                break
+        self.assertEqual(executor.stats().workers, 0)
+        # New work brings workers back.
+        self.assertEqual(executor.submit(mul, 6, 7).result(), 42)
+        self.assertEqual(executor.stats().completed, 5)
+        executor.shutdown(wait=True)
+
+    def test_work_stealing(self):
+        executor = self.executor_type(4, work_stealing=True)
+        def parent():
+            futs = [executor.submit(mul, i, 2) for i in range(50)]
+            return sum(f.result() for f in futs)
+        # The parents wait for their children, which can only run if other
+        # workers take them from the parents' deques.
+        parents = [executor.submit(parent) for _ in range(2)]
+        self.assertEqual([f.result() for f in parents], [2450, 2450])
+        stats = executor.stats()
+        self.assertEqual(stats.submitted, 102)
+        self.assertEqual(stats.completed, 102)
+        self.assertEqual(stats.stolen, 100)
+        self.assertEqual(stats.queued, 0)
+        executor.shutdown(wait=True)
+
+    def test_shutdown_runs_local_work(self):
+        executor = self.executor_type(2, work_stealing=True)
+        submitted = threading.Event()
+        results = []
+        def parent():
+            executor.submit(results.append, 1)
+            submitted.set()
+        executor.submit(parent)
+        executor.submit(results.append, 2)
+        submitted.wait()
+        executor.shutdown(wait=True)
+        self.assertCountEqual(results, [1, 2])
+
+    def test_shutdown_cancels_local_work(self):
+        executor = self.executor_type(1, work_stealing=True)
+        event = threading.Event()
+        children = []
+        def parent():
+            children.append(executor.submit(mul, 2, 3))
+            event.wait()
+        executor.submit(parent)
+        for _ in support.sleeping_retry(support.SHORT_TIMEOUT):
+            if children:
+                break
+        self.assertEqual(executor.stats().queued, 1)
+        executor.shutdown(wait=False, cancel_futures=True)
+        event.set()
+        executor.shutdown(wait=True)
+        self.assertTrue(children[0].cancelled())
+
+    def test_stats(self):
+        stats = self.executor.stats()
+        self.assertEqual(stats.max_workers, self.worker_count)
+        self.assertEqual((stats.submitted, stats.completed, stats.queued),
+                         (0, 0, 0))
+        self.assertEqual(stats.utilization, 0.0)
+        self.executor.submit(time.sleep, 0.05).result()
+        stats = self.executor.stats()
+        self.assertEqual((stats.workers, stats.idle_workers), (1, 1))
+        self.assertGreater(stats.utilization, 0.0)
+        self.assertLessEqual(stats.utilization, 1.0)
+
+    def test_stats_default_mode(self):
+        executor = futures.ThreadPoolExecutor(2)
+        executor.submit(mul, 1, 2).result()
+        stats = executor.stats()
+        self.assertEqual((stats.workers, stats.submitted, stats.queued),
+                         (1, 1, 0))
+        self.assertIsNone(stats.utilization)
+        executor.shutdown(wait=True)
+
+
 class ProcessPoolExecutorTest(ExecutorTest):
 
     @unittest.skipUnless(sys.platform=='win32', 'Windows-only process limit')
@@ -1129,6 +1325,45 @@ class ProcessPoolExecutorTest(ExecutorTest):
         for i, future in enumerate(futures):
             self.assertEqual(future.result(), mul(i, i))
 
+    def test_shared_memory_threshold_validation(self):
+        with self.assertRaises(TypeError):
+            self.executor_type(1, shared_memory_threshold=1.5)
+        for threshold in (0, -1):
+            with self.assertRaises(ValueError):
+                self.executor_type(1, shared_memory_threshold=threshold)
+
+    @staticmethod
+    def _shared_memory_segments():
+        return set(glob.glob('/dev/shm/psm_*'))
+
+    def test_shared_memory_transport(self):
+        import_helper.import_module('multiprocessing.shared_memory')
+        segments = self._shared_memory_segments()
+        executor = self.executor_type(
+                2, mp_context=self.get_context(), shared_memory_threshold=1000)
+        big = bytes(range(256)) * 40
+        args = (big, bytearray(big), array.array('d', range(2000)), b'small')
+        kwargs = {'k': bytearray(5000), 'n': 1}
+        self.assertEqual(executor.submit(capture, *args, **kwargs).result(),
+                         (args, kwargs))
+        result = executor.submit(bytearray, 10000).result()
+        self.assertIs(type(result), bytearray)
+        self.assertEqual(result, bytearray(10000))
+        self.assertEqual(list(executor.map(len, [big] * 5, chunksize=2)),
+                         [len(big)] * 5)
+        # The arguments of the calls of map() are shared too.
+        created = set().union(*executor.map(shared_memory_segments,
+                                            [big, b'small'], chunksize=2))
+        self.assertTrue(created - segments)
+        # Unpicklable arguments and results are reported as usual.
+        future = executor.submit(capture, big, threading.Lock())
+        self.assertRaises(TypeError, future.result)
+        future = executor.submit(threading.Lock)
+        self.assertRaises(TypeError, future.result)
+        executor.shutdown()
+        # The executor unlinked every segment.
+        self.assertEqual(self._shared_memory_segments(), segments)
+
 
 create_executor_tests(ProcessPoolExecutorTest,
                       executor_mixins=(ProcessPoolForkMixin,
@@ -1592,6 +1827,20 @@ class FutureTests(BaseTestCase):
         self.assertTrue(isinstance(f1.exception(timeout=support.SHORT_TIMEOUT), OSError))
         t.join()
 
+    def test_condition_created_lazily(self):
+        f = create_future(state=PENDING)
+        f.add_done_callback(lambda f: None)
+        f.set_result(1)
+        self.assertEqual(f.result(), 1)
+        self.assertIsNone(f._cond)
+
+        f = create_future(state=PENDING)
+        t = threading.Timer(0.1, f.set_result, (2,))
+        t.start()
+        self.assertEqual(f.result(timeout=support.SHORT_TIMEOUT), 2)
+        self.assertIsNotNone(f._cond)
+        t.join()
+
     def test_multiple_set_result(self):
         f = create_future(state=PENDING)
         f.set_result(1)
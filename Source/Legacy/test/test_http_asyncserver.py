@@ -0,0 +1,371 @@
+"""Tests for http/asyncserver.py."""
+
+import asyncio
+import functools
+import http.client
+import os
+import threading
+import unittest
+from http import HTTPStatus
+from http.asyncserver import AsyncHTTPServer, _parse_fields
+from http.server import BaseHTTPRequestHandler, SimpleHTTPRequestHandler
+from test import support
+from test.support import os_helper
+
+support.requires_working_socket(module=True)
+
+
+def tearDownModule():
+    asyncio.set_event_loop_policy(None)
+
+
+class NoLogRequestHandler:
+    def log_message(self, *args):
+        # don't write log messages to stderr
+        pass
+
+
+class RequestHandler(NoLogRequestHandler, BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def reply(self, body, code=HTTPStatus.OK):
+        self.send_response(code)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    async def do_GET(self):
+        self.reply(self.path.encode('ascii'))
+
+    def do_POST(self):
+        self.reply(self.rfile.read())
+
+    def do_THREAD(self):
+        self.reply(threading.current_thread().name.encode())
+
+    async def do_ECHO(self):
+        self.reply(self.rfile.read())
+
+    async def do_HEADERS(self):
+        body = ''.join('%s=%s;' % item for item in self.headers.items())
+        self.reply(body.encode('latin-1'))
+
+    async def do_SLOW(self):
+        await asyncio.sleep(0.1)
+        self.reply(b'slow')
+
+    def do_BIG(self):
+        size = int(self.path[1:])
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Length', str(size))
+        self.end_headers()
+        for i in range(0, size, 1000):
+            self.wfile.write(b'x' * min(1000, size - i))
+
+    async def do_FAIL(self):
+        raise RuntimeError('handler failed')
+
+
+class OldRequestHandler(NoLogRequestHandler, BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(HTTPStatus.OK)
+        self.end_headers()
+        self.wfile.write(b'old')
+
+
+async def read_response(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split()[1])
+    headers = dict(line.split(': ', 1) for line in lines[1:] if line)
+    length = headers.get('Content-Length')
+    if status < 200:
+        body = b''
+    elif length is not None:
+        body = await reader.readexactly(int(length))
+    else:
+        body = await reader.read()
+    return status, headers, body
+
+
+class BaseTestCase(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = AsyncHTTPServer(('127.0.0.1', 0), self.handler)
+        await self.server.start()
+        self.addAsyncCleanup(self.close_server)
+
+    async def close_server(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def connect(self):
+        reader, writer = await asyncio.open_connection(
+            *self.server.server_address[:2])
+        self.addCleanup(writer.close)
+        return reader, writer
+
+    async def request(self, data):
+        reader, writer = await self.connect()
+        writer.write(data)
+        return await read_response(reader)
+
+
+class AsyncHTTPServerTestCase(BaseTestCase):
+    handler = RequestHandler
+
+    async def test_keep_alive(self):
+        reader, writer = await self.connect()
+        for path in (b'/a', b'/b', b'/c'):
+            writer.write(b'GET %s HTTP/1.1\r\nHost: x\r\n\r\n' % path)
+            status, headers, body = await read_response(reader)
+            self.assertEqual(status, 200)
+            self.assertEqual(body, path)
+        writer.write(b'GET /d HTTP/1.1\r\nConnection: close\r\n\r\n')
+        status, headers, body = await read_response(reader)
+        self.assertEqual(body, b'/d')
+        self.assertEqual(await reader.read(), b'')
+
+    async def test_pipelining(self):
+        reader, writer = await self.connect()
+        writer.write(b'SLOW / HTTP/1.1\r\n\r\n'
+                     b'POST / HTTP/1.1\r\nContent-Length: 4\r\n\r\nbody'
+                     b'GET /last HTTP/1.1\r\n\r\n')
+        bodies = [(await read_response(reader))[2] for i in range(3)]
+        self.assertEqual(bodies, [b'slow', b'body', b'/last'])
+
+    async def test_pipelining_split(self):
+        # Requests split at every byte
+        data = (b'\r\nGET /1 HTTP/1.1\r\n\r\n'
+                b'ECHO / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n'
+                b'2\r\nab\r\n0\r\n\r\n'
+                b'GET /2 HTTP/1.1\nX-A: 1\n\n')
+        reader, writer = await self.connect()
+        for i in range(len(data)):
+            writer.write(data[i:i+1])
+            await writer.drain()
+        bodies = [(await read_response(reader))[2] for i in range(3)]
+        self.assertEqual(bodies, [b'/1', b'ab', b'/2'])
+
+    async def test_chunked_body(self):
+        status, headers, body = await self.request(
+            b'POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n'
+            b'5\r\nhello\r\n1;ext=1\r\n \r\nA\r\n0123456789\r\n'
+            b'0\r\nTrailer: x\r\n\r\n')
+        self.assertEqual(status, 200)
+        self.assertEqual(body, b'hello 0123456789')
+
+    async def test_bad_chunked_body(self):
+        for data in (b'x\r\nabc\r\n0\r\n\r\n',
+                     b'0x3\r\nabc\r\n0\r\n\r\n',
+                     b'3\r\nabcd\r\n0\r\n\r\n'):
+            with self.subTest(data=data):
+                status, headers, body = await self.request(
+                    b'POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n'
+                    + data)
+                self.assertEqual(status, HTTPStatus.BAD_REQUEST)
+                self.assertEqual(headers['Connection'], 'close')
+
+    async def test_transfer_encoding(self):
+        for coding, code in (('gzip', HTTPStatus.BAD_REQUEST),
+                             ('gzip, chunked', HTTPStatus.NOT_IMPLEMENTED)):
+            with self.subTest(coding=coding):
+                status, headers, body = await self.request(
+                    b'POST / HTTP/1.1\r\nTransfer-Encoding: %s\r\n\r\n'
+                    % coding.encode())
+                self.assertEqual(status, code)
+        status, headers, body = await self.request(
+            b'POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n'
+            b'Content-Length: 3\r\n\r\n0\r\n\r\n')
+        self.assertEqual(status, HTTPStatus.BAD_REQUEST)
+
+    async def test_content_length(self):
+        for value in (b'-1', b'1x', b'+1'):
+            with self.subTest(value=value):
+                status, headers, body = await self.request(
+                    b'POST / HTTP/1.1\r\nContent-Length: %s\r\n\r\nx' % value)
+                self.assertEqual(status, HTTPStatus.BAD_REQUEST)
+        status, headers, body = await self.request(
+            b'POST / HTTP/1.1\r\nContent-Length: 1\r\n'
+            b'Content-Length: 2\r\n\r\nxx')
+        self.assertEqual(status, HTTPStatus.BAD_REQUEST)
+
+    async def test_body_too_large(self):
+        self.server.max_body_size = 10
+        status, headers, body = await self.request(
+            b'POST / HTTP/1.1\r\nContent-Length: 11\r\n\r\n')
+        self.assertEqual(status, HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        status, headers, body = await self.request(
+            b'POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n'
+            b'8\r\n12345678\r\n8\r\n')
+        self.assertEqual(status, HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+
+    async def test_expect_100_continue(self):
+        reader, writer = await self.connect()
+        writer.write(b'POST / HTTP/1.1\r\nContent-Length: 4\r\n'
+                     b'Expect: 100-continue\r\n\r\n')
+        status, headers, body = await read_response(reader)
+        self.assertEqual(status, HTTPStatus.CONTINUE)
+        writer.write(b'data')
+        status, headers, body = await read_response(reader)
+        self.assertEqual(status, HTTPStatus.OK)
+        self.assertEqual(body, b'data')
+
+    async def test_headers(self):
+        status, headers, body = await self.request(
+            b'HEADERS / HTTP/1.1\r\nHost: example.com\r\n'
+            b'X-Folded: a\r\n  b\r\nX-Empty:\r\n\r\n')
+        self.assertEqual(body, b'Host=example.com;X-Folded=a b;X-Empty=;')
+
+    async def test_bad_headers(self):
+        for line in (b'No colon', b'Space : x', b' continuation'):
+            with self.subTest(line=line):
+                status, headers, body = await self.request(
+                    b'GET / HTTP/1.1\r\n%s\r\n\r\n' % line)
+                self.assertEqual(status, HTTPStatus.BAD_REQUEST)
+
+    async def test_headers_too_large(self):
+        self.server.max_header_size = 100
+        status, headers, body = await self.request(
+            b'GET / HTTP/1.1\r\nX-Long: %s\r\n\r\n' % (b'x' * 200))
+        self.assertEqual(status, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+        fields = b''.join(b'X-%d: 1\r\n' % i
+                          for i in range(http.client._MAXHEADERS + 1))
+        self.server.max_header_size = 65536
+        status, headers, body = await self.request(
+            b'GET / HTTP/1.1\r\n%s\r\n' % fields)
+        self.assertEqual(status, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+
+    async def test_bad_request_line(self):
+        for line, code in (
+                (b'GET / HTTP/1', HTTPStatus.BAD_REQUEST),
+                (b'GET / HTTP/2.0', HTTPStatus.HTTP_VERSION_NOT_SUPPORTED),
+                (b'GET / x HTTP/1.1', HTTPStatus.BAD_REQUEST),
+                (b'NOSUCH / HTTP/1.1', HTTPStatus.NOT_IMPLEMENTED),
+                (b'GET /%s HTTP/1.1' % (b'x' * 65536),
+                 HTTPStatus.REQUEST_URI_TOO_LONG)):
+            with self.subTest(code=code):
+                reader, writer = await self.connect()
+                writer.write(line + b'\r\n\r\n')
+                # Errors are sent in the HTTP/0.9 format if the version of
+                # the request is unknown
+                self.assertIn(b'Error code: %d' % code, await reader.read())
+
+    async def test_http_0_9(self):
+        reader, writer = await self.connect()
+        writer.write(b'GET /nine\r\n')
+        self.assertEqual(await reader.read(), b'/nine')
+
+    async def test_thread_offload(self):
+        status, headers, body = await self.request(
+            b'THREAD / HTTP/1.1\r\n\r\n')
+        self.assertEqual(status, 200)
+        self.assertNotEqual(body, threading.current_thread().name.encode())
+
+    async def test_large_response(self):
+        for size in (10**5, 10**6):
+            with self.subTest(size=size):
+                status, headers, body = await self.request(
+                    b'BIG /%d HTTP/1.1\r\n\r\n' % size)
+                self.assertEqual(len(body), size)
+
+    async def test_handler_error(self):
+        errors = []
+        self.server.handle_error = lambda *args: errors.append(args)
+        reader, writer = await self.connect()
+        writer.write(b'FAIL / HTTP/1.1\r\n\r\n')
+        self.assertEqual(await reader.read(), b'')
+        self.assertEqual(len(errors), 1)
+
+    async def test_keep_alive_timeout(self):
+        self.server.keep_alive_timeout = 0.1
+        reader, writer = await self.connect()
+        writer.write(b'GET / HTTP/1.1\r\n\r\n')
+        await read_response(reader)
+        self.assertEqual(await reader.read(), b'')
+
+    async def test_request_timeout(self):
+        # The timeout is not restarted by each piece of a request.
+        self.server.timeout = 0.3
+        for head in (b'GET / HTTP/1.1\r\nX-Slow: ',
+                     b'POST / HTTP/1.1\r\nContent-Length: 100\r\n\r\n'):
+            with self.subTest(head=head):
+                reader, writer = await self.connect()
+                writer.write(head)
+                for i in range(40):
+                    await asyncio.sleep(0.05)
+                    if reader.at_eof():
+                        break
+                    writer.write(b'a')
+                self.assertTrue(reader.at_eof())
+
+    async def test_close(self):
+        reader, writer = await self.connect()
+        writer.write(b'GET / HTTP/1.1\r\n\r\n')
+        await read_response(reader)
+        slow_reader, slow_writer = await self.connect()
+        slow_writer.write(b'SLOW / HTTP/1.1\r\n\r\n')
+        await asyncio.sleep(0.05)
+        self.server.close()
+        await self.server.wait_closed()
+        # The idle connection is closed, the request being handled is
+        # completed first
+        self.assertEqual(await reader.read(), b'')
+        status, headers, body = await read_response(slow_reader)
+        self.assertEqual(body, b'slow')
+        self.assertEqual(await slow_reader.read(), b'')
+
+
+class HTTP10HandlerTestCase(BaseTestCase):
+    handler = OldRequestHandler
+
+    async def test_connection_close(self):
+        reader, writer = await self.connect()
+        writer.write(b'GET / HTTP/1.1\r\n\r\nGET / HTTP/1.1\r\n\r\n')
+        status, headers, body = await read_response(reader)
+        self.assertEqual(status, 200)
+        self.assertEqual(body, b'old')
+
+
+class SimpleHandlerTestCase(unittest.IsolatedAsyncioTestCase):
+
+    class handler(NoLogRequestHandler, SimpleHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+    async def test_http_client(self):
+        with os_helper.temp_dir() as tempdir:
+            with open(os.path.join(tempdir, 'test.txt'), 'wb') as f:
+                f.write(b'x' * 100000)
+            handler = functools.partial(self.handler, directory=tempdir)
+            async with AsyncHTTPServer(('127.0.0.1', 0), handler) as server:
+                def fetch():
+                    con = http.client.HTTPConnection(
+                        *server.server_address[:2])
+                    try:
+                        result = []
+                        for path in ('/test.txt', '/missing', '/test.txt'):
+                            con.request('GET', path)
+                            response = con.getresponse()
+                            result.append((response.status, response.read()))
+                        return result, con.sock is not None
+                    finally:
+                        con.close()
+                result, reused = await asyncio.to_thread(fetch)
+        self.assertEqual(result[0], (200, b'x' * 100000))
+        self.assertEqual(result[1][0], HTTPStatus.NOT_FOUND)
+        self.assertEqual(result[2], (200, b'x' * 100000))
+
+
+class HeadersTestCase(unittest.TestCase):
+
+    def test_parse_fields(self):
+        fields = _parse_fields(b'Host: a\r\nX-Folded: 1\r\n\t2\r\nx-b:  3 ')
+        self.assertEqual(fields,
+                         ['Host', b'a', 'X-Folded', b'1 2', 'x-b', b'3'])
+        self.assertEqual(_parse_fields(b''), [])
+        headers = http.client.HTTPHeaders(_parse_fields(b'A: \xe9'))
+        self.assertEqual(headers['a'], '\xe9')
+
+
+if __name__ == '__main__':
+    unittest.main()
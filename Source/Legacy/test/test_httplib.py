@@ -2184,6 +2184,114 @@ class HTTPResponseTest(TestCase):
         header = self.resp.getheader('No-Such-Header',default=42)
         self.assertEqual(header, 42)
 
+class HTTPHeadersTest(TestCase):
+
+    def parse(self, data):
+        return client.parse_headers(io.BytesIO(data),
+                                    _class=client.HTTPHeaders)
+
+    def test_parse_headers(self):
+        f = io.BytesIO(b'Host: example.com\r\n'
+                       b'X-Folded: a\r\n'
+                       b'  b\r\n'
+                       b'\tc\r\n'
+                       b'Empty:\r\n'
+                       b'Spaces:  x y \r\n'
+                       b'Lf: 1\n'
+                       b'\r\n'
+                       b'body')
+        headers = client.parse_headers(f, _class=client.HTTPHeaders)
+        self.assertIsInstance(headers, client.HTTPHeaders)
+        self.assertEqual(headers.items(),
+                         [('Host', 'example.com'), ('X-Folded', 'a b c'),
+                          ('Empty', ''), ('Spaces', 'x y'), ('Lf', '1')])
+        self.assertEqual(f.read(), b'body')
+
+    def test_parse_malformed(self):
+        # Lines which are not header fields are skipped
+        headers = self.parse(b' leading\r\nFirst: 1\r\n: nval\r\n'
+                             b'No colon\r\nSpace : x\r\nSecond: 2\r\n\r\n')
+        self.assertEqual(headers.items(), [('First', '1'), ('Second', '2')])
+        # and so are their continuation lines
+        headers = self.parse(b'A: 1\r\nbad\r\n  x\r\nB: 2\r\n y\r\n\r\n')
+        self.assertEqual(headers.items(), [('A', '1'), ('B', '2 y')])
+        self.assertEqual(self.parse(b'').items(), [])
+
+    def test_parse_limits(self):
+        headers = b''.join(b'Header%d: foo\r\n' % i
+                           for i in range(client._MAXHEADERS + 1))
+        with self.assertRaisesRegex(client.HTTPException,
+                                    r"got more than \d+ headers"):
+            self.parse(headers + b'\r\n')
+        with self.assertRaises(client.LineTooLong):
+            self.parse(b'X: ' + b'x' * client._MAXLINE + b'\r\n\r\n')
+
+    def test_mapping(self):
+        headers = self.parse(b'Host: a\r\nAccept: x\r\naccept: y\r\n'
+                             b'Obs-Text: \xe9\r\n\r\n')
+        self.assertEqual(len(headers), 4)
+        names = ['Host', 'Accept', 'accept', 'Obs-Text']
+        self.assertEqual(list(headers), names)
+        self.assertEqual(headers.keys(), names)
+        self.assertEqual(headers.values(), ['a', 'x', 'y', '\xe9'])
+        self.assertIn('HOST', headers)
+        self.assertNotIn('Cookie', headers)
+        self.assertEqual(headers['host'], 'a')
+        self.assertIsNone(headers['cookie'])
+        self.assertEqual(headers.get('cookie', ''), '')
+        self.assertEqual(headers.get('ACCEPT'), 'x')
+        self.assertEqual(headers.get_all('Accept'), ['x', 'y'])
+        self.assertIsNone(headers.get_all('cookie'))
+        self.assertEqual(headers.get_all('cookie', []), [])
+
+        headers['Cookie'] = 'c'
+        headers['accept'] = 'z'
+        self.assertEqual(headers.get_all('Accept'), ['x', 'y', 'z'])
+        del headers['ACCEPT']
+        del headers['missing']
+        self.assertEqual(headers.items(), [('Host', 'a'), ('Obs-Text', '\xe9'),
+                                           ('Cookie', 'c')])
+        self.assertEqual(str(headers),
+                         'Host: a\nObs-Text: \xe9\nCookie: c\n\n')
+
+    def test_content_type(self):
+        headers = client.HTTPHeaders()
+        self.assertEqual(headers.get_content_type(), 'text/plain')
+        self.assertIsNone(headers.get_content_charset())
+        headers['Content-Type'] = 'Text/HTML; q=1; Charset="UTF-8"'
+        self.assertEqual(headers.get_content_type(), 'text/html')
+        self.assertEqual(headers.get_content_maintype(), 'text')
+        self.assertEqual(headers.get_content_subtype(), 'html')
+        self.assertEqual(headers.get_content_charset(), 'utf-8')
+        headers = self.parse(b'Content-Type: invalid\r\n\r\n')
+        self.assertEqual(headers.get_content_type(), 'text/plain')
+        self.assertEqual(headers.get_content_charset('ascii'), 'ascii')
+
+    def test_response(self):
+        class Response(client.HTTPResponse):
+            MessageClass = client.HTTPHeaders
+
+        body = ('HTTP/1.1 200 Ok\r\nMy-Header: first-value\r\n'
+                'My-Header: second-value\r\nContent-Length: 4\r\n'
+                'Connection: close\r\n\r\nText')
+        resp = Response(FakeSocket(body))
+        resp.begin()
+        self.assertIsInstance(resp.headers, client.HTTPHeaders)
+        self.assertIs(resp.msg, resp.headers)
+        self.assertEqual(resp.getheader('my-header'),
+                         'first-value, second-value')
+        self.assertEqual(resp.getheaders()[-1], ('Connection', 'close'))
+        self.assertTrue(resp.will_close)
+        self.assertEqual(resp.read(), b'Text')
+
+        resp = Response(FakeSocket('HTTP/1.1 200 Ok\r\n'
+                                   'Transfer-Encoding: chunked\r\n\r\n'
+                                   '4\r\nText\r\n0\r\n\r\n'))
+        resp.begin()
+        self.assertTrue(resp.chunked)
+        self.assertEqual(resp.read(), b'Text')
+
+
 class TunnelTests(TestCase):
     def setUp(self):
         response_text = (
@@ -1218,6 +1218,21 @@ class BaseHTTPRequestHandlerTestCase(unittest.TestCase):
         self.assertEqual(self.handler.date_time_string(timestamp=now), expected)
 
 
+class HTTPHeadersRequestHandlerTestCase(BaseHTTPRequestHandlerTestCase):
+    """Run the tests with headers parsed into http.client.HTTPHeaders."""
+
+    def setUp(self):
+        super().setUp()
+        self.handler.MessageClass = http.client.HTTPHeaders
+
+    def test_headers_class(self):
+        self.send_typical_request(b'GET / HTTP/1.1\r\nHost: x\r\n'
+                                  b'Connection: close\r\n\r\n')
+        self.assertIsInstance(self.handler.headers, http.client.HTTPHeaders)
+        self.assertEqual(self.handler.headers['host'], 'x')
+        self.assertTrue(self.handler.close_connection)
+
+
 class SimpleHTTPRequestHandlerTestCase(unittest.TestCase):
     """ Test url parsing """
     def setUp(self):
@@ -0,0 +1,104 @@
+import array
+import codecs
+import decimal
+import mmap
+from collections import OrderedDict
+from test.test_json import PyTest, CTest
+
+
+class TestBuffer:
+    doc = {"a": [1, -2.5e3, "x\xb5€\U0001d120", None, True, False],
+           "b": {"c": "q\\\"\n\t", "": []}, "NaN": float('inf')}
+
+    def encoded(self):
+        return self.dumps(self.doc, ensure_ascii=False).encode('utf-8')
+
+    def test_buffer_types(self):
+        data = self.encoded()
+        for obj in (memoryview(data), memoryview(bytearray(data)),
+                    array.array('B', data), memoryview(data).cast('c')):
+            with self.subTest(type=type(obj)):
+                self.assertEqual(self.loads(obj), self.doc)
+
+    def test_mmap(self):
+        data = self.encoded()
+        with mmap.mmap(-1, len(data)) as m:
+            m.write(data)
+            self.assertEqual(self.loads(m), self.doc)
+
+    def test_decoder_accepts_bytes(self):
+        data = self.encoded()
+        decoder = self.json.JSONDecoder()
+        self.assertEqual(decoder.decode(data), self.doc)
+        self.assertEqual(decoder.decode(bytearray(data)), self.doc)
+        self.assertEqual(decoder.raw_decode(b'[1] [2]'), ([1], 3))
+        self.assertEqual(decoder.raw_decode(memoryview(b'xx"\xc3\xa9"'), 2),
+                         ('\xe9', 6))
+
+    def test_bom(self):
+        self.assertEqual(self.loads(memoryview(codecs.BOM_UTF8 + b'[1]')), [1])
+        self.assertEqual(self.json.JSONDecoder().decode(
+            codecs.BOM_UTF8 + b' {}'), {})
+
+    def test_other_encodings(self):
+        data = ["a\xb5€\U0001d120"]
+        for encoding in ('utf-16', 'utf-16-le', 'utf-32-be'):
+            encoded = self.dumps(data).encode(encoding)
+            with self.subTest(encoding=encoding):
+                self.assertEqual(self.loads(memoryview(encoded)), data)
+        self.assertEqual(self.loads(memoryview(b'5\x00')), 5)
+
+    def test_hooks(self):
+        data = memoryview(b'{"b": 1.1, "a": [2, NaN]}')
+        result = self.loads(data, object_pairs_hook=OrderedDict,
+                            parse_float=decimal.Decimal, parse_int=str,
+                            parse_constant=lambda name: name)
+        self.assertEqual(result, OrderedDict(
+            [('b', decimal.Decimal('1.1')), ('a', ['2', 'NaN'])]))
+        self.assertIs(type(result), OrderedDict)
+        self.assertEqual(self.loads(memoryview(b'{"a": {}}'),
+                                    object_hook=lambda d: len(d)), 1)
+
+    def test_escapes(self):
+        for text in ['"\\u00e9\\ud834\\udd20\\/\\b\\f\\r"', '"\\ud834x"',
+                     '"\\ud834\\u0041"', '"€\\n€"']:
+            with self.subTest(text=text):
+                self.assertEqual(self.loads(memoryview(text.encode())),
+                                 self.loads(text))
+
+    def test_byte_offsets(self):
+        data = memoryview('["€€",\n x]'.encode())
+        with self.assertRaises(self.JSONDecodeError) as cm:
+            self.loads(data)
+        err = cm.exception
+        self.assertEqual(err.msg, 'Expecting value')
+        self.assertEqual(err.pos, 12)
+        self.assertEqual(err.lineno, 2)
+        self.assertEqual(err.colno, 2)
+        self.assertIn('(byte 12)', str(err))
+        # The exception can be pickled even though the document was a view.
+        cls, args = err.__reduce__()
+        self.assertIsInstance(args[1], bytes)
+        copy = cls(*args)
+        self.assertEqual((copy.pos, copy.lineno), (12, 2))
+
+    def test_errors(self):
+        bad = [b'', b'[', b'[1,]', b'{"a" 1}', b'{"a": 1,}', b'{1: 2}',
+               b'"abc', b'"\\x"', b'"\\u12 4"', b'"a\x01"', b'[1] x',
+               b'tru', b'-']
+        for data in bad:
+            with self.subTest(data=data):
+                self.assertRaises(self.JSONDecodeError, self.loads,
+                                  memoryview(data))
+        self.assertRaises(UnicodeDecodeError, self.loads,
+                          memoryview(b'["\x80"]'))
+        self.assertEqual(self.json.JSONDecoder(strict=False).decode(
+            b'"a\x01"'), 'a\x01')
+
+    def test_not_a_buffer(self):
+        self.assertRaises(TypeError, self.loads, 1)
+        self.assertRaises(TypeError, self.loads, [])
+
+
+class TestPyBuffer(TestBuffer, PyTest): pass
+class TestCBuffer(TestBuffer, CTest): pass
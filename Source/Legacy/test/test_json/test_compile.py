@@ -0,0 +1,137 @@
+import dataclasses
+from typing import Optional, TypedDict
+from test.test_json import PyTest, CTest
+
+
+@dataclasses.dataclass
+class Point:
+    x: int
+    y: Optional[float] = None
+
+
+@dataclasses.dataclass
+class Path:
+    name: str
+    points: list[Point]
+    closed: bool = False
+
+
+@dataclasses.dataclass
+class Node:
+    name: str
+    child: Optional['Node'] = None
+
+
+class Movie(TypedDict):
+    title: str
+    year: int
+    cast: list[str]
+
+
+class TestCompile:
+    record = {"id": 1, "name": "x", "score": 1.5, "ok": True,
+              "tags": ["a"], "meta": {"k": 1}, "extra": None}
+
+    def test_sample_matches_dumps(self):
+        encoder = self.json.JSONEncoder()
+        encode = encoder.compile(self.record).encode
+        variants = [
+            self.record,
+            {**self.record, "id": 2 ** 70, "score": -0.0},
+            {**self.record, "name": "ሴ\n\"\\"},
+            {**self.record, "tags": ()},
+            {**self.record, "tags": ["b", 1, None]},
+            {**self.record, "meta": {"k": "v", "z": [1]}},
+            {**self.record, "extra": {"anything": [True]}},
+        ]
+        for value in variants:
+            with self.subTest(value=value):
+                self.assertEqual(encode(value), self.dumps(value))
+
+    def test_shape_mismatch_falls_back(self):
+        encode = self.json.JSONEncoder().compile(self.record).encode
+        variants = [
+            {**self.record, "id": "1"},
+            {**self.record, "id": True},
+            {**self.record, "ok": None},
+            {**self.record, "new": 1},
+            {"id": 1},
+            [1, 2],
+            "string",
+        ]
+        for value in variants:
+            with self.subTest(value=value):
+                self.assertEqual(encode(value), self.dumps(value))
+
+    def test_encoder_options(self):
+        options = [
+            dict(ensure_ascii=False),
+            dict(separators=(',', ':')),
+            dict(sort_keys=True),
+            dict(indent=2),
+        ]
+        value = {**self.record, "name": "ሴ"}
+        for kw in options:
+            with self.subTest(**kw):
+                encoder = self.json.JSONEncoder(**kw)
+                self.assertEqual(encoder.compile(self.record).encode(value),
+                                 self.dumps(value, **kw))
+
+    def test_allow_nan(self):
+        encode = self.json.JSONEncoder().compile(self.record).encode
+        self.assertIn('"score": NaN',
+                      encode({**self.record, "score": float('nan')}))
+        encode = self.json.JSONEncoder(allow_nan=False).compile(
+            self.record).encode
+        self.assertRaises(ValueError, encode,
+                          {**self.record, "score": float('inf')})
+
+    def test_special_keys(self):
+        record = {'a{b}': 1, 'q\'"': 'x', 'nl\n\\': [1.5], 'ሴ': 2}
+        encode = self.json.JSONEncoder().compile(record).encode
+        self.assertEqual(encode(record), self.dumps(record))
+
+    def test_encode_many(self):
+        records = [{**self.record, "id": i} for i in range(5)]
+        compiled = self.json.JSONEncoder().compile(self.record)
+        self.assertEqual(compiled.encode_many(records), self.dumps(records))
+        self.assertEqual(compiled.encode_many(iter([])), '[]')
+
+    def test_dataclass(self):
+        compiled = self.json.JSONEncoder().compile(Path)
+        path = Path("p", [Point(1, 2.5), Point(3)])
+        self.assertEqual(compiled.encode(path),
+                         '{"name": "p", "points": [{"x": 1, "y": 2.5}, '
+                         '{"x": 3, "y": null}], "closed": false}')
+        self.assertEqual(self.json.JSONEncoder().compile(path).encode(path),
+                         compiled.encode(path))
+        self.assertFalse(compiled.shape.cyclic)
+
+    def test_typeddict(self):
+        compiled = self.json.JSONEncoder().compile(Movie)
+        movie = {"title": "M", "year": 1999, "cast": ["a", "b"]}
+        self.assertEqual(compiled.encode(movie), self.dumps(movie))
+        # Keys follow the order of the shape.
+        self.assertEqual(compiled.encode({"year": 1, "cast": [], "title": ""}),
+                         '{"title": "", "year": 1, "cast": []}')
+
+    def test_recursive_dataclass(self):
+        compiled = self.json.JSONEncoder().compile(Node)
+        self.assertTrue(compiled.shape.cyclic)
+        node = Node("a", Node("b"))
+        self.assertEqual(compiled.encode(node),
+                         '{"name": "a", "child": {"name": "b", "child": null}}')
+        node.child.child = node
+        self.assertRaises(ValueError, compiled.encode, node)
+        # The markers are per call.
+        self.assertEqual(compiled.encode(Node("c")),
+                         '{"name": "c", "child": null}')
+
+    def test_invalid_shape(self):
+        encoder = self.json.JSONEncoder()
+        self.assertRaises(TypeError, encoder.compile, int)
+        self.assertRaises(TypeError, encoder.compile, [1, 2])
+
+
+class TestPyCompile(TestCompile, PyTest): pass
+class TestCCompile(TestCompile, CTest): pass
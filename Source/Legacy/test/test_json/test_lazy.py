@@ -0,0 +1,112 @@
+import decimal
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from test.test_json import PyTest, CTest
+
+from json import lazy
+
+
+class TestLazy:
+    doc = {"meta": {"count": 3, "name": "r\xe9sum\xe9 [x] {y}"},
+           "rows": [{"id": 1, "tags": ["a", "b"]}, {"id": 2, "tags": []},
+                    {"id": 3, "s": "q\\\"}]"}],
+           "empty": {}, "none": None, "flags": [True, False, -1.5e10]}
+
+    def loads(self, s, **kw):
+        return lazy.loads(s, cls=self.json.JSONDecoder, **kw)
+
+    def test_access(self):
+        doc = self.loads(self.dumps(self.doc))
+        self.assertIsInstance(doc, lazy.LazyObject)
+        self.assertIsInstance(doc, Mapping)
+        self.assertEqual(doc['meta']['name'], "r\xe9sum\xe9 [x] {y}")
+        rows = doc['rows']
+        self.assertIsInstance(rows, lazy.LazyArray)
+        self.assertIsInstance(rows, Sequence)
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[-1]['s'], 'q\\"}]')
+        self.assertEqual(rows[0]['tags'][1:], ['b'])
+        self.assertEqual(list(doc), list(self.doc))
+        self.assertIn('empty', doc)
+        self.assertNotIn('missing', doc)
+        self.assertIsNone(doc['none'])
+        self.assertIsNone(doc.get('missing'))
+        self.assertRaises(KeyError, doc.__getitem__, 'missing')
+        self.assertRaises(IndexError, rows.__getitem__, 3)
+        # Members are decoded once.
+        self.assertIs(doc['rows'], rows)
+
+    def test_equality(self):
+        doc = self.loads(self.dumps(self.doc))
+        self.assertEqual(doc, self.doc)
+        self.assertEqual(doc['rows'], self.doc['rows'])
+        self.assertNotEqual(doc['rows'], self.doc['rows'][:2])
+        self.assertNotEqual(doc['meta'], self.doc['rows'])
+
+    def test_materialize(self):
+        doc = self.loads(self.dumps(self.doc, indent=2))
+        self.assertEqual(doc.materialize(), self.doc)
+        self.assertEqual(doc['rows'].materialize(), self.doc['rows'])
+        self.assertIs(type(doc['meta'].materialize()), dict)
+
+    def test_scalars(self):
+        for value in [1, -2.5, "x", None, True, False]:
+            with self.subTest(value=value):
+                self.assertEqual(self.loads(' %s ' % self.dumps(value)), value)
+        self.assertEqual(self.loads('[]'), [])
+        self.assertEqual(len(self.loads('{ }')), 0)
+
+    def test_hooks(self):
+        doc = self.loads('{"b": 1.1, "a": [2, NaN, {"c": 1}]}',
+                         parse_float=decimal.Decimal, parse_int=str,
+                         parse_constant=lambda name: name,
+                         object_pairs_hook=OrderedDict)
+        self.assertEqual(doc['b'], decimal.Decimal('1.1'))
+        self.assertEqual(doc['a'][:2], ['2', 'NaN'])
+        # Object hooks only apply to materialized objects.
+        self.assertIsInstance(doc['a'][2], lazy.LazyObject)
+        self.assertIs(type(doc['a'][2].materialize()), OrderedDict)
+
+    def test_duplicate_keys(self):
+        doc = self.loads('{"a": 1, "a": 2}')
+        self.assertEqual(len(doc), 1)
+        self.assertEqual(doc['a'], 2)
+
+    def test_bytes(self):
+        data = self.dumps(self.doc, ensure_ascii=False)
+        for encoding in ('utf-8', 'utf-16', 'utf-32-le'):
+            with self.subTest(encoding=encoding):
+                self.assertEqual(self.loads(data.encode(encoding)), self.doc)
+        self.assertEqual(self.loads(memoryview(b'[1]')), [1])
+        self.assertRaises(TypeError, self.loads, 1)
+
+    def test_structural_errors(self):
+        for s in ['', '[', '[}', ']', '{"a": [1}', '[1] x', '"abc', '\ufeff[]',
+                  '{"a" 1}', '[1,]', '{1: 2}', '{"a": 1,}', '[,1]', '{"a": }',
+                  '[[1] [2]]', '[1 [2]]', '{"a": [] 1}', '{"a": 1:}']:
+            with self.subTest(s=s):
+                self.assertRaises(ValueError, self.loads, s)
+
+    def test_brackets_in_strings(self):
+        self.assertEqual(self.loads('"[{"'), '[{')
+        self.assertEqual(self.loads(r'["]", "\\"]'), [']', '\\'])
+        self.assertEqual(self.loads(r'{"}": "\"}"}'), {'}': '"}'})
+        s = '"' + '[' * 100000 + '"'
+        self.assertEqual(self.loads(s), '[' * 100000)
+
+    def test_deferred_errors(self):
+        # Invalid scalars, or two scalars in a row, are only found when
+        # they are decoded.
+        doc = self.loads('{"ok": 1, "bad": [1x], "worse": ["\\x"]}')
+        self.assertEqual(doc['ok'], 1)
+        self.assertEqual(len(doc['bad']), 1)
+        for s in ['[tru]', '[truex]', '[1-2]', '[1 2]', '["a" "b"]', '["\\x"]',
+                  '{"a\\x": 1}', '{"a" "b": 1}']:
+            with self.subTest(s=s):
+                with self.assertRaises(ValueError):
+                    doc = self.loads(s)
+                    doc[0] if isinstance(doc, Sequence) else len(doc)
+
+
+class TestPyLazy(TestLazy, PyTest): pass
+class TestCLazy(TestLazy, CTest): pass
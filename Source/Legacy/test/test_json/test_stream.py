@@ -0,0 +1,194 @@
+import decimal
+from io import BytesIO, StringIO
+from collections import OrderedDict
+from test.test_json import PyTest, CTest
+
+from json import stream
+
+
+def chunked(s, size):
+    return [s[i:i + size] for i in range(0, len(s), size)]
+
+
+class TestStream:
+    docs = [
+        {"a": [1, 2.5, None, True, False], "b": {"c": "d\\\"eሴ"}},
+        [],
+        {},
+        "string with \"quotes\" and \\backslashes\\",
+        -12345,
+        [[[[]]], {"x": [{"y": {}}]}],
+        1e-7,
+        None,
+    ]
+
+    def stream_text(self):
+        return '\n'.join(self.dumps(doc) for doc in self.docs) + '\n'
+
+    def feed_all(self, obj, chunks):
+        result = []
+        for chunk in chunks:
+            result.extend(obj.feed(chunk))
+        result.extend(obj.close())
+        return result
+
+    def test_values_any_chunking(self):
+        text = self.stream_text()
+        for size in (1, 2, 3, 7, 64, len(text)):
+            with self.subTest(size=size):
+                decoder = stream.JSONStreamDecoder(cls=self.json.JSONDecoder)
+                self.assertEqual(self.feed_all(decoder, chunked(text, size)),
+                                 self.docs)
+
+    def test_values_bytes(self):
+        for encoding in ('utf-8', 'utf-8-sig', 'utf-16', 'utf-32'):
+            data = self.stream_text().encode(encoding)
+            with self.subTest(encoding=encoding):
+                decoder = stream.JSONStreamDecoder(cls=self.json.JSONDecoder)
+                self.assertEqual(self.feed_all(decoder, chunked(data, 3)),
+                                 self.docs)
+
+    def test_values_concatenated(self):
+        decoder = stream.JSONStreamDecoder(cls=self.json.JSONDecoder)
+        self.assertEqual(self.feed_all(decoder, ['{"a":1}[2]"x"', '3']),
+                         [{'a': 1}, [2], 'x', 3])
+
+    def test_values_returned_early(self):
+        decoder = stream.JSONStreamDecoder(cls=self.json.JSONDecoder)
+        self.assertEqual(decoder.feed('[1, 2] [3'), [[1, 2]])
+        self.assertEqual(decoder.feed(']'), [[3]])
+        # A number is only complete once a delimiter is seen.
+        self.assertEqual(decoder.feed(' 12'), [])
+        self.assertEqual(decoder.feed('3 '), [123])
+        self.assertEqual(decoder.feed('45'), [])
+        self.assertEqual(decoder.close(), [45])
+
+    def test_values_hooks(self):
+        decoder = stream.JSONStreamDecoder(cls=self.json.JSONDecoder,
+                                           object_pairs_hook=OrderedDict,
+                                           parse_float=decimal.Decimal)
+        result = self.feed_all(decoder, chunked('{"b": 1.1, "a": 2}', 4))
+        self.assertEqual(result, [OrderedDict([('b', decimal.Decimal('1.1')),
+                                               ('a', 2)])])
+        self.assertIs(type(result[0]), OrderedDict)
+
+    def test_values_errors(self):
+        for doc in ['[1,', '{"a"', '"abc', '[1 2]', '{"a":1,}', '12abc',
+                    '{]', ']', ',', 'tru']:
+            with self.subTest(doc=doc):
+                decoder = stream.JSONStreamDecoder(cls=self.json.JSONDecoder)
+                with self.assertRaises(ValueError):
+                    self.feed_all(decoder, chunked(doc, 2))
+
+    def test_feed_after_close(self):
+        decoder = stream.JSONStreamDecoder(cls=self.json.JSONDecoder)
+        decoder.close()
+        self.assertRaises(ValueError, decoder.feed, '1')
+
+    def test_bom_in_str(self):
+        decoder = stream.JSONStreamDecoder(cls=self.json.JSONDecoder)
+        self.assertRaises(stream.JSONDecodeError, decoder.feed, '\ufeff[]')
+
+    def test_mixed_input_types(self):
+        decoder = stream.JSONStreamDecoder(cls=self.json.JSONDecoder)
+        decoder.feed('[')
+        self.assertRaises(TypeError, decoder.feed, b']')
+
+    def test_iterload(self):
+        text = self.stream_text()
+        self.assertEqual(list(stream.iterload(StringIO(text), chunk_size=5,
+                                              cls=self.json.JSONDecoder)),
+                         self.docs)
+        self.assertEqual(list(stream.iterload(BytesIO(text.encode()),
+                                              chunk_size=5,
+                                              cls=self.json.JSONDecoder)),
+                         self.docs)
+        self.assertEqual(list(stream.iterload(StringIO(''))), [])
+
+    def test_iterload_lines(self):
+        text = self.stream_text().replace('\n', '\n\n')
+        self.assertEqual(list(stream.iterload_lines(
+                            StringIO(text), cls=self.json.JSONDecoder)),
+                         self.docs)
+        self.assertEqual(list(stream.iterload_lines(
+                            BytesIO(text.encode()), cls=self.json.JSONDecoder)),
+                         self.docs)
+        lines = stream.iterload_lines(StringIO('1\n[2,\n3\n'),
+                                      cls=self.json.JSONDecoder)
+        self.assertEqual(next(lines), 1)
+        with self.assertRaises(ValueError) as cm:
+            next(lines)
+        self.assertIn('line 2 of the stream', cm.exception.__notes__[0])
+
+    def test_events(self):
+        doc = '{"a": [1, "x", {"b": null}], "c": true, "d": -Infinity}'
+        expected = [
+            ('', 'start_map', None),
+            ('', 'map_key', 'a'),
+            ('a', 'start_array', None),
+            ('a.item', 'number', 1),
+            ('a.item', 'string', 'x'),
+            ('a.item', 'start_map', None),
+            ('a.item', 'map_key', 'b'),
+            ('a.item.b', 'null', None),
+            ('a.item', 'end_map', None),
+            ('a', 'end_array', None),
+            ('', 'map_key', 'c'),
+            ('c', 'boolean', True),
+            ('', 'map_key', 'd'),
+            ('d', 'number', float('-inf')),
+            ('', 'end_map', None),
+        ]
+        for size in (1, 2, 5, len(doc)):
+            with self.subTest(size=size):
+                parser = stream.JSONEventParser(cls=self.json.JSONDecoder)
+                self.assertEqual(self.feed_all(parser, chunked(doc, size)),
+                                 expected)
+        self.assertEqual(list(stream.iterevents(StringIO(doc), chunk_size=3,
+                                                cls=self.json.JSONDecoder)),
+                         expected)
+
+    def test_events_split_string(self):
+        doc = '["' + 'a\\"b\\\\' * 50 + '"]'
+        parser = stream.JSONEventParser(cls=self.json.JSONDecoder)
+        events = self.feed_all(parser, chunked(doc, 3))
+        self.assertEqual(events[1], ('item', 'string', 'a"b\\' * 50))
+
+    def test_events_errors(self):
+        for doc in ['[1,', '{"a"', '"abc', '[1 2]', '{"a":1,}', '{1: 2}',
+                    '{"a" 1}', ']', 'tru', '-Inf', '[1.]']:
+            with self.subTest(doc=doc):
+                parser = stream.JSONEventParser(cls=self.json.JSONDecoder)
+                with self.assertRaises(ValueError):
+                    self.feed_all(parser, chunked(doc, 2))
+
+    def test_iteritems(self):
+        doc = self.dumps({"meta": {"n": 3},
+                          "rows": [{"id": 1, "tags": ["x"]}, {"id": 2}, 3]})
+        self.assertEqual(list(stream.iteritems(StringIO(doc), 'rows.item',
+                                               chunk_size=4,
+                                               cls=self.json.JSONDecoder)),
+                         [{"id": 1, "tags": ["x"]}, {"id": 2}, 3])
+        self.assertEqual(list(stream.iteritems(StringIO(doc), 'meta.n',
+                                               cls=self.json.JSONDecoder)),
+                         [3])
+        self.assertEqual(list(stream.iteritems(StringIO(doc), 'missing',
+                                               cls=self.json.JSONDecoder)),
+                         [])
+        text = self.stream_text()
+        self.assertEqual(list(stream.iteritems(StringIO(text), '',
+                                               chunk_size=7,
+                                               cls=self.json.JSONDecoder)),
+                         self.docs)
+
+    def test_iteritems_hooks(self):
+        doc = '[{"b": 1, "a": 2}]'
+        result = list(stream.iteritems(StringIO(doc), 'item',
+                                       cls=self.json.JSONDecoder,
+                                       object_pairs_hook=OrderedDict))
+        self.assertIs(type(result[0]), OrderedDict)
+        self.assertEqual(list(result[0]), ['b', 'a'])
+
+
+class TestPyStream(TestStream, PyTest): pass
+class TestCStream(TestStream, CTest): pass
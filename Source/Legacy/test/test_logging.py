@@ -1837,6 +1837,17 @@ class SocketHandlerTest(BaseTest):
         self.handled.acquire()
         self.assertEqual(self.log_output, "spam\neggs\n")
 
+    def test_output_batch(self):
+        # A batch is sent at once and received as separate records.
+        if self.server_exception:
+            self.skipTest(self.server_exception)
+        records = [logging.makeLogRecord({'msg': msg})
+                   for msg in ('spam', 'eggs', 'ham')]
+        self.sock_hdlr.handle_batch(records)
+        for _ in records:
+            self.handled.acquire()
+        self.assertEqual(self.log_output, "spam\neggs\nham\n")
+
     def test_noserver(self):
         if self.server_exception:
             self.skipTest(self.server_exception)
@@ -3905,6 +3916,147 @@ class QueueHandlerTest(BaseTest):
         listener.stop()
         self.assertEqual(self.stream.getvalue().strip(), "que -> ERROR: error")
 
+    def test_overflow_policies(self):
+        rec = lambda msg: logging.makeLogRecord({'msg': msg})
+        self.assertRaises(ValueError, logging.handlers.QueueHandler,
+                          self.queue, overflow='spill')
+        for overflow, expected in [('drop-newest', ['0', '1']),
+                                   ('drop-oldest', ['3', '4'])]:
+            with self.subTest(overflow=overflow):
+                q = queue.Queue(2)
+                handler = logging.handlers.QueueHandler(q, overflow=overflow)
+                for i in range(5):
+                    handler.handle(rec(str(i)))
+                self.assertEqual([q.get_nowait().msg for _ in range(2)],
+                                 expected)
+                self.assertEqual((handler.queued, handler.dropped),
+                                 (len(expected) + (overflow == 'drop-oldest') * 3,
+                                  3))
+                handler.close()
+
+        # The stop sentinel is never dropped.
+        q = queue.Queue(1)
+        q.put_nowait(logging.handlers.QueueListener._sentinel)
+        handler = logging.handlers.QueueHandler(q, overflow='drop-oldest')
+        handler.handle(rec('x'))
+        self.assertIs(q.get_nowait(), logging.handlers.QueueListener._sentinel)
+        self.assertEqual(handler.dropped, 1)
+        handler.close()
+
+        # Nor when another producer takes its place once it is removed.
+        class RacingQueue(queue.Queue):
+            def get_nowait(self):
+                item = super().get_nowait()
+                if item is logging.handlers.QueueListener._sentinel:
+                    self.put_nowait(rec('other'))
+                return item
+        q = RacingQueue(2)
+        q.put_nowait(logging.handlers.QueueListener._sentinel)
+        q.put_nowait(rec('a'))
+        handler = logging.handlers.QueueHandler(q, overflow='drop-oldest')
+        handler.handle(rec('x'))
+        self.assertEqual(q.get_nowait().msg, 'other')
+        self.assertIs(q.get_nowait(), logging.handlers.QueueListener._sentinel)
+        self.assertEqual(handler.dropped, 2)
+        handler.close()
+
+        q = queue.Queue(10)
+        handler = logging.handlers.QueueHandler(q, overflow='sample',
+                                                sample_rate=3)
+        for i in range(20):
+            handler.handle(rec(str(i)))
+        # Five records fill the queue to half; then one in three is kept
+        # until it is full.
+        self.assertEqual([q.get_nowait().msg for _ in range(q.qsize())],
+                         ['0', '1', '2', '3', '4', '7', '10', '13', '16',
+                          '19'])
+        self.assertEqual((handler.queued, handler.dropped), (10, 10))
+        handler.close()
+
+    def test_blocking_overflow(self):
+        q = queue.Queue(1)
+        handler = logging.handlers.QueueHandler(q, overflow='block')
+        handler.handle(logging.makeLogRecord({'msg': '1'}))
+        t = threading.Thread(target=handler.handle,
+                             args=(logging.makeLogRecord({'msg': '2'}),))
+        t.start()
+        self.assertEqual(q.get(timeout=support.SHORT_TIMEOUT).msg, '1')
+        t.join()
+        self.assertEqual(q.get_nowait().msg, '2')
+        self.assertEqual((handler.queued, handler.dropped), (2, 0))
+        handler.close()
+
+    def test_stop_listener_full_queue(self):
+        # stop() waits for the listener to make room for the sentinel.
+        handling = threading.Event()
+        release = threading.Event()
+        class BlockingHandler(logging.Handler):
+            def emit(self, record):
+                handling.set()
+                release.wait(support.SHORT_TIMEOUT)
+        q = queue.Queue(1)
+        handler = BlockingHandler()
+        listener = logging.handlers.QueueListener(q, handler)
+        listener.start()
+        q.put_nowait(logging.makeLogRecord({'msg': '1'}))
+        self.assertTrue(handling.wait(support.SHORT_TIMEOUT))
+        q.put_nowait(logging.makeLogRecord({'msg': '2'}))
+        stopper = threading.Thread(target=listener.stop)
+        stopper.start()
+        release.set()
+        stopper.join(support.SHORT_TIMEOUT)
+        self.assertFalse(stopper.is_alive())
+        self.assertIsNone(listener._thread)
+        self.assertTrue(q.empty())
+        handler.close()
+
+    def test_batching_queue_listener(self):
+        class BatchRecorder(logging.Handler):
+            def __init__(self):
+                logging.Handler.__init__(self)
+                self.batches = []
+            def emit_batch(self, records):
+                self.batches.append([record.msg for record in records])
+
+        handler = BatchRecorder()
+        for i in range(5):
+            self.que_logger.warning(str(i))
+        listener = logging.handlers.BatchingQueueListener(
+            self.queue, handler, max_batch=3)
+        listener.start()
+        listener.stop()
+        self.assertEqual(handler.batches, [['0', '1', '2'], ['3', '4']])
+        self.assertEqual((listener.batches, listener.handled), (2, 5))
+        self.assertEqual(self.queue.unfinished_tasks, 0)
+
+        # Handlers without handle_batch() get the records one at a time.
+        handler = TestHandler(support.Matcher())
+        handler.setLevel(logging.ERROR)
+        listener = logging.handlers.BatchingQueueListener(
+            self.queue, handler, respect_handler_level=True, max_wait=0.01)
+        listener.start()
+        self.que_logger.warning('warning')
+        self.que_logger.error('error')
+        listener.stop()
+        self.assertFalse(handler.matches(levelno=logging.WARNING))
+        self.assertTrue(handler.matches(levelno=logging.ERROR,
+                                        message='error'))
+        handler.close()
+
+    def test_batching_queue_listener_with_StreamHandler(self):
+        writes = []
+        class Stream(io.StringIO):
+            def write(self, s):
+                writes.append(s)
+                return super().write(s)
+        handler = logging.StreamHandler(Stream())
+        for i in range(3):
+            self.que_logger.warning(str(i))
+        listener = logging.handlers.BatchingQueueListener(self.queue, handler)
+        listener.start()
+        listener.stop()
+        self.assertEqual(writes, ['0\n1\n2\n'])
+
 if hasattr(logging.handlers, 'QueueListener'):
     import multiprocessing
     from unittest.mock import patch
@@ -4302,6 +4454,62 @@ class FormatterTest(unittest.TestCase, AssertErrorMessage):
         f.converter = time.gmtime
         self.assertEqual(f.formatTime(r), '21/04/1993 08:03:00')
 
+    def test_time_memoized(self):
+        r = self.get_record()
+        r.created = 735379380.5
+        r.msecs = 500
+        f = logging.Formatter('%(asctime)s')
+        f.converter = time.gmtime
+        self.assertEqual(f.formatTime(r), '1993-04-21 08:03:00,500')
+        # Another formatter with the same settings reuses the result; one
+        # with other settings does not.
+        g = logging.Formatter('[%(asctime)s]')
+        g.converter = time.gmtime
+        with support.swap_attr(time, 'strftime', None):
+            self.assertEqual(g.formatTime(r), '1993-04-21 08:03:00,500')
+        g.default_msec_format = '%s.%03d'
+        self.assertEqual(g.formatTime(r), '1993-04-21 08:03:00.500')
+        self.assertEqual(g.formatTime(r, '%H:%M'), '08:03')
+        # Changing the creation time is noticed.
+        r.created += 60
+        r.msecs = 0
+        self.assertEqual(f.formatTime(r), '1993-04-21 08:04:00,000')
+        # Records of the same second only differ in milliseconds.
+        r2 = self.get_record()
+        r2.created = r.created + 0.25
+        r2.msecs = 250
+        self.assertEqual(f.formatTime(r2), '1993-04-21 08:04:00,250')
+
+    def test_message_memoized(self):
+        r = self.get_record()
+        self.assertEqual(r.getMessage(), 'Message with 2 placeholders')
+        self.assertIs(r.getMessage(), r.getMessage())
+        r.args = (3, 'placeholders')
+        self.assertEqual(r.getMessage(), 'Message with 3 placeholders')
+        r.msg = 'Redacted'
+        r.args = None
+        self.assertEqual(r.getMessage(), 'Redacted')
+
+    def test_compiled_template(self):
+        r = self.get_record('custom')
+        cases = [
+            ('%(custom)d %% %(message)s', '%', '%(name)s',
+             '1234 % Message with 2 placeholders'),
+            ('{custom:05d} % {message!r}', '{', '{name}',
+             "01234 % 'Message with 2 placeholders'"),
+            ('$custom %s %% $$ ${message}', '$', '$name',
+             '1234 %s %% $ Message with 2 placeholders'),
+        ]
+        for fmt, style, other_fmt, expected in cases:
+            with self.subTest(style=style):
+                f = logging.Formatter(fmt, style=style)
+                self.assertEqual(f.format(r), expected)
+                # A new format string is picked up.
+                f._style._fmt = other_fmt
+                self.assertEqual(f.format(r), 'formatter.test')
+        f = logging.Formatter('$message $', style='$', validate=False)
+        self.assertRaises(ValueError, f.format, r)
+
     def test_issue_89047(self):
         f = logging.Formatter(fmt='{asctime}.{msecs:03.0f} {message}', style='{', datefmt="%Y-%m-%d %H:%M:%S")
         for i in range(2500):
@@ -4713,6 +4921,88 @@ class LogRecordTest(BaseTest):
         r.removeHandler(h)
         h.close()
 
+    def test_lazy_attributes(self):
+        r = logging.LogRecord('n', logging.INFO, '/a/b/mod.py', 1, 'x', None,
+                              None)
+        lazy = {'filename', 'module', 'msecs', 'relativeCreated',
+                'threadName', 'processName'}
+        computed = lambda r: lazy & logging._recordDict(r).keys()
+        self.assertFalse(computed(r))
+        self.assertEqual((r.filename, r.module), ('mod.py', 'mod'))
+        self.assertEqual(r.threadName, threading.current_thread().name)
+        self.assertEqual(r.msecs, int((r.created % 1) * 1000))
+        self.assertEqual(computed(r),
+                         {'filename', 'module', 'threadName', 'msecs'})
+        # Formatting computes only the attributes the format uses.
+        r = logging.LogRecord('n', logging.INFO, 'mod.py', 1, 'x', None, None)
+        self.assertEqual(logging.Formatter('%(module)s:%(message)s').format(r),
+                         'mod:x')
+        self.assertEqual(computed(r), {'module'})
+        # __dict__ and vars() compute them all.
+        d = vars(r)
+        self.assertIs(d, r.__dict__)
+        self.assertLessEqual(lazy, d.keys())
+        self.assertEqual(d['filename'], 'mod.py')
+        self.assertEqual(d['process'], os.getpid())
+        self.assertEqual(d['threadName'], threading.current_thread().name)
+        self.assertEqual(
+            logging.Formatter('%(filename)s %(relativeCreated)d').format(r),
+            'mod.py %d' % d['relativeCreated'])
+        self.assertEqual(logging.Formatter('{threadName}', style='{').format(r),
+                         threading.current_thread().name)
+        # Copies and pickles carry them all.
+        r = logging.LogRecord('n', logging.INFO, 'mod.py', 1, 'x', None, None)
+        for c in (copy.copy(r), pickle.loads(pickle.dumps(r))):
+            self.assertLessEqual(lazy, vars(c).keys())
+            self.assertEqual(c.threadName, r.threadName)
+        self.assertRaises(KeyError, logging.getLogger().makeRecord, 'n',
+                          logging.INFO, 'p', 1, 'x', None, None,
+                          extra={'process': 1})
+
+    @support.requires_fork()
+    def test_process_after_fork(self):
+        # A record created before fork() reports its creator's pid.
+        r = logging.LogRecord('n', logging.INFO, 'mod.py', 1, 'x', None, None)
+        self.assertEqual(logging._recordDict(r)['process'], os.getpid())
+        rfd, wfd = os.pipe()
+        self.addCleanup(os.close, rfd)
+        pid = os.fork()
+        if pid == 0:
+            try:
+                os.write(wfd, str(r.process).encode())
+            finally:
+                os._exit(0)
+        os.close(wfd)
+        support.wait_process(pid, exitcode=0)
+        self.assertEqual(int(os.read(rfd, 100)), os.getpid())
+
+    def test_no_record_for_rejected_level(self):
+        logger = logging.getLogger('lazy.rejected')
+        logger.propagate = False
+        logger.setLevel(logging.DEBUG)
+        h = RecordingHandler(logging.ERROR)
+        logger.addHandler(h)
+        created = []
+        old_factory = logging.getLogRecordFactory()
+        def factory(*args, **kwargs):
+            created.append(args)
+            return old_factory(*args, **kwargs)
+        logging.setLogRecordFactory(factory)
+        try:
+            logger.info('ignored')
+            self.assertEqual(created, [])
+            logger.error('kept')
+            self.assertEqual(len(created), 1)
+            # A logger filter may change the record, so it always gets one.
+            logger.addFilter(lambda record: True)
+            logger.info('filtered')
+            self.assertEqual(len(created), 2)
+        finally:
+            logging.setLogRecordFactory(old_factory)
+            logger.removeHandler(h)
+            h.close()
+        self.assertEqual([r.msg for r in h.records], ['kept'])
+
     @staticmethod # pickled as target of child process in the following test
     def _extract_logrecord_process_name(key, logMultiprocessing, conn=None):
         prev_logMultiprocessing = logging.logMultiprocessing
@@ -5567,6 +5857,19 @@ class FileHandlerTest(BaseFileTest):
         with open(self.fn) as fp:
             self.assertEqual(fp.read().strip(), '1')
 
+    def test_emit_batch(self):
+        os.unlink(self.fn)
+        fh = logging.FileHandler(self.fn, encoding='utf-8', delay=True)
+        fh.setFormatter(logging.Formatter('%(message)s'))
+        records = [self.next_rec(), self.next_rec(),
+                   logging.makeLogRecord({'msg': '%d', 'args': ('x',)})]
+        with support.captured_stderr() as stderr:
+            self.assertEqual(fh.handle_batch(records), records)
+        self.assertIn('TypeError', stderr.getvalue())
+        fh.close()
+        with open(self.fn, encoding='utf-8') as fp:
+            self.assertEqual(fp.read(), '1\n2\n')
+
 class RotatingFileHandlerTest(BaseFileTest):
     @unittest.skipIf(support.is_wasi, "WASI does not have /dev/null.")
     def test_should_not_rollover(self):
@@ -236,6 +236,141 @@ class PyPicklerHookTests(AbstractHookTests, unittest.TestCase):
     pickler_class = CustomPyPicklerClass
 
 
+class Record:
+    def __init__(self, id, name, children=()):
+        self.id = id
+        self.name = name
+        self.children = list(children)
+
+    def __eq__(self, other):
+        return (type(other) is Record and
+                vars(self) == vars(other))
+
+
+class PyPicklerCompiledSaveTests(unittest.TestCase):
+    # Instances of plain classes are saved by routines compiled per class.
+
+    def dumps(self, obj, proto, fast=False, pickler=pickle._Pickler):
+        f = io.BytesIO()
+        p = pickler(f, proto)
+        p.fast = fast
+        p.dump(obj)
+        return f.getvalue()
+
+    def test_same_output(self):
+        class GenericPickler(pickle._Pickler):
+            def reducer_override(self, obj):
+                return NotImplemented
+
+        shared = Record(0, 'shared')
+        tree = [Record(1, 'a', [Record(2, 'b'), shared]), shared,
+                Record(3, 'c', [Record(4, 'd')]), {1: Record(5, '')},
+                Record(6, 'x' * 300)]
+        vars(tree[-1]).update({7: 'non-str key', 'k' * 300: None})
+        for proto in range(2, pickle.HIGHEST_PROTOCOL + 1):
+            for fast in (False, True):
+                with self.subTest(proto=proto, fast=fast):
+                    if fast:
+                        data = [tree[0], tree[2], tree[3], tree[4]]
+                    else:
+                        data = tree
+                    s = self.dumps(data, proto, fast)
+                    self.assertEqual(
+                        s, self.dumps(data, proto, fast, GenericPickler))
+                    self.assertEqual(pickle.loads(s), data)
+        loaded = pickle.loads(self.dumps(tree, 4))
+        self.assertIs(loaded[0].children[1], loaded[1])
+
+    def test_fast_mode(self):
+        shared = Record(0, 'shared')
+        data = [shared, Record(1, 'a', [shared])]
+        for proto in range(pickle.HIGHEST_PROTOCOL + 1):
+            with self.subTest(proto=proto):
+                s = self.dumps(data, proto, fast=True)
+                self.assertNotIn(pickle.MEMOIZE, s[2:] if proto >= 4 else b'')
+                loaded = pickle.loads(s)
+                self.assertEqual(loaded, data)
+                # Nothing is shared in fast mode.
+                self.assertIsNot(loaded[1].children[0], loaded[0])
+
+    def test_hooks_disable_routines(self):
+        class PersPickler(pickle._Pickler):
+            def persistent_id(self, obj):
+                return 'record' if obj is Record else None
+
+        class PersUnpickler(pickle._Unpickler):
+            def persistent_load(self, pid):
+                return Record
+
+        for fast in (False, True):
+            s = self.dumps([Record(1, 'a')], 4, fast, PersPickler)
+            loaded = PersUnpickler(io.BytesIO(s)).load()
+            self.assertEqual(loaded, [Record(1, 'a')])
+            self.assertNotIn(b'Record', s)
+
+    def test_uncompiled_classes(self):
+        class Slotted:
+            __slots__ = ('x',)
+            def __init__(self):
+                self.x = 1
+        class Reduced:
+            def __reduce__(self):
+                return (list, ([1],))
+        for proto in range(2, pickle.HIGHEST_PROTOCOL + 1):
+            for fast in (False, True):
+                with self.subTest(proto=proto, fast=fast):
+                    self.assertRaises((pickle.PicklingError, AttributeError),
+                                      self.dumps, Slotted(), proto, fast)
+                    self.assertEqual(
+                        pickle.loads(self.dumps(Reduced(), proto, fast)), [1])
+                    # Proxies forward attribute lookups to their referent.
+                    r = Record(1, 'a')
+                    self.assertEqual(
+                        pickle.loads(self.dumps(weakref.proxy(r), proto, fast)),
+                        r)
+
+    def test_wrong_class(self):
+        class Other:
+            pass
+        class Disguised:
+            __class__ = Other
+        Disguised.__qualname__ = '_DisguisedRecord'
+        Disguised.__module__ = __name__
+        with support.swap_item(globals(), '_DisguisedRecord', Disguised):
+            for fast in (False, True):
+                with self.subTest(fast=fast):
+                    with self.assertRaisesRegex(pickle.PicklingError,
+                                                'wrong class'):
+                        self.dumps(Disguised(), 4, fast)
+
+    def test_fix_imports(self):
+        class Local:
+            pass
+        Local.__qualname__ = '_LocalRecord'
+        Local.__module__ = 'builtins'
+        with support.swap_attr(builtins, '_LocalRecord', Local):
+            for fix_imports in (True, False, True):
+                with self.subTest(fix_imports=fix_imports):
+                    f = io.BytesIO()
+                    p = pickle._Pickler(f, 2, fix_imports=fix_imports)
+                    p.fast = True
+                    p.dump(Local())
+                    self.assertEqual(b'__builtin__' in f.getvalue(),
+                                     fix_imports)
+
+    def test_routines_do_not_keep_classes_alive(self):
+        class Local:
+            pass
+        Local.__qualname__ = '_LocalRecord'
+        Local.__module__ = __name__
+        with support.swap_item(globals(), '_LocalRecord', Local):
+            for fast in (False, True):
+                self.dumps(Local(), 4, fast)
+        ref = weakref.ref(Local)
+        del Local
+        support.gc_collect()
+        self.assertIsNone(ref())
+
 if has_c_implementation:
     class CPickleTests(AbstractPickleModuleTests, unittest.TestCase):
         from _pickle import dump, dumps, load, loads, Pickler, Unpickler
@@ -188,6 +188,11 @@ class SocketServerTest(unittest.TestCase):
                         socketserver.StreamRequestHandler,
                         self.stream_examine)
 
+    def test_PoolingTCPServer(self):
+        self.run_server(socketserver.PoolingTCPServer,
+                        socketserver.StreamRequestHandler,
+                        self.stream_examine)
+
     @requires_forking
     def test_ForkingTCPServer(self):
         with simple_subprocess(self):
@@ -225,6 +230,11 @@ class SocketServerTest(unittest.TestCase):
                         socketserver.DatagramRequestHandler,
                         self.dgram_examine)
 
+    def test_PoolingUDPServer(self):
+        self.run_server(socketserver.PoolingUDPServer,
+                        socketserver.DatagramRequestHandler,
+                        self.dgram_examine)
+
     @requires_forking
     def test_ForkingUDPServer(self):
         with simple_subprocess(self):
@@ -468,6 +478,285 @@ class SocketWriterTest(unittest.TestCase):
         self.assertEqual(received2, test.support.SOCK_MAX_SIZE - 100)
 
 
+class PoolingTest(unittest.TestCase):
+
+    def setUp(self):
+        signal_alarm(60)  # Kill deadlocks after 60 seconds.
+        self.release = threading.Event()
+        release = self.release
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                self.wfile.write(b'%d\n' % threading.get_ident())
+                release.wait(test.support.SHORT_TIMEOUT)
+
+        class Server(socketserver.PoolingTCPServer):
+            pool_size = 2
+            queue_size = 1
+
+        self.handler = Handler
+        self.server_class = Server
+
+    def tearDown(self):
+        signal_alarm(0)  # Didn't deadlock.
+
+    def serve(self, server):
+        t = threading.Thread(target=server.serve_forever,
+                             kwargs={'poll_interval': 0.01})
+        t.start()
+        def stop():
+            self.release.set()
+            server.shutdown()
+            t.join()
+            server.server_close()
+        self.addCleanup(stop)
+
+    def connect(self, server):
+        s = socket.create_connection(server.server_address)
+        self.addCleanup(s.close)
+        return s
+
+    def wait_for(self, predicate):
+        for _ in test.support.sleeping_retry(test.support.SHORT_TIMEOUT):
+            if predicate():
+                break
+
+    def test_threads_reused(self):
+        server = self.server_class((HOST, 0), self.handler)
+        self.release.set()
+        self.serve(server)
+        idents = set()
+        for i in range(10):
+            with socket.create_connection(server.server_address) as s:
+                idents.add(int(s.makefile('rb').readline()))
+        self.assertLessEqual(len(idents), 2)
+        self.wait_for(lambda: server.get_pool_stats()['handled'] == 10)
+        stats = server.get_pool_stats()
+        self.assertEqual(stats['workers'], 2)
+        self.assertEqual(stats['rejected'], 0)
+        self.assertEqual(stats['saturated'], 0)
+        self.assertFalse(stats['full'])
+
+    def test_reject(self):
+        self.server_class.overflow = 'reject'
+        server = self.server_class((HOST, 0), self.handler)
+        self.serve(server)
+        clients = [self.connect(server) for i in range(2)]
+        for s in clients:
+            s.makefile('rb').readline()
+        queued = self.connect(server)
+        self.wait_for(lambda: server.get_pool_stats()['full'])
+        rejected = self.connect(server)
+        self.assertEqual(rejected.recv(100), b'')
+        stats = server.get_pool_stats()
+        self.assertEqual(stats['busy'], 2)
+        self.assertEqual(stats['queued'], 1)
+        self.assertEqual(stats['rejected'], 1)
+        self.assertEqual(stats['saturated'], 1)
+
+        self.release.set()
+        self.assertTrue(queued.makefile('rb').readline())
+        self.wait_for(lambda: server.get_pool_stats()['handled'] == 3)
+
+    def test_block(self):
+        server = self.server_class((HOST, 0), self.handler)
+        self.serve(server)
+        clients = [self.connect(server) for i in range(2)]
+        for s in clients:
+            s.makefile('rb').readline()
+        queued = self.connect(server)
+        self.wait_for(lambda: server.get_pool_stats()['full'])
+        # The connection waits in the backlog instead of being rejected.
+        waiting = self.connect(server)
+        waiting.settimeout(0.2)
+        with self.assertRaises(TimeoutError):
+            waiting.recv(100)
+        stats = server.get_pool_stats()
+        self.assertEqual(stats['queued'], 1)
+        self.assertEqual(stats['rejected'], 0)
+
+        self.release.set()
+        waiting.settimeout(test.support.SHORT_TIMEOUT)
+        self.assertTrue(queued.makefile('rb').readline())
+        self.assertTrue(waiting.makefile('rb').readline())
+        self.wait_for(lambda: server.get_pool_stats()['handled'] == 4)
+
+    def test_bad_overflow(self):
+        self.server_class.overflow = 'drop'
+        server = self.server_class((HOST, 0), self.handler)
+        self.addCleanup(server.server_close)
+        with self.assertRaises(ValueError):
+            server.process_request(None, None)
+
+
+if HAVE_FORKING:
+    class PreForkingTCPServer(socketserver.PreForkingMixIn,
+                              socketserver.ThreadingTCPServer):
+        workers = 2
+
+
+class PidHandler(socketserver.StreamRequestHandler):
+    """Echo a line after the pid of the worker."""
+
+    def handle(self):
+        line = self.rfile.readline()
+        self.wfile.write(b'%d %s' % (os.getpid(), line))
+
+
+@requires_forking
+class PreForkingTest(unittest.TestCase):
+
+    def setUp(self):
+        signal_alarm(60)  # Kill deadlocks after 60 seconds.
+
+    def tearDown(self):
+        signal_alarm(0)  # Didn't deadlock.
+        reap_children()
+
+    def serve(self, server):
+        t = threading.Thread(target=server.serve_forever,
+                             kwargs={'poll_interval': 0.01})
+        t.start()
+        def stop():
+            server.shutdown()
+            t.join()
+            server.server_close()
+        self.addCleanup(stop)
+        for _ in test.support.sleeping_retry(test.support.SHORT_TIMEOUT):
+            if server._workers is not None:
+                break
+
+    def request(self, server, data=TEST_STR):
+        with socket.create_connection(server.server_address) as s:
+            s.sendall(data)
+            pid, line = s.makefile('rb').readline().split(b' ', 1)
+        self.assertEqual(line, data)
+        return int(pid)
+
+    def wait_for(self, predicate):
+        for _ in test.support.sleeping_retry(test.support.SHORT_TIMEOUT):
+            if predicate():
+                break
+
+    def worker_pids(self, server):
+        return set(server._workers)
+
+    def check_workers(self, server, nrequests=20):
+        pids = {self.request(server) for i in range(nrequests)}
+        self.assertTrue(pids)
+        self.assertLessEqual(pids, self.worker_pids(server))
+        self.assertNotIn(os.getpid(), pids)
+        self.wait_for(lambda: server.get_stats()['requests'] >= nrequests)
+        return pids
+
+    def test_workers(self):
+        server = PreForkingTCPServer((HOST, 0), PidHandler)
+        self.serve(server)
+        self.check_workers(server)
+        stats = server.get_stats()
+        self.assertEqual(stats['workers'], 2)
+        self.assertEqual(stats['requests'], 20)
+        self.assertEqual(stats['errors'], 0)
+        self.assertEqual(stats['active'], 0)
+        self.assertEqual(stats['restarts'], 0)
+
+    @unittest.skipUnless(hasattr(socket, 'SO_REUSEPORT'),
+                         'requires SO_REUSEPORT')
+    def test_reuse_port(self):
+        class Server(PreForkingTCPServer):
+            reuse_port = True
+
+        server = Server((HOST, 0), PidHandler)
+        self.serve(server)
+        self.check_workers(server)
+
+    def test_blocking_requests(self):
+        # Accepted sockets are blocking, although the listening socket of
+        # the workers is not.
+        class BlockingModeHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                self.wfile.write(b'%d' % self.request.getblocking())
+
+        server = PreForkingTCPServer((HOST, 0), BlockingModeHandler)
+        self.serve(server)
+        with socket.create_connection(server.server_address) as s:
+            self.assertEqual(s.makefile('rb').read(), b'1')
+
+    def test_worker_exits(self):
+        server = PreForkingTCPServer((HOST, 0), PidHandler)
+        self.serve(server)
+        pid = self.request(server)
+        os.kill(pid, signal.SIGKILL)
+        self.wait_for(lambda: pid not in server._workers and
+                              len(server._workers) == 2)
+        self.assertEqual(server.get_stats()['restarts'], 1)
+        self.assertNotIn(pid, self.check_workers(server))
+
+    def test_restart_workers(self):
+        server = PreForkingTCPServer((HOST, 0), PidHandler)
+        self.serve(server)
+        self.wait_for(lambda: len(server._workers) == 2)
+        old = self.worker_pids(server)
+        # A request in progress is finished by its worker.
+        with socket.create_connection(server.server_address) as s:
+            s.sendall(b'x')
+            self.wait_for(lambda: server.get_stats()['active'])
+            server.restart_workers()
+            self.wait_for(lambda: len(server._workers) == 3)
+            s.sendall(TEST_STR)
+            pid, line = s.makefile('rb').readline().split(b' ', 1)
+        self.assertIn(int(pid), old)
+        self.assertEqual(line, b'x' + TEST_STR)
+        self.wait_for(lambda: not (self.worker_pids(server) & old))
+        self.assertEqual(len(server._workers), 2)
+        self.assertFalse(self.check_workers(server) & old)
+        self.wait_for(lambda: server.get_stats()['requests'] == 21)
+        self.assertEqual(server.get_stats()['restarts'], 0)
+
+    def test_worker_timeout(self):
+        class Server(socketserver.PreForkingMixIn, socketserver.TCPServer):
+            workers = 1
+            worker_timeout = 0.5
+
+        class BlockingHandler(socketserver.BaseRequestHandler):
+            def handle(self):
+                self.request.recv(1)
+
+        server = Server((HOST, 0), BlockingHandler)
+        self.serve(server)
+        self.wait_for(lambda: server._workers)
+        [pid] = self.worker_pids(server)
+        with socket.create_connection(server.server_address):
+            self.wait_for(lambda: pid not in server._workers)
+        self.assertEqual(server.get_stats()['restarts'], 1)
+
+    def test_graceful_timeout(self):
+        class Server(socketserver.PreForkingMixIn, socketserver.TCPServer):
+            workers = 2
+            graceful_timeout = 0.1
+
+        class BlockingHandler(socketserver.BaseRequestHandler):
+            def handle(self):
+                self.request.recv(1)
+
+        # Each worker is blocked in a request, and both are killed.
+        server = Server((HOST, 0), BlockingHandler)
+        t = threading.Thread(target=server.serve_forever,
+                             kwargs={'poll_interval': 0.01})
+        t.start()
+        self.wait_for(lambda: server._workers is not None and
+                              len(server._workers) == 2)
+        pids = self.worker_pids(server)
+        with socket.create_connection(server.server_address), \
+             socket.create_connection(server.server_address):
+            self.wait_for(lambda: server.get_stats()['active'] == 2)
+            server.shutdown()
+            t.join()
+        server.server_close()
+        self.assertEqual(server._workers, {})
+        for pid in pids:
+            self.assertRaises(ChildProcessError, os.waitpid, pid, 0)
+
 class MiscTestCase(unittest.TestCase):
 
     def test_all(self):
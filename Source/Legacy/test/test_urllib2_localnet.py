@@ -691,6 +691,157 @@ class TestUrlopen(unittest.TestCase):
         self.assertEqual(b"1234567890", request.data)
         self.assertEqual("10", request.get_header("Content-length"))
 
+class KeepAliveRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Handler of persistent connections recording the client port of each
+    request, so that tests can tell when a connection is reused."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.ports.append(self.client_address[1])
+        body = b"body of " + self.path.encode("ascii")
+        self.send_response(200)
+        if self.path == "/close":
+            self.send_header("Connection", "close")
+        if self.path == "/chunked":
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            self.wfile.write(b"%x\r\n%s\r\n0\r\n\r\n" % (len(body), body))
+        else:
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        if self.path == "/drop":
+            # close the connection without telling the client
+            self.close_connection = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.do_GET()
+
+    do_PUT = do_POST
+
+    def log_message(self, *args):
+        pass
+
+
+class PooledHTTPHandlerTests(unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0),
+                                                     KeepAliveRequestHandler)
+        self.httpd.ports = []
+        self.addCleanup(self.httpd.server_close)
+        thread = threading.Thread(target=self.httpd.serve_forever,
+                                  kwargs={"poll_interval": 0.01})
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.httpd.shutdown)
+        self.url = "http://127.0.0.1:%s" % self.httpd.server_port
+        self.handler = urllib.request.PooledHTTPHandler()
+        self.addCleanup(self.handler.close)
+        self.opener = urllib.request.build_opener(self.handler)
+
+    def read(self, path, data=None):
+        with self.opener.open(self.url + path, data) as response:
+            return response.read()
+
+    def test_build_opener(self):
+        handlers = [h for h in self.opener.handlers
+                    if isinstance(h, urllib.request.HTTPHandler)]
+        self.assertEqual(handlers, [self.handler])
+
+    def test_reuse(self):
+        self.assertEqual(self.read("/a"), b"body of /a")
+        self.assertEqual(self.read("/b"), b"body of /b")
+        self.assertEqual(self.read("/c", b"data"), b"body of /c")
+        ports = self.httpd.ports
+        self.assertEqual(len(ports), 3)
+        self.assertEqual(len(set(ports)), 1)
+
+    def test_reuse_chunked(self):
+        self.assertEqual(self.read("/chunked"), b"body of /chunked")
+        self.assertEqual(self.read("/a"), b"body of /a")
+        self.assertEqual(len(set(self.httpd.ports)), 1)
+
+    def test_partial_read(self):
+        # A connection is released to the pool only once its response
+        # has been read in full.
+        with self.opener.open(self.url + "/a") as response:
+            self.assertEqual(response.read(4), b"body")
+            self.assertEqual(self.read("/b"), b"body of /b")
+            self.assertEqual(response.read(), b" of /a")
+        self.read("/c")
+        ports = self.httpd.ports
+        self.assertNotEqual(ports[0], ports[1])
+        self.assertIn(ports[2], ports[:2])
+
+    def test_close_before_end(self):
+        with self.opener.open(self.url + "/a") as response:
+            response.read(4)
+        self.read("/b")
+        self.assertNotEqual(*self.httpd.ports)
+
+    def test_connection_close(self):
+        self.read("/close")
+        self.read("/a")
+        self.assertNotEqual(*self.httpd.ports)
+
+    def test_dropped_connection(self):
+        self.read("/drop")
+        self.read("/a")
+        self.assertNotEqual(*self.httpd.ports)
+
+    def test_retry(self):
+        # The server closes the connection between the check of an idle
+        # connection and the request sent on it.
+        self.read("/drop")
+        put = urllib.request.Request(self.url + "/b", b"data", method="PUT")
+        with support.swap_attr(urllib.request, "_connection_dropped",
+                               lambda sock: False):
+            self.assertEqual(self.read("/a"), b"body of /a")
+            self.assertEqual(self.read("/drop", b"data"), b"body of /drop")
+            with self.opener.open(put) as response:
+                self.assertEqual(response.read(), b"body of /b")
+            self.read("/drop")
+            # The server may have acted on a request which is not
+            # idempotent, which is not sent again.
+            with self.assertRaises((ConnectionError, urllib.error.URLError)):
+                self.read("/b", b"data")
+        ports = self.httpd.ports
+        self.assertEqual(len(ports), 5)
+        self.assertEqual(ports[1], ports[2])
+        self.assertEqual(ports[3], ports[4])
+        self.assertEqual(len(set(ports)), 3)
+
+    def test_idle_timeout(self):
+        self.handler.idle_timeout = 0
+        self.read("/a")
+        self.read("/b")
+        self.assertNotEqual(*self.httpd.ports)
+
+    def test_maxsize(self):
+        self.handler.maxsize = 1
+        responses = [self.opener.open(self.url + path)
+                     for path in ("/a", "/b", "/c")]
+        for response in responses:
+            with response:
+                response.read()
+        self.read("/d")
+        ports = self.httpd.ports
+        self.assertEqual(len(set(ports)), 3)
+        self.assertEqual(ports[3], ports[2])
+        key, = self.handler._idle
+        self.assertEqual(len(self.handler._idle[key]), 1)
+
+    def test_close(self):
+        self.read("/a")
+        self.handler.close()
+        self.read("/b")
+        self.assertNotEqual(*self.httpd.ports)
+
+
 def setUpModule():
     thread_info = threading_helper.threading_setup()
     unittest.addModuleCleanup(threading_helper.threading_cleanup, *thread_info)
@@ -84,14 +84,18 @@ f = urllib.request.urlopen('https://www.python.org/')
 import base64
 import bisect
 import email
+import errno
+import functools
 import hashlib
 import http.client
 import io
 import os
 import re
+import select
 import socket
 import string
 import sys
+import threading
 import time
 import tempfile
 import contextlib
@@ -122,7 +126,8 @@ __all__ = [
     'HTTPPasswordMgrWithPriorAuth', 'AbstractBasicAuthHandler',
     'HTTPBasicAuthHandler', 'ProxyBasicAuthHandler', 'AbstractDigestAuthHandler',
     'HTTPDigestAuthHandler', 'ProxyDigestAuthHandler', 'HTTPHandler',
-    'FileHandler', 'FTPHandler', 'CacheFTPHandler', 'DataHandler',
+    'AbstractPooledHTTPHandler', 'PooledHTTPHandler', 'FileHandler',
+    'FTPHandler', 'CacheFTPHandler', 'DataHandler',
     'UnknownHandler', 'HTTPErrorProcessor',
     # Functions
     'urlopen', 'install_opener', 'build_opener',
@@ -1395,6 +1400,227 @@ if hasattr(http.client, 'HTTPSConnection'):
 
     __all__.append('HTTPSHandler')
 
+def _connection_dropped(sock):
+    """Return True if an idle connection was closed by the peer (or has
+    unexpected data to read), and cannot be used for a new request."""
+    if sock is None:
+        return True
+    try:
+        if hasattr(select, 'poll'):
+            poller = select.poll()
+            poller.register(sock, select.POLLIN)
+            return bool(poller.poll(0))
+        return bool(select.select([sock], [], [], 0)[0])
+    except (OSError, ValueError):
+        return True
+
+class _PooledHTTPResponse(http.client.HTTPResponse):
+    # Calls _release once the response is closed, with a flag telling
+    # whether the whole body was read and the connection can be reused.
+    _release = None
+    _trailer_read = False
+
+    def _read_and_discard_trailer(self):
+        super()._read_and_discard_trailer()
+        self._trailer_read = True
+
+    def _close_conn(self):
+        super()._close_conn()
+        release = self._release
+        if release is not None:
+            self._release = None
+            if self.chunked:
+                done = self._trailer_read
+            else:
+                done = self.length == 0
+            release(done and not self.will_close)
+
+_IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE',
+                                 'TRACE'})
+
+class AbstractPooledHTTPHandler(AbstractHTTPHandler):
+    """Keep HTTP connections open and reuse them for later requests.
+
+    Idle connections are pooled by scheme, host and port, and proxy.  A
+    connection goes back to its pool when the body of its response has
+    been read in full; closing a response before that closes the
+    connection.  At most maxsize idle connections are kept per pool,
+    and connections idle for idle_timeout seconds are closed.  Before
+    it is reused, a connection is checked for having been closed by the
+    server, and a request with an idempotent method failing on a reused
+    connection because the server closed it meanwhile is sent again on
+    another connection.
+    """
+
+    def __init__(self, debuglevel=0, *, maxsize=10, idle_timeout=60):
+        AbstractHTTPHandler.__init__(self, debuglevel)
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        # key -> list of (expiry time, connection), oldest first
+        self._idle = {}
+        self._idle_lock = threading.Lock()
+        self._next_sweep = 0
+
+    def close(self):
+        """Close the idle connections."""
+        with self._idle_lock:
+            idle = [conn for conns in self._idle.values()
+                    for expiry, conn in conns]
+            self._idle.clear()
+        for conn in idle:
+            conn.close()
+
+    def _get_connection(self, key):
+        # Return a usable idle connection for key, or None
+        now = time.monotonic()
+        stale = []
+        found = None
+        with self._idle_lock:
+            conns = self._idle.get(key)
+            while conns:
+                expiry, conn = conns.pop()
+                if expiry > now and not _connection_dropped(conn.sock):
+                    found = conn
+                    break
+                stale.append(conn)
+            if not conns:
+                self._idle.pop(key, None)
+        for conn in stale:
+            conn.close()
+        return found
+
+    def _release_connection(self, key, conn, reusable):
+        if not reusable or conn.sock is None:
+            conn.close()
+            return
+        now = time.monotonic()
+        evicted = []
+        with self._idle_lock:
+            conns = self._idle.setdefault(key, [])
+            conns.append((now + self.idle_timeout, conn))
+            if len(conns) > self.maxsize:
+                evicted.append(conns.pop(0)[1])
+            if now >= self._next_sweep:
+                # close the connections of all pools that have expired
+                for k, conns in list(self._idle.items()):
+                    n = 0
+                    while n < len(conns) and conns[n][0] <= now:
+                        evicted.append(conns[n][1])
+                        n += 1
+                    del conns[:n]
+                    if not conns:
+                        del self._idle[k]
+                self._next_sweep = now + self.idle_timeout
+        for conn in evicted:
+            conn.close()
+
+    def do_open(self, http_class, req, **http_conn_args):
+        """Return an HTTPResponse object for the request, using http_class
+        or an idle connection of the pool.
+
+        http_class must implement the HTTPConnection API from http.client.
+        """
+        host = req.host
+        if not host:
+            raise URLError('no host given')
+        key = (req.type, host.lower(), req._tunnel_host)
+
+        headers = dict(req.unredirected_hdrs)
+        headers.update({k: v for k, v in req.headers.items()
+                        if k not in headers})
+        headers = {name.title(): val for name, val in headers.items()}
+
+        tunnel_headers = {}
+        if req._tunnel_host:
+            proxy_auth_hdr = "Proxy-Authorization"
+            if proxy_auth_hdr in headers:
+                tunnel_headers[proxy_auth_hdr] = headers[proxy_auth_hdr]
+                # Proxy-Authorization should not be sent to origin
+                # server.
+                del headers[proxy_auth_hdr]
+
+        while True:
+            h = self._get_connection(key)
+            reused = h is not None
+            if reused:
+                timeout = req.timeout
+                if timeout is socket._GLOBAL_DEFAULT_TIMEOUT:
+                    timeout = socket.getdefaulttimeout()
+                h.timeout = req.timeout
+                h.sock.settimeout(timeout)
+            else:
+                # will parse host:port
+                h = http_class(host, timeout=req.timeout, **http_conn_args)
+                if req._tunnel_host:
+                    h.set_tunnel(req._tunnel_host, headers=tunnel_headers)
+            h.set_debuglevel(self._debuglevel)
+            h.response_class = _PooledHTTPResponse
+
+            try:
+                try:
+                    h.request(req.get_method(), req.selector, req.data,
+                              headers,
+                              encode_chunked=req.has_header(
+                                  'Transfer-encoding'))
+                except OSError as err: # timeout error
+                    raise URLError(err)
+                r = h.getresponse()
+            except BaseException as err:
+                h.close()
+                if reused and self._can_retry(req, err):
+                    continue
+                raise
+            break
+
+        if not r.will_close:
+            r._release = functools.partial(self._release_connection, key, h)
+        r.url = req.get_full_url()
+        # This line replaces the .msg attribute of the HTTPResponse
+        # with .headers, because urllib clients expect the response to
+        # have the reason in .msg.
+        r.msg = r.reason
+        return r
+
+    def _can_retry(self, req, err):
+        # The server may close an idle connection just as a request is
+        # sent on it.  The request can then be sent again if its method is
+        # idempotent, since the server may have acted on it anyway, and if
+        # its body can be sent again.
+        if req.get_method() not in _IDEMPOTENT_METHODS:
+            return False
+        if isinstance(err, URLError):
+            err = err.reason
+        if isinstance(err, http.client.RemoteDisconnected):
+            pass
+        elif (not isinstance(err, OSError) or
+                err.errno not in (errno.ECONNRESET, errno.ECONNABORTED,
+                                  errno.EPIPE)):
+            return False
+        return req.data is None or isinstance(req.data, (bytes, bytearray))
+
+class PooledHTTPHandler(AbstractPooledHTTPHandler, HTTPHandler):
+    """HTTPHandler reusing persistent connections.
+
+    See AbstractPooledHTTPHandler.
+    """
+
+if hasattr(http.client, 'HTTPSConnection'):
+
+    class PooledHTTPSHandler(AbstractPooledHTTPHandler, HTTPSHandler):
+        """HTTPSHandler reusing persistent connections.
+
+        See AbstractPooledHTTPHandler.
+        """
+
+        def __init__(self, debuglevel=0, context=None, check_hostname=None,
+                     *, maxsize=10, idle_timeout=60):
+            HTTPSHandler.__init__(self, debuglevel, context, check_hostname)
+            AbstractPooledHTTPHandler.__init__(self, debuglevel,
+                                               maxsize=maxsize,
+                                               idle_timeout=idle_timeout)
+
+    __all__.append('PooledHTTPSHandler')
+
 class HTTPCookieProcessor(BaseHandler):
     def __init__(self, cookiejar=None):
         import http.cookiejar
@@ -0,0 +1,76 @@
+"""Benchmark compiled record encoders against json.dumps.
+
+Usage::
+
+    python Tools/scripts/bench_json_compile.py [-n RECORDS] [-r REPEAT]
+
+Each case encodes a list of records sharing one shape, once as a whole
+array and once record by record, with the default (C accelerated when
+available) json.dumps, the pure Python encoder and JSONEncoder.compile().
+"""
+import argparse
+import dataclasses
+import json
+import timeit
+from json.encoder import JSONEncoder
+
+
+@dataclasses.dataclass
+class User:
+    id: int
+    name: str
+    score: float
+    active: bool
+    tags: list[str]
+
+
+def make_records(n):
+    return [{"id": i, "name": "user%d" % i, "score": i * 0.5,
+             "active": i % 2 == 0, "tags": ["a", "b"]} for i in range(n)]
+
+
+def bench(label, func, repeat):
+    best = min(timeit.repeat(func, number=1, repeat=repeat))
+    print(f'{label:<40} {best * 1e3:10.1f} ms')
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--records', type=int, default=100_000)
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    records = make_records(args.records)
+    users = [User(**record) for record in records]
+    encoder = JSONEncoder()
+    compiled = encoder.compile(records[0])
+    compiled_users = encoder.compile(User)
+    # iterencode() without _one_shot never uses the C accelerator, which
+    # is the path taken when _json is missing.
+    pure_encode = lambda o: ''.join(encoder.iterencode(o))
+
+    assert compiled.encode_many(records) == json.dumps(records)
+    assert compiled_users.encode_many(users) == json.dumps(records)
+
+    print(f'{args.records} records, best of {args.repeat}')
+    print('-- whole list')
+    base = bench('json.dumps', lambda: json.dumps(records), args.repeat)
+    bench('pure Python iterencode', lambda: pure_encode(records), args.repeat)
+    fast = bench('compile(sample).encode_many',
+                 lambda: compiled.encode_many(records), args.repeat)
+    bench('compile(dataclass).encode_many',
+          lambda: compiled_users.encode_many(users), args.repeat)
+    print(f'speedup over json.dumps: {base / fast:.2f}x')
+    print('-- one record at a time')
+    dumps = json.dumps
+    encode = compiled.encode
+    base = bench('json.dumps', lambda: [dumps(r) for r in records],
+                 args.repeat)
+    fast = bench('compile(sample).encode',
+                 lambda: [encode(r) for r in records], args.repeat)
+    print(f'speedup over json.dumps: {base / fast:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark the pure Python pickler on trees of plain objects.
+
+Usage::
+
+    python Tools/scripts/bench_pickle.py [-n RECORDS] [-r REPEAT] [-p PROTOCOL]
+
+Each case pickles a list of dataclass instances, once as a whole list and
+once record by record with a new pickler per record (as an RPC layer
+does), with the pure Python pickler in its default mode and in fast mode,
+which does not memoize objects.  The generic save path, which a
+reducer_override() hook forces, is compared to the save routines compiled
+per class.  The C pickler is shown for reference.
+"""
+import argparse
+import dataclasses
+import io
+import pickle
+import timeit
+
+
+@dataclasses.dataclass
+class Point:
+    x: float
+    y: float
+
+
+@dataclasses.dataclass
+class User:
+    id: int
+    name: str
+    score: float
+    active: bool
+    tags: list
+    location: Point
+
+
+def make_records(n):
+    return [User(i, "user%d" % i, i * 0.5, i % 2 == 0, ["a", "b"],
+                 Point(i, -i)) for i in range(n)]
+
+
+class GenericPickler(pickle._Pickler):
+    # Any reducer_override() disables the compiled save routines.
+    def reducer_override(self, obj):
+        return NotImplemented
+
+
+def dumps(obj, protocol, fast=False, pickler=pickle._Pickler):
+    f = io.BytesIO()
+    p = pickler(f, protocol)
+    p.fast = fast
+    p.dump(obj)
+    return f.getvalue()
+
+
+def bench(label, func, repeat):
+    best = min(timeit.repeat(func, number=1, repeat=repeat))
+    print(f'{label:<40} {best * 1e3:10.1f} ms')
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--records', type=int, default=20_000)
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    parser.add_argument('-p', '--protocol', type=int,
+                        default=pickle.DEFAULT_PROTOCOL)
+    args = parser.parse_args()
+
+    records = make_records(args.records)
+    proto = args.protocol
+    for fast in (False, True):
+        assert pickle.loads(dumps(records, proto, fast)) == records
+
+    print(f'{args.records} records, protocol {proto}, '
+          f'best of {args.repeat}')
+    print('-- whole list')
+    bench('C pickle.dumps', lambda: pickle.dumps(records, proto),
+          args.repeat)
+    for fast in (False, True):
+        mode = ', fast mode' if fast else ''
+        base = bench('pure Python, generic' + mode,
+                     lambda: dumps(records, proto, fast, GenericPickler),
+                     args.repeat)
+        compiled = bench('pure Python, compiled' + mode,
+                         lambda: dumps(records, proto, fast), args.repeat)
+        print(f'speedup: {base / compiled:.2f}x')
+    print('-- record by record')
+    bench('C pickle.dumps',
+          lambda: [pickle.dumps(r, proto) for r in records], args.repeat)
+    for fast in (False, True):
+        mode = ', fast mode' if fast else ''
+        base = bench('pure Python, generic' + mode,
+                     lambda: [dumps(r, proto, fast, GenericPickler)
+                              for r in records], args.repeat)
+        compiled = bench('pure Python, compiled' + mode,
+                         lambda: [dumps(r, proto, fast) for r in records],
+                         args.repeat)
+        print(f'speedup: {base / compiled:.2f}x')
+
+
+if __name__ == '__main__':
+    main()